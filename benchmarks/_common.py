@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for the LocalMind benchmark scripts.
+Result files carry enough metadata (commit, interpreter, platform) to be compared across commits.
+"""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+RESULTS_DIR = REPO_ROOT / "benchmarks" / "results"
+
+# Relative slowdown tolerated before --compare reports a regression
+DEFAULT_MAX_REGRESSION = 0.20
+
+# Metrics below this in both runs are timer noise and never count as regressions
+NOISE_FLOOR = 0.005
+
+
+def git_commit() -> str:
+    """Return the short commit hash of the working tree, or 'unknown'."""
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True,
+        )
+        commit = out.stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=REPO_ROOT, capture_output=True, text=True,
+        ).stdout.strip()
+        return f"{commit}-dirty" if dirty else commit
+    except Exception:
+        return "unknown"
+
+
+def run_metadata() -> Dict[str, Any]:
+    """Describe the machine and revision a benchmark ran on."""
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Reduce repeated timings to median/min/max (seconds)."""
+    if not samples:
+        return {"median": 0.0, "min": 0.0, "max": 0.0, "runs": 0}
+    return {
+        "median": statistics.median(samples),
+        "min": min(samples),
+        "max": max(samples),
+        "runs": len(samples),
+    }
+
+
+def run_python(code: str, cwd: Optional[Path] = None, env: Optional[Dict[str, str]] = None,
+               extra_args: Optional[List[str]] = None, timeout: float = 300) -> subprocess.CompletedProcess:
+    """Run a snippet in a fresh interpreter so module caches never leak between samples."""
+    full_env = dict(os.environ)
+    full_env["PYTHONPATH"] = os.pathsep.join(
+        p for p in [str(REPO_ROOT), full_env.get("PYTHONPATH", "")] if p
+    )
+    if env:
+        full_env.update(env)
+    cmd = [sys.executable] + (extra_args or []) + ["-c", code]
+    return subprocess.run(cmd, cwd=str(cwd or REPO_ROOT), env=full_env,
+                          capture_output=True, text=True, timeout=timeout)
+
+
+def write_results(name: str, results: Dict[str, Any], output: Optional[str] = None) -> Path:
+    """Write a result document to benchmarks/results/<name>-<commit>.json (or --output)."""
+    if output:
+        path = Path(output)
+    else:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        commit = results.get("meta", {}).get("commit", "unknown")
+        path = RESULTS_DIR / f"{name}-{commit}.json"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    return path
+
+
+def flatten_metrics(doc: Dict[str, Any]) -> Dict[str, float]:
+    """Collect every comparable timing from a result document.
+
+    Metrics are leaf 'median' values keyed by their dotted path, e.g.
+    'imports.cv2.wall.median'. Metadata is ignored.
+    """
+    flat: Dict[str, float] = {}
+
+    def walk(node: Any, prefix: str) -> None:
+        if isinstance(node, dict):
+            for key, value in node.items():
+                if prefix == "" and key == "meta":
+                    continue
+                walk(value, f"{prefix}.{key}" if prefix else key)
+        elif isinstance(node, (int, float)) and not isinstance(node, bool):
+            if prefix.endswith(".median"):
+                flat[prefix] = float(node)
+
+    walk(doc, "")
+    return flat
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any],
+                    max_regression: float = DEFAULT_MAX_REGRESSION,
+                    higher_is_better: Tuple[str, ...] = (),
+                    noise_floor: float = NOISE_FLOOR) -> Tuple[List[str], List[str]]:
+    """Compare two result documents.
+
+    Returns (report_lines, regressions). A metric regresses when it is slower than the
+    baseline by more than max_regression (relative); metrics whose path contains one of
+    higher_is_better (e.g. throughput) regress when they drop by that much instead.
+    Metrics below noise_floor in both documents are listed but never flagged.
+    """
+    base = flatten_metrics(baseline)
+    cur = flatten_metrics(current)
+    lines: List[str] = []
+    regressions: List[str] = []
+    for key in sorted(set(base) & set(cur)):
+        old, new = base[key], cur[key]
+        if old <= 0:
+            continue
+        delta = (new - old) / old
+        better_up = any(tag in key for tag in higher_is_better)
+        regressed = (delta < -max_regression) if better_up else (delta > max_regression)
+        if max(old, new) < noise_floor:
+            regressed = False
+        marker = "REGRESSION" if regressed else ""
+        lines.append(f"{key:<60} {old:>12.4f} -> {new:>12.4f} ({delta:+.1%}) {marker}".rstrip())
+        if regressed:
+            regressions.append(key)
+    return lines, regressions
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    """Load a previously written result document."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
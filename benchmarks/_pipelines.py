@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Pipeline runners executed inside a fresh child interpreter by bench_scan.py.
+Each runner wraps the pipeline's stage functions with timers (the pipelines look their
+helpers up as module globals, so the real code path is measured unchanged), runs the
+pipeline once against config.json in the current directory, and prints a JSON result.
+"""
+
+import contextlib
+import functools
+import io
+import json
+import sys
+import time
+from typing import Any, Callable, Dict, Tuple
+
+
+class StageTimer:
+    """Accumulates wall time and call counts per wrapped function."""
+
+    def __init__(self):
+        self.stages: Dict[str, Dict[str, float]] = {}
+
+    def wrap(self, owner: Any, name: str, label: str = "") -> None:
+        original = getattr(owner, name)
+        label = label or name
+        stats = self.stages.setdefault(label, {"seconds": 0.0, "calls": 0})
+
+        @functools.wraps(original)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                stats["seconds"] += time.perf_counter() - start
+                stats["calls"] += 1
+
+        setattr(owner, name, timed)
+
+
+def _import_modules(names: Tuple[str, ...]) -> float:
+    """Import a pipeline's modules up front so scan timings exclude import cost."""
+    import importlib
+    start = time.perf_counter()
+    for name in names:
+        importlib.import_module(name)
+    return time.perf_counter() - start
+
+
+def _peak_rss_bytes() -> int:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def _run_scan(timer: StageTimer) -> Dict[str, Any]:
+    import cleanslate_core as core
+    for name in ("scan_files", "collect_file_stats", "detect_duplicates", "detect_large_files",
+                 "detect_old_files", "detect_empty_files", "detect_near_duplicate_images",
+                 "detect_blurry_images", "write_report", "write_html_report"):
+        timer.wrap(core, name)
+    results = core.run_scan(core.load_config())
+    return {"files": results["total_files"], "metrics": results.get("metrics")}
+
+
+def _scan_folder(timer: StageTimer) -> Dict[str, Any]:
+    import threading
+    import cleanslate_core as core
+    for name in ("_hash_first_chunk", "write_report", "_write_html"):
+        timer.wrap(core, name)
+    config = core.load_config()
+    results = core.scan_folder(
+        config["directories_to_scan"][0],
+        config["large_file_threshold_mb"],
+        config["old_file_threshold_days"],
+        config.get("excluded_folders", []),
+        True, True, threading.Event(),
+    )
+    return {"files": results["total_files"], "metrics": results.get("metrics")}
+
+
+def _phase4(timer: StageTimer) -> Dict[str, Any]:
+    import cleanslate_core as core
+    import cleanslate_phase4 as phase4
+    timer.wrap(phase4, "run_scan", "run_scan (base)")
+    timer.wrap(phase4.AIAnalyzer, "analyze_file_content")
+    timer.wrap(phase4.AIAnalyzer, "find_content_duplicates")
+    timer.wrap(phase4.AIAnalyzer, "_find_image_near_duplicates")
+    timer.wrap(phase4.AIAnalyzer, "_find_text_near_duplicates")
+    timer.wrap(phase4.AdvancedReporter, "generate_ai_report")
+    results = phase4.run_phase4_scan(core.load_config())
+    return {"files": results["total_files"], "metrics": results.get("metrics")}
+
+
+def _phase1(timer: StageTimer) -> Dict[str, Any]:
+    import cleanslate_phase1 as phase1
+    for name in ("scan_directories", "collect_file_metadata", "detect_duplicates",
+                 "detect_large_files", "detect_old_files", "generate_report",
+                 "print_duplicates", "print_large_files", "print_old_files"):
+        timer.wrap(phase1, name)
+    phase1.main()
+    return {"files": int(timer.stages["collect_file_metadata"]["calls"])}
+
+
+PIPELINES: Dict[str, Tuple[Tuple[str, ...], Callable[[StageTimer], Dict[str, Any]]]] = {
+    "run_scan": (("cleanslate_core",), _run_scan),
+    "scan_folder": (("cleanslate_core",), _scan_folder),
+    "phase4": (("cleanslate_core", "cleanslate_phase4"), _phase4),
+    "phase1": (("cleanslate_phase1",), _phase1),
+}
+
+
+def main(name: str) -> None:
+    modules, runner = PIPELINES[name]
+    timer = StageTimer()
+    import_seconds = _import_modules(modules)
+    start = time.perf_counter()
+    # Pipelines print progress with emoji; keep it out of the JSON channel
+    with contextlib.redirect_stdout(io.StringIO()):
+        outcome = runner(timer)
+    total = time.perf_counter() - start
+    print(json.dumps({
+        "import_seconds": import_seconds,
+        "total_seconds": total,
+        "stages": timer.stages,
+        "peak_rss_bytes": _peak_rss_bytes(),
+        **outcome,
+    }))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1])
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+LocalMind Hashing Benchmark
+Compares the three ways of feeding a file to hashlib -- read() into new bytes objects,
+readinto() a reusable buffer, and mmap + memoryview slices -- across file sizes, and
+reports the smallest size from which mmap stays ahead of buffered reads (the value
+cleanslate_hashing.MMAP_MIN_BYTES should be near). Files are hashed warm (page cache);
+the first, cold pass of each file is discarded.
+
+Usage:
+    python benchmarks/bench_hashing.py                       # write benchmarks/results/hashing-<commit>.json
+    python benchmarks/bench_hashing.py --max-size-mb 256     # include very large files
+    python benchmarks/bench_hashing.py --compare OLD.json    # exit 1 if any throughput dropped
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from _common import (
+    DEFAULT_MAX_REGRESSION, REPO_ROOT, compare_results, load_results,
+    run_metadata, summarize, write_results,
+)
+
+sys.path.insert(0, str(REPO_ROOT))
+
+import cleanslate_hashing  # noqa: E402
+
+MB = 1024 * 1024
+
+# 64 KB .. 256 MB, doubling
+ALL_SIZES = [64 * 1024 << i for i in range(13)]
+
+METHODS = ("read", "readinto", "mmap")
+
+
+def _hash_read(path: str, algorithm: str) -> str:
+    """Baseline: what the scanners did before -- a fresh bytes object per chunk."""
+    h = cleanslate_hashing.new_hasher(algorithm)
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(cleanslate_hashing.READ_CHUNK_BYTES)
+            if not chunk:
+                break
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _hash_readinto(path: str, algorithm: str) -> str:
+    return cleanslate_hashing.hash_file(path, algorithm, use_mmap=False)
+
+
+def _hash_mmap(path: str, algorithm: str) -> str:
+    return cleanslate_hashing.hash_file(path, algorithm, use_mmap=True)
+
+
+HASHERS: Dict[str, Callable[[str, str], str]] = {
+    "read": _hash_read,
+    "readinto": _hash_readinto,
+    "mmap": _hash_mmap,
+}
+
+
+def _make_file(directory: Path, size: int) -> Path:
+    path = directory / f"data_{size}.bin"
+    block = os.urandom(min(size, 4 * MB))
+    with open(path, "wb") as f:
+        written = 0
+        while written < size:
+            piece = block[:size - written]
+            f.write(piece)
+            written += len(piece)
+    return path
+
+
+def _runs_for(size: int, budget_bytes: int, min_runs: int) -> int:
+    """Enough repetitions that small files are not pure timer noise."""
+    return max(min_runs, min(2000, budget_bytes // max(size, 1)))
+
+
+def bench_size(path: Path, size: int, algorithm: str, min_runs: int, budget_bytes: int) -> Dict[str, Any]:
+    runs = _runs_for(size, budget_bytes, min_runs)
+    result: Dict[str, Any] = {"bytes": size, "runs": runs}
+    digests = set()
+    for method in METHODS:
+        hasher = HASHERS[method]
+        digests.add(hasher(str(path), algorithm))  # warm-up; also checks the methods agree
+        throughput: List[float] = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            hasher(str(path), algorithm)
+            elapsed = time.perf_counter() - start
+            throughput.append(size / MB / elapsed if elapsed > 0 else 0.0)
+        result[method] = {"mb_per_s": summarize(throughput)}
+    if len(digests) != 1:
+        result["error"] = "methods produced different digests"
+    return result
+
+
+def crossover(sizes: Dict[str, Dict[str, Any]]) -> Optional[int]:
+    """Smallest size from which mmap beats readinto at this and every larger size."""
+    found: Optional[int] = None
+    for key in sorted(sizes, key=lambda k: sizes[k]["bytes"], reverse=True):
+        data = sizes[key]
+        if data["mmap"]["mb_per_s"]["median"] > data["readinto"]["mb_per_s"]["median"]:
+            found = data["bytes"]
+        else:
+            break
+    return found
+
+
+def run_benchmarks(sizes: List[int], algorithm: str, min_runs: int, budget_mb: int) -> Dict[str, Any]:
+    workdir = Path(tempfile.mkdtemp(prefix="localmind_hash_bench_"))
+    try:
+        results: Dict[str, Any] = {"meta": run_metadata(), "sizes": {}}
+        results["meta"].update({"algorithm": algorithm, "min_runs": min_runs,
+                                "mmap_min_bytes": cleanslate_hashing.MMAP_MIN_BYTES})
+        for size in sizes:
+            label = f"{size // 1024}K" if size < MB else f"{size // MB}M"
+            print(f"⏱  {label:>6} ...")
+            path = _make_file(workdir, size)
+            results["sizes"][label] = bench_size(path, size, algorithm, min_runs, budget_mb * MB)
+            path.unlink()
+        results["crossover_bytes"] = crossover(results["sizes"])
+        return results
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def print_summary(results: Dict[str, Any]) -> None:
+    print(f"\n📊 HASHING SUMMARY ({results['meta']['algorithm']}, median MB/s)")
+    print("=" * 60)
+    print(f"{'size':>8} {'read':>12} {'readinto':>12} {'mmap':>12}")
+    for label, data in results["sizes"].items():
+        cells = " ".join(f"{data[m]['mb_per_s']['median']:>12.0f}" for m in METHODS)
+        note = f"  {data['error']}" if "error" in data else ""
+        print(f"{label:>8} {cells}{note}")
+    cross = results["crossover_bytes"]
+    if cross is None:
+        print("\nmmap never stayed ahead of readinto in this range")
+    else:
+        print(f"\nmmap wins from {cross / MB:.2f} MB up "
+              f"(current MMAP_MIN_BYTES: {results['meta']['mmap_min_bytes']})")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="LocalMind file hashing benchmark (read vs readinto vs mmap)")
+    parser.add_argument("--algorithm", default="auto",
+                        help="Hash algorithm, as in config 'hash_algorithm' (default auto)")
+    parser.add_argument("--min-size-kb", type=int, default=64, help="Smallest file size (default 64 KB)")
+    parser.add_argument("--max-size-mb", type=int, default=64, help="Largest file size (default 64 MB, up to 256)")
+    parser.add_argument("--runs", type=int, default=5, help="Minimum samples per size and method (default 5)")
+    parser.add_argument("--budget-mb", type=int, default=512,
+                        help="Bytes hashed per size and method; small files get more samples (default 512)")
+    parser.add_argument("--output", help="Result file path (default benchmarks/results/hashing-<commit>.json)")
+    parser.add_argument("--compare", help="Baseline result file to compare against")
+    parser.add_argument("--max-regression", type=float, default=DEFAULT_MAX_REGRESSION,
+                        help="Relative throughput drop that counts as a regression (default 0.20)")
+    args = parser.parse_args()
+
+    sizes = [s for s in ALL_SIZES if args.min_size_kb * 1024 <= s <= args.max_size_mb * MB]
+    if not sizes:
+        parser.error("no sizes in the requested range")
+    try:
+        algorithm = cleanslate_hashing.resolve_algorithm(args.algorithm)
+    except ValueError as e:
+        parser.error(str(e))
+    results = run_benchmarks(sizes, algorithm, args.runs, args.budget_mb)
+    print_summary(results)
+    path = write_results("hashing", results, args.output)
+    print(f"\n📄 Results saved to '{path}'")
+
+    if args.compare:
+        lines, regressions = compare_results(load_results(args.compare), results, args.max_regression,
+                                             higher_is_better=("mb_per_s",), noise_floor=0.0)
+        print(f"\n🔍 Comparison with {args.compare}")
+        for line in lines:
+            print(line)
+        if regressions:
+            print(f"\n❌ {len(regressions)} hashing throughput regression(s) above {args.max_regression:.0%}")
+            return 1
+        print("\n✅ No hashing regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+LocalMind End-to-End Scan Benchmark
+Generates a reproducible synthetic tree, runs each scan pipeline against it in a fresh
+interpreter, and reports per-stage wall time, throughput (files/s, MB/s) and peak RSS.
+Module import cost is measured separately and excluded from totals and throughput
+(see bench_startup.py for import profiling).
+
+Pipelines:
+    run_scan     cleanslate_core.run_scan (all detectors + text/HTML reports)
+    scan_folder  cleanslate_core.scan_folder (GUI scan path)
+    phase4       cleanslate_phase4.run_phase4_scan (base scan + AI analysis)
+    phase1       cleanslate_phase1.main (standalone scanner)
+
+Usage:
+    python benchmarks/bench_scan.py --files 5000 --duplicate-ratio 0.2 --image-groups 20
+    python benchmarks/bench_scan.py --tree /data/existing_tree --pipeline run_scan
+    python benchmarks/bench_scan.py --compare benchmarks/results/scan-abc1234.json
+"""
+
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from _common import (
+    DEFAULT_MAX_REGRESSION, compare_results, load_results,
+    run_metadata, run_python, summarize, write_results,
+)
+from synthetic_tree import SIZE_DISTRIBUTIONS, generate_tree
+
+BENCH_DIR = Path(__file__).resolve().parent
+PIPELINE_NAMES = ["run_scan", "scan_folder", "phase4", "phase1"]
+
+_CHILD_SNIPPET = "import sys; sys.path.insert(0, {bench_dir!r}); import _pipelines; _pipelines.main({name!r})"
+
+
+def _write_config(workdir: Path, tree: Path) -> None:
+    """config.json in the Phase 2 layout; run_scan, phase1 and phase4 all read it from the CWD."""
+    config = {
+        "directories_to_scan": [str(tree)],
+        "large_file_threshold_mb": 1,
+        "old_file_threshold_days": 365,
+        "excluded_folders": [".git", "node_modules"],
+        "excluded_file_types": [".tmp"],
+    }
+    with open(workdir / "config.json", "w", encoding="utf-8") as f:
+        json.dump(config, f, indent=2)
+
+
+def _tree_size(tree: Path) -> Dict[str, int]:
+    files = 0
+    total = 0
+    for path in tree.rglob("*"):
+        if path.is_file():
+            files += 1
+            total += path.stat().st_size
+    return {"files": files, "total_bytes": total}
+
+
+def bench_pipeline(name: str, runs: int, workdir: Path, tree_files: int, tree_bytes: int,
+                   timeout: float) -> Dict[str, Any]:
+    """Run one pipeline `runs` times in fresh interpreters and summarize."""
+    totals: List[float] = []
+    imports: List[float] = []
+    rss: List[float] = []
+    stages: Dict[str, List[float]] = {}
+    last: Dict[str, Any] = {}
+    for _ in range(runs):
+        try:
+            proc = run_python(_CHILD_SNIPPET.format(bench_dir=str(BENCH_DIR), name=name),
+                              cwd=workdir, timeout=timeout)
+        except Exception as e:
+            return {"error": str(e)}
+        if proc.returncode != 0:
+            return {"error": (proc.stderr.strip().splitlines() or ["failed"])[-1]}
+        last = json.loads(proc.stdout.strip().splitlines()[-1])
+        totals.append(last["total_seconds"])
+        imports.append(last["import_seconds"])
+        rss.append(last["peak_rss_bytes"])
+        for stage, stats in last["stages"].items():
+            stages.setdefault(stage, []).append(stats["seconds"])
+
+    total = summarize(totals)
+    median = total["median"] or 1e-9
+    result: Dict[str, Any] = {
+        "total_seconds": total,
+        "import_seconds": summarize(imports),
+        "stages": {
+            stage: {"seconds": summarize(values), "calls": last["stages"][stage]["calls"]}
+            for stage, values in stages.items()
+        },
+        "throughput": {
+            "files_per_s": {"median": tree_files / median},
+            "mb_per_s": {"median": tree_bytes / 1024 / 1024 / median},
+        },
+        "peak_rss_mb": {"median": summarize(rss)["median"] / 1024 / 1024},
+        "files_reported": last.get("files"),
+    }
+    if last.get("metrics"):
+        result["metrics"] = last["metrics"]
+    return result
+
+
+def print_summary(results: Dict[str, Any]) -> None:
+    tree = results["tree"]
+    print(f"\n📊 SCAN BENCHMARK ({tree['files']} files, {tree['total_bytes'] / 1024 / 1024:.1f} MB)")
+    print("=" * 80)
+    for name, data in results["pipelines"].items():
+        if "error" in data:
+            print(f"{name:<12} ERROR: {data['error']}")
+            continue
+        print(f"{name:<12} {data['total_seconds']['median']:8.3f}s  "
+              f"{data['throughput']['files_per_s']['median']:10.1f} files/s  "
+              f"{data['throughput']['mb_per_s']['median']:8.2f} MB/s  "
+              f"peak RSS {data['peak_rss_mb']['median']:.1f} MB")
+        ranked = sorted(data["stages"].items(), key=lambda kv: kv[1]["seconds"]["median"], reverse=True)
+        for stage, stats in ranked:
+            print(f"    {stage:<32} {stats['seconds']['median']:8.3f}s  ({int(stats['calls'])} calls)")
+    print("Note: stage timings can nest (a wrapped function may call another), so they need not sum to the total.")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="LocalMind end-to-end scan benchmark")
+    parser.add_argument("--pipeline", action="append", choices=PIPELINE_NAMES, dest="pipelines",
+                        help="Pipeline to run (repeatable; default: all)")
+    parser.add_argument("--runs", type=int, default=3, help="Samples per pipeline (default 3)")
+    parser.add_argument("--timeout", type=float, default=3600.0, help="Seconds before a run is abandoned")
+    parser.add_argument("--tree", help="Benchmark an existing tree instead of generating one")
+    parser.add_argument("--keep-tree", action="store_true", help="Do not delete the generated tree")
+    gen = parser.add_argument_group("synthetic tree")
+    gen.add_argument("--files", type=int, default=2000)
+    gen.add_argument("--depth", type=int, default=3)
+    gen.add_argument("--fanout", type=int, default=4)
+    gen.add_argument("--size-distribution", choices=SIZE_DISTRIBUTIONS, default="lognormal")
+    gen.add_argument("--median-kb", type=float, default=16.0)
+    gen.add_argument("--max-mb", type=float, default=64.0)
+    gen.add_argument("--duplicate-ratio", type=float, default=0.1)
+    gen.add_argument("--empty-ratio", type=float, default=0.01)
+    gen.add_argument("--old-ratio", type=float, default=0.2)
+    gen.add_argument("--image-groups", type=int, default=10)
+    gen.add_argument("--image-variants", type=int, default=3)
+    gen.add_argument("--blurry-images", type=int, default=5)
+    gen.add_argument("--text-groups", type=int, default=10)
+    gen.add_argument("--text-variants", type=int, default=3)
+    gen.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Result file path (default benchmarks/results/scan-<commit>.json)")
+    parser.add_argument("--compare", help="Baseline result file to compare against")
+    parser.add_argument("--max-regression", type=float, default=DEFAULT_MAX_REGRESSION)
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="localmind_scanbench_"))
+    manifest: Optional[Dict[str, Any]] = None
+    try:
+        if args.tree:
+            tree = Path(args.tree).resolve()
+        else:
+            tree = workdir / "tree"
+            print(f"🌲 Generating synthetic tree ({args.files} files, seed {args.seed}) ...")
+            manifest = generate_tree(
+                str(tree), files=args.files, depth=args.depth, fanout=args.fanout,
+                size_distribution=args.size_distribution, median_kb=args.median_kb, max_mb=args.max_mb,
+                duplicate_ratio=args.duplicate_ratio, empty_ratio=args.empty_ratio, old_ratio=args.old_ratio,
+                image_groups=args.image_groups, image_variants=args.image_variants,
+                blurry_images=args.blurry_images, text_groups=args.text_groups,
+                text_variants=args.text_variants, seed=args.seed,
+            )
+        _write_config(workdir, tree)
+        size = _tree_size(tree)
+
+        results: Dict[str, Any] = {
+            "meta": run_metadata(),
+            "tree": {**size, "path": str(tree), "options": manifest["options"] if manifest else None},
+            "pipelines": {},
+        }
+        results["meta"]["runs"] = args.runs
+        for name in args.pipelines or PIPELINE_NAMES:
+            print(f"⏱  {name} ...")
+            results["pipelines"][name] = bench_pipeline(
+                name, args.runs, workdir, size["files"], size["total_bytes"], args.timeout)
+    finally:
+        if args.keep_tree and not args.tree:
+            print(f"🌲 Tree kept at {workdir / 'tree'}")
+        else:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print_summary(results)
+    path = write_results("scan", results, args.output)
+    print(f"\n📄 Results saved to '{path}'")
+
+    if args.compare:
+        baseline = load_results(args.compare)
+        lines, regressions = compare_results(baseline, results, args.max_regression,
+                                             higher_is_better=("throughput",))
+        print(f"\n🔍 Comparison with {args.compare}")
+        if baseline.get("tree", {}).get("options") != results["tree"]["options"]:
+            print("Warning: baseline was measured on a different tree; numbers are not comparable")
+        for line in lines:
+            print(line)
+        if regressions:
+            print(f"\n❌ {len(regressions)} scan regression(s) above {args.max_regression:.0%}")
+            return 1
+        print("\n✅ No scan regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
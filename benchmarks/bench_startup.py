@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+LocalMind Startup Benchmark
+Measures per-module import cost, the Phase 2 CLI cost before its first file is scanned,
+and time-to-first-window for the GUI. Every sample runs in a fresh interpreter.
+
+Usage:
+    python benchmarks/bench_startup.py                       # write benchmarks/results/startup-<commit>.json
+    python benchmarks/bench_startup.py --compare OLD.json    # exit 1 if any median regressed
+"""
+
+import argparse
+import json
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from _common import (
+    DEFAULT_MAX_REGRESSION, compare_results, load_results,
+    run_metadata, run_python, summarize, write_results,
+)
+
+# Modules whose import cost we track individually
+IMPORT_TARGETS = [
+    "cleanslate_core",
+    "cleanslate_phase4",
+    "cleanslate_gui",
+    "PySimpleGUI",
+    "cv2",
+    "sklearn",
+]
+
+# Number of slowest transitive imports kept per target
+TOP_CONTRIBUTORS = 10
+
+_IMPORT_SNIPPET = """
+import time, json
+t0 = time.perf_counter()
+import {module}
+print(json.dumps({{"seconds": time.perf_counter() - t0}}))
+"""
+
+_PHASE2_SNIPPET = """
+import time, json
+t0 = time.perf_counter()
+import cleanslate_phase2
+t1 = time.perf_counter()
+config = cleanslate_phase2.load_config()
+t2 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "load_config": t2 - t1, "total": t2 - t0}))
+"""
+
+_WINDOW_SNIPPET = """
+import time, json
+t0 = time.perf_counter()
+import app  # applies the same tkinter patch as the real entry point
+t1 = time.perf_counter()
+import cleanslate_gui
+t2 = time.perf_counter()
+win = cleanslate_gui.LocalMindWindow()
+win.window.refresh()
+t3 = time.perf_counter()
+win.window.close()
+print(json.dumps({"import_app": t1 - t0, "import_gui": t2 - t1, "build_window": t3 - t2, "total": t3 - t0}))
+"""
+
+
+def _last_json_line(stdout: str) -> Dict[str, Any]:
+    """Return the JSON object printed last by a snippet (libraries may print before it)."""
+    for line in reversed(stdout.strip().splitlines()):
+        line = line.strip()
+        if line.startswith("{"):
+            return json.loads(line)
+    raise ValueError("no JSON result in output")
+
+
+def parse_importtime(stderr: str) -> List[Dict[str, Any]]:
+    """Parse `python -X importtime` output into records (microseconds)."""
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            self_us = int(parts[0].strip())
+            cumulative_us = int(parts[1].strip())
+        except ValueError:
+            continue  # header line
+        raw_name = parts[2]
+        name = raw_name.strip()
+        depth = (len(raw_name) - len(raw_name.lstrip()) - 1) // 2
+        records.append({"module": name, "self_us": self_us, "cumulative_us": cumulative_us, "depth": depth})
+    return records
+
+
+def bench_import(module: str, runs: int, cwd: Path) -> Dict[str, Any]:
+    """Time `import module` in fresh interpreters and list its slowest dependencies."""
+    wall: List[float] = []
+    process: List[float] = []
+    error: Optional[str] = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = run_python(_IMPORT_SNIPPET.format(module=module), cwd=cwd)
+        elapsed = time.perf_counter() - start
+        if proc.returncode != 0:
+            error = (proc.stderr.strip().splitlines() or ["import failed"])[-1]
+            break
+        wall.append(_last_json_line(proc.stdout)["seconds"])
+        process.append(elapsed)
+
+    result: Dict[str, Any] = {"wall": summarize(wall), "process": summarize(process)}
+    if error:
+        result["error"] = error
+        return result
+
+    # One extra run with -X importtime for the breakdown
+    proc = run_python(f"import {module}", cwd=cwd, extra_args=["-X", "importtime"])
+    records = parse_importtime(proc.stderr)
+    contributors = sorted(
+        (r for r in records if r["module"] != module),
+        key=lambda r: r["self_us"], reverse=True,
+    )[:TOP_CONTRIBUTORS]
+    result["top_self_us"] = [{"module": r["module"], "self_us": r["self_us"]} for r in contributors]
+    result["modules_loaded"] = len(records)
+    return result
+
+
+def bench_snippet(snippet: str, runs: int, cwd: Path, timeout: float) -> Dict[str, Any]:
+    """Run a phase-timing snippet repeatedly and summarize each phase it reports."""
+    phases: Dict[str, List[float]] = {}
+    process: List[float] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        try:
+            proc = run_python(snippet, cwd=cwd, timeout=timeout)
+        except Exception as e:
+            return {"error": str(e)}
+        elapsed = time.perf_counter() - start
+        if proc.returncode != 0:
+            return {"error": (proc.stderr.strip().splitlines() or ["failed"])[-1]}
+        try:
+            data = _last_json_line(proc.stdout)
+        except ValueError as e:
+            return {"error": str(e)}
+        for key, value in data.items():
+            phases.setdefault(key, []).append(value)
+        process.append(elapsed)
+    result = {key: summarize(values) for key, values in phases.items()}
+    result["process"] = summarize(process)
+    return result
+
+
+def _sandbox_dir() -> Path:
+    """Working directory with a config.json so the app never rewrites the repo's one."""
+    tmp = Path(tempfile.mkdtemp(prefix="localmind_bench_"))
+    (tmp / "empty").mkdir()
+    config = {
+        "directories_to_scan": [str(tmp / "empty")],
+        "large_file_threshold_mb": 100,
+        "old_file_threshold_days": 365,
+        "excluded_folders": [".git", "node_modules"],
+        "excluded_file_types": [".tmp", ".log"],
+    }
+    with open(tmp / "config.json", "w", encoding="utf-8") as f:
+        json.dump(config, f, indent=2)
+    return tmp
+
+
+def run_benchmarks(runs: int, modules: List[str], include_window: bool, window_timeout: float) -> Dict[str, Any]:
+    """Run the whole startup suite and return a result document."""
+    sandbox = _sandbox_dir()
+    try:
+        results: Dict[str, Any] = {"meta": run_metadata(), "imports": {}}
+        results["meta"]["runs"] = runs
+        for module in modules:
+            print(f"⏱  import {module} ...")
+            results["imports"][module] = bench_import(module, runs, sandbox)
+
+        print("⏱  phase2 CLI (import + load_config) ...")
+        results["phase2_cli"] = bench_snippet(_PHASE2_SNIPPET, runs, sandbox, timeout=300)
+
+        if include_window:
+            print("⏱  time to first window ...")
+            results["first_window"] = bench_snippet(_WINDOW_SNIPPET, runs, sandbox, timeout=window_timeout)
+        return results
+    finally:
+        shutil.rmtree(sandbox, ignore_errors=True)
+
+
+def print_summary(results: Dict[str, Any]) -> None:
+    """Print a compact table of medians."""
+    print("\n📊 STARTUP SUMMARY (median seconds)")
+    print("=" * 60)
+    for module, data in results["imports"].items():
+        if "error" in data:
+            print(f"import {module:<24} ERROR: {data['error']}")
+        else:
+            print(f"import {module:<24} {data['wall']['median']:.3f}s  (process {data['process']['median']:.3f}s)")
+    for section in ("phase2_cli", "first_window"):
+        data = results.get(section)
+        if not data:
+            continue
+        if "error" in data:
+            print(f"{section:<31} ERROR: {data['error']}")
+        else:
+            print(f"{section:<31} {data['total']['median']:.3f}s  (process {data['process']['median']:.3f}s)")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="LocalMind startup-time benchmark")
+    parser.add_argument("--runs", type=int, default=5, help="Samples per measurement (default 5)")
+    parser.add_argument("--module", action="append", dest="modules",
+                        help="Module to time (repeatable; default: core, phase4, gui, PySimpleGUI, cv2, sklearn)")
+    parser.add_argument("--no-window", action="store_true", help="Skip time-to-first-window (headless machines)")
+    parser.add_argument("--window-timeout", type=float, default=60.0, help="Seconds before a window sample is abandoned")
+    parser.add_argument("--output", help="Result file path (default benchmarks/results/startup-<commit>.json)")
+    parser.add_argument("--compare", help="Baseline result file to compare against")
+    parser.add_argument("--max-regression", type=float, default=DEFAULT_MAX_REGRESSION,
+                        help="Relative slowdown that counts as a regression (default 0.20)")
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.runs, args.modules or IMPORT_TARGETS, not args.no_window, args.window_timeout)
+    print_summary(results)
+    path = write_results("startup", results, args.output)
+    print(f"\n📄 Results saved to '{path}'")
+
+    if args.compare:
+        lines, regressions = compare_results(load_results(args.compare), results, args.max_regression)
+        print(f"\n🔍 Comparison with {args.compare}")
+        for line in lines:
+            print(line)
+        if regressions:
+            print(f"\n❌ {len(regressions)} startup regression(s) above {args.max_regression:.0%}")
+            return 1
+        print("\n✅ No startup regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
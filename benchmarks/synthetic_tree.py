@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Synthetic File Tree Generator
+Builds reproducible directory trees for scan benchmarks: configurable file count, depth,
+size distribution, exact-duplicate ratio, old/empty files, and near-duplicate images and texts.
+The same seed and options always produce byte-identical trees.
+
+Usage:
+    python benchmarks/synthetic_tree.py /tmp/tree --files 10000 --depth 4 --duplicate-ratio 0.2
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Size distributions: each returns a size in bytes given an RNG and the median/max options
+SIZE_DISTRIBUTIONS = ("lognormal", "uniform", "fixed")
+
+_WORDS = (
+    "local file cleanup offline scan folder report duplicate archive photo invoice draft "
+    "meeting budget project summary backup version final notes review client design "
+    "schedule travel receipt contract music video album family holiday research paper "
+    "table figure chapter outline index source build release config module package"
+).split()
+
+_TEXT_EXTENSIONS = [".txt", ".md", ".csv", ".json", ".log", ".py"]
+_BINARY_EXTENSIONS = [".bin", ".dat", ".zip", ".pdf", ".mp4", ".iso"]
+
+
+def _pick_size(rng: random.Random, distribution: str, median_kb: float, max_mb: float) -> int:
+    """Draw one file size in bytes."""
+    max_bytes = int(max_mb * 1024 * 1024)
+    if distribution == "fixed":
+        size = int(median_kb * 1024)
+    elif distribution == "uniform":
+        size = rng.randint(0, int(median_kb * 2 * 1024))
+    else:
+        # Lognormal with sigma 1.5 gives the long tail real home folders have
+        size = int(rng.lognormvariate(0.0, 1.5) * median_kb * 1024)
+    return max(1, min(size, max_bytes))
+
+
+def _directory_list(root: Path, depth: int, fanout: int) -> List[Path]:
+    """Create the directory skeleton: fanout children per level, depth levels deep."""
+    dirs = [root]
+    frontier = [root]
+    for level in range(depth):
+        next_frontier = []
+        for parent in frontier:
+            for i in range(fanout):
+                child = parent / f"dir_{level}_{i}"
+                next_frontier.append(child)
+        dirs.extend(next_frontier)
+        frontier = next_frontier
+    for d in dirs:
+        d.mkdir(parents=True, exist_ok=True)
+    return dirs
+
+
+def _text_document(rng: random.Random, words: int) -> str:
+    """A deterministic pseudo-prose document."""
+    out = []
+    for i in range(words):
+        out.append(rng.choice(_WORDS))
+        if i % 12 == 11:
+            out.append(".\n")
+    return " ".join(out)
+
+
+def _mutate_text(rng: random.Random, text: str, rate: float) -> str:
+    """Replace a small fraction of words so TF-IDF similarity stays high."""
+    tokens = text.split(" ")
+    for i in range(len(tokens)):
+        if rng.random() < rate:
+            tokens[i] = rng.choice(_WORDS)
+    return " ".join(tokens)
+
+
+def _write_bytes(rng: random.Random, path: Path, size: int, chunk: int = 1024 * 1024) -> None:
+    with open(path, "wb") as f:
+        remaining = size
+        while remaining > 0:
+            n = min(chunk, remaining)
+            f.write(rng.randbytes(n))
+            remaining -= n
+
+
+def _write_images(rng: random.Random, dirs: List[Path], groups: int, variants: int,
+                  blurry: int, manifest: Dict[str, Any]) -> None:
+    """Write near-duplicate image groups and blurry images (requires Pillow)."""
+    try:
+        from PIL import Image, ImageEnhance, ImageFilter
+    except ImportError:
+        manifest["warnings"].append("Pillow not installed; image groups skipped")
+        return
+
+    def base_image(size: int = 256):
+        img = Image.new("RGB", (size, size))
+        px = img.load()
+        # Sharp blocky pattern: high Laplacian variance, stable pHash
+        cells = [[(rng.randrange(256), rng.randrange(256), rng.randrange(256)) for _ in range(8)] for _ in range(8)]
+        cell = size // 8
+        for y in range(size):
+            for x in range(size):
+                px[x, y] = cells[y // cell][x // cell]
+        return img
+
+    for g in range(groups):
+        img = base_image()
+        group_paths = []
+        for v in range(variants):
+            target = rng.choice(dirs) / f"photo_{g}_{v}.jpg"
+            variant = img
+            if v:
+                variant = ImageEnhance.Brightness(img).enhance(1.0 + 0.03 * v)
+                variant = variant.resize((256 - 4 * v, 256 - 4 * v))
+            variant.save(target, "JPEG", quality=90 - v)
+            group_paths.append(str(target))
+        manifest["near_duplicate_images"].append(group_paths)
+
+    for b in range(blurry):
+        target = rng.choice(dirs) / f"blurry_{b}.png"
+        base_image().filter(ImageFilter.GaussianBlur(radius=8)).save(target, "PNG")
+        manifest["blurry_images"].append(str(target))
+
+
+def generate_tree(root: str, files: int = 1000, depth: int = 3, fanout: int = 4,
+                  size_distribution: str = "lognormal", median_kb: float = 16.0, max_mb: float = 64.0,
+                  duplicate_ratio: float = 0.1, empty_ratio: float = 0.01, old_ratio: float = 0.2,
+                  image_groups: int = 0, image_variants: int = 3, blurry_images: int = 0,
+                  text_groups: int = 0, text_variants: int = 3, seed: int = 42) -> Dict[str, Any]:
+    """Generate a synthetic tree under root and return its manifest.
+
+    Args:
+        root: Directory to create (must not contain unrelated files)
+        files: Number of regular files, excluding image/text groups
+        depth / fanout: Directory levels and children per directory
+        size_distribution: One of SIZE_DISTRIBUTIONS
+        median_kb / max_mb: Size distribution parameters
+        duplicate_ratio: Fraction of files that are byte-copies of an earlier file
+        empty_ratio: Fraction of zero-byte files
+        old_ratio: Fraction of files back-dated two years (mtime and atime)
+        image_groups / image_variants: Near-duplicate image groups and their size
+        blurry_images: Heavily blurred images for blur detection
+        text_groups / text_variants: Near-duplicate text groups and their size
+        seed: RNG seed; identical options and seed give identical trees
+
+    Returns:
+        Manifest dict with counts, total bytes and expected findings
+    """
+    if size_distribution not in SIZE_DISTRIBUTIONS:
+        raise ValueError(f"size_distribution must be one of {SIZE_DISTRIBUTIONS}")
+
+    rng = random.Random(seed)
+    root_path = Path(root)
+    dirs = _directory_list(root_path, depth, fanout)
+
+    manifest: Dict[str, Any] = {
+        "root": str(root_path.resolve()),
+        "options": {
+            "files": files, "depth": depth, "fanout": fanout,
+            "size_distribution": size_distribution, "median_kb": median_kb, "max_mb": max_mb,
+            "duplicate_ratio": duplicate_ratio, "empty_ratio": empty_ratio, "old_ratio": old_ratio,
+            "image_groups": image_groups, "image_variants": image_variants, "blurry_images": blurry_images,
+            "text_groups": text_groups, "text_variants": text_variants, "seed": seed,
+        },
+        "directories": len(dirs),
+        "files": 0,
+        "total_bytes": 0,
+        "duplicate_files": 0,
+        "empty_files": 0,
+        "old_files": 0,
+        "near_duplicate_images": [],
+        "blurry_images": [],
+        "near_duplicate_texts": [],
+        "warnings": [],
+    }
+
+    old_time = time.time() - 2 * 365 * 86400
+    originals: List[Path] = []
+
+    for i in range(files):
+        directory = rng.choice(dirs)
+        roll = rng.random()
+        if roll < empty_ratio:
+            path = directory / f"empty_{i}.txt"
+            path.touch()
+            manifest["empty_files"] += 1
+        elif roll < empty_ratio + duplicate_ratio and originals:
+            source = rng.choice(originals)
+            path = directory / f"copy_{i}{source.suffix}"
+            with open(source, "rb") as src, open(path, "wb") as dst:
+                while True:
+                    block = src.read(1024 * 1024)
+                    if not block:
+                        break
+                    dst.write(block)
+            manifest["duplicate_files"] += 1
+        else:
+            size = _pick_size(rng, size_distribution, median_kb, max_mb)
+            if rng.random() < 0.5:
+                path = directory / f"file_{i}{rng.choice(_TEXT_EXTENSIONS)}"
+                # Large text files repeat one bounded document instead of generating millions of words
+                text = _text_document(rng, min(max(1, size // 6), 20000)).encode("utf-8")
+                path.write_bytes((text * (size // max(len(text), 1) + 1))[:size])
+            else:
+                path = directory / f"file_{i}{rng.choice(_BINARY_EXTENSIONS)}"
+                _write_bytes(rng, path, size)
+            originals.append(path)
+
+        if rng.random() < old_ratio:
+            os.utime(path, (old_time, old_time))
+            manifest["old_files"] += 1
+
+    for g in range(text_groups):
+        base = _text_document(rng, 400)
+        group_paths = []
+        for v in range(text_variants):
+            path = rng.choice(dirs) / f"notes_{g}_{v}.txt"
+            path.write_text(base if v == 0 else _mutate_text(rng, base, 0.02), encoding="utf-8")
+            group_paths.append(str(path))
+        manifest["near_duplicate_texts"].append(group_paths)
+
+    _write_images(rng, dirs, image_groups, image_variants, blurry_images, manifest)
+
+    for dirpath, _, filenames in os.walk(root_path):
+        for name in filenames:
+            if name == "manifest.json":
+                continue
+            manifest["files"] += 1
+            manifest["total_bytes"] += os.path.getsize(os.path.join(dirpath, name))
+    return manifest
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate a reproducible synthetic file tree")
+    parser.add_argument("root", help="Directory to create")
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--depth", type=int, default=3)
+    parser.add_argument("--fanout", type=int, default=4)
+    parser.add_argument("--size-distribution", choices=SIZE_DISTRIBUTIONS, default="lognormal")
+    parser.add_argument("--median-kb", type=float, default=16.0)
+    parser.add_argument("--max-mb", type=float, default=64.0)
+    parser.add_argument("--duplicate-ratio", type=float, default=0.1)
+    parser.add_argument("--empty-ratio", type=float, default=0.01)
+    parser.add_argument("--old-ratio", type=float, default=0.2)
+    parser.add_argument("--image-groups", type=int, default=0)
+    parser.add_argument("--image-variants", type=int, default=3)
+    parser.add_argument("--blurry-images", type=int, default=0)
+    parser.add_argument("--text-groups", type=int, default=0)
+    parser.add_argument("--text-variants", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--manifest", help="Write the manifest JSON here")
+    args = parser.parse_args()
+
+    manifest = generate_tree(
+        args.root, files=args.files, depth=args.depth, fanout=args.fanout,
+        size_distribution=args.size_distribution, median_kb=args.median_kb, max_mb=args.max_mb,
+        duplicate_ratio=args.duplicate_ratio, empty_ratio=args.empty_ratio, old_ratio=args.old_ratio,
+        image_groups=args.image_groups, image_variants=args.image_variants, blurry_images=args.blurry_images,
+        text_groups=args.text_groups, text_variants=args.text_variants, seed=args.seed,
+    )
+    if args.manifest:
+        with open(args.manifest, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+    print(f"Generated {manifest['files']} files ({manifest['total_bytes'] / 1024 / 1024:.1f} MB) "
+          f"in {manifest['directories']} directories under {manifest['root']}")
+    for warning in manifest["warnings"]:
+        print(f"Warning: {warning}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+LocalMind Browser - Lazily paged directory listings for the chat workspace browser
+A directory is read with os.scandir one page at a time: opening a folder with 100,000
+entries costs one page of entries, and later pages are pulled from the same open scandir
+iterator as the user scrolls. Sizes and dates come from the scandir entry's stat data
+(free on Windows; elsewhere one stat per entry actually shown), never a second stat.
+
+Listings are cached per directory and reused until the directory's mtime changes (an
+entry was added, removed or renamed), so going back to a folder shows it instantly.
+Entries appear in directory order; nothing has to be read ahead to sort them.
+"""
+
+import os
+from collections import OrderedDict
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+from cleanslate_logging import get_logger
+
+logger = get_logger("browser")
+
+# Entries per page, and how many directory listings stay cached (each may hold an open
+# scandir handle until it is read to the end)
+PAGE_SIZE = 200
+MAX_CACHED_DIRS = 32
+
+
+class BrowserEntry(NamedTuple):
+    name: str
+    path: str
+    is_dir: bool
+    size: int
+    mtime: float
+
+
+class _Listing:
+    """Entries of one directory read so far, plus the scandir iterator to read the rest."""
+
+    def __init__(self, path: str, mtime_ns: int):
+        self.path = path
+        self.mtime_ns = mtime_ns
+        self.entries: List[BrowserEntry] = []
+        self._iterator: Optional[Iterator[os.DirEntry]] = os.scandir(path)
+
+    @property
+    def complete(self) -> bool:
+        return self._iterator is None
+
+    def fill(self, count: int) -> None:
+        """Read until `count` entries are loaded or the directory is exhausted."""
+        while self._iterator is not None and len(self.entries) < count:
+            try:
+                entry = next(self._iterator)
+            except StopIteration:
+                self.close()
+                break
+            except OSError as e:
+                logger.warning("listing %s stopped: %s", self.path, e)
+                self.close()
+                break
+            try:
+                is_dir = entry.is_dir()
+                st = entry.stat()
+            except OSError:
+                continue  # vanished or unreadable entry
+            self.entries.append(BrowserEntry(entry.name, entry.path, is_dir,
+                                             0 if is_dir else st.st_size, st.st_mtime))
+
+    def close(self) -> None:
+        if self._iterator is not None:
+            self._iterator.close()  # type: ignore[attr-defined]
+            self._iterator = None
+
+
+class DirectoryBrowser:
+    """Paged, cached directory listings; not thread-safe (the GUI thread owns it)."""
+
+    def __init__(self, page_size: int = PAGE_SIZE, max_cached: int = MAX_CACHED_DIRS):
+        self.page_size = page_size
+        self.max_cached = max_cached
+        self._listings: "OrderedDict[str, _Listing]" = OrderedDict()
+
+    def _listing(self, path: str) -> _Listing:
+        path = os.path.abspath(path)
+        mtime_ns = os.stat(path).st_mtime_ns
+        listing = self._listings.get(path)
+        if listing is not None and listing.mtime_ns == mtime_ns:
+            self._listings.move_to_end(path)
+            return listing
+        if listing is not None:
+            listing.close()
+        listing = self._listings[path] = _Listing(path, mtime_ns)
+        self._listings.move_to_end(path)
+        while len(self._listings) > self.max_cached:
+            _, evicted = self._listings.popitem(last=False)
+            evicted.close()
+        return listing
+
+    def page(self, path: str, start: int = 0, count: Optional[int] = None) -> Tuple[List[BrowserEntry], bool]:
+        """Entries [start, start + count) of a directory and whether more follow.
+
+        Raises OSError if the directory itself cannot be read.
+        """
+        count = self.page_size if count is None else count
+        listing = self._listing(path)
+        listing.fill(start + count)
+        entries = listing.entries[start:start + count]
+        return entries, not listing.complete or len(listing.entries) > start + count
+
+    def invalidate(self, path: Optional[str] = None) -> None:
+        """Drop the cached listing of one directory (all if None)."""
+        if path is None:
+            for listing in self._listings.values():
+                listing.close()
+            self._listings.clear()
+            return
+        listing = self._listings.pop(os.path.abspath(path), None)
+        if listing is not None:
+            listing.close()
+
+    def close(self) -> None:
+        self.invalidate()
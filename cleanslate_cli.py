@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+LocalMind CLI - Headless batch scanning for cron and schedulers
+Scans many roots concurrently with an explicit config and output directory, writes
+reports/exports per root, and prints machine-readable progress as JSON Lines on stdout
+(human-oriented messages go to stderr). Exit status is non-zero when any root fails.
+
+Usage:
+    python cleanslate_cli.py --config nightly.json --output-dir /var/reports/localmind \\
+        --root /mnt/vol1 --root /mnt/vol2 --jobs 4 --detectors duplicates,large --export
+
+Exit codes:
+    0  every root scanned
+    1  at least one root failed (missing, unreadable, or the scan raised)
+    2  bad arguments or config
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, TextIO
+
+# Add current directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from cleanslate_core import DEFAULT_CONFIG, DETECTOR_REGISTRY, detector_registry, run_scan
+from cleanslate_plugins import load_plugins
+
+EXIT_OK = 0
+EXIT_SCAN_FAILED = 1
+EXIT_USAGE = 2
+
+
+class ProgressWriter:
+    """Thread-safe JSON Lines emitter for machine-readable progress."""
+
+    def __init__(self, stream: Optional[TextIO]):
+        self.stream = stream
+        self._lock = threading.Lock()
+
+    def emit(self, event: str, **fields: Any) -> None:
+        if self.stream is None:
+            return
+        record = {"ts": datetime.now().isoformat(timespec="milliseconds"), "event": event, **fields}
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+
+def load_config_file(path: str) -> Dict[str, Any]:
+    """Read an explicit config file; missing keys take the core defaults."""
+    with open(path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+    if not isinstance(config, dict):
+        raise ValueError(f"{path}: top level must be a JSON object")
+    return {**DEFAULT_CONFIG, **config}
+
+
+def root_slug(root: str) -> str:
+    """Stable, filesystem-safe directory name for a root's outputs."""
+    name = re.sub(r"[^A-Za-z0-9._-]+", "_", str(Path(root).resolve()).strip("/\\")) or "root"
+    digest = hashlib.blake2b(str(Path(root).resolve()).encode("utf-8"), digest_size=4).hexdigest()
+    return f"{name[-60:]}-{digest}"
+
+
+def scan_root(roots: List[str], base_config: Dict[str, Any], output_dir: Path,
+              progress: ProgressWriter, export: bool, label: str,
+              plugins: Optional[List[type]] = None) -> Dict[str, Any]:
+    """Run one run_scan over `roots`, writing outputs under output_dir. Never raises.
+
+    plugins are the config's plugin classes, loaded once by the caller and shared by
+    every worker (each scan plans its own detectors; nothing global is modified).
+    """
+    started = time.perf_counter()
+    summary: Dict[str, Any] = {"roots": roots, "output_dir": str(output_dir), "ok": False}
+    missing = [root for root in roots if not Path(root).is_dir()]
+    if missing:
+        summary["error"] = f"not a readable directory: {', '.join(missing)}"
+        progress.emit("root_error", root=label, error=summary["error"])
+        return summary
+
+    config = dict(base_config)
+    config["directories_to_scan"] = roots
+    config["output_dir"] = str(output_dir)
+    config["metrics_json"] = str(output_dir / "metrics.json")
+    if export:
+        config["export_jsonl"] = str(output_dir / "scan.jsonl.gz")
+        config["export_columnar"] = str(output_dir / "scan.parquet")
+
+    progress.emit("root_start", root=label, output_dir=str(output_dir))
+    try:
+        results = run_scan(config, progress_callback=lambda event: progress.emit(
+            event.pop("event"), root=label, **event), plugins=plugins)
+    except Exception as e:
+        summary["error"] = f"{type(e).__name__}: {e}"
+        summary["seconds"] = round(time.perf_counter() - started, 3)
+        progress.emit("root_error", root=label, error=summary["error"])
+        return summary
+
+    counters = results.get("metrics", {}).get("counters", {})
+    summary.update({
+        "ok": True,
+        "seconds": round(time.perf_counter() - started, 3),
+        "total_files": results["total_files"],
+        "duplicate_groups": len(results["duplicates"]),
+        "large_files": len(results["large_files"]),
+        "old_files": len(results["old_files"]),
+        "empty_files": len(results["empty_files"]),
+        "near_duplicate_groups": len(results["near_duplicates"]),
+        "blurry_files": len(results["blurry_files"]),
+        "plugin_findings": {name: len(found) for name, found in results.get("plugin_findings", {}).items()},
+        "errors_skipped": counters.get("errors_skipped", 0),
+        "reports": {"text": results.get("report_path"), "html": results.get("report_html_path")},
+        "exports": results.get("export_paths", {}),
+        "snapshot_id": results.get("snapshot_id"),
+    })
+    progress.emit("root_done", root=label, **{k: v for k, v in summary.items() if k not in ("roots", "ok")})
+    return summary
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="LocalMind headless batch scanner")
+    parser.add_argument("--config", required=True, help="Config JSON (thresholds, exclusions, roots)")
+    parser.add_argument("--output-dir", required=True, help="Directory for reports, exports and summary.json")
+    parser.add_argument("--root", action="append", default=[],
+                        help="Root to scan (repeatable); overrides directories_to_scan from the config")
+    parser.add_argument("--detectors", help=f"Comma-separated subset of: {','.join(DETECTOR_REGISTRY)}, "
+                                            "plus the config's plugin detectors")
+    parser.add_argument("--jobs", type=int, default=4, help="Roots scanned concurrently (default 4)")
+    parser.add_argument("--combined", action="store_true",
+                        help="Scan all roots as one set (finds duplicates across roots) instead of per root")
+    parser.add_argument("--export", action="store_true", help="Also write JSON Lines and columnar exports")
+    parser.add_argument("--snapshot-db", help="Store snapshots here and log the diff to the previous scan")
+    parser.add_argument("--html-report-mode", choices=("auto", "static", "paged"))
+    parser.add_argument("--fail-on-skipped", action="store_true",
+                        help="Exit 1 if any file had to be skipped because of read errors")
+    parser.add_argument("--quiet", action="store_true", help="No JSON progress on stdout, only the final summary")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    # stdout carries only JSON (and argparse's --help); messages and library warnings go to stderr
+    json_out = sys.stdout
+    parser = build_parser()
+    try:
+        args = parser.parse_args(argv)
+    except SystemExit as e:
+        return EXIT_USAGE if e.code else EXIT_OK
+    progress = ProgressWriter(None if args.quiet else json_out)
+
+    try:
+        config = load_config_file(args.config)
+    except (OSError, ValueError) as e:
+        print(f"Error: cannot load config: {e}", file=sys.stderr)
+        return EXIT_USAGE
+
+    try:
+        plugins = load_plugins(config.get("plugins") or [])
+        registry = detector_registry(plugins)
+    except (ImportError, ValueError) as e:
+        print(f"Error: cannot load plugins: {e}", file=sys.stderr)
+        return EXIT_USAGE
+
+    if args.detectors:
+        detectors = [d.strip() for d in args.detectors.split(",") if d.strip()]
+        unknown = sorted(set(detectors) - set(registry))
+        if unknown:
+            print(f"Error: unknown detectors: {', '.join(unknown)}", file=sys.stderr)
+            return EXIT_USAGE
+        config["detectors"] = detectors
+    if args.snapshot_db:
+        config["snapshot_db"] = args.snapshot_db
+    if args.html_report_mode:
+        config["html_report_mode"] = args.html_report_mode
+
+    roots = args.root or list(config.get("directories_to_scan") or [])
+    if not roots:
+        print("Error: no roots given (--root or directories_to_scan)", file=sys.stderr)
+        return EXIT_USAGE
+    if args.jobs < 1:
+        print("Error: --jobs must be at least 1", file=sys.stderr)
+        return EXIT_USAGE
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+    progress.emit("start", roots=roots, jobs=args.jobs, combined=args.combined,
+                  detectors=config.get("detectors") or list(registry))
+
+    if args.combined:
+        batches = [(roots, output_dir, "combined")]
+    else:
+        batches = [([root], output_dir / root_slug(root), root) for root in roots]
+
+    summaries: List[Dict[str, Any]] = []
+    with ThreadPoolExecutor(max_workers=min(args.jobs, len(batches))) as pool:
+        futures = [pool.submit(scan_root, batch_roots, config, batch_dir, progress, args.export, label, plugins)
+                   for batch_roots, batch_dir, label in batches]
+        for future in as_completed(futures):
+            summaries.append(future.result())
+
+    failed = [s for s in summaries if not s["ok"]]
+    skipped = sum(s.get("errors_skipped", 0) for s in summaries)
+    exit_code = EXIT_SCAN_FAILED if failed or (args.fail_on_skipped and skipped) else EXIT_OK
+    summary = {
+        "ok": exit_code == EXIT_OK,
+        "exit_code": exit_code,
+        "seconds": round(time.perf_counter() - started, 3),
+        "roots_scanned": len(summaries) - len(failed),
+        "roots_failed": len(failed),
+        "errors_skipped": skipped,
+        "results": sorted(summaries, key=lambda s: s["roots"]),
+    }
+    with open(output_dir / "summary.json", "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2, default=str)
+    ProgressWriter(json_out).emit("summary", **{k: v for k, v in summary.items() if k != "results"},
+                                  summary_path=str((output_dir / "summary.json").resolve()))
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
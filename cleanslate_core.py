@@ -7,10 +7,9 @@ Advanced file analysis with AI-powered content detection and media optimization.
 import os
 import sys
 import json
-import hashlib
 import mimetypes
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Any
 from datetime import datetime, timedelta
 import cv2
 import numpy as np
@@ -20,48 +19,68 @@ from sklearn.cluster import DBSCAN
 from sklearn.feature_extraction.text import TfidfVectorizer
 import jieba
 import re
+import time
+from html import escape
+from contextlib import nullcontext
 
 # Add current directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
+from cleanslate_export import export_results
+from cleanslate_hashing import hash_file, resolve_algorithm
+from cleanslate_inventory import IMAGE_EXTENSIONS, PARTIAL_HASH_BYTES, ScanInventory
+from cleanslate_links import FileId, collapse_hardlinks, link_id, reclaimable_bytes, shared_extent_sets
+from cleanslate_metrics import ScanMetrics
+from cleanslate_plugins import load_plugins, plugin_needs, run_plugin
+from cleanslate_snapshot import SnapshotStore, format_diff
+from cleanslate_paged_report import choose_mode, count_findings, remove_paged_data, write_paged_html_report
+from cleanslate_logging import get_logger
+
 # Constants
 REPORT_FILE = "LocalMind_Report.txt"
 REPORT_HTML_FILE = "LocalMind_Report.html"
 
+# Write buffer for streamed reports (report memory stays at this size regardless of findings)
+REPORT_BUFFER_BYTES = 1024 * 1024
+
 # Default configuration
 DEFAULT_CONFIG = {
     "directories_to_scan": ["demo_data"],
     "large_file_threshold_mb": 100,
     "old_file_threshold_days": 365,
     "excluded_folders": [".git", "node_modules"],
-    "excluded_file_types": [".tmp", ".log"]
+    "excluded_file_types": [".tmp", ".log"],
+    "hash_algorithm": "auto"
 }
 
+# Per-file metadata captured during a scan: path -> (size_bytes, mtime_epoch).
+# Reports read sizes and dates from here instead of stat'ing files again.
+FileStats = Dict[str, Tuple[int, float]]
+
 # Logging and scan-folder helpers for GUI contract
 from threading import Event
+import logging
 
-LOG_DIR = Path("logs")
-LOG_FILE = LOG_DIR / "localmind.log"
+logger = get_logger("core")
 
 
-def _log_message(message: str) -> None:
-    try:
-        LOG_DIR.mkdir(parents=True, exist_ok=True)
-        with open(LOG_FILE, "a", encoding="utf-8") as f:
-            f.write(f"{datetime.now().isoformat()} | {message}\n")
-    except Exception:
-        pass
+def _log_message(message: str, level: int = logging.INFO) -> None:
+    """Queue a log line; the background writer in cleanslate_logging does the file I/O."""
+    logger.log(level, message)
 
 
-def _hash_first_chunk(file_path: str, chunk_size: int = 4 * 1024 * 1024) -> str:
-    try:
-        h = hashlib.md5()
-        with open(file_path, "rb") as f:
-            chunk = f.read(chunk_size)
-            h.update(chunk)
-        return h.hexdigest()
-    except Exception:
+def _stage(metrics: Optional[ScanMetrics], name: str):
+    """Time a block as a metrics stage, or do nothing when metrics are off."""
+    return metrics.stage(name) if metrics is not None else nullcontext()
+
+
+def _hash_first_chunk(file_path: str, chunk_size: int = 4 * 1024 * 1024,
+                      metrics: Optional[ScanMetrics] = None, algorithm: str = "blake2b") -> str:
+    digest = hash_file(file_path, algorithm, limit=chunk_size, metrics=metrics)
+    if digest is None:
+        logger.debug("hash failed, skipping %s", file_path)
         return ""
+    return digest
 
 
 def scan_folder(
@@ -73,13 +92,30 @@ def scan_folder(
     write_html_report: bool,
     cancel_event: Event,
     progress_callback: Optional[Any] = None,
+    metrics_path: Optional[str] = None,
+    html_report_mode: str = "auto",
+    hash_algorithm: Optional[str] = None,
+    status_callback: Optional[Callable[[int, int, int], None]] = None,
 ) -> Dict[str, Any]:
     """Scan a single folder and return results per GUI contract.
 
     Returns dict with keys:
-      total_files, large_count, old_count, dup_groups, lines, report_txt_path, report_html_path
+      total_files, large_count, old_count, dup_groups, lines, report_txt_path, report_html_path,
+      file_stats (path -> (size, mtime) captured during the scan),
+      large_files, old_files (paths), duplicates (list of path groups),
+      hardlinks (path -> other hard links to it; links are hashed once, never duplicates),
+      reclaimable_bytes (space freed by keeping one copy per group; reflinked copies count once),
+      metrics (per-stage timings and counters, see cleanslate_metrics)
+
+    If metrics_path is given, the metrics are also written there as JSON.
+    html_report_mode is 'auto', 'static' or 'paged' (see write_html_report).
+    hash_algorithm is a config 'hash_algorithm' value (default 'auto', see cleanslate_hashing).
+    status_callback, if given, receives (files_done, files_total, bytes_hashed) once per
+    file; it must be cheap (see cleanslate_progress.ProgressBatcher for the GUI).
     """
     _log_message(f"scan_folder start: path={scan_path}")
+    algorithm = resolve_algorithm(hash_algorithm)
+    metrics = ScanMetrics("scan_folder")
     results: Dict[str, Any] = {
         "total_files": 0,
         "large_count": 0,
@@ -88,6 +124,11 @@ def scan_folder(
         "lines": [],
         "report_txt_path": None,
         "report_html_path": None,
+        "large_files": [],
+        "old_files": [],
+        "duplicates": [],
+        "hardlinks": {},
+        "reclaimable_bytes": 0,
     }
 
     try:
@@ -98,37 +139,52 @@ def scan_folder(
 
         # Gather files with simple exclusions (substring match)
         files: List[Path] = []
-        for root, dirs, filenames in os.walk(base_path):
-            if cancel_event.is_set():
-                _log_message("scan_folder: canceled during walk")
-                return results
-            # Apply exclusions to directories by substring
-            dirs[:] = [d for d in dirs if not any(excl in os.path.join(root, d) for excl in exclusions)]
-            for fn in filenames:
-                fp = Path(root) / fn
-                if any(excl in str(fp) for excl in exclusions):
-                    continue
-                files.append(fp)
+        with metrics.stage("walk"):
+            for root, dirs, filenames in os.walk(base_path):
+                if cancel_event.is_set():
+                    _log_message("scan_folder: canceled during walk")
+                    return results
+                # Apply exclusions to directories by substring
+                dirs[:] = [d for d in dirs if not any(excl in os.path.join(root, d) for excl in exclusions)]
+                for fn in filenames:
+                    fp = Path(root) / fn
+                    if any(excl in str(fp) for excl in exclusions):
+                        continue
+                    files.append(fp)
 
         results["total_files"] = len(files)
+        if status_callback:
+            status_callback(0, len(files), 0)
 
         threshold_bytes = size_threshold_mb * 1024 * 1024
         cutoff_time = datetime.now() - timedelta(days=age_threshold_days)
 
-        # Duplicate grouping by (size, first_4mb_hash)
+        # Duplicate grouping by (size, first_4mb_hash); one entry per inode
         group_map: Dict[Tuple[int, str], List[Path]] = {}
+        file_stats: FileStats = {}
+        link_owners: Dict[FileId, str] = {}
+        hardlinks: Dict[str, List[str]] = {}
 
-        for fp in files:
+        for done, fp in enumerate(files):
             if cancel_event.is_set():
                 _log_message("scan_folder: canceled during file loop")
                 return results
+            if status_callback:
+                status_callback(done, len(files), metrics.counters["bytes_read"])
+            t0 = time.perf_counter()
             try:
                 st = fp.stat()
-            except OSError:
+            except OSError as e:
+                metrics.incr("errors_skipped")
+                logger.debug("stat failed, skipping %s: %s", fp, e)
                 continue
+            finally:
+                metrics.add_time("stat", time.perf_counter() - t0)
+            metrics.incr("files_processed")
 
             size_bytes = st.st_size
             mtime = datetime.fromtimestamp(st.st_mtime)
+            file_stats[str(fp)] = (size_bytes, st.st_mtime)
 
             # Large
             if size_bytes >= threshold_bytes:
@@ -137,6 +193,7 @@ def scan_folder(
                 if progress_callback:
                     progress_callback(line)
                 results["large_count"] += 1
+                results["large_files"].append(str(fp))
 
             # Old
             if mtime < cutoff_time:
@@ -145,47 +202,69 @@ def scan_folder(
                 if progress_callback:
                     progress_callback(line)
                 results["old_count"] += 1
+                results["old_files"].append(str(fp))
+
+            # Further hard links to an inode already seen are the same file: no re-read
+            fid = link_id(st)
+            if fid is not None:
+                owner = link_owners.setdefault(fid, str(fp))
+                if owner != str(fp):
+                    hardlinks.setdefault(owner, []).append(str(fp))
+                    continue
 
             # Prepare duplicates grouping
-            size_hash_key = (size_bytes, _hash_first_chunk(str(fp)))
+            t0 = time.perf_counter()
+            size_hash_key = (size_bytes, _hash_first_chunk(str(fp), metrics=metrics, algorithm=algorithm))
+            metrics.add_time("hash", time.perf_counter() - t0)
             group_map.setdefault(size_hash_key, []).append(fp)
 
+        if status_callback:
+            status_callback(len(files), len(files), metrics.counters["bytes_read"])
+
         # Build duplicate groups
         dup_groups: List[List[str]] = []
-        for key, group in group_map.items():
-            if cancel_event.is_set():
-                _log_message("scan_folder: canceled during dup grouping")
-                return results
-            if len(group) > 1:
-                dup_list = [str(p) for p in group]
-                dup_groups.append(dup_list)
-                # Add a DUP summary line
-                line = f"[DUP] {len(group)} files group size {key[0]:,} hash {key[1][:8]}..."
-                results["lines"].append(line)
-                if progress_callback:
-                    progress_callback(line)
-
+        with metrics.stage("dup_grouping"):
+            for key, group in group_map.items():
+                if cancel_event.is_set():
+                    _log_message("scan_folder: canceled during dup grouping")
+                    return results
+                if len(group) > 1:
+                    dup_list = [str(p) for p in group]
+                    dup_groups.append(dup_list)
+                    # Add a DUP summary line
+                    line = f"[DUP] {len(group)} files group size {key[0]:,} hash {key[1][:8]}..."
+                    results["lines"].append(line)
+                    if progress_callback:
+                        progress_callback(line)
+
+        with metrics.stage("extents"):
+            shared_extents = [shared_extent_sets(group) for group in dup_groups]
         results["dup_groups"] = len(dup_groups)
+        results["duplicates"] = dup_groups
+        results["file_stats"] = file_stats
+        results["hardlinks"] = hardlinks
+        results["reclaimable_bytes"] = sum(
+            reclaimable_bytes(len(group), file_stats[group[0]][0], shared)
+            for group, shared in zip(dup_groups, shared_extents))
 
         # Write reports if requested
         report_txt_path = None
         report_html_path = None
         if write_text_report:
             try:
-                report_text = generate_report(dup_groups, [], [], [], {}, [])
-                with open(REPORT_FILE, "w", encoding="utf-8") as f:
-                    f.write(report_text)
-                report_txt_path = str(Path(REPORT_FILE).resolve())
+                with metrics.stage("report_text"):
+                    report_txt_path = write_report(REPORT_FILE, dup_groups, [], [], [], {}, [], file_stats,
+                                                   hardlinks=hardlinks, shared_extents=shared_extents)
             except Exception as e:
-                _log_message(f"write text report error: {e}")
+                _log_message(f"write text report error: {e}", logging.ERROR)
         if write_html_report:
             try:
-                html_text = generate_html_report(dup_groups, [], [], [], {}, [])
-                with open(REPORT_HTML_FILE, "w", encoding="utf-8") as f:
-                    f.write(html_text)
-                report_html_path = str(Path(REPORT_HTML_FILE).resolve())
+                with metrics.stage("report_html"):
+                    # (the write_html_report parameter shadows the writer function here)
+                    report_html_path = _write_html(REPORT_HTML_FILE, dup_groups, [], [], [], {}, [],
+                                                   file_stats, html_report_mode)
             except Exception as e:
-                _log_message(f"write html report error: {e}")
+                _log_message(f"write html report error: {e}", logging.ERROR)
 
         results["report_txt_path"] = report_txt_path
         results["report_html_path"] = report_html_path
@@ -193,8 +272,22 @@ def scan_folder(
         return results
 
     except Exception as e:
-        _log_message(f"scan_folder exception: {e}")
+        _log_message(f"scan_folder exception: {e}", logging.ERROR)
         return results
+    finally:
+        finish_metrics(metrics, results, metrics_path)
+
+
+def finish_metrics(metrics: ScanMetrics, results: Dict[str, Any], metrics_path: Optional[str]) -> None:
+    """Attach metrics to a results dict, log a summary line and optionally export JSON."""
+    metrics.finish()
+    results["metrics"] = metrics.as_dict()
+    _log_message(metrics.summary())
+    if metrics_path:
+        try:
+            metrics.export_json(metrics_path)
+        except Exception as e:
+            _log_message(f"metrics export error: {e}", logging.ERROR)
 
 
 def load_config() -> Dict:
@@ -210,7 +303,8 @@ def load_config() -> Dict:
             "large_file_threshold_mb": 100,
             "old_file_threshold_days": 365,
             "excluded_folders": [".git", "node_modules"],
-            "excluded_file_types": [".tmp", ".log"]
+            "excluded_file_types": [".tmp", ".log"],
+            "hash_algorithm": "auto"
         }
         save_config(default_config)
         return default_config
@@ -222,13 +316,18 @@ def save_config(config: Dict) -> None:
         json.dump(config, f, indent=2)
 
 
-def scan_files(paths: List[str], exclusions: Dict) -> List[str]:
+def scan_files(paths: List[str], exclusions: Dict, metrics: Optional[ScanMetrics] = None) -> List[str]:
     """Scan files from given paths, excluding specified folders and file types."""
+    with _stage(metrics, "walk"):
+        return _walk_files(paths, exclusions)
+
+
+def _walk_files(paths: List[str], exclusions: Dict) -> List[str]:
     all_files = []
     
     for path in paths:
         if not os.path.exists(path):
-            print(f"Warning: Path does not exist: {path}")
+            print(f"Warning: Path does not exist: {path}", file=sys.stderr)
             continue
             
         for root, dirs, files in os.walk(path):
@@ -247,151 +346,153 @@ def scan_files(paths: List[str], exclusions: Dict) -> List[str]:
     return all_files
 
 
-def find_duplicates(paths: List[str]) -> List[List[str]]:
-    """Find duplicate files using MD5 hash."""
-    config = load_config()
-    exclusions = {
+def _resolve_exclusions(exclusions: Optional[Dict], metrics: Optional[ScanMetrics] = None) -> Dict:
+    """Exclusions passed by the caller, or those of config.json in the working directory."""
+    if exclusions is not None:
+        return exclusions
+    with _stage(metrics, "config"):
+        config = load_config()
+    return {
         "folders": config.get("excluded_folders", []),
         "extensions": config.get("excluded_file_types", [])
     }
-    files = scan_files(paths, exclusions)
-    
+
+
+# =============================================================================
+# DETECTORS
+# Each detect_* works on the shared scan inventory (one walk, one stat per file);
+# the find_* wrappers keep the old path-based API by building an inventory first.
+# =============================================================================
+
+def build_inventory(paths: List[str], exclusions: Dict, metrics: Optional[ScanMetrics] = None,
+                    file_ids: Optional[Dict[str, FileId]] = None) -> Tuple[List[str], FileStats]:
+    """Walk once and stat once: (all files, path -> (size, mtime) for the readable ones).
+
+    Hard-linked files are recorded in file_ids when it is given (see collect_file_stats).
+    """
+    files = scan_files(paths, exclusions, metrics)
+    return files, collect_file_stats(files, metrics, file_ids)
+
+
+def _group_by_hash(file_list: List[str], limit: Optional[int], metrics: Optional[ScanMetrics],
+                   inventory: Optional[ScanInventory], algorithm: str,
+                   cancel_event: Optional[Event] = None) -> List[List[str]]:
+    groups: Dict[str, List[str]] = {}
+    for file_path in file_list:
+        if cancel_event is not None and cancel_event.is_set():
+            break
+        if inventory is not None:
+            # Shared cache: plugins asking for the same hash later get it for free
+            digest = inventory.feature(file_path, "content_hash" if limit is None else "partial_hash")
+        else:
+            digest = hash_file(file_path, algorithm, limit, metrics)
+        if digest is not None:
+            groups.setdefault(digest, []).append(file_path)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def detect_duplicates(file_stats: FileStats, metrics: Optional[ScanMetrics] = None,
+                      inventory: Optional[ScanInventory] = None,
+                      hash_algorithm: Optional[str] = None,
+                      file_ids: Optional[Dict[str, FileId]] = None,
+                      cancel_event: Optional[Event] = None,
+                      on_group: Optional[Callable[[List[str]], None]] = None) -> List[List[str]]:
+    """Groups of files with identical content hash, from scan-time sizes.
+
+    Hard links to one inode count as one file (the first path walked) and are never
+    reported as duplicates of each other. Files with a unique size are never opened;
+    same-size files larger than PARTIAL_HASH_BYTES are read in full only if their
+    leading bytes match. With an inventory, hashes use its algorithm and go through
+    (and stay in) its feature cache, and its file_ids are used; otherwise
+    hash_algorithm is resolved as in the config.
+
+    on_group, if given, receives each group as soon as it is confirmed. Once cancel_event
+    is set no further file is read and the groups confirmed so far are returned.
+    """
+    if inventory is not None:
+        algorithm, file_ids = inventory.hash_algorithm, inventory.file_ids
+    else:
+        algorithm = resolve_algorithm(hash_algorithm)
+    logical, _ = collapse_hardlinks(file_stats, file_ids or {})
     # Group files by size first (files with different sizes can't be duplicates)
-    size_groups = {}
-    for file_path in files:
-        try:
-            size = os.path.getsize(file_path)
-            if size not in size_groups:
-                size_groups[size] = []
-            size_groups[size].append(file_path)
-        except (OSError, PermissionError):
-            continue
-    
-    # Find duplicates within each size group
-    duplicates = []
-    for size, file_list in size_groups.items():
-        if len(file_list) < 2:
-            continue
-        
-        # Calculate MD5 hash for files with same size
-        hash_groups = {}
-        for file_path in file_list:
-            try:
-                with open(file_path, 'rb') as f:
-                    file_hash = hashlib.md5(f.read()).hexdigest()
-                
-                if file_hash not in hash_groups:
-                    hash_groups[file_hash] = []
-                hash_groups[file_hash].append(file_path)
-            except (OSError, PermissionError):
+    size_groups: Dict[int, List[str]] = {}
+    for file_path in logical:
+        size_groups.setdefault(file_stats[file_path][0], []).append(file_path)
+
+    duplicates: List[List[str]] = []
+
+    def confirmed(groups: List[List[str]]) -> None:
+        duplicates.extend(groups)
+        if on_group is not None:
+            for group in groups:
+                on_group(group)
+
+    with _stage(metrics, "hash"):
+        for size, file_list in size_groups.items():
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            if len(file_list) < 2:
                 continue
-        
-        # Add groups with multiple files (duplicates)
-        for file_hash, duplicate_files in hash_groups.items():
-            if len(duplicate_files) > 1:
-                duplicates.append(duplicate_files)
-    
+            if size <= PARTIAL_HASH_BYTES:
+                confirmed(_group_by_hash(file_list, None, metrics, inventory, algorithm, cancel_event))
+                continue
+            for candidates in _group_by_hash(file_list, PARTIAL_HASH_BYTES, metrics, inventory, algorithm,
+                                             cancel_event):
+                confirmed(_group_by_hash(candidates, None, metrics, inventory, algorithm, cancel_event))
     return duplicates
 
 
-def find_large_files(paths: List[str], threshold_mb: int) -> List[str]:
-    """Find files larger than the specified threshold."""
-    config = load_config()
-    exclusions = {
-        "folders": config.get("excluded_folders", []),
-        "extensions": config.get("excluded_file_types", [])
-    }
-    files = scan_files(paths, exclusions)
-    
-    large_files = []
+def detect_large_files(file_stats: FileStats, threshold_mb: int) -> List[str]:
+    """Files larger than threshold_mb, from scan-time sizes."""
     threshold_bytes = threshold_mb * 1024 * 1024
-    
-    for file_path in files:
-        try:
-            if os.path.getsize(file_path) > threshold_bytes:
-                large_files.append(file_path)
-        except (OSError, PermissionError):
-            continue
-    
-    return large_files
+    return [file_path for file_path, (size, _) in file_stats.items() if size > threshold_bytes]
 
 
-def find_old_files(paths: List[str], threshold_days: int) -> List[str]:
-    """Find files older than the specified threshold."""
-    config = load_config()
-    exclusions = {
-        "folders": config.get("excluded_folders", []),
-        "extensions": config.get("excluded_file_types", [])
-    }
-    files = scan_files(paths, exclusions)
-    
-    old_files = []
-    cutoff_time = datetime.now() - timedelta(days=threshold_days)
-    
-    for file_path in files:
-        try:
-            mtime = datetime.fromtimestamp(os.path.getmtime(file_path))
-            if mtime < cutoff_time:
-                old_files.append(file_path)
-        except (OSError, PermissionError):
-            continue
-    
-    return old_files
+def detect_old_files(file_stats: FileStats, threshold_days: int) -> List[str]:
+    """Files last modified more than threshold_days ago, from scan-time mtimes."""
+    cutoff = (datetime.now() - timedelta(days=threshold_days)).timestamp()
+    return [file_path for file_path, (_, mtime) in file_stats.items() if mtime < cutoff]
 
 
-def find_empty_files(paths: List[str]) -> List[str]:
-    """Find empty files."""
-    config = load_config()
-    exclusions = {
-        "folders": config.get("excluded_folders", []),
-        "extensions": config.get("excluded_file_types", [])
-    }
-    files = scan_files(paths, exclusions)
-    
-    empty_files = []
-    
-    for file_path in files:
-        try:
-            if os.path.getsize(file_path) == 0:
-                empty_files.append(file_path)
-        except (OSError, PermissionError):
-            continue
-    
-    return empty_files
+def detect_empty_files(file_stats: FileStats) -> List[str]:
+    """Zero-byte files, from scan-time sizes."""
+    return [file_path for file_path, (size, _) in file_stats.items() if size == 0]
 
 
-def find_near_duplicate_images(paths: List[str]) -> Dict[str, List[str]]:
-    """Find near-duplicate images using perceptual hashing."""
-    config = load_config()
-    exclusions = {
-        "folders": config.get("excluded_folders", []),
-        "extensions": config.get("excluded_file_types", [])
-    }
-    files = scan_files(paths, exclusions)
-    
-    # Filter for image files
-    image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.gif', '.tiff', '.webp'}
-    image_files = [f for f in files if Path(f).suffix.lower() in image_extensions]
-    
+def _image_files(files: Iterable[str]) -> List[str]:
+    return [f for f in files if Path(f).suffix.lower() in IMAGE_EXTENSIONS]
+
+
+def detect_near_duplicate_images(files: Iterable[str], metrics: Optional[ScanMetrics] = None) -> Dict[str, List[str]]:
+    """Near-duplicate image groups using perceptual hashing."""
+    image_files = _image_files(files)
     if not image_files:
         return {}
     
     # Calculate perceptual hashes
     hash_data = []
-    for file_path in image_files:
-        try:
-            with Image.open(file_path) as img:
-                # Convert to RGB if necessary
-                if img.mode != 'RGB':
-                    img = img.convert('RGB')
-                
-                # Calculate perceptual hash
-                phash = imagehash.phash(img)
-                hash_data.append((file_path, phash))
-        except Exception:
-            continue
+    with _stage(metrics, "image_decode"):
+        for file_path in image_files:
+            try:
+                with Image.open(file_path) as img:
+                    # Convert to RGB if necessary
+                    if img.mode != 'RGB':
+                        img = img.convert('RGB')
+                    
+                    # Calculate perceptual hash
+                    phash = imagehash.phash(img)
+                    hash_data.append((file_path, phash))
+            except Exception:
+                if metrics is not None:
+                    metrics.incr("errors_skipped")
+                continue
     
-    # Group similar images
+    with _stage(metrics, "image_grouping"):
+        return _group_similar_hashes(hash_data)
+
+
+def _group_similar_hashes(hash_data: List[Tuple[str, Any]]) -> Dict[str, List[str]]:
+    """Greedily group images whose perceptual hashes are within the similarity threshold."""
     near_duplicates = {}
     processed = set()
     
@@ -421,289 +522,619 @@ def find_near_duplicate_images(paths: List[str]) -> Dict[str, List[str]]:
     return near_duplicates
 
 
-def find_blurry_images(paths: List[str]) -> List[str]:
-    """Find blurry images using Laplacian variance."""
-    config = load_config()
-    exclusions = {
-        "folders": config.get("excluded_folders", []),
-        "extensions": config.get("excluded_file_types", [])
-    }
-    files = scan_files(paths, exclusions)
-    
-    # Filter for image files
-    image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.gif', '.tiff', '.webp'}
-    image_files = [f for f in files if Path(f).suffix.lower() in image_extensions]
-    
+def detect_blurry_images(files: Iterable[str], metrics: Optional[ScanMetrics] = None) -> List[str]:
+    """Blurry images using Laplacian variance."""
     blurry_files = []
     
-    for file_path in image_files:
-        try:
-            # Read image with OpenCV
-            img = cv2.imread(file_path)
-            if img is None:
-                continue
-            
-            # Convert to grayscale
-            gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-            
-            # Calculate Laplacian variance
-            laplacian_var = cv2.Laplacian(gray, cv2.CV_64F).var()
-            
-            # Consider image blurry if variance is low
-            if laplacian_var < 100:  # Threshold for blur detection
-                blurry_files.append(file_path)
+    with _stage(metrics, "image_decode"):
+        for file_path in _image_files(files):
+            try:
+                # Read image with OpenCV
+                img = cv2.imread(file_path)
+                if img is None:
+                    continue
                 
-        except Exception:
-            continue
+                # Convert to grayscale
+                gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+                
+                # Calculate Laplacian variance
+                laplacian_var = cv2.Laplacian(gray, cv2.CV_64F).var()
+                
+                # Consider image blurry if variance is low
+                if laplacian_var < 100:  # Threshold for blur detection
+                    blurry_files.append(file_path)
+                    
+            except Exception:
+                if metrics is not None:
+                    metrics.incr("errors_skipped")
+                continue
     
     return blurry_files
 
 
-def generate_report(duplicates: List[List[str]], large_files: List[str], 
-                   old_files: List[str], empty_files: List[str],
-                   near_duplicates: Dict[str, List[str]], blurry_files: List[str]) -> str:
-    """Generate a comprehensive report of all findings."""
+def find_duplicates(paths: List[str], metrics: Optional[ScanMetrics] = None,
+                    exclusions: Optional[Dict] = None, hash_algorithm: Optional[str] = None) -> List[List[str]]:
+    """Find duplicate files by content hash (config 'hash_algorithm', default auto).
+
+    Hard links to the same file are one file, not duplicates.
+    """
+    file_ids: Dict[str, FileId] = {}
+    _, file_stats = build_inventory(paths, _resolve_exclusions(exclusions, metrics), metrics, file_ids)
+    return detect_duplicates(file_stats, metrics, hash_algorithm=hash_algorithm, file_ids=file_ids)
+
+
+def find_large_files(paths: List[str], threshold_mb: int, metrics: Optional[ScanMetrics] = None,
+                     exclusions: Optional[Dict] = None) -> List[str]:
+    """Find files larger than the specified threshold."""
+    _, file_stats = build_inventory(paths, _resolve_exclusions(exclusions, metrics), metrics)
+    return detect_large_files(file_stats, threshold_mb)
+
+
+def find_old_files(paths: List[str], threshold_days: int, metrics: Optional[ScanMetrics] = None,
+                   exclusions: Optional[Dict] = None) -> List[str]:
+    """Find files older than the specified threshold."""
+    _, file_stats = build_inventory(paths, _resolve_exclusions(exclusions, metrics), metrics)
+    return detect_old_files(file_stats, threshold_days)
+
+
+def find_empty_files(paths: List[str], metrics: Optional[ScanMetrics] = None,
+                     exclusions: Optional[Dict] = None) -> List[str]:
+    """Find empty files."""
+    _, file_stats = build_inventory(paths, _resolve_exclusions(exclusions, metrics), metrics)
+    return detect_empty_files(file_stats)
+
+
+def find_near_duplicate_images(paths: List[str], metrics: Optional[ScanMetrics] = None,
+                               exclusions: Optional[Dict] = None) -> Dict[str, List[str]]:
+    """Find near-duplicate images using perceptual hashing."""
+    files = scan_files(paths, _resolve_exclusions(exclusions, metrics), metrics)
+    return detect_near_duplicate_images(files, metrics)
+
+
+def find_blurry_images(paths: List[str], metrics: Optional[ScanMetrics] = None,
+                       exclusions: Optional[Dict] = None) -> List[str]:
+    """Find blurry images using Laplacian variance."""
+    files = scan_files(paths, _resolve_exclusions(exclusions, metrics), metrics)
+    return detect_blurry_images(files, metrics)
+
+
+# =============================================================================
+# DETECTOR REGISTRY
+# run_scan runs only the selected detectors, cheapest first, over one inventory.
+# =============================================================================
+
+# What a detector has to touch, cheapest first
+NEED_STAT = "stat"          # scan-time size/mtime only, no I/O
+NEED_PARTIAL = "partial"    # reads the leading bytes of some files
+NEED_FULL = "full"          # may read whole files
+NEED_IMAGE = "image"        # decodes images
+NEED_COST = {NEED_STAT: 0, NEED_PARTIAL: 1, NEED_FULL: 2, NEED_IMAGE: 3}
+
+
+class Detector:
+    """A registered check: `run(inventory, config, metrics)` returns its findings.
+
+    needs is one of NEED_STAT / NEED_PARTIAL / NEED_FULL / NEED_IMAGE and orders the plan;
+    empty is what the detector reports when it is not selected.
+    """
+
+    def __init__(self, name: str, needs: str, run: Callable[..., Any], empty: Callable[[], Any],
+                 description: str = ""):
+        if needs not in NEED_COST:
+            raise ValueError(f"unknown need {needs!r} for detector {name!r}")
+        self.name = name
+        self.needs = needs
+        self.run = run
+        self.empty = empty
+        self.description = description
+
+    def __repr__(self) -> str:
+        return f"Detector({self.name!r}, needs={self.needs!r})"
+
+
+DETECTOR_REGISTRY: Dict[str, Detector] = {}
+
+
+def register_detector(detector: Detector) -> Detector:
+    """Add (or replace) a detector in the registry."""
+    DETECTOR_REGISTRY[detector.name] = detector
+    return detector
+
+
+def plan_detectors(names: Optional[Iterable[str]] = None,
+                   registry: Optional[Dict[str, Detector]] = None) -> List[Detector]:
+    """Selected detectors (default: all) ordered by cost; registration order breaks ties.
+
+    registry defaults to DETECTOR_REGISTRY; pass detector_registry(plugins) to include
+    plugin detectors for one scan only.
+    """
+    registry = DETECTOR_REGISTRY if registry is None else registry
+    if names is None:
+        selected = list(registry.values())
+    else:
+        names = list(names)
+        unknown = sorted(set(names) - set(registry))
+        if unknown:
+            raise ValueError(f"unknown detectors: {', '.join(unknown)}")
+        selected = [d for d in registry.values() if d.name in names]
+    order = {name: i for i, name in enumerate(registry)}
+    return sorted(selected, key=lambda d: (NEED_COST[d.needs], order[d.name]))
+
+
+register_detector(Detector(
+    "large", NEED_STAT, lambda inv, config, metrics: detect_large_files(inv.file_stats, config['large_file_threshold_mb']),
+    list, "Files above large_file_threshold_mb"))
+register_detector(Detector(
+    "old", NEED_STAT, lambda inv, config, metrics: detect_old_files(inv.file_stats, config['old_file_threshold_days']),
+    list, "Files not modified for old_file_threshold_days"))
+register_detector(Detector(
+    "empty", NEED_STAT, lambda inv, config, metrics: detect_empty_files(inv.file_stats),
+    list, "Zero-byte files"))
+register_detector(Detector(
+    "duplicates", NEED_FULL, lambda inv, config, metrics: detect_duplicates(inv.file_stats, metrics, inv),
+    list, "Identical content (size, then partial hash, then full hash)"))
+register_detector(Detector(
+    "near_duplicates", NEED_IMAGE, lambda inv, config, metrics: detect_near_duplicate_images(inv.files, metrics),
+    dict, "Visually similar images (perceptual hash)"))
+register_detector(Detector(
+    "blurry", NEED_IMAGE, lambda inv, config, metrics: detect_blurry_images(inv.files, metrics),
+    list, "Blurry images (Laplacian variance)"))
+
+
+def plugin_detector(plugin_cls: type) -> Detector:
+    """A detector running a DetectorPlugin subclass (see cleanslate_plugins)."""
+    return Detector(
+        plugin_cls.name, plugin_needs(plugin_cls),
+        lambda inv, config, metrics: run_plugin(plugin_cls, inv, config, metrics),
+        plugin_cls.empty, plugin_cls.description or plugin_cls.__doc__ or "")
+
+
+def register_plugin(plugin_cls: type) -> Detector:
+    """Register a DetectorPlugin subclass as a detector for every later scan in this process."""
+    return register_detector(plugin_detector(plugin_cls))
+
+
+def detector_registry(plugins: Iterable[type] = ()) -> Dict[str, Detector]:
+    """A copy of DETECTOR_REGISTRY with plugin detectors added; the global registry is left alone."""
+    registry = dict(DETECTOR_REGISTRY)
+    for plugin_cls in plugins:
+        registry[plugin_cls.name] = plugin_detector(plugin_cls)
+    return registry
+
+
+# Built-in detector names, in report order
+DETECTORS = ("duplicates", "large", "old", "empty", "near_duplicates", "blurry")
+
+
+def collect_file_stats(files: List[str], metrics: Optional[ScanMetrics] = None,
+                       file_ids: Optional[Dict[str, FileId]] = None) -> FileStats:
+    """Stat each file once and keep (size, mtime) for reporting. Unreadable files are skipped.
+
+    If file_ids is given, it receives path -> (st_dev, st_ino) for hard-linked files.
+    """
+    file_stats: FileStats = {}
+    with _stage(metrics, "stat"):
+        for file_path in files:
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                if metrics is not None:
+                    metrics.incr("errors_skipped")
+                continue
+            file_stats[file_path] = (st.st_size, st.st_mtime)
+            if file_ids is not None:
+                fid = link_id(st)
+                if fid is not None:
+                    file_ids[file_path] = fid
+    return file_stats
+
+
+def _size_label(file_stats: Optional[FileStats], file_path: str) -> str:
+    """'1,234 bytes' from scan metadata, without touching the filesystem."""
+    entry = file_stats.get(file_path) if file_stats else None
+    return f"{entry[0]:,} bytes" if entry else "size unknown"
+
+
+def _mtime_label(file_stats: Optional[FileStats], file_path: str) -> str:
+    """'modified: YYYY-MM-DD HH:MM:SS' from scan metadata, without touching the filesystem."""
+    entry = file_stats.get(file_path) if file_stats else None
+    if not entry:
+        return "modified: unknown"
+    return f"modified: {datetime.fromtimestamp(entry[1]).strftime('%Y-%m-%d %H:%M:%S')}"
+
+
+def iter_report_lines(duplicates: List[List[str]], large_files: List[str], 
+                      old_files: List[str], empty_files: List[str],
+                      near_duplicates: Dict[str, List[str]], blurry_files: List[str],
+                      file_stats: Optional[FileStats] = None,
+                      hardlinks: Optional[Dict[str, List[str]]] = None,
+                      shared_extents: Optional[List[List[List[str]]]] = None) -> Iterator[str]:
+    """Yield the text report line by line (without newlines).
+
+    Sizes and dates come from file_stats (captured during the scan); the report makes no
+    filesystem calls, so files deleted since the scan are still reported, not fatal.
+    hardlinks ({path: other links}) and shared_extents (per duplicate group, the sets of
+    members already sharing storage) annotate the duplicate groups.
+    """
+    hardlinks = hardlinks or {}
+    shared_extents = shared_extents or [[] for _ in duplicates]
     
-    report = []
-    report.append("=" * 80)
-    report.append("LocalMind - Privacy-First File Scanner Report")
-    report.append("Smart file cleanup. 100% offline. AI that tidies your computer without touching the cloud.")
-    report.append("=" * 80)
-    report.append(f"Report generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    report.append("")
+    yield "=" * 80
+    yield "LocalMind - Privacy-First File Scanner Report"
+    yield "Smart file cleanup. 100% offline. AI that tidies your computer without touching the cloud."
+    yield "=" * 80
+    yield f"Report generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+    yield ""
     
     # Summary
     total_duplicate_files = sum(len(group) for group in duplicates)
     total_near_duplicate_files = sum(len(group) for group in near_duplicates.values())
     
-    report.append("SUMMARY")
-    report.append("-" * 40)
-    report.append(f"Duplicate groups found: {len(duplicates)}")
-    report.append(f"Total duplicate files: {total_duplicate_files}")
-    report.append(f"Large files found: {len(large_files)}")
-    report.append(f"Old files found: {len(old_files)}")
-    report.append(f"Empty files found: {len(empty_files)}")
-    report.append(f"Near-duplicate image groups: {len(near_duplicates)}")
-    report.append(f"Total near-duplicate files: {total_near_duplicate_files}")
-    report.append(f"Blurry images found: {len(blurry_files)}")
-    report.append("")
+    yield "SUMMARY"
+    yield "-" * 40
+    yield f"Duplicate groups found: {len(duplicates)}"
+    yield f"Total duplicate files: {total_duplicate_files}"
+    if file_stats is not None and duplicates:
+        reclaimable = sum(reclaimable_bytes(len(group), file_stats[group[0]][0], shared)
+                          for group, shared in zip(duplicates, shared_extents) if group[0] in file_stats)
+        yield f"Reclaimable by removing duplicates: {reclaimable:,} bytes"
+    yield f"Large files found: {len(large_files)}"
+    yield f"Old files found: {len(old_files)}"
+    yield f"Empty files found: {len(empty_files)}"
+    yield f"Near-duplicate image groups: {len(near_duplicates)}"
+    yield f"Total near-duplicate files: {total_near_duplicate_files}"
+    yield f"Blurry images found: {len(blurry_files)}"
+    yield ""
     
     # Duplicates
     if duplicates:
-        report.append("DUPLICATE FILES")
-        report.append("-" * 40)
-        for i, group in enumerate(duplicates, 1):
-            report.append(f"Group {i}:")
+        yield "DUPLICATE FILES"
+        yield "-" * 40
+        for i, (group, shared) in enumerate(zip(duplicates, shared_extents), 1):
+            yield f"Group {i}:"
             for file_path in group:
-                size = os.path.getsize(file_path)
-                report.append(f"  {file_path} ({size:,} bytes)")
-            report.append("")
+                yield f"  {file_path} ({_size_label(file_stats, file_path)})"
+                for link in hardlinks.get(file_path, ()):
+                    yield f"    = {link} (hard link to the same file)"
+            for same_storage in shared:
+                yield f"  Already share storage (reflinks): {', '.join(same_storage)}"
+            yield ""
     
     # Large files
     if large_files:
-        report.append("LARGE FILES")
-        report.append("-" * 40)
+        yield "LARGE FILES"
+        yield "-" * 40
         for file_path in large_files:
-            size = os.path.getsize(file_path)
-            report.append(f"{file_path} ({size:,} bytes)")
-        report.append("")
+            yield f"{file_path} ({_size_label(file_stats, file_path)})"
+        yield ""
     
     # Old files
     if old_files:
-        report.append("OLD FILES")
-        report.append("-" * 40)
+        yield "OLD FILES"
+        yield "-" * 40
         for file_path in old_files:
-            mtime = datetime.fromtimestamp(os.path.getmtime(file_path))
-            report.append(f"{file_path} (modified: {mtime.strftime('%Y-%m-%d %H:%M:%S')})")
-        report.append("")
+            yield f"{file_path} ({_mtime_label(file_stats, file_path)})"
+        yield ""
     
     # Empty files
     if empty_files:
-        report.append("EMPTY FILES")
-        report.append("-" * 40)
+        yield "EMPTY FILES"
+        yield "-" * 40
         for file_path in empty_files:
-            report.append(file_path)
-        report.append("")
+            yield file_path
+        yield ""
     
     # Near-duplicate images
     if near_duplicates:
-        report.append("NEAR-DUPLICATE IMAGES")
-        report.append("-" * 40)
+        yield "NEAR-DUPLICATE IMAGES"
+        yield "-" * 40
         for group_name, file_list in near_duplicates.items():
-            report.append(f"{group_name}:")
+            yield f"{group_name}:"
             for file_path in file_list:
-                report.append(f"  {file_path}")
-            report.append("")
+                yield f"  {file_path}"
+            yield ""
     
     # Blurry images
     if blurry_files:
-        report.append("BLURRY IMAGES")
-        report.append("-" * 40)
+        yield "BLURRY IMAGES"
+        yield "-" * 40
         for file_path in blurry_files:
-            report.append(file_path)
-        report.append("")
+            yield file_path
+        yield ""
     
-    report.append("=" * 80)
-    report.append("End of Report")
-    report.append("=" * 80)
-    
-    return "\n".join(report)
+    yield "=" * 80
+    yield "End of Report"
+    yield "=" * 80
 
 
-def generate_html_report(duplicates: List[List[str]], large_files: List[str], 
-                        old_files: List[str], empty_files: List[str],
-                        near_duplicates: Dict[str, List[str]], blurry_files: List[str]) -> str:
-    """Generate an HTML report of all findings."""
-    
-    html = []
-    html.append("<!DOCTYPE html>")
-    html.append("<html lang='en'>")
-    html.append("<head>")
-    html.append("    <meta charset='UTF-8'>")
-    html.append("    <meta name='viewport' content='width=device-width, initial-scale=1.0'>")
-    html.append("    <title>LocalMind Report</title>")
-    html.append("    <style>")
-    html.append("        body { font-family: Arial, sans-serif; margin: 20px; }")
-    html.append("        .header { text-align: center; margin-bottom: 30px; }")
-    html.append("        .section { margin: 20px 0; }")
-    html.append("        .file-list { background: #f5f5f5; padding: 10px; border-radius: 5px; }")
-    html.append("        .file-item { margin: 5px 0; font-family: monospace; }")
-    html.append("        .summary { background: #e8f4fd; padding: 15px; border-radius: 5px; }")
-    html.append("        .tagline { color: #666; font-style: italic; }")
-    html.append("    </style>")
-    html.append("</head>")
-    html.append("<body>")
+def generate_report(duplicates: List[List[str]], large_files: List[str], 
+                   old_files: List[str], empty_files: List[str],
+                   near_duplicates: Dict[str, List[str]], blurry_files: List[str],
+                   file_stats: Optional[FileStats] = None,
+                   hardlinks: Optional[Dict[str, List[str]]] = None,
+                   shared_extents: Optional[List[List[List[str]]]] = None) -> str:
+    """Generate a comprehensive report of all findings as one string.
+
+    Prefer write_report for large result sets; it streams to disk in constant memory.
+    """
+    return "\n".join(iter_report_lines(duplicates, large_files, old_files, empty_files,
+                                         near_duplicates, blurry_files, file_stats,
+                                         hardlinks, shared_extents))
+
+
+def write_report(report_path: str, duplicates: List[List[str]], large_files: List[str],
+                 old_files: List[str], empty_files: List[str],
+                 near_duplicates: Dict[str, List[str]], blurry_files: List[str],
+                 file_stats: Optional[FileStats] = None,
+                 hardlinks: Optional[Dict[str, List[str]]] = None,
+                 shared_extents: Optional[List[List[List[str]]]] = None) -> str:
+    """Stream the text report to report_path through a buffered handle; returns the absolute path."""
+    _write_lines(report_path, iter_report_lines(duplicates, large_files, old_files, empty_files,
+                                                near_duplicates, blurry_files, file_stats,
+                                                hardlinks, shared_extents))
+    return str(Path(report_path).resolve())
+
+
+def iter_html_report_lines(duplicates: List[List[str]], large_files: List[str], 
+                           old_files: List[str], empty_files: List[str],
+                           near_duplicates: Dict[str, List[str]], blurry_files: List[str],
+                           file_stats: Optional[FileStats] = None) -> Iterator[str]:
+    """Yield the HTML report line by line (metadata from file_stats, no filesystem calls)."""
+    
+    yield "<!DOCTYPE html>"
+    yield "<html lang='en'>"
+    yield "<head>"
+    yield "    <meta charset='UTF-8'>"
+    yield "    <meta name='viewport' content='width=device-width, initial-scale=1.0'>"
+    yield "    <title>LocalMind Report</title>"
+    yield "    <style>"
+    yield "        body { font-family: Arial, sans-serif; margin: 20px; }"
+    yield "        .header { text-align: center; margin-bottom: 30px; }"
+    yield "        .section { margin: 20px 0; }"
+    yield "        .file-list { background: #f5f5f5; padding: 10px; border-radius: 5px; }"
+    yield "        .file-item { margin: 5px 0; font-family: monospace; }"
+    yield "        .summary { background: #e8f4fd; padding: 15px; border-radius: 5px; }"
+    yield "        .tagline { color: #666; font-style: italic; }"
+    yield "    </style>"
+    yield "</head>"
+    yield "<body>"
     
     # Header
-    html.append("    <div class='header'>")
-    html.append("        <h1>LocalMind Report</h1>")
-    html.append("        <p class='tagline'>Smart file cleanup. 100% offline. AI that tidies your computer without touching the cloud.</p>")
-    html.append(f"        <p>Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>")
-    html.append("    </div>")
+    yield "    <div class='header'>"
+    yield "        <h1>LocalMind Report</h1>"
+    yield "        <p class='tagline'>Smart file cleanup. 100% offline. AI that tidies your computer without touching the cloud.</p>"
+    yield f"        <p>Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>"
+    yield "    </div>"
     
     # Summary
     total_duplicate_files = sum(len(group) for group in duplicates)
     total_near_duplicate_files = sum(len(group) for group in near_duplicates.values())
     
-    html.append("    <div class='summary'>")
-    html.append("        <h2>Summary</h2>")
-    html.append(f"        <p><strong>Duplicate groups:</strong> {len(duplicates)}</p>")
-    html.append(f"        <p><strong>Total duplicate files:</strong> {total_duplicate_files}</p>")
-    html.append(f"        <p><strong>Large files:</strong> {len(large_files)}</p>")
-    html.append(f"        <p><strong>Old files:</strong> {len(old_files)}</p>")
-    html.append(f"        <p><strong>Empty files:</strong> {len(empty_files)}</p>")
-    html.append(f"        <p><strong>Near-duplicate image groups:</strong> {len(near_duplicates)}</p>")
-    html.append(f"        <p><strong>Total near-duplicate files:</strong> {total_near_duplicate_files}</p>")
-    html.append(f"        <p><strong>Blurry images:</strong> {len(blurry_files)}</p>")
-    html.append("    </div>")
+    yield "    <div class='summary'>"
+    yield "        <h2>Summary</h2>"
+    yield f"        <p><strong>Duplicate groups:</strong> {len(duplicates)}</p>"
+    yield f"        <p><strong>Total duplicate files:</strong> {total_duplicate_files}</p>"
+    yield f"        <p><strong>Large files:</strong> {len(large_files)}</p>"
+    yield f"        <p><strong>Old files:</strong> {len(old_files)}</p>"
+    yield f"        <p><strong>Empty files:</strong> {len(empty_files)}</p>"
+    yield f"        <p><strong>Near-duplicate image groups:</strong> {len(near_duplicates)}</p>"
+    yield f"        <p><strong>Total near-duplicate files:</strong> {total_near_duplicate_files}</p>"
+    yield f"        <p><strong>Blurry images:</strong> {len(blurry_files)}</p>"
+    yield "    </div>"
     
     # Duplicates
     if duplicates:
-        html.append("    <div class='section'>")
-        html.append("        <h2>Duplicate Files</h2>")
+        yield "    <div class='section'>"
+        yield "        <h2>Duplicate Files</h2>"
         for i, group in enumerate(duplicates, 1):
-            html.append(f"        <h3>Group {i}</h3>")
-            html.append("        <div class='file-list'>")
+            yield f"        <h3>Group {i}</h3>"
+            yield "        <div class='file-list'>"
             for file_path in group:
-                size = os.path.getsize(file_path)
-                html.append(f"            <div class='file-item'>{file_path} ({size:,} bytes)</div>")
-            html.append("        </div>")
-        html.append("    </div>")
+                yield f"            <div class='file-item'>{escape(file_path)} ({_size_label(file_stats, file_path)})</div>"
+            yield "        </div>"
+        yield "    </div>"
     
     # Large files
     if large_files:
-        html.append("    <div class='section'>")
-        html.append("        <h2>Large Files</h2>")
-        html.append("        <div class='file-list'>")
+        yield "    <div class='section'>"
+        yield "        <h2>Large Files</h2>"
+        yield "        <div class='file-list'>"
         for file_path in large_files:
-            size = os.path.getsize(file_path)
-            html.append(f"            <div class='file-item'>{file_path} ({size:,} bytes)</div>")
-        html.append("        </div>")
-        html.append("    </div>")
+            yield f"            <div class='file-item'>{escape(file_path)} ({_size_label(file_stats, file_path)})</div>"
+        yield "        </div>"
+        yield "    </div>"
     
     # Old files
     if old_files:
-        html.append("    <div class='section'>")
-        html.append("        <h2>Old Files</h2>")
-        html.append("        <div class='file-list'>")
+        yield "    <div class='section'>"
+        yield "        <h2>Old Files</h2>"
+        yield "        <div class='file-list'>"
         for file_path in old_files:
-            mtime = datetime.fromtimestamp(os.path.getmtime(file_path))
-            html.append(f"            <div class='file-item'>{file_path} (modified: {mtime.strftime('%Y-%m-%d %H:%M:%S')})</div>")
-        html.append("        </div>")
-        html.append("    </div>")
+            yield f"            <div class='file-item'>{escape(file_path)} ({_mtime_label(file_stats, file_path)})</div>"
+        yield "        </div>"
+        yield "    </div>"
     
     # Empty files
     if empty_files:
-        html.append("    <div class='section'>")
-        html.append("        <h2>Empty Files</h2>")
-        html.append("        <div class='file-list'>")
+        yield "    <div class='section'>"
+        yield "        <h2>Empty Files</h2>"
+        yield "        <div class='file-list'>"
         for file_path in empty_files:
-            html.append(f"            <div class='file-item'>{file_path}</div>")
-        html.append("        </div>")
-        html.append("    </div>")
+            yield f"            <div class='file-item'>{escape(file_path)}</div>"
+        yield "        </div>"
+        yield "    </div>"
     
     # Near-duplicate images
     if near_duplicates:
-        html.append("    <div class='section'>")
-        html.append("        <h2>Near-Duplicate Images</h2>")
+        yield "    <div class='section'>"
+        yield "        <h2>Near-Duplicate Images</h2>"
         for group_name, file_list in near_duplicates.items():
-            html.append(f"        <h3>{group_name}</h3>")
-            html.append("        <div class='file-list'>")
+            yield f"        <h3>{escape(group_name)}</h3>"
+            yield "        <div class='file-list'>"
             for file_path in file_list:
-                html.append(f"            <div class='file-item'>{file_path}</div>")
-            html.append("        </div>")
-        html.append("    </div>")
+                yield f"            <div class='file-item'>{escape(file_path)}</div>"
+            yield "        </div>"
+        yield "    </div>"
     
     # Blurry images
     if blurry_files:
-        html.append("    <div class='section'>")
-        html.append("        <h2>Blurry Images</h2>")
-        html.append("        <div class='file-list'>")
+        yield "    <div class='section'>"
+        yield "        <h2>Blurry Images</h2>"
+        yield "        <div class='file-list'>"
         for file_path in blurry_files:
-            html.append(f"            <div class='file-item'>{file_path}</div>")
-        html.append("        </div>")
-        html.append("    </div>")
+            yield f"            <div class='file-item'>{escape(file_path)}</div>"
+        yield "        </div>"
+        yield "    </div>"
     
-    html.append("</body>")
-    html.append("</html>")
-    
-    return "\n".join(html)
+    yield "</body>"
+    yield "</html>"
+
 
+def generate_html_report(duplicates: List[List[str]], large_files: List[str], 
+                        old_files: List[str], empty_files: List[str],
+                        near_duplicates: Dict[str, List[str]], blurry_files: List[str],
+                        file_stats: Optional[FileStats] = None) -> str:
+    """Generate an HTML report of all findings as one string (see write_html_report)."""
+    return "\n".join(iter_html_report_lines(duplicates, large_files, old_files, empty_files,
+                                              near_duplicates, blurry_files, file_stats))
+
+
+def write_html_report(report_path: str, duplicates: List[List[str]], large_files: List[str],
+                      old_files: List[str], empty_files: List[str],
+                      near_duplicates: Dict[str, List[str]], blurry_files: List[str],
+                      file_stats: Optional[FileStats] = None, mode: str = "auto") -> str:
+    """Write the HTML report to report_path; returns the absolute path.
+
+    mode: 'static' streams every finding into one page, 'paged' writes a lightweight page
+    plus lazily loaded data chunks (see cleanslate_paged_report), 'auto' picks paged above
+    PAGED_REPORT_THRESHOLD findings.
+    """
+    return _write_html(report_path, duplicates, large_files, old_files, empty_files,
+                       near_duplicates, blurry_files, file_stats, mode)
+
+
+def _write_html(report_path: str, duplicates: List[List[str]], large_files: List[str],
+                old_files: List[str], empty_files: List[str],
+                near_duplicates: Dict[str, List[str]], blurry_files: List[str],
+                file_stats: Optional[FileStats], mode: str) -> str:
+    total_rows = count_findings(duplicates, large_files, old_files, empty_files, near_duplicates, blurry_files)
+    if choose_mode(mode, total_rows) == "paged":
+        _log_message(f"writing paged HTML report ({total_rows} findings)")
+        return write_paged_html_report(report_path, duplicates, large_files, old_files, empty_files,
+                                       near_duplicates, blurry_files, file_stats)
+    remove_paged_data(report_path)  # chunks of an earlier paged report would be stale
+    _write_lines(report_path, iter_html_report_lines(duplicates, large_files, old_files, empty_files,
+                                                     near_duplicates, blurry_files, file_stats))
+    return str(Path(report_path).resolve())
+
+
+def _write_lines(path: str, lines: Iterable[str]) -> None:
+    """Write lines to path as they are produced; memory stays bounded by the write buffer."""
+    with open(path, "w", encoding="utf-8", buffering=REPORT_BUFFER_BYTES) as f:
+        for line in lines:
+            f.write(line)
+            f.write("\n")
+
+
+def run_scan(config: Dict, metrics: Optional[ScanMetrics] = None,
+             progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+             plugins: Optional[List[type]] = None) -> Dict:
+    """Run a complete scan with the given configuration.
+
+    Per-stage timings and counters are returned under results['metrics'] and written as
+    JSON when config['metrics_json'] names a file. Pass `metrics` to collect into an
+    existing session (e.g. Phase 4 adds its AI stages to the same one).
+
+    Optional config keys:
+        detectors   names from DETECTOR_REGISTRY or the plugins to run (default: all),
+                    scheduled cheapest first; skipped ones report nothing
+        plugins     DetectorPlugin specs (see cleanslate_plugins), used for this scan only
+        output_dir  directory for the reports (default: the working directory)
+        hash_algorithm  content hash for duplicate detection ('auto' picks the fastest
+                    installed, see cleanslate_hashing); recorded in results['hash_algorithm']
+
+    progress_callback, if given, receives {"event": "detector", "detector": name,
+    "status": "start" | "done", ...} dicts as the scan advances.
+    plugins, if given, are already loaded plugin classes used instead of config['plugins'].
+    """
+    owns_metrics = metrics is None
+    if metrics is None:
+        metrics = ScanMetrics("run_scan")
+    _log_message(f"run_scan start: paths={config['directories_to_scan']}")
+    paths = config['directories_to_scan']
+    if plugins is None:
+        plugins = load_plugins(config.get("plugins") or [])
+    registry = detector_registry(plugins)
+    plan = plan_detectors(config.get("detectors") or None, registry)
+    _log_message(f"run_scan plan: {', '.join(f'{d.name}({d.needs})' for d in plan)}")
+
+    def notify(event: Dict[str, Any]) -> None:
+        if progress_callback:
+            progress_callback(event)
 
-def run_scan(config: Dict) -> Dict:
-    """Run a complete scan with the given configuration."""
     # Convert Phase 2 exclusions to Phase 4 format for internal functions
     exclusions = {
         "folders": config.get("excluded_folders", []),
         "extensions": config.get("excluded_file_types", [])
     }
-    all_files = scan_files(config['directories_to_scan'], exclusions)
+    # One walk and one stat per file, shared by every detector
+    file_ids: Dict[str, FileId] = {}
+    all_files, file_stats = build_inventory(paths, exclusions, metrics, file_ids)
+    inventory = ScanInventory(all_files, file_stats, metrics, config.get("hash_algorithm"), file_ids)
     total_files = len(all_files)
-
-    duplicates_raw = find_duplicates(config['directories_to_scan'])
-    large_files = find_large_files(config['directories_to_scan'], config['large_file_threshold_mb'])
-    old_files = find_old_files(config['directories_to_scan'], config['old_file_threshold_days'])
-    empty_files = find_empty_files(config['directories_to_scan'])
-    near_duplicates = find_near_duplicate_images(config['directories_to_scan'])
-    blurry_files = find_blurry_images(config['directories_to_scan'])
+    metrics.incr("files_processed", total_files)
+    notify({"event": "inventory", "files": total_files})
+
+    found: Dict[str, Any] = {}
+    for detector in plan:
+        notify({"event": "detector", "detector": detector.name, "status": "start"})
+        found[detector.name] = detector.run(inventory, config, metrics)
+        notify({"event": "detector", "detector": detector.name, "status": "done",
+                "found": len(found[detector.name])})
+
+    def findings(name: str) -> Any:
+        return found[name] if name in found else registry[name].empty()
+
+    duplicates_raw = findings("duplicates")
+    large_files = findings("large")
+    old_files = findings("old")
+    empty_files = findings("empty")
+    near_duplicates = findings("near_duplicates")
+    blurry_files = findings("blurry")
+    plugin_findings = {name: value for name, value in found.items() if name not in DETECTORS}
 
     # Convert duplicates to Phase 2 format (dict with group keys)
     duplicates = {}
     for i, group in enumerate(duplicates_raw):
         duplicates[f"group_{i+1}"] = group
 
-    report = generate_report(duplicates_raw, large_files, old_files,
-                            empty_files, near_duplicates, blurry_files)
-
-    with open(REPORT_FILE, 'w') as f:
-        f.write(report)
+    # Hard links were collapsed before hashing; duplicates that already share their
+    # data blocks (reflinks) count as one copy in the reclaimable figure
+    _, hardlinks = collapse_hardlinks(file_stats, file_ids)
+    with metrics.stage("extents"):
+        shared_extents = [shared_extent_sets(group) for group in duplicates_raw]
+    reclaimable = sum(reclaimable_bytes(len(group), file_stats[group[0]][0], shared)
+                      for group, shared in zip(duplicates_raw, shared_extents))
+    content_hashes = inventory.cached("content_hash")
+    for owner, links in hardlinks.items():
+        if content_hashes.get(owner):
+            content_hashes.update(dict.fromkeys(links, content_hashes[owner]))
+
+    output_dir = Path(config.get("output_dir") or ".")
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    # Reports are streamed to disk; results carry their paths rather than the full text
+    with metrics.stage("report_text"):
+        report_path = write_report(str(output_dir / REPORT_FILE), duplicates_raw, large_files, old_files,
+                                   empty_files, near_duplicates, blurry_files, file_stats,
+                                   hardlinks=hardlinks, shared_extents=shared_extents)
 
     # Generate HTML report
-    html_report = generate_html_report(duplicates_raw, large_files, old_files,
-                                     empty_files, near_duplicates, blurry_files)
-    
-    with open(REPORT_HTML_FILE, 'w') as f:
-        f.write(html_report)
+    with metrics.stage("report_html"):
+        report_html_path = write_html_report(str(output_dir / REPORT_HTML_FILE), duplicates_raw, large_files,
+                                             old_files, empty_files, near_duplicates, blurry_files, file_stats,
+                                             config.get("html_report_mode", "auto"))
+    notify({"event": "reports", "text": report_path, "html": report_html_path})
 
     results = {
         'total_files': total_files,
@@ -713,11 +1144,54 @@ def run_scan(config: Dict) -> Dict:
         'empty_files': empty_files,
         'near_duplicates': near_duplicates,
         'blurry_files': blurry_files,
-        'report': report
+        'plugin_findings': plugin_findings,
+        'file_stats': file_stats,
+        'hardlinks': hardlinks,
+        'shared_extents': {f"group_{i+1}": shared for i, shared in enumerate(shared_extents) if shared},
+        'reclaimable_bytes': reclaimable,
+        'hash_algorithm': inventory.hash_algorithm,
+        # Full-content digests computed during the scan, reusable by later stages (Phase 4)
+        'content_hashes': content_hashes,
+        'report_path': report_path,
+        'report_html_path': report_html_path
     }
+    if owns_metrics:
+        # Callers passing their own metrics (Phase 4) add more findings and call this themselves
+        write_scan_outputs(results, config, metrics)
+        finish_metrics(metrics, results, config.get("metrics_json"))
     return results
 
 
+def write_scan_outputs(results: Dict[str, Any], config: Dict, metrics: Optional[ScanMetrics] = None) -> None:
+    """Write the optional machine-readable outputs requested in config.
+
+    export_jsonl / export_columnar: structured exports, paths in results['export_paths'].
+    snapshot_db: store the scan as a snapshot (results['snapshot_id']) and diff it against
+    the previous snapshot of the same roots (results['snapshot_diff']).
+    """
+    if config.get("export_jsonl") or config.get("export_columnar"):
+        try:
+            with _stage(metrics, "export"):
+                results["export_paths"] = export_results(results, config)
+        except Exception as e:
+            _log_message(f"export error: {e}", logging.ERROR)
+
+    if config.get("snapshot_db"):
+        roots = list(config.get("directories_to_scan", []))
+        try:
+            with _stage(metrics, "snapshot"):
+                with SnapshotStore(config["snapshot_db"]) as store:
+                    snapshot_id = store.save(results, roots)
+                    results["snapshot_id"] = snapshot_id
+                    previous = [i for i in store.latest_ids(roots, count=2) if i != snapshot_id]
+                    if previous:
+                        diff = store.diff(previous[0], snapshot_id)
+                        results["snapshot_diff"] = diff
+                        _log_message(format_diff(diff, max_items=5))
+        except Exception as e:
+            _log_message(f"snapshot error: {e}", logging.ERROR)
+
+
 def run_demo_scan():
     """Run a demo scan with default settings."""
     config = load_config()
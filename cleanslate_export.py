@@ -0,0 +1,397 @@
+#!/usr/bin/env python3
+"""
+LocalMind Export - Machine-readable scan output
+Writes the full inventory and findings of a scan in two structured forms, so pipelines
+no longer have to re-parse the prose reports:
+
+- JSON Lines (.jsonl, or .jsonl.gz): one header record, then one record per file sorted
+  by path (stable across runs, so two exports diff cleanly), then a summary record.
+  Streamed to disk; gzip-compressed when the name ends in .gz.
+- Columnar: one row per file, one column per attribute. Written as Parquet when pyarrow
+  is installed and the path ends in .parquet; otherwise as LocalMind's own compact
+  columnar format (.lmcol, zlib-compressed column blocks), readable with read_columnar().
+
+Config keys (used by run_scan / run_phase4_scan):
+    "export_jsonl": "exports/scan.jsonl"
+    "export_columnar": "exports/scan.parquet"   (or .lmcol)
+"""
+
+import gzip
+import importlib.util
+import json
+import struct
+import sys
+import zlib
+from array import array
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from cleanslate_logging import get_logger
+
+EXPORT_FORMAT = "localmind-scan"
+EXPORT_VERSION = 1
+
+LMCOL_MAGIC = b"LMCOL\x01"
+PARQUET_MAGIC = b"PAR1"
+
+# Result key -> finding name, for findings that are flat lists of paths
+LIST_FINDINGS = (
+    ("large_files", "large"),
+    ("old_files", "old"),
+    ("empty_files", "empty"),
+    ("blurry_files", "blurry"),
+)
+
+# Result key -> finding name, for findings that are {group name: [paths]}
+GROUP_FINDINGS = (
+    ("duplicates", "duplicate"),
+    ("near_duplicates", "near_duplicate"),
+    ("content_duplicates", "content_duplicate"),
+)
+
+# Column name, type. Types: str (plain strings), dict (dictionary-encoded strings),
+# int64, float64, bool. Missing values: -1 for size, NaN for floats, "" for groups.
+# Plugin detectors vary per scan, so their findings share one column: compact JSON
+# {plugin name: true or group name}, sorted by name, "" when a file has none.
+COLUMNS = (
+    ("path", "str"),
+    ("size", "int64"),
+    ("mtime", "float64"),
+    ("large", "bool"),
+    ("old", "bool"),
+    ("empty", "bool"),
+    ("blurry", "bool"),
+    ("duplicate", "dict"),
+    ("near_duplicate", "dict"),
+    ("content_duplicate", "dict"),
+    ("ai_score", "float64"),
+    ("plugins", "dict"),
+)
+
+_BUFFER_BYTES = 1024 * 1024
+
+logger = get_logger("export")
+
+
+def findings_by_path(results: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """path -> {finding name: True or group name}."""
+    findings: Dict[str, Dict[str, Any]] = {}
+    for key, name in LIST_FINDINGS:
+        for file_path in results.get(key) or []:
+            findings.setdefault(file_path, {})[name] = True
+    for key, name in GROUP_FINDINGS:
+        groups = results.get(key) or {}
+        if isinstance(groups, list):  # raw duplicate groups from find_duplicates
+            groups = {f"group_{i + 1}": group for i, group in enumerate(groups)}
+        for group_name, file_list in groups.items():
+            for file_path in file_list:
+                findings.setdefault(file_path, {})[name] = group_name
+    for name, found in (results.get("plugin_findings") or {}).items():
+        if isinstance(found, dict):
+            for group_name, file_list in found.items():
+                for file_path in file_list:
+                    findings.setdefault(file_path, {})[name] = group_name
+        else:
+            for file_path in found:
+                findings.setdefault(file_path, {})[name] = True
+    for file_path, analysis in (results.get("ai_analyses") or {}).items():
+        if isinstance(analysis, dict) and "ai_score" in analysis:
+            findings.setdefault(file_path, {})["ai_score"] = analysis["ai_score"]
+    return findings
+
+
+def _all_paths(results: Dict[str, Any], findings: Dict[str, Dict[str, Any]]) -> List[str]:
+    """Inventory paths plus any path only known from a finding, sorted."""
+    file_stats = results.get("file_stats") or {}
+    paths = set(file_stats)
+    paths.update(findings)
+    return sorted(paths)
+
+
+def iter_jsonl_records(results: Dict[str, Any], metadata: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+    """Yield export records: a 'scan' header, one 'file' record per path, a 'summary' trailer.
+
+    File record: {"type": "file", "path", "size", "mtime", "findings": {...}}; size and
+    mtime are null when the file was only seen by a detector, findings is omitted when empty.
+    """
+    file_stats = results.get("file_stats") or {}
+    findings = findings_by_path(results)
+    paths = _all_paths(results, findings)
+
+    yield {
+        "type": "scan",
+        "format": EXPORT_FORMAT,
+        "version": EXPORT_VERSION,
+        "exported_at": datetime.now().isoformat(timespec="seconds"),
+        "total_files": results.get("total_files", len(file_stats)),
+        **(metadata or {}),
+    }
+
+    counts: Dict[str, int] = {}
+    total_bytes = 0
+    # Extra links of a hard-linked file share its data; count the bytes once
+    aliases = {link for links in (results.get("hardlinks") or {}).values() for link in links}
+    for file_path in paths:
+        entry = file_stats.get(file_path)
+        record: Dict[str, Any] = {
+            "type": "file",
+            "path": file_path,
+            "size": entry[0] if entry else None,
+            "mtime": entry[1] if entry else None,
+        }
+        if entry and file_path not in aliases:
+            total_bytes += entry[0]
+        file_findings = findings.get(file_path)
+        if file_findings:
+            record["findings"] = file_findings
+            for name in file_findings:
+                counts[name] = counts.get(name, 0) + 1
+        yield record
+
+    summary: Dict[str, Any] = {"type": "summary", "files": len(paths), "bytes": total_bytes,
+                               "findings": counts}
+    if results.get("metrics"):
+        summary["metrics"] = results["metrics"]
+    yield summary
+
+
+def _open_text(path: Path, mode: str):
+    if path.name.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8", buffering=_BUFFER_BYTES)
+
+
+def write_jsonl(results: Dict[str, Any], path: str, metadata: Optional[Dict[str, Any]] = None) -> str:
+    """Stream the export as JSON Lines to path (gzip if it ends in .gz); returns the absolute path."""
+    out = Path(path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    with _open_text(out, "w") as f:
+        for record in iter_jsonl_records(results, metadata):
+            f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")))
+            f.write("\n")
+    return str(out.resolve())
+
+
+def read_jsonl(path: str) -> Iterator[Dict[str, Any]]:
+    """Iterate the records of a JSON Lines export (plain or .gz)."""
+    with _open_text(Path(path), "r") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def build_columns(results: Dict[str, Any]) -> Dict[str, list]:
+    """The columnar table as {column name: list of values}, one row per path (sorted)."""
+    file_stats = results.get("file_stats") or {}
+    findings = findings_by_path(results)
+    paths = _all_paths(results, findings)
+    columns: Dict[str, list] = {name: [] for name, _ in COLUMNS}
+    plugin_names = sorted(results.get("plugin_findings") or {})
+    nan = float("nan")
+    for file_path in paths:
+        entry = file_stats.get(file_path)
+        found = findings.get(file_path, {})
+        columns["path"].append(file_path)
+        columns["size"].append(int(entry[0]) if entry else -1)
+        columns["mtime"].append(float(entry[1]) if entry else nan)
+        for name in ("large", "old", "empty", "blurry"):
+            columns[name].append(bool(found.get(name)))
+        for name in ("duplicate", "near_duplicate", "content_duplicate"):
+            columns[name].append(str(found.get(name, "")))
+        score = found.get("ai_score")
+        columns["ai_score"].append(float(score) if score is not None else nan)
+        plugin_found = {name: found[name] for name in plugin_names if name in found}
+        columns["plugins"].append(json.dumps(plugin_found, ensure_ascii=False, separators=(",", ":"))
+                                  if plugin_found else "")
+    return columns
+
+
+def _have_pyarrow() -> bool:
+    try:
+        return importlib.util.find_spec("pyarrow.parquet") is not None
+    except ImportError:  # find_spec imports the parent package, which may be missing
+        return False
+
+
+def write_columnar(results: Dict[str, Any], path: str, metadata: Optional[Dict[str, Any]] = None) -> str:
+    """Write the columnar export; returns the absolute path actually written.
+
+    A .parquet path is written with pyarrow. Without pyarrow, the file is written in the
+    .lmcol format instead, with the suffix changed accordingly.
+    """
+    out = Path(path)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    columns = build_columns(results)
+    meta = {"format": EXPORT_FORMAT, "version": EXPORT_VERSION,
+            "exported_at": datetime.now().isoformat(timespec="seconds"), **(metadata or {})}
+
+    if out.suffix == ".parquet":
+        if _have_pyarrow():
+            _write_parquet(columns, out, meta)
+            return str(out.resolve())
+        out = out.with_suffix(".lmcol")
+        logger.warning("pyarrow not installed; writing columnar export as %s", out)
+
+    _write_lmcol(columns, out, meta)
+    return str(out.resolve())
+
+
+def _write_parquet(columns: Dict[str, list], out: Path, meta: Dict[str, Any]) -> None:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    types = {"str": pa.string(), "dict": pa.string(), "int64": pa.int64(),
+             "float64": pa.float64(), "bool": pa.bool_()}
+    arrays = []
+    for name, kind in COLUMNS:
+        arr = pa.array(columns[name], type=types[kind])
+        arrays.append(arr.dictionary_encode() if kind == "dict" else arr)
+    table = pa.Table.from_arrays(arrays, names=[name for name, _ in COLUMNS])
+    table = table.replace_schema_metadata({"localmind": json.dumps(meta)})
+    pq.write_table(table, out, compression="zstd")
+
+
+# ----------------------------------------------------------------------------
+# .lmcol format
+#
+#   magic      6 bytes  b"LMCOL\x01"
+#   hdr_len    uint32 little-endian
+#   header     JSON: {"rows": N, "metadata": {...},
+#                     "columns": [{"name", "type", "offset", "length"}, ...]}
+#   blocks     one zlib-compressed block per column, offsets relative to the
+#              first byte after the header
+#
+# Block payloads (little-endian): int64/float64 raw arrays, bool one byte per
+# row, str = uint32 byte lengths followed by the UTF-8 bytes, dict = str-encoded
+# dictionary count (uint32) + dictionary strings + int32 codes per row.
+# ----------------------------------------------------------------------------
+
+def _le_bytes(arr: array) -> bytes:
+    if sys.byteorder != "little":
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _from_le(typecode: str, data: bytes) -> array:
+    arr = array(typecode)
+    arr.frombytes(data)
+    if sys.byteorder != "little":
+        arr.byteswap()
+    return arr
+
+
+def _encode_strings(values: List[str]) -> bytes:
+    encoded = [value.encode("utf-8", "surrogateescape") for value in values]
+    return _le_bytes(array("I", (len(b) for b in encoded))) + b"".join(encoded)
+
+
+def _decode_strings(data: bytes, count: int, start: int = 0) -> Tuple[List[str], int]:
+    lengths = _from_le("I", data[start:start + 4 * count])
+    pos = start + 4 * count
+    values = []
+    for length in lengths:
+        values.append(data[pos:pos + length].decode("utf-8", "surrogateescape"))
+        pos += length
+    return values, pos
+
+
+def _encode_column(kind: str, values: list) -> bytes:
+    if kind == "int64":
+        return _le_bytes(array("q", values))
+    if kind == "float64":
+        return _le_bytes(array("d", values))
+    if kind == "bool":
+        return bytes(bytearray(1 if v else 0 for v in values))
+    if kind == "str":
+        return _encode_strings(values)
+    if kind == "dict":
+        codes: Dict[str, int] = {}
+        indices = array("i", (codes.setdefault(v, len(codes)) for v in values))
+        return struct.pack("<I", len(codes)) + _encode_strings(list(codes)) + _le_bytes(indices)
+    raise ValueError(f"unknown column type: {kind}")
+
+
+def _decode_column(kind: str, data: bytes, rows: int) -> list:
+    if kind == "int64":
+        return _from_le("q", data).tolist()
+    if kind == "float64":
+        return _from_le("d", data).tolist()
+    if kind == "bool":
+        return [b != 0 for b in data]
+    if kind == "str":
+        return _decode_strings(data, rows)[0]
+    if kind == "dict":
+        (count,) = struct.unpack_from("<I", data)
+        dictionary, pos = _decode_strings(data, count, 4)
+        return [dictionary[i] for i in _from_le("i", data[pos:pos + 4 * rows])]
+    raise ValueError(f"unknown column type: {kind}")
+
+
+def _write_lmcol(columns: Dict[str, list], out: Path, meta: Dict[str, Any]) -> None:
+    rows = len(columns["path"])
+    blocks = []
+    header_columns = []
+    offset = 0
+    for name, kind in COLUMNS:
+        block = zlib.compress(_encode_column(kind, columns[name]), 6)
+        header_columns.append({"name": name, "type": kind, "offset": offset, "length": len(block)})
+        blocks.append(block)
+        offset += len(block)
+    header = json.dumps({"rows": rows, "metadata": meta, "columns": header_columns}).encode("utf-8")
+    with open(out, "wb") as f:
+        f.write(LMCOL_MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        for block in blocks:
+            f.write(block)
+
+
+def read_columnar(path: str, columns: Optional[List[str]] = None) -> Dict[str, list]:
+    """Load a columnar export (.lmcol or Parquet) as {column: values}.
+
+    Only the requested columns are decompressed. NaN marks missing floats.
+    """
+    with open(path, "rb") as f:
+        magic = f.read(len(LMCOL_MAGIC))
+        if magic[:4] == PARQUET_MAGIC:
+            import pyarrow.parquet as pq
+            return pq.read_table(path, columns=columns).to_pydict()
+        if magic != LMCOL_MAGIC:
+            raise ValueError(f"{path} is not a LocalMind columnar export")
+        (header_len,) = struct.unpack("<I", f.read(4))
+        header = json.loads(f.read(header_len).decode("utf-8"))
+        base = f.tell()
+        table: Dict[str, list] = {}
+        for column in header["columns"]:
+            if columns is not None and column["name"] not in columns:
+                continue
+            f.seek(base + column["offset"])
+            data = zlib.decompress(f.read(column["length"]))
+            table[column["name"]] = _decode_column(column["type"], data, header["rows"])
+        return table
+
+
+def read_columnar_metadata(path: str) -> Dict[str, Any]:
+    """Header of a .lmcol export: row count, metadata and column layout."""
+    with open(path, "rb") as f:
+        if f.read(len(LMCOL_MAGIC)) != LMCOL_MAGIC:
+            raise ValueError(f"{path} is not a .lmcol export")
+        (header_len,) = struct.unpack("<I", f.read(4))
+        return json.loads(f.read(header_len).decode("utf-8"))
+
+
+def export_results(results: Dict[str, Any], config: Dict[str, Any]) -> Dict[str, str]:
+    """Write the exports requested in config ('export_jsonl', 'export_columnar').
+
+    Returns {"jsonl": path, "columnar": path} for the files written.
+    """
+    metadata = {"directories_scanned": list(config.get("directories_to_scan", []))}
+    written: Dict[str, str] = {}
+    if config.get("export_jsonl"):
+        written["jsonl"] = write_jsonl(results, config["export_jsonl"], metadata)
+    if config.get("export_columnar"):
+        written["columnar"] = write_columnar(results, config["export_columnar"], metadata)
+    return written
+
@@ -6,6 +6,7 @@ LocalMind GUI (PySimpleGUI) - Simple 3-tab interface per MVP spec.
 import os
 os.environ["TK_SILENCE_DEPRECATION"] = "1"
 import json
+import logging
 import threading
 from pathlib import Path
 from typing import List, Dict, Any
@@ -13,6 +14,18 @@ import webbrowser
 import PySimpleGUI as sg
 import sys
 from datetime import datetime
+from cleanslate_logging import LOG_FILE, flush_logs, get_logger
+from cleanslate_progress import ProgressBatcher, format_status
+from cleanslate_browser import BrowserEntry, DirectoryBrowser
+from cleanslate_hashing import resolve_algorithm
+from cleanslate_index import SizeIndex
+from cleanslate_journal import DEFAULT_JOURNAL_DB, TrashJournal, fingerprint
+from cleanslate_links import collapse_hardlinks
+from cleanslate_planner import KEEP_RULES, CleanupPlan, is_within, plan_cleanup, stat_findings
+from cleanslate_tasks import ToolRunner
+from cleanslate_trash import BulkTrasher, TrashPlan, apply_to_results, duplicates_plan
+from cleanslate_watcher import LiveInventory, Watcher, create_watcher
+from cleanslate_results import COLUMN_SORT_KEYS, COLUMNS, KINDS, ResultsModel, format_row
 
 # Disable all icon handling (macOS-safe)
 try:
@@ -55,12 +68,19 @@ except Exception:
 INPUT_SCAN_PATH = "-INPUT_SCAN_PATH-"
 BTN_BROWSE = "-BTN_BROWSE-"
 CHK_DEMO = "-CHK_DEMO-"
+CHK_WATCH = "-CHK_WATCH-"
 BTN_RUN = "-BTN_RUN-"
 BTN_STOP = "-BTN_STOP-"
 BTN_OPEN_REPORT = "-BTN_OPEN_REPORT-"
 TXT_STATUS = "-TXT_STATUS-"
-ML_RESULTS = "-ML_RESULTS-"
+TBL_RESULTS = "-TBL_RESULTS-"
+SLD_RESULTS = "-SLD_RESULTS-"
+IN_FILTER = "-IN_FILTER-"
+CMB_KIND = "-CMB_KIND-"
 TXT_SUMMARY = "-TXT_SUMMARY-"
+BTN_TRASH_SELECTED = "-BTN_TRASH_SELECTED-"
+BTN_TRASH_DUPES = "-BTN_TRASH_DUPES-"
+BTN_UNDO_TRASH = "-BTN_UNDO_TRASH-"
 IN_SIZE_MB = "-IN_SIZE_MB-"
 IN_AGE_DAYS = "-IN_AGE_DAYS-"
 ML_EXCLUSIONS = "-ML_EXCLUSIONS-"
@@ -74,6 +94,10 @@ BTN_VIEW_LICENSE = "-BTN_VIEW_LICENSE-"
 EV_SCAN_PROGRESS = "-EV_SCAN_PROGRESS-"
 EV_SCAN_DONE = "-EV_SCAN_DONE-"
 EV_SCAN_ERROR = "-EV_SCAN_ERROR-"
+EV_FS_CHANGED = "-EV_FS_CHANGED-"
+EV_TRASH_PROGRESS = "-EV_TRASH_PROGRESS-"
+EV_TRASH_DONE = "-EV_TRASH_DONE-"
+EV_UNDO_DONE = "-EV_UNDO_DONE-"
 
 # Chat keys and events
 WORKSPACE_PICK = "-WORKSPACE_PICK-"
@@ -90,14 +114,23 @@ ACTIONS_FORM = "-ACTIONS_FORM-"
 TOOL_LARGEST = "-TOOL_LARGEST-"
 TOOL_DUPES = "-TOOL_DUPES-"
 TOOL_CLEANUP = "-TOOL_CLEANUP-"
+TOOL_TRASH_PLAN = "-TOOL_TRASH_PLAN-"
 FILE_OPEN = "-FILE_OPEN-"
 FILE_REVEAL = "-FILE_REVEAL-"
 FILE_TRASH = "-FILE_TRASH-"
+CHAT_STOP = "-CHAT_STOP-"
+INDEX_STATUS = "-INDEX_STATUS-"
+EV_TOOL_PARTIAL = "-EV_TOOL_PARTIAL-"
+EV_TOOL_DONE = "-EV_TOOL_DONE-"
+EV_TOOL_CANCELED = "-EV_TOOL_CANCELED-"
+EV_TOOL_ERROR = "-EV_TOOL_ERROR-"
+TOOL_EVENTS = {"partial": EV_TOOL_PARTIAL, "done": EV_TOOL_DONE, "canceled": EV_TOOL_CANCELED, "error": EV_TOOL_ERROR}
 
 APP_VERSION = "1.0.0"
 CONFIG_PATH = Path("config.json")
-LOG_DIR = Path("logs")
-LOG_FILE = LOG_DIR / "localmind.log"
+
+# Rows rendered by the results table; scrolling swaps their contents (virtualized view)
+TABLE_ROWS = 20
 
 DEFAULTS = {
     "size_threshold_mb": 50,
@@ -105,16 +138,15 @@ DEFAULTS = {
     "exclusions": [],
     "write_text_report": True,
     "write_html_report": True,
+    "hash_algorithm": "auto",
 }
 
 
-def _log(msg: str) -> None:
-    try:
-        LOG_DIR.mkdir(parents=True, exist_ok=True)
-        with open(LOG_FILE, "a", encoding="utf-8") as f:
-            f.write(msg + "\n")
-    except Exception:
-        pass
+logger = get_logger("gui")
+
+
+def _log(msg: str, level: int = logging.INFO) -> None:
+    logger.log(level, msg)
 
 
 def load_settings() -> Dict[str, Any]:
@@ -129,13 +161,14 @@ def load_settings() -> Dict[str, Any]:
                 "exclusions": data.get("exclusions") or data.get("exclude_paths") or data.get("excluded_file_types", []),
                 "write_text_report": data.get("write_text_report", True),
                 "write_html_report": data.get("write_html_report", True),
+                "hash_algorithm": data.get("hash_algorithm"),
             }
             # Normalize list
             if isinstance(mapped["exclusions"], str):
                 mapped["exclusions"] = [mapped["exclusions"]]
             return {**DEFAULTS, **{k: v for k, v in mapped.items() if v is not None}}
         except Exception:
-            _log("load_settings error; using defaults")
+            _log("load_settings error; using defaults", logging.WARNING)
     save_settings(DEFAULTS)
     return dict(DEFAULTS)
 
@@ -145,7 +178,7 @@ def save_settings(settings: Dict[str, Any]) -> None:
         with open(CONFIG_PATH, "w", encoding="utf-8") as f:
             json.dump(settings, f, indent=2)
     except Exception as e:
-        _log(f"save_settings error: {e}")
+        _log(f"save_settings error: {e}", logging.ERROR)
 
 
 def build_layout(settings: Dict[str, Any]):
@@ -155,18 +188,26 @@ def build_layout(settings: Dict[str, Any]):
         [sg.Input(key=INPUT_SCAN_PATH, enable_events=False, readonly=True, size=(36, 1)),
          sg.FolderBrowse("Browse", key=BTN_BROWSE)],
         [sg.Checkbox("Demo mode", key=CHK_DEMO, enable_events=True)],
+        [sg.Checkbox("Keep results live (watch folder after scan)", key=CHK_WATCH)],
         [sg.HorizontalSeparator()],
         [sg.Text("Actions.")],
         [sg.Button("Run Scan", key=BTN_RUN, size=(12, 1)),
          sg.Button("Stop", key=BTN_STOP, size=(8, 1), disabled=True),
          sg.Button("Open Report", key=BTN_OPEN_REPORT, size=(12, 1), disabled=True)],
-        [sg.Text("Status:"), sg.Text("Ready", key=TXT_STATUS, size=(40, 1))],
+        [sg.Text("Status:"), sg.Text("Ready", key=TXT_STATUS, size=(40, 2))],
     ]
     right_col = [
-        [sg.Text("Results.")],
-        [sg.Multiline(key=ML_RESULTS, size=(70, 25), font=("Courier New", 10), autoscroll=True,
-                      write_only=True, disabled=True)],
+        [sg.Text("Results."), sg.Push(), sg.Text("Filter:"), sg.Input(key=IN_FILTER, size=(24, 1), enable_events=True),
+         sg.Combo(["All", *KINDS], default_value="All", key=CMB_KIND, readonly=True, enable_events=True, size=(10, 1))],
+        [sg.Table(values=[], headings=list(COLUMNS), key=TBL_RESULTS, num_rows=TABLE_ROWS, auto_size_columns=False,
+                  col_widths=[9, 10, 10, 6, 40], justification="left", enable_click_events=True,
+                  select_mode=sg.TABLE_SELECT_MODE_EXTENDED, hide_vertical_scroll=True, expand_x=True, expand_y=True),
+         sg.Slider(range=(0, 0), default_value=0, orientation="v", key=SLD_RESULTS, enable_events=True,
+                   disable_number_display=True, expand_y=True)],
         [sg.Text("", key=TXT_SUMMARY, size=(60, 1))],
+        [sg.Button("Trash Selected", key=BTN_TRASH_SELECTED, disabled=True),
+         sg.Button("Trash Duplicates (keep one)", key=BTN_TRASH_DUPES, disabled=True),
+         sg.Button("Undo Last Trash", key=BTN_UNDO_TRASH)],
     ]
     tab_scan = [
         [sg.Column(left_col, pad=((0, 16), (0, 0))), sg.Column(right_col, expand_y=True)],
@@ -207,7 +248,7 @@ def build_layout(settings: Dict[str, Any]):
     chat_header = [
         [
             sg.Text("Workspace:"),
-            sg.Input(key=WORKSPACE_PICK, size=(40,1), readonly=True, disabled=False, enable_events=False),
+            sg.Input(key=WORKSPACE_PICK, size=(40,1), readonly=True, disabled=False, enable_events=True),
             sg.FolderBrowse("Choose", target=WORKSPACE_PICK),
             sg.Push(),
             sg.Text("Model:"), sg.Combo(values=["Local"], default_value="Local", readonly=True, size=(12,1)),
@@ -219,7 +260,7 @@ def build_layout(settings: Dict[str, Any]):
         [sg.Button("New chat", key=BTN_NEW_CHAT)],
         [sg.Listbox(values=[], size=(28, 20), key=CHATS_LIST, enable_events=True)],
         [sg.Text("Filters:"), sg.Text("All  | With actions | Errors | Starred", text_color="gray")],
-        [sg.Text("Index: Idle", key="-INDEX_STATUS-", text_color="gray")],
+        [sg.Text("Index: Idle", key=INDEX_STATUS, text_color="gray", size=(28, 1))],
     ]
 
     chat_center = [
@@ -233,7 +274,8 @@ def build_layout(settings: Dict[str, Any]):
                 ["Find duplicates", TOOL_DUPES],
                 ["Generate cleanup plan", TOOL_CLEANUP],
             ]),
-            sg.Button("Send", key=CHAT_SEND)
+            sg.Button("Send", key=CHAT_SEND),
+            sg.Button("Stop", key=CHAT_STOP, disabled=True),
         ]
     ]
 
@@ -252,6 +294,12 @@ def build_layout(settings: Dict[str, Any]):
         [sg.Button("Run", key=TOOL_LARGEST)],
         [sg.HorizontalSeparator()],
         [sg.Text("Find duplicates by size + partial hash"), sg.Button("Run", key=TOOL_DUPES)],
+        [sg.HorizontalSeparator()],
+        [sg.Text("Cleanup plan, keep copy:"), sg.Combo(list(KEEP_RULES), default_value="newest", key="-ACT_KEEP-",
+                                                      readonly=True, size=(8, 1))],
+        [sg.Text("Never trash files in:"), sg.Input("", size=(18, 1), key="-ACT_KEEP_IN-"),
+         sg.FolderBrowse("…", target="-ACT_KEEP_IN-")],
+        [sg.Button("Plan", key=TOOL_CLEANUP), sg.Button("Trash plan", key=TOOL_TRASH_PLAN, disabled=True)],
     ]
 
     inspector = [
@@ -284,15 +332,43 @@ class LocalMindWindow:
             margins=(16, 16),
             finalize=True,
         )
-        self.window[ML_RESULTS].Widget.configure(state="normal")
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.window[TBL_RESULTS].bind(sequence, "+WHEEL")
+            self.window[FILES_LIST].bind(sequence, "+WHEEL")
+        self.window[FILES_LIST].bind("<Double-Button-1>", "+DOUBLE")
         self.cancel_event: threading.Event = threading.Event()
         self.worker: threading.Thread | None = None
         self.latest_reports = {"txt": None, "html": None}
+        self.findings_so_far = 0
+        self.results_model: ResultsModel | None = None
+        self.table_offset = 0
+        # Last scan inventory (Scan tab or a chat workspace): size index and hard links
+        # (kept path -> its other links), replaced together as one tuple
+        self.workspace_inventory: tuple[SizeIndex, dict] | None = None
+        self.scan_root: str | None = None
+        self.scan_params: Dict[str, Any] = {}
+        # Optional live updates after a scan (watcher thread owns the LiveInventory)
+        self.watcher: Watcher | None = None
+        # Last scan results (kept current after trash operations) and bulk trash state
+        self.scan_results: Dict[str, Any] | None = None
+        self.trash_cancel: threading.Event = threading.Event()
+        self.trash_worker: threading.Thread | None = None
+        self.trash_history: list = []  # TrashResult per operation, newest last
+        # Scan results as they were before each trash operation (by operation id), for undo
+        self.pre_trash_results: Dict[str, Dict[str, Any]] = {}
+        # Chat tools run off the UI thread; results come back as EV_TOOL_* events
+        self.tools = ToolRunner(lambda kind, payload: self.window.write_event_value(TOOL_EVENTS[kind], payload))
         self._enforce_demo_state()
         # Chat state
         self.workspace_path: str | None = None
         self.conversations: list[dict] = []  # [{id, title, messages: [{role, text, citations: [paths]}]}]
         self.active_conv_idx: int | None = None
+        # Last cleanup plan from the chat tools, executable with "Trash plan"
+        self.cleanup_plan: CleanupPlan | None = None
+        # Workspace browser: paged listing of browse_dir; rows are BrowserEntry, "..", or "more"
+        self.browser = DirectoryBrowser()
+        self.browse_dir: str | None = None
+        self.browser_rows: list = []
 
     def _enforce_demo_state(self):
         demo = self.window[CHK_DEMO].get()
@@ -300,16 +376,66 @@ class LocalMindWindow:
         if demo:
             self.window[INPUT_SCAN_PATH].update("./demo_data")
 
-    def _append_line(self, line: str):
-        self.window[ML_RESULTS].print(line)
-
-    def _scan_worker(self, scan_path: str, thresholds: Dict[str, int], exclusions: List[str], write_txt: bool, write_html: bool):
+    def _append_progress(self, batch: Dict[str, Any]):
+        """Apply one coalesced progress batch as a single status update."""
+        self.findings_so_far += len(batch["lines"])
+        self.window[TXT_STATUS].update(f"{format_status(batch)} · {self.findings_so_far:,} findings")
+
+    # Results table (virtualized: only TABLE_ROWS rows exist, scrolling swaps their values)
+    def _show_results(self, model: ResultsModel | None):
+        self.results_model = model
+        if model is not None:
+            self._apply_filter(self.window[IN_FILTER].get(), self.window[CMB_KIND].get())
+        self.table_offset = 0
+        self._render_table()
+
+    def _replace_results(self, model: ResultsModel):
+        """Swap in updated results, keeping the user's sort, filter and scroll position."""
+        if self.results_model is not None:
+            model.sort(self.results_model.sort_key, self.results_model.descending)
+        self.results_model = model
+        self._apply_filter(self.window[IN_FILTER].get(), self.window[CMB_KIND].get())
+        self._render_table()
+
+    def _apply_filter(self, text: str, kind: str):
+        if self.results_model is not None:
+            self.results_model.set_filter(text or "", None if kind in ("", "All") else kind)
+
+    def _render_table(self):
+        model = self.results_model
+        count = len(model) if model is not None else 0
+        last = max(count - TABLE_ROWS, 0)
+        self.table_offset = min(max(self.table_offset, 0), last)
+        rows = model.page(self.table_offset, TABLE_ROWS) if model is not None else []
+        self.window[TBL_RESULTS].update(values=[format_row(row) for row in rows])
+        self.window[SLD_RESULTS].update(value=self.table_offset, range=(0, last))
+        if model is not None:
+            order = "descending" if model.descending else "ascending"
+            self.window[TXT_SUMMARY].update(
+                f"{count:,} of {model.total:,} findings · sorted by {model.sort_key} ({order})")
+
+    def _scroll_table(self, rows: int):
+        self.table_offset += rows
+        self._render_table()
+
+    def _table_wheel_rows(self) -> int:
+        tk_event = self.window[TBL_RESULTS].user_bind_event
+        if getattr(tk_event, "num", None) == 4:
+            return -3
+        if getattr(tk_event, "num", None) == 5:
+            return 3
+        delta = getattr(tk_event, "delta", 0)
+        # Windows reports multiples of 120, macOS small integers
+        steps = delta // 120 if abs(delta) >= 120 else delta
+        return -3 * steps
+
+    def _scan_worker(self, scan_path: str, thresholds: Dict[str, int], exclusions: List[str], write_txt: bool,
+                     write_html: bool, hash_algorithm: str):
+        # Findings and counters reach the UI as ~10 batches per second, not one event per line
+        batcher = ProgressBatcher(lambda batch: self.window.write_event_value(EV_SCAN_PROGRESS, batch)).start()
         try:
             from cleanslate_core import scan_folder
 
-            def progress_cb(line: str):
-                self.window.write_event_value(EV_SCAN_PROGRESS, line)
-
             results = scan_folder(
                 scan_path,
                 thresholds["size_threshold_mb"],
@@ -318,209 +444,519 @@ class LocalMindWindow:
                 write_txt,
                 write_html,
                 self.cancel_event,
-                progress_cb,
+                batcher.add_line,
+                hash_algorithm=hash_algorithm,
+                status_callback=batcher.update,
             )
+            batcher.close()
             self.window.write_event_value(EV_SCAN_DONE, results)
         except Exception as e:
+            batcher.close()
             self.window.write_event_value(EV_SCAN_ERROR, str(e))
 
+    def _build_handlers(self) -> Dict[Any, Any]:
+        """Event -> handler(event, values). Tuple events (table clicks) are keyed by their first two items."""
+        handlers = {
+            "-HELP-": lambda event, values: sg.popup("LocalMind\nSmart file cleanup. 100% offline."),
+            CHK_DEMO: lambda event, values: self._enforce_demo_state(),
+            # Scan tab
+            BTN_RUN: self._on_run_scan,
+            BTN_STOP: self._on_stop_scan,
+            BTN_OPEN_REPORT: self._on_open_report,
+            EV_SCAN_PROGRESS: lambda event, values: self._append_progress(values[event]),
+            EV_SCAN_DONE: self._on_scan_done,
+            EV_SCAN_ERROR: self._on_scan_error,
+            EV_FS_CHANGED: self._on_fs_changed,
+            BTN_TRASH_SELECTED: self._on_trash_selected,
+            BTN_TRASH_DUPES: self._on_trash_duplicates,
+            EV_TRASH_PROGRESS: self._on_trash_progress,
+            EV_TRASH_DONE: self._on_trash_done,
+            BTN_UNDO_TRASH: self._on_undo_trash,
+            EV_UNDO_DONE: self._on_undo_done,
+            # Results table
+            (TBL_RESULTS, "+CLICKED+"): self._on_table_click,
+            IN_FILTER: self._on_filter,
+            CMB_KIND: self._on_filter,
+            SLD_RESULTS: self._on_slider,
+            TBL_RESULTS + "+WHEEL": lambda event, values: self._scroll_table(self._table_wheel_rows()),
+            # Settings / About
+            BTN_SAVE_SETTINGS: self._on_save_settings,
+            BTN_RELOAD_SETTINGS: self._on_reload_settings,
+            BTN_DEFAULTS: self._on_defaults,
+            BTN_OPEN_LOGS: self._on_open_logs,
+            BTN_VIEW_LICENSE: lambda event, values: sg.popup("License: Unlicensed (OK for testing)"),
+            # Chat
+            WORKSPACE_PICK: self._on_workspace_pick,
+            BTN_NEW_CHAT: self._on_new_chat,
+            CHATS_LIST: self._on_select_chat,
+            CHAT_SEND: self._on_chat_send,
+            CHAT_STOP: self._on_chat_stop,
+            EV_TOOL_PARTIAL: lambda event, values: self._tool_partial(values[event]),
+            EV_TOOL_DONE: lambda event, values: self._tool_finished(event, values[event]),
+            EV_TOOL_CANCELED: lambda event, values: self._tool_finished(event, values[event]),
+            EV_TOOL_ERROR: lambda event, values: self._tool_finished(event, values[event]),
+            # Workspace browser and inspector
+            FILES_LIST: self._on_files_select,
+            FILES_LIST + "+WHEEL": self._on_files_wheel,
+            FILES_LIST + "+DOUBLE": self._on_files_double,
+            FILE_OPEN: lambda event, values: self._inspector_open(values),
+            FILE_REVEAL: lambda event, values: self._inspector_reveal(values),
+            FILE_TRASH: lambda event, values: self._inspector_trash(values),
+            TOOL_TRASH_PLAN: self._on_trash_plan,
+        }
+        for tool_event in (TOOL_LARGEST, TOOL_DUPES, TOOL_CLEANUP, CHAT_QUICK):
+            handlers[tool_event] = self._on_chat_tool
+        return handlers
+
     def run(self):
+        # Blocks until a real event: user input, or a worker's write_event_value (scan progress
+        # and chat tool answers arrive already batched). Nothing runs while the app is idle.
+        handlers = self._build_handlers()
         while True:
-            event, values = self.window.read(timeout=200)
+            event, values = self.window.read()
             if event in (sg.WIN_CLOSED, "Exit"):
                 # cancel worker if running
                 if self.worker and self.worker.is_alive():
                     self.cancel_event.set()
                     self.worker.join(timeout=2)
+                if self.trash_worker and self.trash_worker.is_alive():
+                    self.trash_cancel.set()
+                    self.trash_worker.join(timeout=5)
+                self._stop_watcher()
+                self.tools.close()
+                self.browser.close()
                 break
-
-            if event == "-HELP-":
-                sg.popup("LocalMind\nSmart file cleanup. 100% offline.")
-
-            # Demo toggle for Scan
-            if event == CHK_DEMO:
-                self._enforce_demo_state()
-
-            # Scan browse handled by FolderBrowse
-
-            # Start Scan
-            if event == BTN_RUN:
-                scan_path = values.get(INPUT_SCAN_PATH, "").strip()
-                demo_mode = values.get(CHK_DEMO, False)
-                if demo_mode:
-                    scan_path = "./demo_data"
-                if not scan_path or not Path(scan_path).exists():
-                    sg.popup_error("Please select a folder or enable Demo mode.")
-                    continue
-                # Parse settings
-                try:
-                    size_mb = int(values.get(IN_SIZE_MB, self.settings["size_threshold_mb"]))
-                    age_days = int(values.get(IN_AGE_DAYS, self.settings["age_threshold_days"]))
-                except ValueError:
-                    sg.popup_error("Please enter valid numbers for thresholds.")
-                    continue
-                exclusions_text = values.get(ML_EXCLUSIONS, "") or ""
-                exclusions = [ln.strip() for ln in exclusions_text.splitlines() if ln.strip()]
-                write_txt = bool(values.get(CHK_WRITE_TXT, True))
-                write_html = bool(values.get(CHK_WRITE_HTML, True))
-
-                # Start worker
-                self.window[BTN_RUN].update(disabled=True)
-                self.window[BTN_STOP].update(disabled=False)
-                self.window[TXT_STATUS].update("Scanning")
-                self.window[ML_RESULTS].update("")
-                self.cancel_event.clear()
-                self.worker = threading.Thread(
-                    target=self._scan_worker,
-                    args=(scan_path, {"size_threshold_mb": size_mb, "age_threshold_days": age_days}, exclusions, write_txt, write_html),
-                    daemon=True,
-                )
-                self.worker.start()
-
-            # Stop Scan
-            if event == BTN_STOP:
-                self.cancel_event.set()
-                self.window[TXT_STATUS].update("Canceled")
-                self.window[BTN_RUN].update(disabled=False)
-                self.window[BTN_STOP].update(disabled=True)
-
-            # Open report
-            if event == BTN_OPEN_REPORT:
-                # open text report first
-                if self.latest_reports.get("txt") and Path(self.latest_reports["txt"]).exists():
-                    webbrowser.open(self.latest_reports["txt"])  # default editor
-                elif self.latest_reports.get("html") and Path(self.latest_reports["html"]).exists():
-                    webbrowser.open(self.latest_reports["html"])  # browser
-                else:
-                    sg.popup("No report available yet.")
-
-            # Save/Reload/Defaults settings
-            if event == BTN_SAVE_SETTINGS:
-                try:
-                    new_settings = {
-                        "size_threshold_mb": int(values.get(IN_SIZE_MB, self.settings["size_threshold_mb"])),
-                        "age_threshold_days": int(values.get(IN_AGE_DAYS, self.settings["age_threshold_days"])),
-                        "exclusions": [ln.strip() for ln in (values.get(ML_EXCLUSIONS, "") or "").splitlines() if ln.strip()],
-                        "write_text_report": bool(values.get(CHK_WRITE_TXT, True)),
-                        "write_html_report": bool(values.get(CHK_WRITE_HTML, True)),
-                    }
-                    save_settings(new_settings)
-                    self.settings = new_settings
-                    sg.popup("Settings saved.")
-                except ValueError:
-                    sg.popup_error("Please enter valid numbers for thresholds.")
-            if event == BTN_RELOAD_SETTINGS:
-                self.settings = load_settings()
-                # refresh fields
-                self.window[IN_SIZE_MB].update(str(self.settings["size_threshold_mb"]))
-                self.window[IN_AGE_DAYS].update(str(self.settings["age_threshold_days"]))
-                self.window[ML_EXCLUSIONS].update("\n".join(self.settings["exclusions"]))
-                self.window[CHK_WRITE_TXT].update(self.settings["write_text_report"]) 
-                self.window[CHK_WRITE_HTML].update(self.settings["write_html_report"]) 
-                sg.popup("Settings reloaded.")
-            if event == BTN_DEFAULTS:
-                if sg.popup_yes_no("Restore default settings?") == "Yes":
-                    save_settings(DEFAULTS)
-                    self.settings = dict(DEFAULTS)
-                    self.window[IN_SIZE_MB].update(str(self.settings["size_threshold_mb"]))
-                    self.window[IN_AGE_DAYS].update(str(self.settings["age_threshold_days"]))
-                    self.window[ML_EXCLUSIONS].update("\n".join(self.settings["exclusions"]))
-                    self.window[CHK_WRITE_TXT].update(self.settings["write_text_report"]) 
-                    self.window[CHK_WRITE_HTML].update(self.settings["write_html_report"]) 
-
-            # Logs / License
-            if event == BTN_OPEN_LOGS:
-                if LOG_FILE.exists():
-                    webbrowser.open(str(LOG_FILE.resolve()))
-                else:
-                    sg.popup("No logs yet.")
-            if event == BTN_VIEW_LICENSE:
-                sg.popup("License: Unlicensed (OK for testing)")
-
-            # Worker events for Scan
-            if event == EV_SCAN_PROGRESS:
-                self._append_line(values.get(EV_SCAN_PROGRESS, ""))
-            if event == EV_SCAN_DONE:
-                res = values.get(EV_SCAN_DONE, {})
-                self.window[BTN_RUN].update(disabled=False)
-                self.window[BTN_STOP].update(disabled=True)
-                self.window[TXT_STATUS].update("Scan complete")
-                total = res.get("total_files", 0)
-                large = res.get("large_count", 0)
-                old = res.get("old_count", 0)
-                dups = res.get("dup_groups", 0)
-                self.window[TXT_SUMMARY].update(f"Files scanned {total}. Large {large}. Old {old}. Duplicate groups {dups}.")
-                self.latest_reports["txt"] = res.get("report_txt_path")
-                self.latest_reports["html"] = res.get("report_html_path")
-                if self.latest_reports["txt"] or self.latest_reports["html"]:
-                    self.window[BTN_OPEN_REPORT].update(disabled=False)
-
-            if event == EV_SCAN_ERROR:
-                self.window[BTN_RUN].update(disabled=False)
-                self.window[BTN_STOP].update(disabled=True)
-                self.window[TXT_STATUS].update("Error")
-                sg.popup_error(f"Scan error: {values.get(EV_SCAN_ERROR)}")
-
-            # Chat: workspace selected
-            if event == WORKSPACE_PICK:
-                self.workspace_path = values.get(WORKSPACE_PICK) or None
-                self._load_workspace_files()
-
-            # Chat: new chat
-            if event == BTN_NEW_CHAT:
-                self.conversations.append({"id": len(self.conversations)+1, "title": "New chat", "messages": []})
-                self.active_conv_idx = len(self.conversations)-1
-                self.window[CHATS_LIST].update(values=[self._conv_label(i,c) for i,c in enumerate(self.conversations)], set_to_index=self.active_conv_idx)
-                self._render_chat()
-
-            # Chat: select conversation
-            if event == CHATS_LIST:
-                selected = values.get(CHATS_LIST)
-                if selected:
-                    idx = [self._conv_label(i,c) for i,c in enumerate(self.conversations)].index(selected[0])
-                    self.active_conv_idx = idx
-                    self._render_chat()
-
-            # Chat: send message
-            if event in (CHAT_SEND,):
-                text = (values.get(CHAT_INPUT) or "").strip()
-                if not text:
-                    continue
-                if self.active_conv_idx is None:
-                    sg.popup_error("Create a chat first (New chat)")
-                    continue
-                conv = self.conversations[self.active_conv_idx]
-                conv["messages"].append({"role": "user", "text": text, "citations": []})
-                self.window[CHAT_INPUT].update("")
-                self._append_chat(f"You: {text}")
-                # Simple routing: quick heuristic
-                self._chat_handle_user(text)
-
-            # Chat quick actions
-            if event in (TOOL_LARGEST, TOOL_DUPES, TOOL_CLEANUP, CHAT_QUICK):
-                if self.active_conv_idx is None:
-                    sg.popup_error("Create a chat first (New chat)")
-                    continue
-                if not self.workspace_path:
-                    sg.popup_error("Choose a workspace folder in Chat header")
-                    continue
-                if event == TOOL_LARGEST:
-                    self._run_largest()
-                elif event == TOOL_DUPES:
-                    self._run_dupes()
-                elif event == TOOL_CLEANUP:
-                    self._run_cleanup_plan()
-
-            # Inspector file actions
-            if event == FILE_OPEN:
-                self._inspector_open(values)
-            if event == FILE_REVEAL:
-                self._inspector_reveal(values)
-            if event == FILE_TRASH:
-                self._inspector_trash(values)
+            handler = handlers.get(event[:2] if isinstance(event, tuple) else event)
+            if handler is not None:
+                handler(event, values)
 
         self.window.close()
 
+    # Scan tab handlers
+    def _on_run_scan(self, event, values):
+        scan_path = values.get(INPUT_SCAN_PATH, "").strip()
+        demo_mode = values.get(CHK_DEMO, False)
+        if demo_mode:
+            scan_path = "./demo_data"
+        if not scan_path or not Path(scan_path).exists():
+            sg.popup_error("Please select a folder or enable Demo mode.")
+            return
+        # Parse settings
+        try:
+            size_mb = int(values.get(IN_SIZE_MB, self.settings["size_threshold_mb"]))
+            age_days = int(values.get(IN_AGE_DAYS, self.settings["age_threshold_days"]))
+        except ValueError:
+            sg.popup_error("Please enter valid numbers for thresholds.")
+            return
+        exclusions_text = values.get(ML_EXCLUSIONS, "") or ""
+        exclusions = [ln.strip() for ln in exclusions_text.splitlines() if ln.strip()]
+        write_txt = bool(values.get(CHK_WRITE_TXT, True))
+        write_html = bool(values.get(CHK_WRITE_HTML, True))
+
+        # Start worker
+        self.window[BTN_RUN].update(disabled=True)
+        self.window[BTN_STOP].update(disabled=False)
+        self.window[TXT_STATUS].update("Scanning")
+        self.findings_so_far = 0
+        self._show_results(None)
+        self._stop_watcher()
+        self.scan_root = str(Path(scan_path))
+        self.scan_params = {"size_threshold_mb": size_mb, "age_threshold_days": age_days,
+                            "exclusions": exclusions, "watch": bool(values.get(CHK_WATCH))}
+        self.cancel_event.clear()
+        self.worker = threading.Thread(
+            target=self._scan_worker,
+            args=(scan_path, {"size_threshold_mb": size_mb, "age_threshold_days": age_days}, exclusions, write_txt,
+                  write_html, self.settings["hash_algorithm"]),
+            daemon=True,
+        )
+        self.worker.start()
+
+    def _on_stop_scan(self, event, values):
+        self.cancel_event.set()
+        self.trash_cancel.set()
+        self.window[BTN_STOP].update(disabled=True)
+        if self.trash_worker is not None and self.trash_worker.is_alive():
+            # Bulk trash stops after its current batch; _on_trash_done restores the buttons
+            self.window[TXT_STATUS].update("Canceling after the current batch")
+            return
+        self.window[TXT_STATUS].update("Canceled")
+        self.window[BTN_RUN].update(disabled=False)
+
+    def _on_open_report(self, event, values):
+        # open text report first
+        if self.latest_reports.get("txt") and Path(self.latest_reports["txt"]).exists():
+            webbrowser.open(self.latest_reports["txt"])  # default editor
+        elif self.latest_reports.get("html") and Path(self.latest_reports["html"]).exists():
+            webbrowser.open(self.latest_reports["html"])  # browser
+        else:
+            sg.popup("No report available yet.")
+
+    def _on_scan_done(self, event, values):
+        res = values.get(EV_SCAN_DONE, {})
+        self.window[BTN_RUN].update(disabled=False)
+        self.window[BTN_STOP].update(disabled=True)
+        total = res.get("total_files", 0)
+        large = res.get("large_count", 0)
+        old = res.get("old_count", 0)
+        dups = res.get("dup_groups", 0)
+        self.window[TXT_STATUS].update(f"Scan complete. Files {total}. Large {large}. Old {old}. Duplicate groups {dups}.")
+        self._show_results(ResultsModel.from_scan(res))
+        self._set_scan_results(res)
+        if res.get("file_stats"):
+            self.workspace_inventory = (SizeIndex.from_stats(res["file_stats"], root=self.scan_root),
+                                        res.get("hardlinks") or {})
+            self.tools.invalidate(self.scan_root)
+        self.latest_reports["txt"] = res.get("report_txt_path")
+        self.latest_reports["html"] = res.get("report_html_path")
+        if self.latest_reports["txt"] or self.latest_reports["html"]:
+            self.window[BTN_OPEN_REPORT].update(disabled=False)
+        if self.scan_params.get("watch") and res.get("file_stats") is not None:
+            self._start_watcher(res)
+
+    # Live results: a watcher thread applies changes to a LiveInventory and posts snapshots
+    def _start_watcher(self, res: Dict[str, Any]):
+        exclusions = list(self.scan_params.get("exclusions") or [])
+        exclude = (lambda path: any(excl in path for excl in exclusions)) if exclusions else None
+        live = LiveInventory.from_scan(res, self.scan_root, self.scan_params["size_threshold_mb"],
+                                       self.scan_params["age_threshold_days"], exclude)
+
+        def on_changes(paths):
+            delta = live.apply(paths)
+            if delta is not None:
+                self.window.write_event_value(EV_FS_CHANGED, {"delta": delta, "results": live.results()})
+
+        try:
+            self.watcher = create_watcher(self.scan_root, on_changes, exclude).start()
+            _log(f"Watching {self.scan_root} ({self.watcher.name})")
+        except OSError as e:
+            _log(f"Cannot watch {self.scan_root}: {e}", logging.WARNING)
+
+    def _stop_watcher(self):
+        if self.watcher is not None:
+            self.watcher.stop()
+            self.watcher = None
+
+    def _on_fs_changed(self, event, values):
+        if self.watcher is None:
+            return  # a batch posted just before the watcher was stopped
+        update = values[EV_FS_CHANGED]
+        res, delta = update["results"], update["delta"]
+        self._replace_results(ResultsModel.from_scan(res))
+        self._set_scan_results(res)
+        if self.workspace_inventory is not None and self.workspace_inventory[0].root == self.scan_root:
+            index = self.workspace_inventory[0]
+            index.apply(delta["updated"], delta["removed"])
+            self.workspace_inventory = (index, res["hardlinks"])
+        self.tools.invalidate(self.scan_root)
+        self.window[TXT_STATUS].update(
+            f"Live: Files {res['total_files']}. Large {res['large_count']}. Old {res['old_count']}. "
+            f"Duplicate groups {res['dup_groups']}.")
+
+    # Bulk trash: plans run on a worker thread in batches; progress and the result come back as events
+    def _set_scan_results(self, res: Dict[str, Any] | None):
+        self.scan_results = res
+        busy = self.trash_worker is not None and self.trash_worker.is_alive()
+        self.window[BTN_TRASH_SELECTED].update(disabled=busy or not res)
+        self.window[BTN_TRASH_DUPES].update(disabled=busy or not (res and res.get("duplicates")))
+
+    def _on_trash_selected(self, event, values):
+        if self.results_model is None:
+            return
+        rows = self.results_model.page(self.table_offset, TABLE_ROWS)
+        paths = list(dict.fromkeys(rows[i].path for i in values.get(TBL_RESULTS) or [] if i < len(rows)))
+        if not paths:
+            sg.popup("Select one or more rows first.")
+            return
+        file_stats = self.scan_results.get("file_stats") or {}
+        total = sum(file_stats.get(p, (0, 0.0))[0] for p in paths)
+        self._start_trash(TrashPlan(f"Selected files ({len(paths):,})", paths, total))
+
+    def _on_trash_duplicates(self, event, values):
+        res = self.scan_results or {}
+        self._start_trash(duplicates_plan(res.get("duplicates") or [], res.get("file_stats") or {}))
+
+    def _start_trash(self, plan: TrashPlan, expected: Dict[str, Any] | None = None):
+        if not plan.paths:
+            sg.popup("Nothing to move to Trash.")
+            return
+        if self.trash_worker is not None and self.trash_worker.is_alive():
+            sg.popup("A trash operation is already running.")
+            return
+        if sg.popup_ok_cancel(f"{plan.description}\n\nMove {len(plan.paths):,} files "
+                              f"({plan.total_bytes / 1024 / 1024:,.1f} MB) to Trash?") != "OK":
+            return
+        if expected is None:
+            expected = dict((self.scan_results or {}).get("file_stats") or {})
+        self.trash_cancel.clear()
+        self.window[BTN_RUN].update(disabled=True)
+        self.window[BTN_STOP].update(disabled=False)
+        self.window[BTN_TRASH_SELECTED].update(disabled=True)
+        self.window[BTN_TRASH_DUPES].update(disabled=True)
+        self.window[TXT_STATUS].update(f"Moving {len(plan.paths):,} files to Trash")
+        self.trash_worker = threading.Thread(target=self._trash_worker,
+                                             args=(plan, expected, self.settings["hash_algorithm"]), daemon=True)
+        self.trash_worker.start()
+
+    def _trash_worker(self, plan: TrashPlan, expected: Dict[str, Any], hash_algorithm: str):
+        def progress(done, total, nbytes):
+            self.window.write_event_value(EV_TRASH_PROGRESS, (done, total, nbytes))
+
+        try:
+            result = self._journaled_trash(plan, hash_algorithm, self.trash_cancel, expected, progress)
+            self.window.write_event_value(EV_TRASH_DONE, result)
+        except Exception as e:
+            logger.exception("bulk trash failed")
+            self.window.write_event_value(EV_TRASH_DONE, str(e))
+
+    @staticmethod
+    def _journaled_trash(plan: TrashPlan, hash_algorithm: str, cancel_event=None, expected=None, progress=None):
+        """Run a plan through BulkTrasher, recording every batch in the undo journal.
+
+        Fingerprints use the configured hash_algorithm, like the scan; the journal records it
+        with the operation so undo checks trashed copies with the same algorithm.
+        """
+        algorithm = resolve_algorithm(hash_algorithm)
+        with TrashJournal(DEFAULT_JOURNAL_DB) as journal:
+            op_id = None
+
+            def on_batch(records):
+                nonlocal op_id
+                if op_id is None:
+                    op_id = journal.begin(records[0].operation_id, plan.description, algorithm)
+                journal.append(op_id, records)
+
+            trasher = BulkTrasher(fingerprint=lambda path: fingerprint(path, algorithm))
+            return trasher.run(plan.paths, cancel_event, expected, progress, on_batch)
+
+    def _on_trash_progress(self, event, values):
+        done, total, nbytes = values[EV_TRASH_PROGRESS]
+        self.window[TXT_STATUS].update(f"Trash {done:,}/{total:,} files · {nbytes / 1024 / 1024:,.1f} MB freed")
+
+    def _on_trash_done(self, event, values):
+        result = values[EV_TRASH_DONE]
+        self.trash_worker = None
+        self.window[BTN_RUN].update(disabled=False)
+        self.window[BTN_STOP].update(disabled=True)
+        if isinstance(result, str):
+            self.window[TXT_STATUS].update("Error")
+            self._set_scan_results(self.scan_results)
+            sg.popup_error(f"Trash error: {result}")
+            return
+        self._record_trash(result)
+        self.window[TXT_STATUS].update(result.summary())
+
+    def _record_trash(self, result):
+        if result.trashed and self.scan_results is not None:
+            self.pre_trash_results[result.operation_id] = self.scan_results
+        self.trash_history.append(result)
+        self._apply_removals(result.trashed_paths)
+        if result.trashed:
+            self._set_cleanup_plan(None)  # planned against files that are gone now
+            if self.workspace_inventory is not None and self.workspace_inventory[0].root != self.scan_root:
+                self.workspace_inventory[0].apply({}, result.trashed_paths)
+            self.tools.invalidate()  # trashed files may be in any workspace
+
+    # Undo: the journal restores the newest operation on a worker thread
+    def _on_undo_trash(self, event, values):
+        if self.trash_worker is not None and self.trash_worker.is_alive():
+            sg.popup("A trash operation is already running.")
+            return
+        self.window[BTN_UNDO_TRASH].update(disabled=True)
+        self.window[TXT_STATUS].update("Restoring files from Trash")
+        self.trash_worker = threading.Thread(target=self._undo_worker, daemon=True)
+        self.trash_worker.start()
+
+    def _undo_worker(self):
+        try:
+            with TrashJournal(DEFAULT_JOURNAL_DB) as journal:
+                op_id = journal.latest_undoable()
+                result = journal.undo(op_id) if op_id is not None else None
+            self.window.write_event_value(EV_UNDO_DONE, result)
+        except Exception as e:
+            logger.exception("undo failed")
+            self.window.write_event_value(EV_UNDO_DONE, str(e))
+
+    def _on_undo_done(self, event, values):
+        result = values[EV_UNDO_DONE]
+        self.trash_worker = None
+        self.window[BTN_UNDO_TRASH].update(disabled=False)
+        self._set_scan_results(self.scan_results)
+        if result is None:
+            self.window[TXT_STATUS].update("Nothing to undo.")
+            return
+        if isinstance(result, str):
+            self.window[TXT_STATUS].update("Error")
+            sg.popup_error(f"Undo error: {result}")
+            return
+        status = result.summary()
+        if result.restored:
+            before = self.pre_trash_results.pop(result.op_uuid, None)
+            latest = self.trash_history[-1].operation_id if self.trash_history else None
+            if self.watcher is not None:
+                pass  # the watcher picks the restored files up like any other change
+            elif before is not None and not result.failed and latest == result.op_uuid:
+                # Undoing the last operation completely: the results are what they were before it
+                self.trash_history.pop()
+                self._replace_results(ResultsModel.from_scan(before))
+                if self.workspace_inventory is not None and self.workspace_inventory[0].root == self.scan_root:
+                    self.workspace_inventory = (SizeIndex.from_stats(before["file_stats"], root=self.scan_root),
+                                                before.get("hardlinks") or {})
+                self._set_scan_results(before)
+            else:
+                status += " (run the scan again to list them)"
+            self.tools.invalidate()  # restored files may be in any workspace
+        self.window[TXT_STATUS].update(status)
+        if result.failed:
+            sg.popup("Some files could not be restored:\n" + "\n".join(
+                f"{path}: {reason}" for path, reason in list(result.failed.items())[:20]))
+
+    def _apply_removals(self, paths: List[str]):
+        """Drop removed files from the results, size index and chat cache without a rescan."""
+        if paths and self.scan_results is not None:
+            res = apply_to_results(self.scan_results, paths)
+            self._replace_results(ResultsModel.from_scan(res))
+            if self.workspace_inventory is not None and self.workspace_inventory[0].root == self.scan_root:
+                index = self.workspace_inventory[0]
+                index.apply({}, paths)
+                self.workspace_inventory = (index, res["hardlinks"])
+            self.tools.invalidate(self.scan_root)
+            self.scan_results = res
+        self._set_scan_results(self.scan_results)
+
+    def _on_scan_error(self, event, values):
+        self.window[BTN_RUN].update(disabled=False)
+        self.window[BTN_STOP].update(disabled=True)
+        self.window[TXT_STATUS].update("Error")
+        sg.popup_error(f"Scan error: {values.get(EV_SCAN_ERROR)}")
+
+    # Results table handlers: header click sorts, filter narrows as you type, slider/wheel scroll
+    def _on_table_click(self, event, values):
+        row, col = event[2]
+        if row == -1 and col is not None and 0 <= col < len(COLUMN_SORT_KEYS) and self.results_model:
+            self.results_model.sort(COLUMN_SORT_KEYS[col])
+            self.table_offset = 0
+            self._render_table()
+
+    def _on_filter(self, event, values):
+        self._apply_filter(values.get(IN_FILTER, ""), values.get(CMB_KIND, "All"))
+        self.table_offset = 0
+        self._render_table()
+
+    def _on_slider(self, event, values):
+        self.table_offset = int(values.get(SLD_RESULTS) or 0)
+        self._render_table()
+
+    # Settings / About handlers
+    def _refresh_settings_fields(self):
+        self.window[IN_SIZE_MB].update(str(self.settings["size_threshold_mb"]))
+        self.window[IN_AGE_DAYS].update(str(self.settings["age_threshold_days"]))
+        self.window[ML_EXCLUSIONS].update("\n".join(self.settings["exclusions"]))
+        self.window[CHK_WRITE_TXT].update(self.settings["write_text_report"])
+        self.window[CHK_WRITE_HTML].update(self.settings["write_html_report"])
+
+    def _on_save_settings(self, event, values):
+        try:
+            new_settings = {
+                "size_threshold_mb": int(values.get(IN_SIZE_MB, self.settings["size_threshold_mb"])),
+                "age_threshold_days": int(values.get(IN_AGE_DAYS, self.settings["age_threshold_days"])),
+                "exclusions": [ln.strip() for ln in (values.get(ML_EXCLUSIONS, "") or "").splitlines() if ln.strip()],
+                "write_text_report": bool(values.get(CHK_WRITE_TXT, True)),
+                "write_html_report": bool(values.get(CHK_WRITE_HTML, True)),
+                "hash_algorithm": self.settings["hash_algorithm"],
+            }
+            save_settings(new_settings)
+            self.settings = new_settings
+            sg.popup("Settings saved.")
+        except ValueError:
+            sg.popup_error("Please enter valid numbers for thresholds.")
+
+    def _on_reload_settings(self, event, values):
+        self.settings = load_settings()
+        self._refresh_settings_fields()
+        sg.popup("Settings reloaded.")
+
+    def _on_defaults(self, event, values):
+        if sg.popup_yes_no("Restore default settings?") == "Yes":
+            save_settings(DEFAULTS)
+            self.settings = dict(DEFAULTS)
+            self._refresh_settings_fields()
+
+    def _on_open_logs(self, event, values):
+        flush_logs()
+        if LOG_FILE.exists():
+            webbrowser.open(str(LOG_FILE.resolve()))
+        else:
+            sg.popup("No logs yet.")
+
+    # Chat handlers
+    def _on_workspace_pick(self, event, values):
+        self.workspace_path = values.get(WORKSPACE_PICK) or None
+        self._load_workspace_files()
+
+    def _on_new_chat(self, event, values):
+        self.conversations.append({"id": len(self.conversations)+1, "title": "New chat", "messages": []})
+        self.active_conv_idx = len(self.conversations)-1
+        self.window[CHATS_LIST].update(values=[self._conv_label(i,c) for i,c in enumerate(self.conversations)], set_to_index=self.active_conv_idx)
+        self._render_chat()
+
+    def _on_select_chat(self, event, values):
+        selected = values.get(CHATS_LIST)
+        if selected:
+            idx = [self._conv_label(i,c) for i,c in enumerate(self.conversations)].index(selected[0])
+            self.active_conv_idx = idx
+            self._render_chat()
+
+    def _on_chat_send(self, event, values):
+        text = (values.get(CHAT_INPUT) or "").strip()
+        if not text:
+            return
+        if self.active_conv_idx is None:
+            sg.popup_error("Create a chat first (New chat)")
+            return
+        conv = self.conversations[self.active_conv_idx]
+        conv["messages"].append({"role": "user", "text": text, "citations": []})
+        self.window[CHAT_INPUT].update("")
+        self._append_chat(f"You: {text}")
+        # Simple routing: quick heuristic
+        self._chat_handle_user(text)
+
+    def _on_chat_tool(self, event, values):
+        if self.active_conv_idx is None:
+            sg.popup_error("Create a chat first (New chat)")
+            return
+        if not self.workspace_path:
+            sg.popup_error("Choose a workspace folder in Chat header")
+            return
+        if event == TOOL_LARGEST:
+            self._run_largest()
+        elif event == TOOL_DUPES:
+            self._run_dupes()
+        elif event == TOOL_CLEANUP:
+            self._run_cleanup_plan()
+
+    def _on_chat_stop(self, event, values):
+        if self.tools.cancel():
+            self.window[INDEX_STATUS].update("Index: Canceling")
+
+    # Workspace browser handlers: next page on selecting "Load more" or scrolling to the end,
+    # double-click enters a folder
+    def _on_files_select(self, event, values):
+        if self._selected_row() == "more":
+            self._load_more_files()
+
+    def _on_files_wheel(self, event, values):
+        if self.browser_rows and self.browser_rows[-1] == "more":
+            if self.window[FILES_LIST].Widget.yview()[1] >= 1.0:
+                self._load_more_files()
+
+    def _on_files_double(self, event, values):
+        row = self._selected_row()
+        if row == "..":
+            self._show_directory(str(Path(self.browse_dir).parent))
+        elif isinstance(row, BrowserEntry) and row.is_dir:
+            self._show_directory(row.path)
+
     # Chat helpers
     def _conv_label(self, idx: int, conv: dict) -> str:
         title = conv.get("title") or f"Chat {idx+1}"
@@ -539,19 +975,59 @@ class LocalMindWindow:
         self.window[CHAT_THREAD].print(line)
 
     def _load_workspace_files(self):
+        self._show_directory(self.workspace_path)
+
+    @staticmethod
+    def _browser_label(row) -> str:
+        if row == "..":
+            return ".."
+        if row == "more":
+            return "Load more…"
+        if row.is_dir:
+            return f"{row.name}/"
+        return f"{row.name}  ({row.size/1024/1024:.1f} MB)"
+
+    def _show_directory(self, path: str | None):
+        """List the first page of a folder in the workspace browser."""
+        self.browse_dir = path
+        self.browser_rows = []
+        if path:
+            if self.workspace_path and os.path.abspath(path) != os.path.abspath(self.workspace_path):
+                self.browser_rows.append("..")
+            try:
+                entries, more = self.browser.page(path)
+            except OSError as e:
+                _log(f"Cannot list {path}: {e}", logging.WARNING)
+                entries, more = [], False
+            self.browser_rows.extend(entries)
+            if more:
+                self.browser_rows.append("more")
+        self.window[FILES_LIST].update([self._browser_label(row) for row in self.browser_rows])
+
+    def _load_more_files(self):
+        """Append the next page of the current folder, keeping the scroll position."""
+        loaded = sum(1 for row in self.browser_rows if isinstance(row, BrowserEntry))
+        first_visible = len(self.browser_rows) - 1  # the "Load more" row
         try:
-            base = Path(self.workspace_path) if self.workspace_path else None
-            items = []
-            if base and base.exists():
-                for p in list(base.glob("*"))[:200]:
-                    try:
-                        size = p.stat().st_size
-                        items.append(f"{p.name}  ({size/1024/1024:.1f} MB)")
-                    except Exception:
-                        continue
-            self.window[FILES_LIST].update(items)
-        except Exception:
-            self.window[FILES_LIST].update([])
+            entries, more = self.browser.page(self.browse_dir, loaded)
+        except OSError as e:
+            _log(f"Cannot list {self.browse_dir}: {e}", logging.WARNING)
+            entries, more = [], False
+        self.browser_rows = [row for row in self.browser_rows if row != "more"] + list(entries)
+        if more:
+            self.browser_rows.append("more")
+        self.window[FILES_LIST].update([self._browser_label(row) for row in self.browser_rows],
+                                       scroll_to_index=max(first_visible - 1, 0))
+
+    def _selected_row(self):
+        indexes = self.window[FILES_LIST].get_indexes()
+        if not indexes or indexes[0] >= len(self.browser_rows):
+            return None
+        return self.browser_rows[indexes[0]]
+
+    def _selected_path(self) -> str | None:
+        row = self._selected_row()
+        return row.path if isinstance(row, BrowserEntry) else None
 
     def _chat_handle_user(self, text: str):
         t = text.lower()
@@ -559,87 +1035,199 @@ class LocalMindWindow:
             self._run_largest()
         elif "duplicate" in t:
             self._run_dupes()
+        elif "cleanup" in t or "clean up" in t or "plan" in t:
+            self._run_cleanup_plan()
         else:
             self._assistant_reply("I can help with largest files, duplicates, or a cleanup plan. Use Quick menu or ask directly.")
 
-    def _assistant_reply(self, text: str, citations: list[str] | None = None):
-        if self.active_conv_idx is None:
+    def _assistant_reply(self, text: str, citations: list[str] | None = None, conv_idx: int | None = None):
+        """Add an assistant message to a conversation (the active one by default)."""
+        if conv_idx is None:
+            conv_idx = self.active_conv_idx
+        if conv_idx is None or conv_idx >= len(self.conversations):
             return
-        conv = self.conversations[self.active_conv_idx]
+        conv = self.conversations[conv_idx]
         conv["messages"].append({"role": "assistant", "text": text, "citations": citations or []})
+        if conv_idx != self.active_conv_idx:
+            return
         self._append_chat(f"Assistant: {text}")
         if citations:
             chips = " ".join([f"[{Path(c).name}]" for c in citations[:5]])
             self._append_chat(f"Citations: {chips}")
 
+    # Chat tools (run on self.tools' worker thread; never touch the window from there)
+    def _submit_tool(self, tool: str, params: tuple, fn):
+        state = self.tools.submit(self.workspace_path, tool, params, fn, context=self.active_conv_idx)
+        if state != "cached":
+            self.window[INDEX_STATUS].update(f"Index: Working ({tool})")
+            self.window[CHAT_STOP].update(disabled=False)
+        if state == "joined":
+            self._append_chat("Assistant: Already working on that, the answer will follow.")
+
+    def _tool_partial(self, payload: Dict[str, Any]):
+        if payload["context"] != self.active_conv_idx:
+            return
+        if payload["tool"] == "dupes":
+            for group, size in payload["partial"]:
+                self._append_chat(f"  … duplicate group: {len(group)} files, {size/1024/1024:.1f} MB each")
+
+    def _tool_finished(self, event: str, payload: Dict[str, Any]):
+        if not self.tools.busy():
+            self.window[INDEX_STATUS].update("Index: Idle")
+            self.window[CHAT_STOP].update(disabled=True)
+        conv_idx = payload["context"]
+        if event == EV_TOOL_CANCELED:
+            self._assistant_reply("Canceled.", conv_idx=conv_idx)
+        elif event == EV_TOOL_ERROR:
+            self._assistant_reply(f"Error: {payload['error']}", conv_idx=conv_idx)
+        else:
+            # Tools answer (result, inventory they had to build or None)
+            result, built = payload["result"]
+            if built is not None:
+                self._adopt_inventory(built)
+            if payload["tool"] == "largest":
+                self._reply_largest(result, conv_idx)
+            elif payload["tool"] == "dupes":
+                self._reply_dupes(result, conv_idx)
+            elif payload["tool"] == "cleanup":
+                self._reply_cleanup_plan(result, conv_idx)
+
+    @staticmethod
+    def _workspace_snapshot(workspace: str, snapshot: tuple[SizeIndex, dict] | None
+                            ) -> tuple[tuple[SizeIndex, dict], tuple[SizeIndex, dict] | None]:
+        """Inventory covering the workspace and, if it had to be built, the new one (worker thread).
+
+        snapshot is self.workspace_inventory as read on the UI thread when the tool was
+        submitted; a walk happens only if it does not cover the workspace. The UI thread
+        adopts a built inventory when the tool finishes (_adopt_inventory). The UI thread keeps
+        updating the SizeIndex in place meanwhile; its queries lock, so reading it here is safe.
+        """
+        if snapshot is not None and snapshot[0].covers(workspace):
+            return snapshot, None
+        from cleanslate_core import build_inventory, _resolve_exclusions
+        file_ids: Dict[str, Any] = {}
+        _, file_stats = build_inventory([workspace], _resolve_exclusions(None), file_ids=file_ids)
+        _, links = collapse_hardlinks(file_stats, file_ids)
+        built = (SizeIndex.from_stats(file_stats, root=workspace), links)
+        return built, built
+
+    def _adopt_inventory(self, built: tuple[SizeIndex, dict]):
+        """Keep an inventory a chat tool walked, unless one covering it arrived meanwhile."""
+        current = self.workspace_inventory
+        if current is None or not current[0].covers(built[0].root):
+            self.workspace_inventory = built
+
     def _run_largest(self):
+        size_mb = 100
         try:
-            from cleanslate_core import find_large_files
-            size_mb = 100
-            try:
-                size_mb = int(self.window["-ACT_MINMB-"].get())
-            except Exception:
-                pass
-            paths = [self.workspace_path]
-            files = find_large_files(paths, size_mb)
-            # Sort by size desc
-            files = sorted(files, key=lambda p: Path(p).stat().st_size if Path(p).exists() else 0, reverse=True)
-            topn = 20
-            try:
-                topn = int(self.window["-ACT_COUNT-"].get())
-            except Exception:
-                pass
-            rows = []
-            for p in files[:topn]:
-                try:
-                    st = Path(p).stat()
-                    rows.append((Path(p).name, f"{st.st_size/1024/1024:.1f} MB", datetime.fromtimestamp(st.st_mtime).strftime('%Y-%m-%d'), p))
-                except Exception:
-                    continue
-            if not rows:
-                self._assistant_reply("No files matched the criteria.")
-                return
-            # Render simple table
-            table_lines = ["Name | Size | Modified | Path", "-----|------|----------|-----"]
-            for r in rows:
-                table_lines.append(f"{r[0]} | {r[1]} | {r[2]} | {r[3]}")
-            self._assistant_reply("\n".join(table_lines), citations=[r[3] for r in rows])
-        except Exception as e:
-            self._assistant_reply(f"Error: {e}")
+            size_mb = int(self.window["-ACT_MINMB-"].get())
+        except Exception:
+            pass
+        topn = 20
+        try:
+            topn = int(self.window["-ACT_COUNT-"].get())
+        except Exception:
+            pass
+        workspace, inventory = self.workspace_path, self.workspace_inventory
+
+        def task(cancel_event, partial):
+            (index, _), built = self._workspace_snapshot(workspace, inventory)
+            return index.top(topn, min_bytes=size_mb * 1024 * 1024 + 1, under=workspace), built
+
+        self._submit_tool("largest", (topn, size_mb), task)
+
+    def _reply_largest(self, files: list, conv_idx: int | None):
+        if not files:
+            self._assistant_reply("No files matched the criteria.", conv_idx=conv_idx)
+            return
+        # Render simple table
+        table_lines = ["Name | Size | Modified | Path", "-----|------|----------|-----"]
+        for p, size, mtime in files:
+            table_lines.append(f"{Path(p).name} | {size/1024/1024:.1f} MB | {datetime.fromtimestamp(mtime).strftime('%Y-%m-%d')} | {p}")
+        self._assistant_reply("\n".join(table_lines), citations=[p for p, _, _ in files], conv_idx=conv_idx)
 
     def _run_dupes(self):
-        try:
-            from cleanslate_core import find_duplicates
-            paths = [self.workspace_path]
-            groups = find_duplicates(paths)
-            if not groups:
-                self._assistant_reply("No duplicate groups found.")
-                return
-            lines = ["Duplicate groups:"]
-            citations = []
-            for i, grp in enumerate(groups[:10], 1):
-                sizestr = "?"
-                try:
-                    sizestr = f"{Path(grp[0]).stat().st_size/1024/1024:.1f} MB"
-                except Exception:
-                    pass
-                lines.append(f"Group {i} ({len(grp)} files, {sizestr})")
-                for p in grp[:5]:
-                    lines.append(f"  - {p}")
-                citations.extend(grp)
-            self._assistant_reply("\n".join(lines), citations=citations[:20])
-        except Exception as e:
-            self._assistant_reply(f"Error: {e}")
+        workspace, inventory = self.workspace_path, self.workspace_inventory
+
+        def task(cancel_event, partial):
+            from cleanslate_core import detect_duplicates
+            (index, links), built = self._workspace_snapshot(workspace, inventory)
+            aliases = {link for others in links.values() for link in others}
+            file_stats = {p: (size, mtime) for p, size, mtime in index.iter_largest(under=workspace)
+                          if p not in aliases}
+            groups = detect_duplicates(file_stats, cancel_event=cancel_event,
+                                       on_group=lambda group: partial((group, file_stats[group[0]][0])))
+            return [(group, file_stats[group[0]][0]) for group in groups], built
+
+        self._submit_tool("dupes", (), task)
+
+    def _reply_dupes(self, groups: list, conv_idx: int | None):
+        if not groups:
+            self._assistant_reply("No duplicate groups found.", conv_idx=conv_idx)
+            return
+        lines = ["Duplicate groups:"]
+        citations = []
+        for i, (grp, size) in enumerate(groups[:10], 1):
+            lines.append(f"Group {i} ({len(grp)} files, {size/1024/1024:.1f} MB)")
+            for p in grp[:5]:
+                lines.append(f"  - {p}")
+            citations.extend(grp)
+        self._assistant_reply("\n".join(lines), citations=citations[:20], conv_idx=conv_idx)
 
     def _run_cleanup_plan(self):
-        self._assistant_reply("Cleanup plan: coming soon.")
+        keep = self.window["-ACT_KEEP-"].get() or "newest"
+        keep_in = [folder for folder in [self.window["-ACT_KEEP_IN-"].get().strip()] if folder]
+        size_mb, age_days = self.settings["size_threshold_mb"], self.settings["age_threshold_days"]
+        workspace, inventory = self.workspace_path, self.workspace_inventory
+        # The Scan tab's findings are used when that scan covers the workspace
+        res, root = self.scan_results, self.scan_root
+        if not (res and root and res.get("file_stats") is not None and is_within(workspace, root)):
+            res, root = None, workspace
+
+        def task(cancel_event, partial):
+            results, built = res, None
+            if results is None:
+                from cleanslate_core import detect_duplicates
+                (index, links), built = self._workspace_snapshot(workspace, inventory)
+                file_stats = {p: (size, mtime) for p, size, mtime in index.iter_largest(under=workspace)}
+                aliases = {link for others in links.values() for link in others}
+                duplicates = detect_duplicates({p: st for p, st in file_stats.items() if p not in aliases},
+                                               cancel_event=cancel_event)
+                results = {"file_stats": file_stats, "hardlinks": links, "duplicates": duplicates,
+                           **stat_findings(file_stats, size_mb, age_days)}
+            return plan_cleanup(results, keep=keep, keep_in=keep_in, root=root, under=workspace), built
+
+        self._submit_tool("cleanup", (keep, tuple(keep_in), size_mb, age_days, res is not None), task)
+
+    def _set_cleanup_plan(self, plan: CleanupPlan | None):
+        self.cleanup_plan = plan
+        self.window[TOOL_TRASH_PLAN].update(disabled=not plan)
+
+    def _reply_cleanup_plan(self, plan: CleanupPlan, conv_idx: int | None):
+        self._set_cleanup_plan(plan)
+        if not plan:
+            self._assistant_reply("Nothing to clean up with these settings.", conv_idx=conv_idx)
+            return
+        lines = [plan.summary(), "Size | Why | Path", "-----|-----|-----"]
+        top = plan.top(15)
+        for entry in top:
+            why = ", ".join(entry.reasons)
+            if entry.kept_copy:
+                why += f" (keeping {Path(entry.kept_copy).name})"
+            lines.append(f"{entry.size/1024/1024:.1f} MB | {why} | {entry.path}")
+        if len(plan) > len(top):
+            lines.append(f"… and {len(plan) - len(top):,} more. Use \"Trash plan\" in Actions to move them all to Trash.")
+        self._assistant_reply("\n".join(lines), citations=[entry.path for entry in top], conv_idx=conv_idx)
+
+    def _on_trash_plan(self, event, values):
+        plan = self.cleanup_plan
+        if plan:
+            self._start_trash(plan.trash_plan(), expected=plan.expected())
 
     def _inspector_open(self, values: Dict[str, Any]):
-        sel = values.get(FILES_LIST)
-        if not sel or not self.workspace_path:
+        path = self._selected_path()
+        if not path:
             return
-        name = sel[0].split("  (",1)[0]
-        path = str(Path(self.workspace_path) / name)
         try:
             if sys.platform == 'darwin':
                 os.system(f"open '{path}'")
@@ -651,11 +1239,9 @@ class LocalMindWindow:
             pass
 
     def _inspector_reveal(self, values: Dict[str, Any]):
-        sel = values.get(FILES_LIST)
-        if not sel or not self.workspace_path:
+        path = self._selected_path()
+        if not path:
             return
-        name = sel[0].split("  (",1)[0]
-        path = str(Path(self.workspace_path) / name)
         try:
             if sys.platform == 'darwin':
                 os.system(f"open -R '{path}'")
@@ -663,22 +1249,21 @@ class LocalMindWindow:
             pass
 
     def _inspector_trash(self, values: Dict[str, Any]):
-        try:
-            from send2trash import send2trash
-        except Exception:
-            return
-        sel = values.get(FILES_LIST)
-        if not sel or not self.workspace_path:
+        path = self._selected_path()
+        if not path:
             return
-        name = sel[0].split("  (",1)[0]
-        path = str(Path(self.workspace_path) / name)
         if sg.popup_ok_cancel(f"Move to Trash?\n{path}") == "OK":
             try:
-                send2trash(path)
-                sg.popup("Moved to Trash. Undo not implemented in MVP.")
-                self._load_workspace_files()
+                result = self._journaled_trash(TrashPlan(f"Inspector: {os.path.basename(path)}", [path], 0),
+                                               self.settings["hash_algorithm"])
             except Exception as e:
                 sg.popup_error(f"Failed to trash: {e}")
+                return
+            if result.failed:
+                sg.popup_error(f"Failed to trash: {result.failed[path]}")
+                return
+            self._record_trash(result)
+            self._show_directory(self.browse_dir)
 
 
 def main():
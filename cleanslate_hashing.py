@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+LocalMind Hashing - File content hashing shared by every scanner
+Small files are hashed with buffered readinto() into one reusable buffer (no per-chunk
+bytes objects). Files at or above MMAP_MIN_BYTES are memory-mapped and fed to hashlib as
+memoryview slices: no copy into user space, and the kernel's readahead sees one
+sequential mapping. benchmarks/bench_hashing.py measures where mmap starts to win on a
+given machine.
+
+Content identity uses one configurable algorithm per run (config "hash_algorithm"):
+    auto      xxh3_128 if the xxhash package is installed, else blake3 if installed,
+              else blake2b (default)
+    blake2b   128-bit BLAKE2b from hashlib: always available, at least as fast as MD5
+              (on CPUs with SHA extensions sha256 is faster still; run bench_hashing.py)
+    xxh3_128, xxh64   need the xxhash package
+    blake3            needs the blake3 package
+    md5, sha1, sha256, ... any other hashlib name
+Digests of different algorithms are not interchangeable, so caches record the algorithm
+next to the digest.
+
+Environment:
+    LOCALMIND_HASH_MMAP   "0" disables mmap (e.g. for flaky network mounts, where a file
+                          truncated while mapped would crash the process); a number sets
+                          the mmap threshold in bytes
+"""
+
+import hashlib
+import importlib
+import mmap
+import os
+from typing import Any, Callable, Dict, List, Optional
+
+from cleanslate_metrics import ScanMetrics
+
+# Files at least this big are hashed through mmap (see benchmarks/bench_hashing.py)
+DEFAULT_MMAP_MIN_BYTES = 4 * 1024 * 1024
+
+# Buffered reads: chunk size of the reusable read buffer
+READ_CHUNK_BYTES = 1024 * 1024
+
+# mmap: slice size handed to hashlib per update() (hashlib drops the GIL per call)
+MMAP_SLICE_BYTES = 8 * 1024 * 1024
+
+
+DEFAULT_HASH_ALGORITHM = "auto"
+
+
+def _optional_hasher(module_name: str, attr: str) -> Optional[Callable[[], Any]]:
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError:
+        return None
+    return getattr(module, attr, None)
+
+
+# Fast non-hashlib algorithms, present only when their package is installed
+_EXTRA_HASHERS: Dict[str, Callable[[], Any]] = {
+    name: factory for name, factory in (
+        ("xxh3_128", _optional_hasher("xxhash", "xxh3_128")),
+        ("xxh64", _optional_hasher("xxhash", "xxh64")),
+        ("blake3", _optional_hasher("blake3", "blake3")),
+    ) if factory is not None
+}
+
+# "auto" resolves to the first available of these
+_AUTO_PREFERENCE = ("xxh3_128", "blake3", "blake2b")
+
+
+def available_algorithms() -> List[str]:
+    """Algorithm names hash_algorithm can take on this machine (besides 'auto')."""
+    names = {name for name in hashlib.algorithms_available if not name.startswith("shake_")}
+    return sorted(names | set(_EXTRA_HASHERS) | {"blake2b"})
+
+
+def resolve_algorithm(name: Optional[str] = None) -> str:
+    """Concrete algorithm for a config value ('auto'/None pick the fastest available).
+
+    Raises ValueError for names that are neither installed nor known to hashlib.
+    """
+    name = (name or DEFAULT_HASH_ALGORITHM).strip().lower()
+    if name == "auto":
+        return next(algo for algo in _AUTO_PREFERENCE if algo == "blake2b" or algo in _EXTRA_HASHERS)
+    if name in _EXTRA_HASHERS or name == "blake2b":
+        return name
+    try:
+        hashlib.new(name).hexdigest()  # variable-length (shake_*) digests need a length
+    except (ValueError, TypeError):
+        raise ValueError(f"unknown hash algorithm {name!r} (available: {', '.join(available_algorithms())})")
+    return name
+
+
+def new_hasher(algorithm: str) -> Any:
+    """A fresh hash object with update()/hexdigest() for a resolved algorithm name."""
+    if algorithm == "blake2b":
+        return hashlib.blake2b(digest_size=16)
+    factory = _EXTRA_HASHERS.get(algorithm)
+    if factory is not None:
+        return factory()
+    return hashlib.new(algorithm)
+
+
+def _mmap_threshold_from_env() -> Optional[int]:
+    value = os.environ.get("LOCALMIND_HASH_MMAP", "").strip()
+    if not value:
+        return DEFAULT_MMAP_MIN_BYTES
+    if value.lower() in ("0", "off", "false", "no"):
+        return None
+    try:
+        return max(1, int(value))
+    except ValueError:
+        return DEFAULT_MMAP_MIN_BYTES
+
+
+# None disables the mmap path
+MMAP_MIN_BYTES: Optional[int] = _mmap_threshold_from_env()
+
+
+def set_mmap_threshold(min_bytes: Optional[int]) -> None:
+    """Use mmap for files of at least min_bytes; None turns the mmap path off."""
+    global MMAP_MIN_BYTES
+    MMAP_MIN_BYTES = min_bytes
+
+
+def _update_buffered(h, f, limit: Optional[int], expected: int) -> int:
+    """Feed f into h (up to `limit` bytes, else to EOF) via one reusable buffer; returns bytes read.
+
+    The buffer is sized to the expected length so small files do not pay for a 1 MB allocation.
+    """
+    buf = bytearray(max(4096, min(READ_CHUNK_BYTES, expected)))
+    view = memoryview(buf)
+    total = 0
+    try:
+        while limit is None or total < limit:
+            want = len(buf) if limit is None else min(len(buf), limit - total)
+            n = f.readinto(view[:want])
+            if not n:
+                break
+            h.update(view[:n])
+            total += n
+    finally:
+        view.release()
+    return total
+
+
+def _update_mmap(h, f, length: int) -> int:
+    """Feed the first `length` bytes of f into h from a read-only mapping; returns bytes hashed."""
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if hasattr(mm, "madvise") and hasattr(mmap, "MADV_SEQUENTIAL"):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        length = min(length, len(mm))
+        view = memoryview(mm)
+        try:
+            for offset in range(0, length, MMAP_SLICE_BYTES):
+                h.update(view[offset:min(offset + MMAP_SLICE_BYTES, length)])
+        finally:
+            view.release()
+    return length
+
+
+def hash_file(file_path: str, algorithm: str = "blake2b", limit: Optional[int] = None,
+              metrics: Optional[ScanMetrics] = None, use_mmap: Optional[bool] = None) -> Optional[str]:
+    """Hex digest of a file's content (or its first `limit` bytes); None if unreadable.
+
+    algorithm must be resolved already (see resolve_algorithm); 'auto' is not accepted here.
+
+    use_mmap: None picks mmap for lengths >= MMAP_MIN_BYTES, True/False force a path.
+    Falls back to buffered reads when the file cannot be mapped (pipes, some network
+    filesystems, empty files).
+    """
+    h = new_hasher(algorithm)
+    try:
+        with open(file_path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            length = size if limit is None else min(size, limit)
+            if use_mmap is None:
+                use_mmap = MMAP_MIN_BYTES is not None and length >= MMAP_MIN_BYTES
+            hashed = None
+            if use_mmap and length > 0:
+                try:
+                    hashed = _update_mmap(h, f, length)
+                except (ValueError, OSError):
+                    h = new_hasher(algorithm)
+                    f.seek(0)
+            if hashed is None:
+                hashed = _update_buffered(h, f, limit, length)
+    except (OSError, PermissionError):
+        if metrics is not None:
+            metrics.incr("errors_skipped")
+        return None
+    if metrics is not None:
+        metrics.incr("bytes_read", hashed)
+    return h.hexdigest()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+LocalMind Index - Size-ordered index over a scan inventory for instant "largest files" queries
+The chat tools used to answer "largest files" by walking the workspace, re-reading
+config.json and stat-ing every match twice. A SizeIndex is built once from the (size, mtime)
+inventory of the last scan and answers top-N queries without touching the filesystem:
+
+    index = SizeIndex.from_stats(results["file_stats"], root=scan_path)
+    for path, size, mtime in index.top(20, min_bytes=100 * 1024 * 1024):
+        ...
+
+Entries are kept sorted by size, so a top-N query walks from the large end and stops after
+N matches (or at the first file below min_bytes). Files can be added and removed in place
+as the tree changes (apply() takes a watcher batch), without rebuilding or copying.
+Queries copy their matches out under a lock, so chat tools on worker threads can read an
+index while the UI thread updates it.
+"""
+
+import os
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# path -> (size, mtime), as captured by the scan
+FileStats = Dict[str, Tuple[int, float]]
+
+# (path, size, mtime)
+SizeEntry = Tuple[str, int, float]
+
+
+class SizeIndex:
+    """Files of one inventory ordered by size; answers largest-first queries in O(N + skipped)."""
+
+    def __init__(self, file_stats: FileStats, root: Optional[str] = None):
+        self.file_stats: FileStats = dict(file_stats)
+        self.root = root
+        # Ascending (size, path); the largest files are at the end
+        self._entries: List[Tuple[int, str]] = sorted((size, path) for path, (size, _) in self.file_stats.items())
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_stats(cls, file_stats: FileStats, root: Optional[str] = None) -> "SizeIndex":
+        return cls(file_stats, root)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def covers(self, folder: str) -> bool:
+        """True if the index root is folder or one of its parents."""
+        if self.root is None:
+            return False
+        root, folder = os.path.abspath(self.root), os.path.abspath(folder)
+        return folder == root or folder.startswith(root.rstrip(os.sep) + os.sep)
+
+    def _prefix(self, folder: Optional[str]) -> Optional[str]:
+        """Path prefix (in the index's own spelling) of the files under folder; None = all."""
+        if folder is None or self.root is None:
+            return None
+        relative = os.path.relpath(os.path.abspath(folder), os.path.abspath(self.root))
+        if relative == os.curdir:
+            return None
+        return os.path.join(self.root, relative) + os.sep
+
+    def top(self, count: int, min_bytes: int = 0, under: Optional[str] = None) -> List[SizeEntry]:
+        """The `count` largest files of at least min_bytes (optionally only those under a folder)."""
+        return self._largest(min_bytes, under, count)
+
+    def iter_largest(self, min_bytes: int = 0, under: Optional[str] = None,
+                     limit: Optional[int] = None) -> Iterator[SizeEntry]:
+        """Files largest first, stopping at the first one below min_bytes or after `limit`."""
+        return iter(self._largest(min_bytes, under, limit))
+
+    def _largest(self, min_bytes: int, under: Optional[str], limit: Optional[int]) -> List[SizeEntry]:
+        prefix = self._prefix(under)
+        found: List[SizeEntry] = []
+        with self._lock:
+            stats = self.file_stats
+            for size, path in reversed(self._entries):
+                if limit is not None and len(found) >= limit:
+                    break
+                if size < min_bytes:
+                    break
+                if prefix is not None and not path.startswith(prefix):
+                    continue
+                found.append((path, size, stats[path][1]))
+        return found
+
+    def apply(self, changed: FileStats, removed: Iterable[str] = ()) -> None:
+        """Add or update the changed files and drop the removed ones, in place."""
+        with self._lock:
+            for path in removed:
+                self.remove(path)
+            for path, (size, mtime) in changed.items():
+                self.add(path, size, mtime)
+
+    def add(self, path: str, size: int, mtime: float) -> None:
+        """Insert or update one file."""
+        with self._lock:
+            if path in self.file_stats:
+                self.remove(path)
+            self.file_stats[path] = (size, mtime)
+            insort(self._entries, (size, path))
+
+    def remove(self, path: str) -> None:
+        """Drop one file; unknown paths are ignored."""
+        with self._lock:
+            entry = self.file_stats.pop(path, None)
+            if entry is None:
+                return
+            i = bisect_left(self._entries, (entry[0], path))
+            if i < len(self._entries) and self._entries[i] == (entry[0], path):
+                del self._entries[i]
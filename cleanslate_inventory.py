@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+LocalMind Inventory - The shared per-scan file inventory and feature cache
+A scan walks and stats the tree once; every detector (built-in or plugin) then works on
+that inventory. Expensive per-file features (hashes, image features, text statistics)
+are computed lazily on first request and cached for the rest of the scan, so two
+detectors needing the same feature cost one read, not two.
+
+Features:
+    partial_hash   digest of the first PARTIAL_HASH_BYTES     (partial read)
+    content_hash   digest of the whole file                   (full read)
+    text_stats     {"lines", "words", "chars"} for text files  (full read)
+    image          {"width", "height", "mode", "phash"}        (image decode)
+A feature is None when it does not apply (e.g. image of a PDF) or the file is unreadable.
+Hash features use the inventory's hash_algorithm and are cached under it.
+"""
+
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from cleanslate_hashing import hash_file, resolve_algorithm
+from cleanslate_metrics import ScanMetrics
+
+# Same-size duplicate candidates are first compared on this many leading bytes
+PARTIAL_HASH_BYTES = 64 * 1024
+
+# Text statistics are only gathered for these extensions and up to this size
+TEXT_EXTENSIONS = {'.txt', '.md', '.csv', '.tsv', '.json', '.xml', '.html', '.htm', '.log',
+                   '.py', '.js', '.ts', '.java', '.c', '.cpp', '.h', '.yaml', '.yml', '.ini', '.rst'}
+TEXT_STATS_MAX_BYTES = 16 * 1024 * 1024
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp', '.gif', '.tiff', '.webp'}
+
+
+def _partial_hash(record: "FileRecord", metrics: Optional[ScanMetrics]) -> Optional[str]:
+    return hash_file(record.path, record.hash_algorithm, PARTIAL_HASH_BYTES, metrics)
+
+
+def _content_hash(record: "FileRecord", metrics: Optional[ScanMetrics]) -> Optional[str]:
+    return hash_file(record.path, record.hash_algorithm, None, metrics)
+
+
+def _text_stats(record: "FileRecord", metrics: Optional[ScanMetrics]) -> Optional[Dict[str, int]]:
+    if record.ext not in TEXT_EXTENSIONS or record.size > TEXT_STATS_MAX_BYTES:
+        return None
+    lines = words = chars = 0
+    try:
+        with open(record.path, 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                lines += 1
+                words += len(line.split())
+                chars += len(line)
+    except OSError:
+        if metrics is not None:
+            metrics.incr("errors_skipped")
+        return None
+    if metrics is not None:
+        metrics.incr("bytes_read", record.size)
+    return {"lines": lines, "words": words, "chars": chars}
+
+
+def _image_features(record: "FileRecord", metrics: Optional[ScanMetrics]) -> Optional[Dict[str, Any]]:
+    if record.ext not in IMAGE_EXTENSIONS:
+        return None
+    from PIL import Image
+    import imagehash
+
+    try:
+        with Image.open(record.path) as img:
+            width, height, mode = img.width, img.height, img.mode
+            if img.mode != 'RGB':
+                img = img.convert('RGB')
+            phash = str(imagehash.phash(img))
+    except Exception:
+        if metrics is not None:
+            metrics.incr("errors_skipped")
+        return None
+    if metrics is not None:
+        metrics.incr("bytes_read", record.size)
+    return {"width": width, "height": height, "mode": mode, "phash": phash}
+
+
+# Feature name -> (need level, provider). Need levels match the detector registry:
+# "stat" < "partial" < "full" < "image".
+FEATURES: Dict[str, Tuple[str, Callable[["FileRecord", Optional[ScanMetrics]], Any]]] = {
+    "partial_hash": ("partial", _partial_hash),
+    "content_hash": ("full", _content_hash),
+    "text_stats": ("full", _text_stats),
+    "image": ("image", _image_features),
+}
+
+# Features whose values depend on the hash algorithm (their cache entries are keyed by it)
+HASH_FEATURES = {"partial_hash", "content_hash"}
+
+
+def register_feature(name: str, needs: str, provider: Callable[["FileRecord", Optional[ScanMetrics]], Any]) -> None:
+    """Make a new lazily computed per-file feature available to every detector."""
+    FEATURES[name] = (needs, provider)
+
+
+class FileRecord:
+    """One stat'ed file of the scan. Features are fetched through the shared cache."""
+
+    __slots__ = ("path", "size", "mtime", "_inventory")
+
+    def __init__(self, path: str, size: int, mtime: float, inventory: "ScanInventory"):
+        self.path = path
+        self.size = size
+        self.mtime = mtime
+        self._inventory = inventory
+
+    @property
+    def ext(self) -> str:
+        return Path(self.path).suffix.lower()
+
+    @property
+    def hash_algorithm(self) -> str:
+        return self._inventory.hash_algorithm
+
+    def feature(self, name: str) -> Any:
+        """The named feature (computed on first request, then cached for the scan)."""
+        return self._inventory.feature(self.path, name)
+
+    def __repr__(self) -> str:
+        return f"FileRecord({self.path!r}, size={self.size})"
+
+
+class ScanInventory:
+    """Files found by one walk, their scan-time (size, mtime), and a per-scan feature cache.
+
+    hash_algorithm is a config value ('auto', 'blake2b', 'md5', ...; see cleanslate_hashing).
+    file_ids maps hard-linked paths to their (st_dev, st_ino) (see cleanslate_links).
+    Not thread-safe; each scan (thread) owns its inventory.
+    """
+
+    def __init__(self, files: List[str], file_stats: Dict[str, Tuple[int, float]],
+                 metrics: Optional[ScanMetrics] = None, hash_algorithm: Optional[str] = None,
+                 file_ids: Optional[Dict[str, Tuple[int, int]]] = None):
+        self.files = files
+        self.file_stats = file_stats
+        self.metrics = metrics
+        self.file_ids = file_ids if file_ids is not None else {}
+        self.hash_algorithm = resolve_algorithm(hash_algorithm)
+        self._cache: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    def _cache_key(self, name: str) -> Tuple[str, str]:
+        return (name, self.hash_algorithm if name in HASH_FEATURES else "")
+
+    def __len__(self) -> int:
+        return len(self.file_stats)
+
+    def records(self) -> Iterator[FileRecord]:
+        """Every stat'ed file, in walk order."""
+        for path, (size, mtime) in self.file_stats.items():
+            yield FileRecord(path, size, mtime, self)
+
+    def record(self, path: str) -> Optional[FileRecord]:
+        entry = self.file_stats.get(path)
+        return FileRecord(path, entry[0], entry[1], self) if entry else None
+
+    def feature(self, path: str, name: str) -> Any:
+        if name not in FEATURES:
+            raise KeyError(f"unknown feature: {name}")
+        cache = self._cache.setdefault(self._cache_key(name), {})
+        if path in cache:
+            if self.metrics is not None:
+                self.metrics.incr("cache_hits")
+            return cache[path]
+        entry = self.file_stats.get(path)
+        record = FileRecord(path, entry[0] if entry else 0, entry[1] if entry else 0.0, self)
+        value = cache[path] = FEATURES[name][1](record, self.metrics)
+        return value
+
+    def cached(self, name: str) -> Dict[str, Any]:
+        """Values of a feature computed so far (path -> value)."""
+        return dict(self._cache.get(self._cache_key(name), {}))
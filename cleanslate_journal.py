@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+LocalMind Journal - Append-only undo journal for trash operations
+Every file the bulk trash engine moves to the Trash is recorded in a local SQLite
+database: original location, size, mtime and a fingerprint (hash of the leading bytes).
+Undo restores a whole operation at once: the platform Trash is indexed once, every file
+is matched back to its original location (and checked against size and fingerprint), and
+moved there with a rename.
+
+The journal only grows: operations and trashed files are inserted, restores are recorded
+as rows of their own, nothing is updated in place. Directories are stored once and files
+refer to them by id, and every lookup goes through a primary key, so the database stays
+small and undo stays fast after hundreds of thousands of entries.
+
+Restore support:
+    Linux/BSD   freedesktop Trash (home trash and per-volume .Trash/$uid, .Trash-$uid)
+    macOS       ~/.Trash and /Volumes/*/.Trashes/$uid, matched by name, size and fingerprint
+    Windows     not supported (the Recycle Bin is left to Explorer)
+
+Usage:
+    python cleanslate_journal.py list
+    python cleanslate_journal.py undo [OPERATION_ID]      # latest operation by default
+
+The GUI records every trash operation in journal/trash.db ("Undo Last Trash").
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import unquote
+
+from cleanslate_hashing import hash_file, resolve_algorithm
+from cleanslate_inventory import PARTIAL_HASH_BYTES
+from cleanslate_logging import get_logger
+
+DEFAULT_JOURNAL_DB = "journal/trash.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS operations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    op_uuid TEXT NOT NULL UNIQUE,
+    created_at TEXT NOT NULL,
+    description TEXT,
+    hash_algorithm TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS dirs (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS entries (
+    op_id INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    dir_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime REAL NOT NULL,
+    fingerprint TEXT,
+    trashed_at REAL NOT NULL,
+    PRIMARY KEY (op_id, seq)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS restores (
+    op_id INTEGER NOT NULL,
+    seq INTEGER NOT NULL,
+    restored_at REAL NOT NULL,
+    PRIMARY KEY (op_id, seq)
+) WITHOUT ROWID;
+"""
+
+# Per-operation counts for queries over `operations o`; both are range scans of a primary key
+_FILES_OF_OP = "(SELECT COUNT(*) FROM entries e WHERE e.op_id = o.id)"
+_RESTORED_OF_OP = "(SELECT COUNT(*) FROM restores r WHERE r.op_id = o.id)"
+
+logger = get_logger("journal")
+
+
+def fingerprint(path: str, algorithm: str) -> Optional[str]:
+    """Hash of a file's leading bytes, used to recognise it in the Trash."""
+    return hash_file(path, algorithm, PARTIAL_HASH_BYTES)
+
+
+class RestoreResult:
+    """Outcome of undoing one operation."""
+
+    def __init__(self, op_id: int, op_uuid: str):
+        self.op_id = op_id
+        self.op_uuid = op_uuid   # cleanslate_trash operation id
+        self.restored: List[Tuple[str, int, float]] = []   # (path, size, mtime)
+        self.failed: Dict[str, str] = {}                    # path -> reason
+
+    def summary(self) -> str:
+        text = f"Restored {len(self.restored):,} files"
+        if self.failed:
+            text += f", {len(self.failed):,} could not be restored"
+        return text
+
+
+class TrashJournal:
+    """SQLite-backed undo journal. Use as a context manager or call close(); one thread per instance."""
+
+    def __init__(self, db_path: str = DEFAULT_JOURNAL_DB):
+        path = Path(db_path)
+        if str(db_path) != ":memory:":
+            path.parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = str(db_path)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._dir_ids: Dict[str, int] = {}
+
+    def __enter__(self) -> "TrashJournal":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def begin(self, op_uuid: str, description: str = "", hash_algorithm: Optional[str] = None) -> int:
+        """Start (or continue) an operation; returns its id."""
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR IGNORE INTO operations (op_uuid, created_at, description, hash_algorithm) "
+                "VALUES (?, ?, ?, ?)",
+                (op_uuid, datetime.now().isoformat(timespec="seconds"), description,
+                 resolve_algorithm(hash_algorithm)))
+        return self.conn.execute("SELECT id FROM operations WHERE op_uuid = ?", (op_uuid,)).fetchone()[0]
+
+    def _dir_id(self, directory: str) -> int:
+        dir_id = self._dir_ids.get(directory)
+        if dir_id is None:
+            self.conn.execute("INSERT OR IGNORE INTO dirs (path) VALUES (?)", (directory,))
+            dir_id = self._dir_ids[directory] = self.conn.execute(
+                "SELECT id FROM dirs WHERE path = ?", (directory,)).fetchone()[0]
+        return dir_id
+
+    def append(self, op_id: int, records: Iterable[Any]) -> int:
+        """Record trashed files (cleanslate_trash.TrashRecord); one transaction per call."""
+        with self.conn:
+            seq = self.conn.execute("SELECT COALESCE(MAX(seq), 0) FROM entries WHERE op_id = ?",
+                                    (op_id,)).fetchone()[0]
+            rows = []
+            for record in records:
+                seq += 1
+                directory, name = os.path.split(os.path.abspath(record.path))
+                rows.append((op_id, seq, self._dir_id(directory), name, record.size, record.mtime,
+                             record.fingerprint, record.trashed_at))
+            self.conn.executemany(
+                "INSERT INTO entries (op_id, seq, dir_id, name, size, mtime, fingerprint, trashed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+        return len(rows)
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def operations(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Newest operations first, with file/byte counts and how many files were restored."""
+        return [dict(row) for row in self.conn.execute(
+            "SELECT o.id, o.op_uuid, o.created_at, o.description, "
+            f"{_FILES_OF_OP} AS files, "
+            "(SELECT COALESCE(SUM(e.size), 0) FROM entries e WHERE e.op_id = o.id) AS bytes, "
+            f"{_RESTORED_OF_OP} AS restored "
+            "FROM operations o ORDER BY o.id DESC LIMIT ?", (limit,))]
+
+    def latest_undoable(self) -> Optional[int]:
+        """Id of the newest operation with files not yet restored."""
+        row = self.conn.execute(
+            f"SELECT o.id FROM operations o WHERE {_FILES_OF_OP} > {_RESTORED_OF_OP} "
+            "ORDER BY o.id DESC LIMIT 1").fetchone()
+        return row[0] if row is not None else None
+
+    def pending(self, op_id: int) -> List[Dict[str, Any]]:
+        """Files of an operation that have not been restored."""
+        rows = self.conn.execute(
+            "SELECT e.seq, d.path AS dir, e.name, e.size, e.mtime, e.fingerprint, e.trashed_at "
+            "FROM entries e JOIN dirs d ON d.id = e.dir_id "
+            "LEFT JOIN restores r ON r.op_id = e.op_id AND r.seq = e.seq "
+            "WHERE e.op_id = ? AND r.seq IS NULL ORDER BY e.seq", (op_id,))
+        return [{**dict(row), "path": os.path.join(row["dir"], row["name"])} for row in rows]
+
+    # ------------------------------------------------------------------
+    # Undo
+    # ------------------------------------------------------------------
+
+    def undo(self, op_id: int) -> RestoreResult:
+        """Move an operation's files back from the Trash to where they were."""
+        row = self.conn.execute("SELECT op_uuid, hash_algorithm FROM operations WHERE id = ?", (op_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"no trash operation {op_id}")
+        result = RestoreResult(op_id, row["op_uuid"])
+        algorithm = row["hash_algorithm"]
+        entries = self.pending(op_id)
+        if not entries:
+            return result
+        trash = TrashIndex.for_paths([entry["path"] for entry in entries])
+        restored_rows = []
+        for entry in entries:
+            path = entry["path"]
+            if os.path.lexists(path):
+                result.failed[path] = "a file already exists at the original location"
+                continue
+            candidate = trash.find(entry, algorithm)
+            if candidate is None:
+                result.failed[path] = "not found in the Trash"
+                continue
+            try:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                os.rename(candidate.files_path, path)
+            except OSError as e:
+                result.failed[path] = str(e)
+                continue
+            candidate.consumed()
+            restored_rows.append((op_id, entry["seq"], time.time()))
+            result.restored.append((path, entry["size"], entry["mtime"]))
+        with self.conn:
+            self.conn.executemany("INSERT OR IGNORE INTO restores (op_id, seq, restored_at) VALUES (?, ?, ?)",
+                                  restored_rows)
+        logger.info("undo of operation %s: %s", op_id, result.summary())
+        return result
+
+
+# =============================================================================
+# TRASH LOOKUP
+# =============================================================================
+
+class _TrashItem:
+    __slots__ = ("files_path", "info_path", "deleted_at", "used")
+
+    def __init__(self, files_path: str, info_path: Optional[str], deleted_at: Optional[float]):
+        self.files_path = files_path
+        self.info_path = info_path
+        self.deleted_at = deleted_at
+        self.used = False
+
+    def consumed(self) -> None:
+        self.used = True
+        if self.info_path:
+            try:
+                os.remove(self.info_path)
+            except OSError:
+                pass
+
+
+class TrashIndex:
+    """Items in the Trash directories relevant to a set of original paths, read once."""
+
+    def __init__(self) -> None:
+        self.by_original: Dict[str, List[_TrashItem]] = {}   # freedesktop: original path -> items
+        self.by_name: Dict[str, List[_TrashItem]] = {}       # macOS: trashed name -> items
+        # macOS: "stem" -> (name, item) for every name starting with "stem " (renamed clashes)
+        self.by_stem: Dict[str, List[Tuple[str, _TrashItem]]] = {}
+        self._read_dirs: set = set()
+
+    @classmethod
+    def for_paths(cls, paths: List[str]) -> "TrashIndex":
+        index = cls()
+        if sys.platform == "darwin":
+            for trash_dir in _mac_trash_dirs(paths):
+                index._read_mac(trash_dir)
+        elif os.name != "nt":
+            for trash_dir, topdir in _freedesktop_trash_dirs(paths):
+                index._read_freedesktop(trash_dir, topdir)
+        return index
+
+    def _read_freedesktop(self, trash_dir: str, topdir: Optional[str]) -> None:
+        if trash_dir in self._read_dirs:
+            return
+        self._read_dirs.add(trash_dir)
+        info_dir = os.path.join(trash_dir, "info")
+        try:
+            names = os.listdir(info_dir)
+        except OSError:
+            return
+        for info_name in names:
+            if not info_name.endswith(".trashinfo"):
+                continue
+            info_path = os.path.join(info_dir, info_name)
+            original, deleted_at = _parse_trashinfo(info_path)
+            if original is None:
+                continue
+            if not os.path.isabs(original) and topdir:
+                original = os.path.join(topdir, original)
+            files_path = os.path.join(trash_dir, "files", info_name[:-len(".trashinfo")])
+            self.by_original.setdefault(original, []).append(_TrashItem(files_path, info_path, deleted_at))
+
+    def _read_mac(self, trash_dir: str) -> None:
+        if trash_dir in self._read_dirs:
+            return
+        self._read_dirs.add(trash_dir)
+        try:
+            names = os.listdir(trash_dir)
+        except OSError:
+            return
+        for name in names:
+            item = _TrashItem(os.path.join(trash_dir, name), None, None)
+            self.by_name.setdefault(name, []).append(item)
+            # The stem of a clash is unknown here ("my file 2.txt" may be "my file.txt" or
+            # "my.txt" renamed), so the name is indexed under every prefix ending at a space
+            for i, char in enumerate(name):
+                if char == " ":
+                    self.by_stem.setdefault(name[:i], []).append((name, item))
+
+    def _candidates(self, entry: Dict[str, Any]) -> List[_TrashItem]:
+        if self.by_original:
+            return self.by_original.get(entry["path"], [])
+        # macOS renames clashes to "name 2.ext", "name 3.ext", ...
+        stem, ext = os.path.splitext(entry["name"])
+        items = list(self.by_name.get(entry["name"], []))
+        items.extend(item for name, item in self.by_stem.get(stem, ())
+                     if name != entry["name"] and name.endswith(ext))
+        return items
+
+    def find(self, entry: Dict[str, Any], algorithm: str) -> Optional[_TrashItem]:
+        """The trashed copy of a journal entry: same size and fingerprint, deleted closest to when we trashed it."""
+        best: Optional[_TrashItem] = None
+        best_gap = float("inf")
+        for item in self._candidates(entry):
+            if item.used:
+                continue
+            try:
+                st = os.lstat(item.files_path)
+            except OSError:
+                continue
+            if st.st_size != entry["size"]:
+                continue
+            if entry["fingerprint"] and fingerprint(item.files_path, algorithm) != entry["fingerprint"]:
+                continue
+            gap = abs(item.deleted_at - entry["trashed_at"]) if item.deleted_at is not None else 0.0
+            if gap < best_gap:
+                best, best_gap = item, gap
+        return best
+
+
+def _parse_trashinfo(info_path: str) -> Tuple[Optional[str], Optional[float]]:
+    original = deleted_at = None
+    try:
+        with open(info_path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                if line.startswith("Path="):
+                    original = unquote(line[5:].strip())
+                elif line.startswith("DeletionDate="):
+                    try:
+                        deleted_at = datetime.strptime(line[13:].strip(), "%Y-%m-%dT%H:%M:%S").timestamp()
+                    except ValueError:
+                        pass
+    except OSError:
+        pass
+    return original, deleted_at
+
+
+def _mount_point(path: str) -> str:
+    path = os.path.realpath(path)
+    while not os.path.ismount(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    return path
+
+
+def _freedesktop_trash_dirs(paths: List[str]) -> List[Tuple[str, Optional[str]]]:
+    xdg = os.environ.get("XDG_DATA_HOME") or os.path.expanduser("~/.local/share")
+    dirs: List[Tuple[str, Optional[str]]] = [(os.path.join(xdg, "Trash"), None)]
+    uid = str(os.getuid()) if hasattr(os, "getuid") else ""
+    for topdir in {_mount_point(os.path.dirname(p)) for p in paths}:
+        dirs.append((os.path.join(topdir, ".Trash", uid), topdir))
+        dirs.append((os.path.join(topdir, f".Trash-{uid}"), topdir))
+    return dirs
+
+
+def _mac_trash_dirs(paths: List[str]) -> List[str]:
+    dirs = [os.path.expanduser("~/.Trash")]
+    uid = str(os.getuid())
+    for topdir in {_mount_point(os.path.dirname(p)) for p in paths}:
+        if topdir != "/":
+            dirs.append(os.path.join(topdir, ".Trashes", uid))
+    return dirs
+
+
+# =============================================================================
+# CLI
+# =============================================================================
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="LocalMind trash journal: list and undo trash operations")
+    parser.add_argument("--db", default=DEFAULT_JOURNAL_DB, help=f"Journal database (default {DEFAULT_JOURNAL_DB})")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="Recent trash operations")
+    undo = sub.add_parser("undo", help="Restore the files of an operation")
+    undo.add_argument("operation", nargs="?", type=int, help="Operation id (default: latest undoable)")
+    args = parser.parse_args()
+
+    with TrashJournal(args.db) as journal:
+        if args.command == "list":
+            ops = journal.operations()
+            if not ops:
+                print("No trash operations recorded.")
+            for op in ops:
+                print(f"#{op['id']:<5} {op['created_at']}  {op['files']:>7,} files  "
+                      f"{op['bytes'] / 1024 / 1024:>10,.1f} MB  restored {op['restored']:,}  {op['description'] or ''}")
+            return 0
+        op_id = args.operation or journal.latest_undoable()
+        if op_id is None:
+            print("Nothing to undo.")
+            return 0
+        result = journal.undo(op_id)
+        print(f"↩️  Operation #{op_id}: {result.summary()}")
+        for path, reason in list(result.failed.items())[:20]:
+            print(f"   ❌ {path}: {reason}")
+        return 1 if result.failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+LocalMind Links - Hard link and shared-extent (reflink) awareness for duplicate detection
+Two hard links are one file: hashing both reads the same data twice, and reporting them as
+duplicates promises space that deleting one link would not free. Duplicate detection
+therefore collapses every hard-linked set to one logical file (the first path walked)
+before hashing.
+
+Reflinked copies (cp --reflink, btrfs/XFS dedupe) are separate files that already share
+their data blocks. They are real duplicates by content, but removing one frees little, so
+reclaimable-space figures count them once. Shared extents are read with the Linux FIEMAP
+ioctl; elsewhere (and on filesystems without FIEMAP) every file counts as its own copy.
+"""
+
+import os
+import struct
+import sys
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+# (st_dev, st_ino) of a file with more than one hard link
+FileId = Tuple[int, int]
+
+# FIEMAP (linux/fiemap.h)
+FS_IOC_FIEMAP = 0xC020660B
+FIEMAP_EXTENT_LAST = 0x0001
+FIEMAP_EXTENT_SHARED = 0x2000
+# Extents whose physical location is not meaningful yet (delayed allocation, inline, ...)
+_FIEMAP_UNSTABLE = 0x0002 | 0x0004 | 0x0008 | 0x0200 | 0x0400
+
+_FIEMAP_HEADER = struct.Struct("=QQIIII")          # start, length, flags, mapped, count, reserved
+_FIEMAP_EXTENT = struct.Struct("=QQQQQIIII")       # logical, physical, length, 2x reserved, flags, 3x reserved
+
+# Extents fetched per ioctl, and the most we inspect per file before giving up
+FIEMAP_BATCH = 64
+FIEMAP_MAX_EXTENTS = 4096
+
+_HAVE_FIEMAP = sys.platform.startswith("linux")
+
+
+def link_id(st: os.stat_result) -> Optional[FileId]:
+    """Identity of a hard-linked file from its stat result; None for single-link files."""
+    if st.st_nlink > 1 and st.st_ino:
+        return (st.st_dev, st.st_ino)
+    return None
+
+
+def collapse_hardlinks(paths: Iterable[str],
+                       file_ids: Dict[str, FileId]) -> Tuple[List[str], Dict[str, List[str]]]:
+    """Reduce paths to one per inode.
+
+    Returns (logical paths in input order, {kept path: [its other links]}).
+    Paths missing from file_ids are single-link files and always kept.
+    """
+    owners: Dict[FileId, str] = {}
+    logical: List[str] = []
+    links: Dict[str, List[str]] = {}
+    for path in paths:
+        fid = file_ids.get(path)
+        if fid is None:
+            logical.append(path)
+            continue
+        owner = owners.setdefault(fid, path)
+        if owner == path:
+            logical.append(path)
+        else:
+            links.setdefault(owner, []).append(path)
+    return logical, links
+
+
+def extent_map(file_path: str) -> Optional[Tuple[Tuple[int, int, int], ...]]:
+    """(logical, physical, length) of every extent of a file whose data is entirely shared.
+
+    None when the file has unshared or unstable extents, is empty, is too fragmented to
+    inspect, or the platform/filesystem has no FIEMAP.
+    """
+    if not _HAVE_FIEMAP:
+        return None
+    import fcntl
+
+    extents: List[Tuple[int, int, int]] = []
+    start = 0
+    try:
+        fd = os.open(file_path, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        while len(extents) < FIEMAP_MAX_EXTENTS:
+            buf = bytearray(_FIEMAP_HEADER.size + FIEMAP_BATCH * _FIEMAP_EXTENT.size)
+            _FIEMAP_HEADER.pack_into(buf, 0, start, 0xFFFFFFFFFFFFFFFF - start, 0, 0, FIEMAP_BATCH, 0)
+            fcntl.ioctl(fd, FS_IOC_FIEMAP, buf, True)
+            mapped = _FIEMAP_HEADER.unpack_from(buf, 0)[3]
+            if mapped == 0:
+                break
+            last = False
+            for i in range(mapped):
+                logical, physical, length, _, _, flags, _, _, _ = _FIEMAP_EXTENT.unpack_from(
+                    buf, _FIEMAP_HEADER.size + i * _FIEMAP_EXTENT.size)
+                if not flags & FIEMAP_EXTENT_SHARED or flags & _FIEMAP_UNSTABLE:
+                    return None
+                extents.append((logical, physical, length))
+                start = logical + length
+                last = bool(flags & FIEMAP_EXTENT_LAST)
+            if last:
+                break
+        else:
+            return None
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+    return tuple(extents) or None
+
+
+def shared_extent_sets(paths: Sequence[str]) -> List[List[str]]:
+    """Subsets of paths (same-content duplicates) whose data is the very same extents."""
+    by_extents: Dict[Tuple[Tuple[int, int, int], ...], List[str]] = {}
+    for path in paths:
+        extents = extent_map(path)
+        if extents is not None:
+            by_extents.setdefault(extents, []).append(path)
+    return [group for group in by_extents.values() if len(group) > 1]
+
+
+def reclaimable_bytes(members: int, file_size: int, shared_sets: Sequence[Sequence[str]] = ()) -> int:
+    """Bytes freed by keeping one copy of a duplicate group.
+
+    Each set of files sharing extents is one physical copy.
+    """
+    copies = members - sum(len(s) - 1 for s in shared_sets)
+    return file_size * max(copies - 1, 0)
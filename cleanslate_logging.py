@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+LocalMind Logging - Buffered, non-blocking log backend
+Callers hand records to an in-memory queue; a single background thread owns the open
+log file, writes every record waiting in the queue and then flushes once, and rotates the
+file by size. Disabled levels (DEBUG by default) are filtered before any formatting
+happens, so debug calls on hot paths cost almost nothing.
+
+Messages are formatted on the writer thread. Records whose arguments are not plain
+immutable values (str, numbers, None, paths) are formatted when they are logged instead,
+so a list or dict changed after the call is still logged as it was.
+
+Environment:
+    LOCALMIND_LOG_LEVEL   DEBUG, INFO (default), WARNING, ERROR
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+from pathlib import Path
+from typing import Optional
+
+LOG_DIR = Path("logs")
+LOG_FILE = LOG_DIR / "localmind.log"
+
+# Rotate at 5 MB, keep localmind.log.1 .. localmind.log.3
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
+
+LOG_FORMAT = "%(asctime)s | %(levelname)s | %(name)s | %(message)s"
+
+# Most records the writer thread takes from the queue before flushing the file
+LOG_BATCH_MAX = 512
+
+# Argument types safe to format later, on the writer thread
+_IMMUTABLE_ARGS = (str, bytes, int, float, complex, bool, type(None), Path)
+
+ROOT_LOGGER_NAME = "localmind"
+
+_lock = threading.Lock()
+_listener: Optional["_BatchingListener"] = None
+_configured = False
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Enqueue records unformatted, so formatting happens on the writer thread, not the caller's.
+
+    The exception: records with mutable arguments are formatted now.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        args = record.args
+        if args:
+            values = args.values() if isinstance(args, dict) else args
+            if not all(isinstance(value, _IMMUTABLE_ARGS) for value in values):
+                record.msg = record.getMessage()
+                record.args = None
+        return record
+
+
+class _BatchedFileHandler(logging.handlers.RotatingFileHandler):
+    """Rotating file handler that flushes when told to (once per batch), not after every record."""
+
+    def flush(self) -> None:
+        pass
+
+    def flush_batch(self) -> None:
+        super().flush()
+
+
+class _BatchingListener(logging.handlers.QueueListener):
+    """Writes every record already queued (up to LOG_BATCH_MAX), then flushes once."""
+
+    def _monitor(self) -> None:
+        while True:
+            batch = [self.dequeue(True)]
+            while len(batch) < LOG_BATCH_MAX:
+                try:
+                    batch.append(self.dequeue(False))
+                except queue.Empty:
+                    break
+            stop = False
+            for record in batch:
+                if record is self._sentinel:
+                    stop = True
+                else:
+                    self.handle(record)
+            for handler in self.handlers:
+                handler.flush_batch()
+            if stop:
+                return
+
+
+def _level_from_env(default: int = logging.INFO) -> int:
+    name = os.environ.get("LOCALMIND_LOG_LEVEL", "").strip().upper()
+    level = logging.getLevelName(name) if name else default
+    return level if isinstance(level, int) else default
+
+
+def configure_logging(level: Optional[int] = None, log_file: Optional[Path] = None,
+                      max_bytes: int = LOG_MAX_BYTES, backup_count: int = LOG_BACKUP_COUNT) -> logging.Logger:
+    """(Re)configure the LocalMind log backend and return the root 'localmind' logger.
+
+    Safe to call more than once; a previous background writer is drained and replaced.
+    Never raises: if the log file cannot be opened, logging is silently disabled.
+    """
+    global _listener, _configured
+    with _lock:
+        root = logging.getLogger(ROOT_LOGGER_NAME)
+        if _listener is not None:
+            _listener.stop()
+            for handler in list(_listener.handlers):
+                handler.close()
+            _listener = None
+        for handler in list(root.handlers):
+            root.removeHandler(handler)
+
+        root.setLevel(level if level is not None else _level_from_env())
+        root.propagate = False
+
+        path = Path(log_file) if log_file else LOG_FILE
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            file_handler = _BatchedFileHandler(
+                path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True,
+            )
+            file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        except Exception:
+            root.addHandler(logging.NullHandler())
+            _configured = True
+            return root
+
+        log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        root.addHandler(_DeferredQueueHandler(log_queue))
+        _listener = _BatchingListener(log_queue, file_handler, respect_handler_level=True)
+        _listener.start()
+        _configured = True
+        return root
+
+
+def get_logger(name: str = "") -> logging.Logger:
+    """Return a LocalMind logger, configuring the backend on first use.
+
+    Args:
+        name: Child name, e.g. 'core' gives the 'localmind.core' logger
+    """
+    if not _configured:
+        configure_logging()
+    return logging.getLogger(f"{ROOT_LOGGER_NAME}.{name}" if name else ROOT_LOGGER_NAME)
+
+
+def flush_logs() -> None:
+    """Block until every queued record has been written (e.g. before opening the log file)."""
+    with _lock:
+        if _listener is None:
+            return
+        _listener.stop()  # drains the queue, flushes and joins the writer thread
+        _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Drain the queue, stop the writer thread and close the log file."""
+    global _listener
+    with _lock:
+        if _listener is None:
+            return
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
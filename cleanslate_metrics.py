@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+LocalMind Metrics - Per-stage timing and counters for scans
+Lets production runs show where time goes (walk, stat, hash, image decode, TF-IDF, reports)
+without attaching a profiler. Results are plain dicts so they travel in the scan results
+and can be exported as JSON.
+"""
+
+import json
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+# Counters every scan reports, even when zero
+DEFAULT_COUNTERS = ("files_processed", "bytes_read", "cache_hits", "errors_skipped")
+
+
+class ScanMetrics:
+    """Collects per-stage wall time and counters for a single scan.
+
+    Stage times are exclusive: while a nested stage runs, its time is charged to the
+    nested stage only, so the stage seconds add up to the instrumented wall time.
+    Not thread-safe; use one instance per scanning thread.
+    """
+
+    def __init__(self, name: str = "scan"):
+        """Start a metrics session; wall time is measured from construction."""
+        self.name = name
+        self.started_at = datetime.now()
+        self._start = time.perf_counter()
+        self._end: Optional[float] = None
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, int] = {key: 0 for key in DEFAULT_COUNTERS}
+        # Open stages: [name, start, child_seconds]
+        self._stack: List[List[Any]] = []
+
+    def _stage_entry(self, name: str) -> Dict[str, float]:
+        entry = self.stages.get(name)
+        if entry is None:
+            entry = self.stages[name] = {"seconds": 0.0, "calls": 0}
+        return entry
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Time a block as stage `name` (exclusive of nested stages)."""
+        frame = [name, time.perf_counter(), 0.0]
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - frame[1]
+            self._stack.pop()
+            entry = self._stage_entry(name)
+            entry["seconds"] += elapsed - frame[2]
+            entry["calls"] += 1
+            if self._stack:
+                self._stack[-1][2] += elapsed
+
+    def add_time(self, name: str, seconds: float, calls: int = 1) -> None:
+        """Charge externally measured time to a stage (cheap per-file hot-path timing)."""
+        entry = self._stage_entry(name)
+        entry["seconds"] += seconds
+        entry["calls"] += calls
+        if self._stack:
+            self._stack[-1][2] += seconds
+
+    def incr(self, counter: str, amount: int = 1) -> None:
+        """Increase a counter (created on first use)."""
+        self.counters[counter] = self.counters.get(counter, 0) + amount
+
+    def finish(self) -> "ScanMetrics":
+        """Freeze the wall time. Safe to call more than once."""
+        if self._end is None:
+            self._end = time.perf_counter()
+        return self
+
+    @property
+    def wall_seconds(self) -> float:
+        end = self._end if self._end is not None else time.perf_counter()
+        return end - self._start
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Snapshot as a JSON-serializable dict (the 'metrics' key of scan results)."""
+        wall = self.wall_seconds
+        stages = {
+            name: {"seconds": round(entry["seconds"], 6), "calls": int(entry["calls"])}
+            for name, entry in sorted(self.stages.items(), key=lambda kv: kv[1]["seconds"], reverse=True)
+        }
+        throughput = {}
+        if wall > 0:
+            throughput = {
+                "files_per_s": round(self.counters.get("files_processed", 0) / wall, 2),
+                "mb_read_per_s": round(self.counters.get("bytes_read", 0) / 1024 / 1024 / wall, 2),
+            }
+        return {
+            "name": self.name,
+            "started_at": self.started_at.isoformat(timespec="seconds"),
+            "wall_seconds": round(wall, 6),
+            "stages": stages,
+            "counters": dict(self.counters),
+            "throughput": throughput,
+        }
+
+    def summary(self) -> str:
+        """One-line summary for the log file."""
+        parts = [f"{name}={entry['seconds']:.3f}s" for name, entry in self.as_dict()["stages"].items()]
+        counters = " ".join(f"{k}={v}" for k, v in self.counters.items())
+        return f"{self.name} metrics: wall={self.wall_seconds:.3f}s {' '.join(parts)} {counters}".strip()
+
+    def export_json(self, path: str) -> str:
+        """Write the metrics snapshot to `path` and return its absolute path."""
+        out = Path(path)
+        if out.parent and not out.parent.exists():
+            out.parent.mkdir(parents=True, exist_ok=True)
+        with open(out, "w", encoding="utf-8") as f:
+            json.dump(self.as_dict(), f, indent=2)
+        return str(out.resolve())
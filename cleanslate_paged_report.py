@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+LocalMind Paged Report - HTML report for very large result sets
+The static report writes every finding into one page, which browsers cannot open once it
+reaches hundreds of thousands of entries. The paged report writes a small HTML shell plus
+the findings as compact JSON chunk files next to it; the page loads chunks on demand and
+renders them with pagination, virtual scrolling and client-side sort/filter.
+
+Chunks are JSONP-style scripts (`window.__lmChunk(...)`) rather than .json files so the
+report keeps working when opened straight from disk (file://), where fetch() is blocked.
+
+Layout:
+    LocalMind_Report.html
+    LocalMind_Report_data/dup_00000.js, large_00000.js, ...
+"""
+
+import json
+from datetime import datetime
+from html import escape
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Rows per chunk file (~150-300 KB of JSON per chunk for typical paths)
+CHUNK_ROWS = 2000
+
+# Above this many findings, "auto" mode switches from the static page to the paged one
+PAGED_REPORT_THRESHOLD = 5000
+
+HTML_REPORT_MODES = ("auto", "static", "paged")
+
+# (section key, tab title); every section has the same group / path / size / modified columns
+SECTIONS = (
+    ("dup", "Duplicate Files"),
+    ("large", "Large Files"),
+    ("old", "Old Files"),
+    ("empty", "Empty Files"),
+    ("near", "Near-Duplicate Images"),
+    ("blurry", "Blurry Images"),
+)
+
+# Row = [group, path, size_bytes or None, mtime_epoch or None]
+Row = List[object]
+
+
+def count_findings(duplicates: List[List[str]], large_files: List[str], old_files: List[str],
+                   empty_files: List[str], near_duplicates: Dict[str, List[str]],
+                   blurry_files: List[str]) -> int:
+    """Total number of report rows (one per file per finding)."""
+    return (sum(len(group) for group in duplicates) + len(large_files) + len(old_files)
+            + len(empty_files) + sum(len(group) for group in near_duplicates.values())
+            + len(blurry_files))
+
+
+def choose_mode(mode: str, total_rows: int, threshold: int = PAGED_REPORT_THRESHOLD) -> str:
+    """Resolve 'auto' to 'static' or 'paged'; unknown modes fall back to 'auto'."""
+    if mode not in HTML_REPORT_MODES:
+        mode = "auto"
+    if mode == "auto":
+        return "paged" if total_rows > threshold else "static"
+    return mode
+
+
+def data_dir_for(report_path: str) -> Path:
+    """Directory holding the chunk files of a paged report."""
+    path = Path(report_path)
+    return path.with_name(f"{path.stem}_data")
+
+
+def _remove_chunks(data_dir: Path) -> None:
+    for stale in data_dir.glob("*_[0-9][0-9][0-9][0-9][0-9].js"):
+        stale.unlink()
+
+
+def remove_paged_data(report_path: str) -> None:
+    """Delete the chunk directory a previous paged report left next to report_path.
+
+    Only chunk files are removed; the directory goes too if nothing else is in it.
+    """
+    data_dir = data_dir_for(report_path)
+    if not data_dir.is_dir():
+        return
+    _remove_chunks(data_dir)
+    try:
+        data_dir.rmdir()
+    except OSError:
+        pass
+
+
+def _stat_row(group: str, file_path: str, file_stats) -> Row:
+    entry = file_stats.get(file_path) if file_stats else None
+    if entry:
+        return [group, file_path, entry[0], int(entry[1])]
+    return [group, file_path, None, None]
+
+
+def _section_rows(key: str, duplicates: List[List[str]], large_files: List[str], old_files: List[str],
+                  empty_files: List[str], near_duplicates: Dict[str, List[str]],
+                  blurry_files: List[str], file_stats) -> Iterator[Row]:
+    if key == "dup":
+        for i, group in enumerate(duplicates, 1):
+            for file_path in group:
+                yield _stat_row(f"Group {i}", file_path, file_stats)
+    elif key == "near":
+        for group_name, file_list in near_duplicates.items():
+            for file_path in file_list:
+                yield _stat_row(group_name, file_path, file_stats)
+    else:
+        files = {"large": large_files, "old": old_files, "empty": empty_files, "blurry": blurry_files}[key]
+        for file_path in files:
+            yield _stat_row("", file_path, file_stats)
+
+
+def _write_chunks(data_dir: Path, key: str, rows: Iterable[Row], chunk_rows: int) -> Tuple[int, int]:
+    """Write rows as <key>_NNNNN.js chunks; only one chunk is held in memory. Returns (rows, chunks)."""
+    total = 0
+    chunks = 0
+    buffer: List[Row] = []
+
+    def flush() -> None:
+        nonlocal chunks
+        payload = json.dumps(buffer, ensure_ascii=False, separators=(",", ":"))
+        with open(data_dir / f"{key}_{chunks:05d}.js", "w", encoding="utf-8") as f:
+            f.write(f"window.__lmChunk({json.dumps(key)},{chunks},{payload});\n")
+        chunks += 1
+        buffer.clear()
+
+    for row in rows:
+        buffer.append(row)
+        total += 1
+        if len(buffer) >= chunk_rows:
+            flush()
+    if buffer:
+        flush()
+    return total, chunks
+
+
+def write_paged_html_report(report_path: str, duplicates: List[List[str]], large_files: List[str],
+                            old_files: List[str], empty_files: List[str],
+                            near_duplicates: Dict[str, List[str]], blurry_files: List[str],
+                            file_stats: Optional[Dict[str, Tuple[int, float]]] = None,
+                            chunk_rows: int = CHUNK_ROWS) -> str:
+    """Write the paged HTML report and its chunk directory; returns the absolute report path.
+
+    Sizes and dates come from file_stats (scan-time metadata); no filesystem calls are made
+    for the reported files. Chunk files left over from a previous report are removed.
+    """
+    data_dir = data_dir_for(report_path)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    _remove_chunks(data_dir)
+
+    sections = []
+    for key, title in SECTIONS:
+        rows = _section_rows(key, duplicates, large_files, old_files, empty_files,
+                             near_duplicates, blurry_files, file_stats)
+        total, chunks = _write_chunks(data_dir, key, rows, chunk_rows)
+        sections.append({"key": key, "title": title, "rows": total, "chunks": chunks})
+
+    manifest = {
+        "generated": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "data_dir": data_dir.name,
+        "chunk_rows": chunk_rows,
+        "sections": sections,
+        "duplicate_groups": len(duplicates),
+        "near_duplicate_groups": len(near_duplicates),
+    }
+    with open(report_path, "w", encoding="utf-8") as f:
+        f.write(_render_shell(manifest))
+    return str(Path(report_path).resolve())
+
+
+def _render_shell(manifest: Dict) -> str:
+    """The report page: summary rendered server-side, findings rendered by the script."""
+    by_key = {s["key"]: s for s in manifest["sections"]}
+    summary = "\n".join([
+        f"        <p><strong>Duplicate groups:</strong> {manifest['duplicate_groups']}</p>",
+        f"        <p><strong>Total duplicate files:</strong> {by_key['dup']['rows']}</p>",
+        f"        <p><strong>Large files:</strong> {by_key['large']['rows']}</p>",
+        f"        <p><strong>Old files:</strong> {by_key['old']['rows']}</p>",
+        f"        <p><strong>Empty files:</strong> {by_key['empty']['rows']}</p>",
+        f"        <p><strong>Near-duplicate image groups:</strong> {manifest['near_duplicate_groups']}</p>",
+        f"        <p><strong>Total near-duplicate files:</strong> {by_key['near']['rows']}</p>",
+        f"        <p><strong>Blurry images:</strong> {by_key['blurry']['rows']}</p>",
+    ])
+    # '</' must not appear inside the inline <script>
+    manifest_json = json.dumps(manifest, ensure_ascii=False).replace("</", "<\\/")
+    return (_SHELL_TEMPLATE
+            .replace("{{GENERATED}}", escape(manifest["generated"]))
+            .replace("{{SUMMARY}}", summary)
+            .replace("{{MANIFEST}}", manifest_json))
+
+
+_SHELL_TEMPLATE = """<!DOCTYPE html>
+<html lang='en'>
+<head>
+    <meta charset='UTF-8'>
+    <meta name='viewport' content='width=device-width, initial-scale=1.0'>
+    <title>LocalMind Report</title>
+    <style>
+        body { font-family: Arial, sans-serif; margin: 20px; }
+        .header { text-align: center; margin-bottom: 30px; }
+        .summary { background: #e8f4fd; padding: 15px; border-radius: 5px; }
+        .tagline { color: #666; font-style: italic; }
+        .tabs button { margin: 0 4px 8px 0; padding: 6px 10px; border: 1px solid #ccc; background: #fff; cursor: pointer; }
+        .tabs button.active { background: #333; color: #fff; }
+        .controls { margin: 8px 0; display: flex; gap: 8px; align-items: center; flex-wrap: wrap; }
+        .controls input[type=search] { width: 320px; padding: 4px; }
+        .status { color: #666; font-size: 90%; }
+        .grid-head, .row { display: grid; grid-template-columns: 110px 1fr 130px 160px; gap: 8px; }
+        .grid-head { font-weight: bold; border-bottom: 1px solid #ccc; padding: 4px; }
+        .grid-head span { cursor: pointer; }
+        .viewport { height: 600px; overflow-y: auto; position: relative; background: #f5f5f5; border-radius: 5px; }
+        .row { position: absolute; left: 0; right: 0; height: 22px; line-height: 22px; padding: 0 4px;
+               font-family: monospace; font-size: 12px; white-space: nowrap; }
+        .row span { overflow: hidden; text-overflow: ellipsis; }
+        .row.loading { color: #aaa; }
+    </style>
+</head>
+<body>
+    <div class='header'>
+        <h1>LocalMind Report</h1>
+        <p class='tagline'>Smart file cleanup. 100% offline. AI that tidies your computer without touching the cloud.</p>
+        <p>Generated: {{GENERATED}}</p>
+    </div>
+    <div class='summary'>
+        <h2>Summary</h2>
+{{SUMMARY}}
+    </div>
+    <div class='section'>
+        <h2>Findings</h2>
+        <div class='tabs' id='tabs'></div>
+        <div class='controls'>
+            <input type='search' id='filter' placeholder='Filter by path or group'>
+            <button id='prev'>&laquo; Prev</button>
+            <span id='pageinfo'></span>
+            <button id='next'>Next &raquo;</button>
+            <span class='status' id='status'></span>
+        </div>
+        <div class='grid-head'>
+            <span data-sort='0'>Group</span><span data-sort='1'>Path</span>
+            <span data-sort='2'>Size</span><span data-sort='3'>Modified</span>
+        </div>
+        <div class='viewport' id='viewport'><div id='spacer'></div></div>
+    </div>
+    <script>
+    (function () {
+        var M = {{MANIFEST}};
+        var ROW_H = 22, PAGE_SIZE = 10000, OVERSCAN = 20;
+        var store = {}, waiting = {};
+        M.sections.forEach(function (s) { store[s.key] = []; });
+
+        // Chunk scripts call back into here
+        window.__lmChunk = function (key, idx, rows) {
+            store[key][idx] = rows;
+            var cbs = waiting[key + ':' + idx] || [];
+            delete waiting[key + ':' + idx];
+            cbs.forEach(function (cb) { cb(); });
+        };
+
+        function loadChunk(key, idx, cb) {
+            if (store[key][idx]) { cb(); return; }
+            var id = key + ':' + idx;
+            if (waiting[id]) { waiting[id].push(cb); return; }
+            waiting[id] = [cb];
+            var el = document.createElement('script');
+            el.src = M.data_dir + '/' + key + '_' + ('0000' + idx).slice(-5) + '.js';
+            el.onerror = function () { store[key][idx] = []; window.__lmChunk(key, idx, []); };
+            document.head.appendChild(el);
+        }
+
+        function loadAll(key, cb) {
+            var sec = section(key), i = 0;
+            (function next() {
+                if (i >= sec.chunks) { cb(); return; }
+                status('Loading ' + (i + 1) + ' / ' + sec.chunks + ' chunks...');
+                loadChunk(key, i++, next);
+            })();
+        }
+
+        var state = { key: null, filter: '', sort: null, desc: false, view: null, page: 0 };
+        var viewport = document.getElementById('viewport');
+        var spacer = document.getElementById('spacer');
+
+        function section(key) { return M.sections.filter(function (s) { return s.key === key; })[0]; }
+        function status(text) { document.getElementById('status').textContent = text; }
+        function rowAt(key, i) {
+            var chunk = store[key][Math.floor(i / M.chunk_rows)];
+            return chunk ? chunk[i % M.chunk_rows] : null;
+        }
+        // Group names sort by their number ("Group 2" before "Group 10")
+        function sortValue(r, col) {
+            if (col !== 0) return r[col];
+            var m = /(\\d+)$/.exec(r[0]);
+            return m ? +m[1] : r[0];
+        }
+        function viewLength() { return state.view ? state.view.length : section(state.key).rows; }
+        function pageCount() { return Math.max(1, Math.ceil(viewLength() / PAGE_SIZE)); }
+        function fmtSize(n) { return n === null ? 'unknown' : n.toLocaleString() + ' B'; }
+        function fmtDate(t) { return t === null ? 'unknown' : new Date(t * 1000).toISOString().slice(0, 19).replace('T', ' '); }
+
+        // Filtering/sorting needs the whole section: load every chunk, then build an index
+        function rebuildView() {
+            var key = state.key;
+            if (!state.filter && state.sort === null) { state.view = null; state.page = 0; render(); return; }
+            loadAll(key, function () {
+                if (key !== state.key) return;
+                var sec = section(key), needle = state.filter.toLowerCase(), view = [];
+                for (var i = 0; i < sec.rows; i++) {
+                    var r = rowAt(key, i);
+                    if (!r) continue;  // chunk failed to load
+                    if (!needle || r[1].toLowerCase().indexOf(needle) >= 0 || String(r[0]).toLowerCase().indexOf(needle) >= 0) view.push(i);
+                }
+                if (state.sort !== null) {
+                    var col = state.sort, dir = state.desc ? -1 : 1;
+                    view.sort(function (a, b) {
+                        var x = sortValue(rowAt(key, a), col), y = sortValue(rowAt(key, b), col);
+                        if (x === y) return a - b;
+                        if (x === null) return 1;
+                        if (y === null) return -1;
+                        return (x < y ? -1 : 1) * dir;
+                    });
+                }
+                state.view = view; state.page = 0; status('');
+                render();
+            });
+        }
+
+        // Virtual scrolling: only the rows inside the viewport (plus overscan) exist in the DOM
+        function render() {
+            var total = viewLength(), start = state.page * PAGE_SIZE;
+            var count = Math.max(0, Math.min(PAGE_SIZE, total - start));
+            spacer.style.height = (count * ROW_H) + 'px';
+            document.getElementById('pageinfo').textContent = total
+                ? 'Rows ' + (start + 1).toLocaleString() + '-' + (start + count).toLocaleString() + ' of ' + total.toLocaleString() + ' (page ' + (state.page + 1) + ' / ' + pageCount() + ')'
+                : 'No rows';
+            var first = Math.max(0, Math.floor(viewport.scrollTop / ROW_H) - OVERSCAN);
+            var last = Math.min(count, Math.ceil((viewport.scrollTop + viewport.clientHeight) / ROW_H) + OVERSCAN);
+            var frag = document.createDocumentFragment(), missing = {};
+            for (var i = first; i < last; i++) {
+                var idx = state.view ? state.view[start + i] : start + i;
+                var r = rowAt(state.key, idx), el = document.createElement('div');
+                var loaded = !!store[state.key][Math.floor(idx / M.chunk_rows)];
+                el.className = r ? 'row' : 'row loading';
+                el.style.top = (i * ROW_H) + 'px';
+                var cells = r ? [r[0], r[1], fmtSize(r[2]), fmtDate(r[3])] : ['', loaded ? 'unavailable' : 'loading...', '', ''];
+                cells.forEach(function (text) { var c = document.createElement('span'); c.textContent = text; c.title = text; el.appendChild(c); });
+                frag.appendChild(el);
+                if (!loaded) missing[Math.floor(idx / M.chunk_rows)] = true;
+            }
+            while (spacer.firstChild) spacer.removeChild(spacer.firstChild);
+            spacer.appendChild(frag);
+            var key = state.key;
+            Object.keys(missing).forEach(function (c) { loadChunk(key, +c, function () { if (key === state.key) render(); }); });
+        }
+
+        function select(key) {
+            state.key = key; state.view = null; state.page = 0; viewport.scrollTop = 0;
+            Array.prototype.forEach.call(document.querySelectorAll('#tabs button'), function (b) {
+                b.className = b.getAttribute('data-key') === key ? 'active' : '';
+            });
+            rebuildView();
+        }
+
+        M.sections.forEach(function (s) {
+            var b = document.createElement('button');
+            b.setAttribute('data-key', s.key);
+            b.textContent = s.title + ' (' + s.rows.toLocaleString() + ')';
+            b.onclick = function () { select(s.key); };
+            document.getElementById('tabs').appendChild(b);
+        });
+
+        var timer = null;
+        document.getElementById('filter').oninput = function (e) {
+            clearTimeout(timer);
+            timer = setTimeout(function () { state.filter = e.target.value; viewport.scrollTop = 0; rebuildView(); }, 250);
+        };
+        Array.prototype.forEach.call(document.querySelectorAll('.grid-head span'), function (h) {
+            h.onclick = function () {
+                var col = +h.getAttribute('data-sort');
+                state.desc = state.sort === col ? !state.desc : false;
+                state.sort = col; viewport.scrollTop = 0; rebuildView();
+            };
+        });
+        document.getElementById('prev').onclick = function () { if (state.page > 0) { state.page--; viewport.scrollTop = 0; render(); } };
+        document.getElementById('next').onclick = function () { if (state.page < pageCount() - 1) { state.page++; viewport.scrollTop = 0; render(); } };
+        viewport.onscroll = function () { window.requestAnimationFrame(render); };
+
+        var firstNonEmpty = M.sections.filter(function (s) { return s.rows; })[0] || M.sections[0];
+        select(firstNonEmpty.key);
+    })();
+    </script>
+</body>
+</html>
+"""
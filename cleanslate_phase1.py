@@ -6,13 +6,14 @@ Now includes configuration file support and report generation.
 """
 
 import os
-import hashlib
 import datetime
 import json
 from pathlib import Path
-from typing import Dict, List, Set, Tuple
+from typing import Dict, Iterator, List, Set, Tuple
 from collections import defaultdict
 
+from cleanslate_hashing import hash_file, resolve_algorithm
+
 
 # =============================================================================
 # CONFIGURATION MANAGEMENT
@@ -209,31 +210,31 @@ def collect_file_metadata(file_path: Path) -> Dict:
 # DETECTION RULES
 # =============================================================================
 
-def detect_duplicates(files_metadata: List[Dict]) -> Dict[str, List[Dict]]:
+def detect_duplicates(files_metadata: List[Dict], hash_algorithm: str = "auto") -> Dict[str, List[Dict]]:
     """
-    Detect duplicate files based on MD5 hash of file contents.
+    Detect duplicate files based on a hash of file contents.
     
     Args:
         files_metadata: List of file metadata dictionaries
+        hash_algorithm: Config 'hash_algorithm' value ('auto' picks the fastest installed)
         
     Returns:
         Dictionary mapping hash to list of duplicate files
     """
     hash_to_files = defaultdict(list)
+    algorithm = resolve_algorithm(hash_algorithm)
     
     for file_info in files_metadata:
         if file_info is None:
             continue
             
-        try:
-            # Calculate MD5 hash of file contents
-            with open(file_info['path'], 'rb') as f:
-                file_hash = hashlib.md5(f.read()).hexdigest()
-            
-            hash_to_files[file_hash].append(file_info)
-            
-        except (OSError, PermissionError) as e:
-            print(f"Warning: Cannot read file for hash calculation {file_info['path']}: {e}")
+        # Hash file contents in chunks (never the whole file in memory)
+        file_hash = hash_file(file_info['path'], algorithm)
+        if file_hash is None:
+            print(f"Warning: Cannot read file for hash calculation {file_info['path']}")
+            continue
+        
+        hash_to_files[file_hash].append(file_info)
     
     # Return only hashes with multiple files (duplicates)
     return {hash_val: files for hash_val, files in hash_to_files.items() 
@@ -297,6 +298,7 @@ def generate_report(scan_start_time: datetime.datetime, total_files: int,
                    config: Dict) -> None:
     """
     Generate a comprehensive report and save it to file.
+    Lines are streamed to a buffered file handle, so memory does not grow with the report.
     
     Args:
         scan_start_time: When the scan started
@@ -306,95 +308,112 @@ def generate_report(scan_start_time: datetime.datetime, total_files: int,
         old_files: List of old files
         config: Configuration dictionary
     """
-    report_lines = []
+    # Write report to file
+    try:
+        with open(REPORT_FILE, 'w', encoding='utf-8', buffering=1024 * 1024) as f:
+            separator = ''
+            for line in iter_report_lines(scan_start_time, total_files, duplicates,
+                                          large_files, old_files, config):
+                f.write(separator)
+                f.write(line)
+                separator = '\n'
+        print(f"\n📄 Report saved to '{REPORT_FILE}'")
+    except IOError as e:
+        print(f"Warning: Could not save report file: {e}")
+
+
+def iter_report_lines(scan_start_time: datetime.datetime, total_files: int,
+                      duplicates: Dict, large_files: List, old_files: List,
+                      config: Dict) -> Iterator[str]:
+    """
+    Yield the report line by line (without newlines).
+    
+    Args:
+        Same as generate_report
+        
+    Yields:
+        Report lines in output order
+    """
     
     # Header
-    report_lines.append("🧹 CleanSlate Phase 2 - File Scanner Report")
-    report_lines.append("=" * 80)
-    report_lines.append(f"Scan Date: {scan_start_time.strftime('%Y-%m-%d %H:%M:%S')}")
-    report_lines.append(f"Configuration: {CONFIG_FILE}")
-    report_lines.append("=" * 80)
+    yield "🧹 CleanSlate Phase 2 - File Scanner Report"
+    yield "=" * 80
+    yield f"Scan Date: {scan_start_time.strftime('%Y-%m-%d %H:%M:%S')}"
+    yield f"Configuration: {CONFIG_FILE}"
+    yield "=" * 80
     
     # Configuration summary
-    report_lines.append("\n📋 CONFIGURATION SUMMARY")
-    report_lines.append("-" * 40)
-    report_lines.append(f"Directories scanned: {len(config['directories_to_scan'])}")
+    yield "\n📋 CONFIGURATION SUMMARY"
+    yield "-" * 40
+    yield f"Directories scanned: {len(config['directories_to_scan'])}"
     for dir_path in config['directories_to_scan']:
-        report_lines.append(f"  - {dir_path}")
-    report_lines.append(f"Large file threshold: {config['large_file_threshold_mb']} MB")
-    report_lines.append(f"Old file threshold: {config['old_file_threshold_days']} days")
-    report_lines.append(f"Excluded folders: {config['excluded_folders']}")
-    report_lines.append(f"Excluded file types: {config['excluded_file_types']}")
+        yield f"  - {dir_path}"
+    yield f"Large file threshold: {config['large_file_threshold_mb']} MB"
+    yield f"Old file threshold: {config['old_file_threshold_days']} days"
+    yield f"Excluded folders: {config['excluded_folders']}"
+    yield f"Excluded file types: {config['excluded_file_types']}"
     
     # Scan summary
-    report_lines.append("\n📊 SCAN SUMMARY")
-    report_lines.append("-" * 40)
-    report_lines.append(f"Total files scanned: {total_files}")
-    report_lines.append(f"Duplicate groups found: {len(duplicates)}")
-    report_lines.append(f"Large files found: {len(large_files)}")
-    report_lines.append(f"Old files found: {len(old_files)}")
+    yield "\n📊 SCAN SUMMARY"
+    yield "-" * 40
+    yield f"Total files scanned: {total_files}"
+    yield f"Duplicate groups found: {len(duplicates)}"
+    yield f"Large files found: {len(large_files)}"
+    yield f"Old files found: {len(old_files)}"
     
     total_flagged = len(large_files) + len(old_files)
     for duplicate_group in duplicates.values():
         total_flagged += len(duplicate_group) - 1  # Count duplicates (excluding original)
     
-    report_lines.append(f"Total flagged files: {total_flagged}")
+    yield f"Total flagged files: {total_flagged}"
     
     # Duplicate files section
     if duplicates:
-        report_lines.append(f"\n🔍 DUPLICATE FILES ({len(duplicates)} groups)")
-        report_lines.append("=" * 80)
+        yield f"\n🔍 DUPLICATE FILES ({len(duplicates)} groups)"
+        yield "=" * 80
         
         for hash_val, files in duplicates.items():
-            report_lines.append(f"\n📁 Duplicate Group (Hash: {hash_val[:8]}...):")
+            yield f"\n📁 Duplicate Group (Hash: {hash_val[:8]}...):"
             for i, file_info in enumerate(files, 1):
-                report_lines.append(f"  {i}. {file_info['absolute_path']}")
-                report_lines.append(f"     Size: {file_info['size_mb']} MB")
-                report_lines.append(f"     Last accessed: {file_info['accessed_date'].strftime('%Y-%m-%d %H:%M')}")
-                report_lines.append(f"     Last modified: {file_info['modified_date'].strftime('%Y-%m-%d %H:%M')}")
+                yield f"  {i}. {file_info['absolute_path']}"
+                yield f"     Size: {file_info['size_mb']} MB"
+                yield f"     Last accessed: {file_info['accessed_date'].strftime('%Y-%m-%d %H:%M')}"
+                yield f"     Last modified: {file_info['modified_date'].strftime('%Y-%m-%d %H:%M')}"
     else:
-        report_lines.append("\n✅ No duplicate files found.")
+        yield "\n✅ No duplicate files found."
     
     # Large files section
     if large_files:
-        report_lines.append(f"\n📏 LARGE FILES (> {config['large_file_threshold_mb']} MB)")
-        report_lines.append("=" * 80)
+        yield f"\n📏 LARGE FILES (> {config['large_file_threshold_mb']} MB)"
+        yield "=" * 80
         
         for file_info in large_files:
-            report_lines.append(f"\n📄 {file_info['absolute_path']}")
-            report_lines.append(f"   Size: {file_info['size_mb']} MB")
-            report_lines.append(f"   Last accessed: {file_info['accessed_date'].strftime('%Y-%m-%d %H:%M')}")
-            report_lines.append(f"   Last modified: {file_info['modified_date'].strftime('%Y-%m-%d %H:%M')}")
+            yield f"\n📄 {file_info['absolute_path']}"
+            yield f"   Size: {file_info['size_mb']} MB"
+            yield f"   Last accessed: {file_info['accessed_date'].strftime('%Y-%m-%d %H:%M')}"
+            yield f"   Last modified: {file_info['modified_date'].strftime('%Y-%m-%d %H:%M')}"
     else:
-        report_lines.append(f"\n✅ No files larger than {config['large_file_threshold_mb']} MB found.")
+        yield f"\n✅ No files larger than {config['large_file_threshold_mb']} MB found."
     
     # Old files section
     if old_files:
-        report_lines.append(f"\n⏰ OLD FILES (> {config['old_file_threshold_days']} days since last access)")
-        report_lines.append("=" * 80)
+        yield f"\n⏰ OLD FILES (> {config['old_file_threshold_days']} days since last access)"
+        yield "=" * 80
         
         current_date = datetime.datetime.now()
         for file_info in old_files:
             days_old = (current_date - file_info['accessed_date']).days
-            report_lines.append(f"\n📄 {file_info['absolute_path']}")
-            report_lines.append(f"   Size: {file_info['size_mb']} MB")
-            report_lines.append(f"   Last accessed: {file_info['accessed_date'].strftime('%Y-%m-%d %H:%M')} ({days_old} days ago)")
-            report_lines.append(f"   Last modified: {file_info['modified_date'].strftime('%Y-%m-%d %H:%M')}")
+            yield f"\n📄 {file_info['absolute_path']}"
+            yield f"   Size: {file_info['size_mb']} MB"
+            yield f"   Last accessed: {file_info['accessed_date'].strftime('%Y-%m-%d %H:%M')} ({days_old} days ago)"
+            yield f"   Last modified: {file_info['modified_date'].strftime('%Y-%m-%d %H:%M')}"
     else:
-        report_lines.append(f"\n✅ No files older than {config['old_file_threshold_days']} days found.")
+        yield f"\n✅ No files older than {config['old_file_threshold_days']} days found."
     
     # Footer
-    report_lines.append("\n" + "=" * 80)
-    report_lines.append("✅ Scan complete! No files were modified or deleted.")
-    report_lines.append("💡 This is Phase 2 - scanning, flagging, and reporting.")
-    
-    # Write report to file
-    try:
-        with open(REPORT_FILE, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(report_lines))
-        print(f"\n📄 Report saved to '{REPORT_FILE}'")
-    except IOError as e:
-        print(f"Warning: Could not save report file: {e}")
+    yield "\n" + "=" * 80
+    yield "✅ Scan complete! No files were modified or deleted."
+    yield "💡 This is Phase 2 - scanning, flagging, and reporting."
 
 
 # =============================================================================
@@ -514,7 +533,7 @@ def main():
     
     # Step 3: Apply detection rules
     print("🔍 Applying detection rules...")
-    duplicates = detect_duplicates(files_metadata)
+    duplicates = detect_duplicates(files_metadata, config.get('hash_algorithm', 'auto'))
     large_files = detect_large_files(files_metadata, config['large_file_threshold_mb'])
     old_files = detect_old_files(files_metadata, config['old_file_threshold_days'])
     
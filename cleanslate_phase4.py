@@ -7,7 +7,6 @@ Advanced file analysis with AI-powered content detection and media optimization.
 import os
 import sys
 import json
-import hashlib
 import mimetypes
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
@@ -20,56 +19,88 @@ from sklearn.cluster import DBSCAN
 from sklearn.feature_extraction.text import TfidfVectorizer
 import jieba
 import re
+from contextlib import nullcontext
 
 # Add current directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
 from cleanslate_core import (
-    load_config, save_config, run_scan,
+    load_config, save_config, run_scan, write_scan_outputs, finish_metrics,
     REPORT_FILE, REPORT_HTML_FILE
 )
+from cleanslate_hashing import hash_file, resolve_algorithm
+from cleanslate_metrics import ScanMetrics
 
 class AIAnalyzer:
     """AI-powered file analysis and content detection."""
     
-    def __init__(self):
+    def __init__(self, metrics: Optional[ScanMetrics] = None, hash_algorithm: Optional[str] = None):
         """Initialize AI analyzer with models and settings."""
         self.content_cache = {}
         self.similarity_threshold = 0.85
         self.cluster_eps = 0.3
         self.min_samples = 2
+        self.metrics = metrics
+        # Same content hash as the base scan, so one run never hashes a file twice
+        self.hash_algorithm = resolve_algorithm(hash_algorithm)
+        self.known_hashes: Dict[str, str] = {}
+
+    def use_scan_hashes(self, content_hashes: Dict[str, str], algorithm: Optional[str]) -> None:
+        """Reuse digests computed by run_scan (ignored if they used another algorithm)."""
+        if algorithm == self.hash_algorithm:
+            self.known_hashes.update(content_hashes)
+    
+    def _stage(self, name: str):
+        """Time a block as a metrics stage when metrics are enabled."""
+        return self.metrics.stage(name) if self.metrics is not None else nullcontext()
         
     def analyze_file_content(self, file_path: str) -> Dict[str, Any]:
         """Analyze file content and extract features."""
-        if file_path in self.content_cache:
-            return self.content_cache[file_path]
+        cached = self.content_cache.get(file_path)
+        if cached is not None and cached.get('hash_algorithm') == self.hash_algorithm:
+            if self.metrics is not None:
+                self.metrics.incr("cache_hits")
+            return cached
+        
+        with self._stage("ai_hash"):
+            content_hash = self._generate_content_hash(file_path)
+        with self._stage("ai_metadata"):
+            metadata = self._extract_metadata(file_path)
             
         analysis = {
             'file_type': self._detect_file_type(file_path),
-            'content_hash': self._generate_content_hash(file_path),
+            'content_hash': content_hash,
+            'hash_algorithm': self.hash_algorithm,
             'text_features': None,
             'image_features': None,
             'audio_features': None,
             'video_features': None,
-            'metadata': self._extract_metadata(file_path),
+            'metadata': metadata,
             'ai_score': 0.0
         }
         
         # Text analysis
         if analysis['file_type']['category'] == 'text':
-            analysis['text_features'] = self._analyze_text_content(file_path)
+            with self._stage("ai_text"):
+                analysis['text_features'] = self._analyze_text_content(file_path)
             
         # Image analysis
         elif analysis['file_type']['category'] == 'image':
-            analysis['image_features'] = self._analyze_image_content(file_path)
+            with self._stage("ai_image_decode"):
+                analysis['image_features'] = self._analyze_image_content(file_path)
             
         # Audio analysis
         elif analysis['file_type']['category'] == 'audio':
-            analysis['audio_features'] = self._analyze_audio_content(file_path)
+            with self._stage("ai_audio"):
+                analysis['audio_features'] = self._analyze_audio_content(file_path)
             
         # Video analysis
         elif analysis['file_type']['category'] == 'video':
-            analysis['video_features'] = self._analyze_video_content(file_path)
+            with self._stage("ai_video"):
+                analysis['video_features'] = self._analyze_video_content(file_path)
+        
+        if self.metrics is not None:
+            self.metrics.incr("ai_files_analyzed")
             
         # Calculate AI score
         analysis['ai_score'] = self._calculate_ai_score(analysis)
@@ -114,12 +145,12 @@ class AIAnalyzer:
     
     def _generate_content_hash(self, file_path: str) -> str:
         """Generate content-based hash."""
-        try:
-            with open(file_path, 'rb') as f:
-                content = f.read()
-                return hashlib.sha256(content).hexdigest()
-        except Exception:
-            return ""
+        known = self.known_hashes.get(file_path)
+        if known:
+            if self.metrics is not None:
+                self.metrics.incr("cache_hits")
+            return known
+        return hash_file(file_path, self.hash_algorithm, metrics=self.metrics) or ""
     
     def _extract_metadata(self, file_path: str) -> Dict[str, Any]:
         """Extract file metadata."""
@@ -371,19 +402,27 @@ class AIAnalyzer:
         texts = []
         valid_files = []
         
-        for file_path in text_files:
-            try:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    if len(content.strip()) > 50:  # Only consider files with substantial content
-                        texts.append(content)
-                        valid_files.append(file_path)
-            except Exception:
-                continue
+        with self._stage("ai_text_read"):
+            for file_path in text_files:
+                try:
+                    with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                        content = f.read()
+                        if len(content.strip()) > 50:  # Only consider files with substantial content
+                            texts.append(content)
+                            valid_files.append(file_path)
+                except Exception:
+                    if self.metrics is not None:
+                        self.metrics.incr("errors_skipped")
+                    continue
         
         if len(texts) < 2:
             return {}
         
+        with self._stage("tfidf"):
+            return self._group_similar_texts(texts, valid_files)
+    
+    def _group_similar_texts(self, texts: List[str], valid_files: List[str]) -> Dict[str, List[str]]:
+        """Group texts whose TF-IDF cosine similarity exceeds the threshold."""
         # Use TF-IDF for similarity
         try:
             vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
@@ -709,13 +748,15 @@ def run_phase4_scan(config: Dict) -> Dict[str, Any]:
     print("=" * 80)
     
     # Initialize AI components
-    ai_analyzer = AIAnalyzer()
+    metrics = ScanMetrics("phase4")
+    ai_analyzer = AIAnalyzer(metrics, config.get("hash_algorithm"))
     media_optimizer = MediaOptimizer()
     advanced_reporter = AdvancedReporter(ai_analyzer)
     
     # Run base scan
     print("📊 Running base scan...")
-    base_results = run_scan(config)
+    base_results = run_scan(config, metrics)
+    ai_analyzer.use_scan_hashes(base_results.get("content_hashes", {}), base_results.get("hash_algorithm"))
     
     # Get all scanned files
     all_files = []
@@ -741,18 +782,21 @@ def run_phase4_scan(config: Dict) -> Dict[str, Any]:
     content_duplicates = ai_analyzer.find_content_duplicates(unique_files)
     
     # Generate AI report
-    ai_report = advanced_reporter.generate_ai_report(base_results, analyses)
-    
-    # Save AI report
-    ai_report_file = "CleanSlate_AI_Report.txt"
-    with open(ai_report_file, 'w', encoding='utf-8') as f:
-        f.write(ai_report)
+    with metrics.stage("report_ai"):
+        ai_report = advanced_reporter.generate_ai_report(base_results, analyses)
+        
+        # Save AI report
+        ai_report_file = "CleanSlate_AI_Report.txt"
+        with open(ai_report_file, 'w', encoding='utf-8') as f:
+            f.write(ai_report)
     
     # Enhanced results
     enhanced_results = base_results.copy()
     enhanced_results['ai_analyses'] = analyses
     enhanced_results['content_duplicates'] = content_duplicates
     enhanced_results['ai_report'] = ai_report
+    write_scan_outputs(enhanced_results, config, metrics)
+    finish_metrics(metrics, enhanced_results, config.get("metrics_json"))
     
     print("✅ Phase 4 scan complete!")
     print(f"📄 AI Report saved to: {ai_report_file}")
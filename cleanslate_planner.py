@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+LocalMind Planner - Ranked cleanup plans from scan findings
+A scan flags files for several reasons (duplicate, near-duplicate image, large, old, empty,
+blurry) and the same file is often flagged more than once. The planner merges the findings
+into one entry per file, applies the user's constraints, and ranks what is left by the
+space it frees, so the top of the plan is where trashing pays off most:
+
+    plan = plan_cleanup(results, keep="newest", keep_in=["~/Documents/Originals"], root=scan_path)
+    trasher.run(plan.trash_plan().paths, expected=plan.expected())
+
+Constraints:
+    keep      which copy of a duplicate / near-duplicate group survives: "newest", "oldest"
+              or "first" (scan order). Every group always keeps one copy.
+    keep_in   folders whose files are never trashed; a group keeps its copy from there
+              when it has one.
+    limit / target_bytes
+              stop after `limit` files (a hard-linked file counts once), or once
+              `target_bytes` would be freed. Taking the files that free the most first
+              frees the most bytes for any file budget.
+
+Hard links are one file: all links are trashed together (the space is only freed when
+the last link goes) and the bytes are counted once. Planning is a few passes over the
+findings plus one sort (a heap for `limit`), so millions of candidates plan in seconds.
+"""
+
+import heapq
+import os
+import time
+from itertools import islice
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from cleanslate_logging import get_logger
+from cleanslate_trash import TrashPlan
+
+logger = get_logger("planner")
+
+FileStats = Dict[str, Tuple[int, float]]
+
+CATEGORIES = ("duplicate", "near_duplicate", "large", "old", "empty", "blurry")
+KEEP_RULES = ("newest", "oldest", "first")
+
+# Categories of a file are a bitmask while planning; _REASONS decodes every mask once
+_BITS = {category: 1 << i for i, category in enumerate(CATEGORIES)}
+_REASONS = [tuple(c for c in CATEGORIES if mask & _BITS[c]) for mask in range(1 << len(CATEGORIES))]
+_COUNTS = [len(reasons) for reasons in _REASONS]
+_NO_STAT = (0, 0.0)
+
+# results key -> category, for findings that are plain path lists
+_FILE_FINDINGS = (("large_files", "large"), ("old_files", "old"), ("empty_files", "empty"),
+                  ("blurry_files", "blurry"))
+
+
+class PlanEntry(NamedTuple):
+    path: str
+    size: int                # size on disk as scanned
+    mtime: float
+    freed: int               # bytes freed by trashing it (0 for the extra links of a hard-linked file)
+    reasons: Tuple[str, ...]
+    kept_copy: Optional[str]  # the surviving copy, for duplicates and near-duplicates
+
+
+class CleanupPlan:
+    """Ranked plan (most space freed first); each file appears once.
+
+    Entries are produced on demand from the ranked units, so a plan over millions of
+    files costs one tuple per file until it is listed or executed.
+    """
+
+    def __init__(self, units: List[Tuple[int, int, int, str]], file_stats: FileStats,
+                 links_of: Dict[str, List[str]], kept: Dict[str, str], candidates: int):
+        self._units = units          # ranked (bytes freed, reason count, reason bits, path)
+        self._file_stats = file_stats
+        self._links_of = links_of    # hard-link owner -> all its links
+        self._kept = kept            # trashed group member -> copy that stays
+        self.candidates = candidates  # files flagged before constraints and limits
+        self.total_bytes = sum(unit[0] for unit in units)
+        self.file_count = len(units)
+        if links_of:
+            self.file_count += sum(len(links_of[unit[3]]) - 1 for unit in units if unit[3] in links_of)
+
+    def __len__(self) -> int:
+        return self.file_count
+
+    def __iter__(self) -> Iterator[PlanEntry]:
+        for freed, _, mask, owner in self._units:
+            reasons = _REASONS[mask]
+            for i, path in enumerate(self._links_of.get(owner) or (owner,)):
+                size, mtime = self._file_stats.get(path, _NO_STAT)
+                yield PlanEntry(path, size, mtime, freed if i == 0 else 0, reasons, self._kept.get(path))
+
+    def top(self, count: int) -> List[PlanEntry]:
+        return list(islice(self, count))
+
+    def paths(self) -> List[str]:
+        if not self._links_of:
+            return [unit[3] for unit in self._units]
+        return [path for unit in self._units for path in self._links_of.get(unit[3]) or (unit[3],)]
+
+    def summary(self) -> str:
+        return (f"Cleanup plan: {self.file_count:,} files, {self.total_bytes / 1024 / 1024:,.1f} MB reclaimable "
+                f"({self.candidates:,} flagged)")
+
+    def expected(self) -> FileStats:
+        """path -> (size, mtime) as planned, for BulkTrasher to skip files changed since."""
+        stats = self._file_stats
+        return {path: stats[path] for path in self.paths() if path in stats}
+
+    def trash_plan(self, description: Optional[str] = None) -> TrashPlan:
+        return TrashPlan(description or self.summary(), self.paths(), self.total_bytes)
+
+
+def is_within(path: str, folder: str) -> bool:
+    """True if path is folder or inside it (both made absolute)."""
+    path, folder = os.path.abspath(path), os.path.abspath(folder)
+    return path == folder or path.startswith(folder.rstrip(os.sep) + os.sep)
+
+
+def _prefixes(folders: Iterable[str], root: Optional[str]) -> Tuple[str, ...]:
+    """Every spelling of the folders a scan path may start with (as given, absolute, root-relative)."""
+    spellings = set()
+    for folder in folders:
+        folder = os.path.expanduser(folder)
+        absolute = os.path.abspath(folder)
+        spellings.update((folder, absolute))
+        if root is not None and is_within(absolute, root):
+            relative = os.path.relpath(absolute, os.path.abspath(root))
+            spellings.add(root if relative == os.curdir else os.path.join(root, relative))
+    return tuple(s.rstrip(os.sep) + os.sep for s in spellings if s)
+
+
+def _groups(value: Any) -> List[Sequence[str]]:
+    """Group findings come as a list of groups (scan_folder) or a dict of them (run_scan)."""
+    if not value:
+        return []
+    return list(value.values()) if isinstance(value, dict) else list(value)
+
+
+def stat_findings(file_stats: FileStats, size_mb: int, age_days: int,
+                  now: Optional[float] = None) -> Dict[str, List[str]]:
+    """Large, old and empty files from an inventory alone (no scan report needed)."""
+    min_size = size_mb * 1024 * 1024
+    cutoff = (now if now is not None else time.time()) - age_days * 86400
+    large, old, empty = [], [], []
+    for path, (size, mtime) in file_stats.items():
+        if size > min_size:
+            large.append(path)
+        if mtime < cutoff:
+            old.append(path)
+        if size == 0:
+            empty.append(path)
+    return {"large_files": large, "old_files": old, "empty_files": empty}
+
+
+def plan_cleanup(results: Dict[str, Any], keep: str = "newest", keep_in: Iterable[str] = (),
+                 root: Optional[str] = None, categories: Iterable[str] = CATEGORIES,
+                 under: Optional[str] = None, limit: Optional[int] = None,
+                 target_bytes: Optional[int] = None) -> CleanupPlan:
+    """Merge the findings of scan results into one ranked plan.
+
+    results is scan_folder or run_scan output (file_stats, hardlinks and whichever of
+    duplicates, near_duplicates, large_files, old_files, empty_files, blurry_files it has).
+    root is the scanned folder as passed to the scan, so keep_in and under folders match
+    its path spelling. under restricts the plan to files inside one folder.
+    """
+    if keep not in KEEP_RULES:
+        raise ValueError(f"keep must be one of {', '.join(KEEP_RULES)}")
+    wanted = set(categories)
+    unknown = wanted.difference(CATEGORIES)
+    if unknown:
+        raise ValueError(f"unknown categories: {', '.join(sorted(unknown))}")
+    file_stats: FileStats = results.get("file_stats") or {}
+    protected = _prefixes(keep_in, root)
+    inside = _prefixes([under], root) if under is not None else None
+
+    # path -> bitmask of categories (bit i = CATEGORIES[i]); merging a finding is one OR
+    reasons: Dict[str, int] = {}
+    kept: Dict[str, str] = {}
+    pinned = set()  # copies that stay: never trashed, whatever else flags them
+
+    def keeper(group: Sequence[str]) -> str:
+        pool = [p for p in group if p.startswith(protected)] if protected else None
+        pool = pool or group
+        if keep == "first":
+            return pool[0]
+        # max/min keep the first of equal mtimes, so ties go to scan order
+        pick = max if keep == "newest" else min
+        return pick(pool, key=lambda p: file_stats.get(p, _NO_STAT)[1])
+
+    for key, category in (("duplicates", "duplicate"), ("near_duplicates", "near_duplicate")):
+        if category not in wanted:
+            continue
+        bit = _BITS[category]
+        for group in _groups(results.get(key)):
+            if len(group) < 2:
+                continue
+            survivor = keeper(group)
+            pinned.add(survivor)
+            for path in group:
+                if path != survivor:
+                    reasons[path] = reasons.get(path, 0) | bit
+                    kept.setdefault(path, survivor)
+    for key, category in _FILE_FINDINGS:
+        if category in wanted:
+            bit = _BITS[category]
+            for path in results.get(key) or ():
+                reasons[path] = reasons.get(path, 0) | bit
+    candidates = len(reasons)
+
+    # Hard links move as one unit, keyed by the link the scan kept
+    links_of: Dict[str, List[str]] = {}
+    owner_of: Dict[str, str] = {}
+    for owner, links in (results.get("hardlinks") or {}).items():
+        links_of[owner] = [owner, *links]
+        for link in links:
+            owner_of[link] = owner
+
+    def allowed(path: str) -> bool:
+        return (path not in pinned and not (protected and path.startswith(protected))
+                and (inside is None or path.startswith(inside)))
+
+    units: List[Tuple[int, int, int, str]] = []  # (bytes freed, reason count, reason bits, owner)
+    seen = set()
+    for path, mask in reasons.items():
+        owner = owner_of.get(path, path)
+        members = links_of.get(owner)
+        if members is None:
+            # The common case: a file without other links
+            if allowed(path):
+                units.append((file_stats.get(path, _NO_STAT)[0], _COUNTS[mask], mask, path))
+            continue
+        if owner in seen:
+            continue
+        seen.add(owner)
+        if all(allowed(m) for m in members):
+            for m in members:
+                mask |= reasons.get(m, 0)
+            units.append((file_stats.get(owner, _NO_STAT)[0], _COUNTS[mask], mask, owner))
+
+    # Plain tuple order: most bytes, then most reasons (no key function on millions of items)
+    if limit is not None and target_bytes is None:
+        units = heapq.nlargest(limit, units)
+    else:
+        units.sort(reverse=True)
+        if limit is not None:
+            del units[limit:]
+    if target_bytes is not None:
+        freed = 0
+        for taken, unit in enumerate(units):
+            if freed >= target_bytes:
+                del units[taken:]
+                break
+            freed += unit[0]
+
+    plan = CleanupPlan(units, file_stats, links_of, kept, candidates)
+    logger.info("%s (keep=%s, keep_in=%s)", plan.summary(), keep, list(keep_in))
+    return plan
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+LocalMind Plugins - Custom detectors over the shared scan inventory
+A plugin is a DetectorPlugin subclass. It sees every file of the scan once as a
+FileRecord (path, size, mtime, ext), asks for the features it needs through
+record.feature(...), and returns its findings from finish(). Walking, stat'ing and
+feature extraction are shared with the built-in detectors and other plugins, so a
+plugin adds no extra directory walks and reads a file at most once per feature.
+
+Example (my_rules.py):
+
+    from cleanslate_plugins import DetectorPlugin
+
+    class HugeTextFiles(DetectorPlugin):
+        name = "huge_text"
+        features = ("text_stats",)
+
+        def applies_to(self, record):
+            return record.ext in (".txt", ".log")
+
+        def process(self, record):
+            stats = record.feature("text_stats")
+            if stats and stats["lines"] > 1_000_000:
+                self.flag(record.path)
+
+Enable it in config.json with  "plugins": ["my_rules"]  (or "my_rules:HugeTextFiles",
+or a path to a .py file). Findings appear under results["plugin_findings"]["huge_text"].
+"""
+
+import importlib
+import importlib.util
+import inspect
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from cleanslate_inventory import FEATURES, FileRecord, ScanInventory
+from cleanslate_logging import get_logger
+from cleanslate_metrics import ScanMetrics
+
+# Need levels in cost order (mirrors the detector registry in cleanslate_core)
+_NEED_ORDER = ("stat", "partial", "full", "image")
+
+logger = get_logger("plugins")
+
+
+class DetectorPlugin:
+    """Base class for custom detectors.
+
+    Class attributes:
+        name         unique detector name (also the results key)
+        features     feature names the plugin will request (see cleanslate_inventory)
+        description  one line for listings
+
+    Override process() (per file) and optionally applies_to() and finish(). By default
+    findings are the list of paths passed to flag(), or a {group: [paths]} dict when
+    flag() is given a group name.
+    """
+
+    name: str = ""
+    features: tuple = ()
+    description: str = ""
+
+    def __init__(self, config: Dict[str, Any]):
+        self.config = config
+        self._flagged: List[str] = []
+        self._groups: Dict[str, List[str]] = {}
+
+    @classmethod
+    def empty(cls) -> Any:
+        """Findings reported when the plugin does not run."""
+        return []
+
+    def applies_to(self, record: FileRecord) -> bool:
+        """Cheap pre-filter (extension, size); features are only computed for matches."""
+        return True
+
+    def process(self, record: FileRecord) -> None:
+        raise NotImplementedError
+
+    def flag(self, path: str, group: Optional[str] = None) -> None:
+        """Report a path, optionally as a member of a named group."""
+        if group is None:
+            self._flagged.append(path)
+        else:
+            self._groups.setdefault(group, []).append(path)
+
+    def finish(self) -> Any:
+        """Findings after every record has been processed."""
+        if self._groups:
+            return {group: paths for group, paths in self._groups.items() if len(paths) > 1}
+        return self._flagged
+
+
+def plugin_needs(plugin_cls: type) -> str:
+    """The costliest need among the plugin's declared features ('stat' if none)."""
+    needs = "stat"
+    for feature in plugin_cls.features:
+        if feature not in FEATURES:
+            raise ValueError(f"plugin {plugin_cls.name!r} requests unknown feature {feature!r}")
+        level = FEATURES[feature][0]
+        if _NEED_ORDER.index(level) > _NEED_ORDER.index(needs):
+            needs = level
+    return needs
+
+
+def run_plugin(plugin_cls: type, inventory: ScanInventory, config: Dict[str, Any],
+               metrics: Optional[ScanMetrics] = None) -> Any:
+    """Feed every inventory record to a fresh plugin instance and return its findings.
+
+    A record that makes the plugin raise is skipped and counted in errors_skipped.
+    """
+    plugin = plugin_cls(config)
+    errors = 0
+    with (metrics.stage(f"plugin:{plugin_cls.name}") if metrics is not None else nullcontext()):
+        for record in inventory.records():
+            try:
+                if plugin.applies_to(record):
+                    plugin.process(record)
+            except Exception as e:
+                errors += 1
+                if metrics is not None:
+                    metrics.incr("errors_skipped")
+                if errors <= 5:
+                    logger.warning("plugin %s failed on %s: %s", plugin_cls.name, record.path, e)
+        return plugin.finish()
+
+
+def _plugin_classes(module: Any) -> List[type]:
+    explicit = getattr(module, "PLUGINS", None)
+    if explicit is not None:
+        return list(explicit)
+    return [obj for _, obj in inspect.getmembers(module, inspect.isclass)
+            if issubclass(obj, DetectorPlugin) and obj is not DetectorPlugin
+            and obj.__module__ == module.__name__]
+
+
+def _import_module(spec: str) -> Any:
+    if spec.endswith(".py"):
+        path = Path(spec)
+        module_spec = importlib.util.spec_from_file_location(f"localmind_plugin_{path.stem}", path)
+        if module_spec is None or module_spec.loader is None:
+            raise ImportError(f"cannot load plugin file {spec}")
+        module = importlib.util.module_from_spec(module_spec)
+        module_spec.loader.exec_module(module)
+        return module
+    return importlib.import_module(spec)
+
+
+def load_plugins(specs: List[str]) -> List[type]:
+    """Import plugin classes from 'module', 'module:Class' or 'path/to/file.py' specs.
+
+    A module contributes its PLUGINS list if it has one, else every DetectorPlugin
+    subclass it defines. Raises ImportError / ValueError for bad specs.
+    """
+    classes: List[type] = []
+    for spec in specs:
+        module_name, sep, class_name = spec.rpartition(":")
+        if not sep or not class_name.isidentifier():  # no class given (or a drive letter)
+            module_name, class_name = spec, ""
+        module = _import_module(module_name)
+        found = [getattr(module, class_name)] if class_name else _plugin_classes(module)
+        if not found:
+            raise ValueError(f"no DetectorPlugin subclasses in {spec}")
+        for plugin_cls in found:
+            if not (inspect.isclass(plugin_cls) and issubclass(plugin_cls, DetectorPlugin)):
+                raise ValueError(f"{spec}: {plugin_cls!r} is not a DetectorPlugin")
+            if not plugin_cls.name:
+                raise ValueError(f"{spec}: plugin {plugin_cls.__name__} has no name")
+            plugin_needs(plugin_cls)  # validates declared features
+            classes.append(plugin_cls)
+    return classes
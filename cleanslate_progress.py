@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+LocalMind Progress - Time-boxed batching of scan progress for the GUI
+A scan can produce findings far faster than a Tk event queue can absorb them. The scan
+thread hands lines and counters to a ProgressBatcher (list append / tuple store, no
+locking on the hot path beyond one short lock), and a small timer thread emits at most one
+batch per interval with everything that accumulated, plus throughput and an ETA.
+
+    batcher = ProgressBatcher(lambda batch: window.write_event_value(EV, batch))
+    batcher.start()
+    scan_folder(..., progress_callback=batcher.add_line, status_callback=batcher.update)
+    batcher.close()   # emits the final batch
+
+A batch is a dict:
+    lines          findings since the previous batch
+    files_done     files processed so far
+    files_total    files found by the walk (0 while walking)
+    bytes_hashed   bytes read for hashing so far
+    elapsed_s, files_per_s, mb_per_s, eta_s (None until a rate is known)
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+# Default batch interval: ~10 UI updates per second regardless of scan speed
+DEFAULT_INTERVAL_S = 0.1
+
+
+class ProgressBatcher:
+    """Coalesces progress lines and counters into batches emitted every `interval` seconds.
+
+    add_line/update may be called from the scan thread; emit runs on the batcher's own
+    timer thread (and on the caller's thread for the final flush in close()).
+    """
+
+    def __init__(self, emit: Callable[[Dict[str, Any]], None], interval: float = DEFAULT_INTERVAL_S):
+        self.emit = emit
+        self.interval = interval
+        self._lines: List[str] = []
+        self._lock = threading.Lock()
+        self._counts = (0, 0, 0)  # files_done, files_total, bytes_hashed
+        self._emitted_counts: Optional[tuple] = None
+        self._started = time.perf_counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "ProgressBatcher":
+        self._started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name="progress-batcher", daemon=True)
+        self._thread.start()
+        return self
+
+    def close(self) -> None:
+        """Stop the timer thread and emit whatever is still pending."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    def add_line(self, line: str) -> None:
+        with self._lock:
+            self._lines.append(line)
+
+    def update(self, files_done: int, files_total: int, bytes_hashed: int) -> None:
+        self._counts = (files_done, files_total, bytes_hashed)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    def flush(self) -> None:
+        """Emit one batch if anything changed since the last one."""
+        with self._lock:
+            lines, self._lines = self._lines, []
+        counts = self._counts
+        if not lines and counts == self._emitted_counts:
+            return
+        self._emitted_counts = counts
+        self.emit(self._batch(lines, counts))
+
+    def _batch(self, lines: List[str], counts: tuple) -> Dict[str, Any]:
+        files_done, files_total, bytes_hashed = counts
+        elapsed = time.perf_counter() - self._started
+        files_per_s = files_done / elapsed if elapsed > 0 else 0.0
+        eta = None
+        if files_per_s > 0 and files_total >= files_done:
+            eta = (files_total - files_done) / files_per_s
+        return {
+            "lines": lines,
+            "files_done": files_done,
+            "files_total": files_total,
+            "bytes_hashed": bytes_hashed,
+            "elapsed_s": round(elapsed, 3),
+            "files_per_s": round(files_per_s, 1),
+            "mb_per_s": round(bytes_hashed / 1024 / 1024 / elapsed, 2) if elapsed > 0 else 0.0,
+            "eta_s": round(eta, 1) if eta is not None else None,
+        }
+
+
+def _clock(seconds: float) -> str:
+    minutes, secs = divmod(int(seconds + 0.5), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes}:{secs:02d}"
+
+
+def format_status(batch: Dict[str, Any]) -> str:
+    """One status-bar line, e.g. 'Scanning 1,200/5,000 files · 850 files/s · 96.0 MB hashed · ETA 0:04'."""
+    if not batch["files_total"]:
+        return "Scanning (listing files)"
+    parts = [f"Scanning {batch['files_done']:,}/{batch['files_total']:,} files",
+             f"{batch['files_per_s']:,.0f} files/s",
+             f"{batch['bytes_hashed'] / 1024 / 1024:,.1f} MB hashed"]
+    if batch["eta_s"] is not None:
+        parts.append(f"ETA {_clock(batch['eta_s'])}")
+    return " · ".join(parts)
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+LocalMind Results - In-memory results model behind the GUI's virtualized results table
+One row per finding (large, old, duplicate), built from scan results and the scan-time
+(size, mtime) inventory, so sorting and filtering never touch the filesystem or rescan.
+The view asks for one page of rows at a time; only those rows are formatted.
+
+Sorting is instant after the first use of a key: each key's full ordering is computed
+once and cached, and the current filter is applied to it as a linear mask pass.
+Filtering is incremental: typing more characters only re-tests rows that still match.
+"""
+
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+KIND_LARGE = "Large"
+KIND_OLD = "Old"
+KIND_DUPLICATE = "Duplicate"
+KINDS = (KIND_LARGE, KIND_OLD, KIND_DUPLICATE)
+
+COLUMNS = ("Kind", "Size", "Modified", "Group", "Path")
+
+
+class ResultRow(NamedTuple):
+    kind: str
+    path: str
+    size: int
+    mtime: float
+    group: int  # duplicate group number, 0 for other findings
+
+
+# Sort key name -> (row key, descending by default)
+SORT_KEYS: Dict[str, Tuple[Callable[[ResultRow], Any], bool]] = {
+    "size": (lambda r: r.size, True),
+    "age": (lambda r: r.mtime, False),       # oldest first
+    "group": (lambda r: (r.group == 0, r.group, r.path), False),
+    "kind": (lambda r: (r.kind, -r.size), False),
+    "path": (lambda r: r.path.lower(), False),
+}
+
+# Table column index -> sort key
+COLUMN_SORT_KEYS = ("kind", "size", "age", "group", "path")
+
+
+def _size_text(size: int) -> str:
+    if size >= 1024 * 1024:
+        return f"{size / 1024 / 1024:,.1f} MB"
+    if size >= 1024:
+        return f"{size / 1024:,.1f} KB"
+    return f"{size:,} B"
+
+
+def format_row(row: ResultRow) -> List[str]:
+    """Table cells for one row."""
+    modified = datetime.fromtimestamp(row.mtime).strftime("%Y-%m-%d") if row.mtime else ""
+    return [row.kind, _size_text(row.size), modified, str(row.group) if row.group else "", row.path]
+
+
+class ResultsModel:
+    """Sortable, filterable list of findings exposing a windowed (virtual) view."""
+
+    def __init__(self, rows: List[ResultRow]):
+        self.rows = rows
+        self._haystack = [row.path.lower() for row in rows]
+        self._orders: Dict[str, List[int]] = {}
+        self.sort_key = "size"
+        self.descending = True
+        self._filter_text = ""
+        self._filter_kind: Optional[str] = None
+        self._match: Optional[bytearray] = None  # None = every row matches
+        self._view: List[int] = []
+        self._rebuild_view()
+
+    @classmethod
+    def from_scan(cls, results: Dict[str, Any]) -> "ResultsModel":
+        """Rows for scan_folder/run_scan results ('large_files', 'old_files', 'duplicates')."""
+        file_stats = results.get("file_stats") or {}
+        rows: List[ResultRow] = []
+
+        def add(kind: str, path: str, group: int = 0) -> None:
+            size, mtime = file_stats.get(path, (0, 0.0))
+            rows.append(ResultRow(kind, path, size, mtime, group))
+
+        for path in results.get("large_files") or []:
+            add(KIND_LARGE, path)
+        for path in results.get("old_files") or []:
+            add(KIND_OLD, path)
+        groups = results.get("duplicates") or []
+        if isinstance(groups, dict):
+            groups = list(groups.values())
+        for number, group in enumerate(groups, 1):
+            for path in group:
+                add(KIND_DUPLICATE, path, number)
+        return cls(rows)
+
+    # ------------------------------------------------------------------
+    # View
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._view)
+
+    @property
+    def total(self) -> int:
+        return len(self.rows)
+
+    def page(self, start: int, count: int) -> List[ResultRow]:
+        """Rows [start, start + count) of the sorted, filtered view."""
+        return [self.rows[i] for i in self._view[max(start, 0):max(start, 0) + count]]
+
+    def _order(self, key: str) -> List[int]:
+        order = self._orders.get(key)
+        if order is None:
+            row_key, _ = SORT_KEYS[key]
+            keys = [row_key(row) for row in self.rows]
+            order = self._orders[key] = sorted(range(len(keys)), key=keys.__getitem__)
+        return order
+
+    def _rebuild_view(self) -> None:
+        order = self._order(self.sort_key)
+        if self.descending:
+            order = order[::-1]
+        match = self._match
+        self._view = list(order) if match is None else [i for i in order if match[i]]
+
+    # ------------------------------------------------------------------
+    # Sorting and filtering
+    # ------------------------------------------------------------------
+
+    def sort(self, key: str, descending: Optional[bool] = None) -> None:
+        """Sort by key ('size', 'age', 'group', 'kind', 'path').
+
+        Without `descending`, sorting by the current key again flips the direction and a
+        new key starts in its natural direction (largest, oldest, group order).
+        """
+        if key not in SORT_KEYS:
+            raise ValueError(f"unknown sort key: {key}")
+        if descending is None:
+            descending = (not self.descending) if key == self.sort_key else SORT_KEYS[key][1]
+        self.sort_key, self.descending = key, descending
+        self._rebuild_view()
+
+    def set_filter(self, text: str = "", kind: Optional[str] = None) -> None:
+        """Keep rows whose path contains `text` (case-insensitive) and, if given, of `kind`."""
+        text = text.strip().lower()
+        if text == self._filter_text and kind == self._filter_kind:
+            return
+        if not text and kind is None:
+            self._match = None
+        elif self._match is not None and kind == self._filter_kind and text.startswith(self._filter_text):
+            # Narrowing: only rows that matched the shorter text can match the longer one,
+            # and the view is already in sort order
+            match, haystack = self._match, self._haystack
+            kept: List[int] = []
+            for i in self._view:
+                if text in haystack[i]:
+                    kept.append(i)
+                else:
+                    match[i] = 0
+            self._view = kept
+            self._filter_text = text
+            return
+        else:
+            rows, haystack = self.rows, self._haystack
+            self._match = bytearray(
+                1 if (kind is None or rows[i].kind == kind) and text in haystack[i] else 0
+                for i in range(len(rows)))
+        self._filter_text, self._filter_kind = text, kind
+        self._rebuild_view()
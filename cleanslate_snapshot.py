@@ -0,0 +1,383 @@
+#!/usr/bin/env python3
+"""
+LocalMind Snapshots - Stored scan results and scan-to-scan diffs
+Each scan can be saved as a snapshot in a local SQLite database (inventory, finding flags
+and duplicate groups). Two snapshots are then compared with indexed queries, without
+rescanning, to answer "what changed since last night":
+
+- duplicate groups that are new, gone, or whose members changed
+- files that became large or old
+- total, duplicate-reclaimable, large and old byte deltas
+
+Usage:
+    python cleanslate_snapshot.py list
+    python cleanslate_snapshot.py diff              # latest two snapshots
+    python cleanslate_snapshot.py diff OLD_ID NEW_ID [--json]
+
+Config key (used by run_scan): "snapshot_db": "snapshots/localmind.db"
+"""
+
+import argparse
+import json
+import sqlite3
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from cleanslate_export import findings_by_path
+from cleanslate_links import reclaimable_bytes
+from cleanslate_logging import get_logger
+
+DEFAULT_SNAPSHOT_DB = "snapshots/localmind.db"
+
+# Per-file finding flags (files.flags bitmask)
+FLAG_LARGE = 1
+FLAG_OLD = 2
+FLAG_EMPTY = 4
+FLAG_BLURRY = 8
+FLAG_DUPLICATE = 16
+
+_FLAG_BY_FINDING = {
+    "large": FLAG_LARGE,
+    "old": FLAG_OLD,
+    "empty": FLAG_EMPTY,
+    "blurry": FLAG_BLURRY,
+    "duplicate": FLAG_DUPLICATE,
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at TEXT NOT NULL,
+    label TEXT,
+    roots TEXT NOT NULL,
+    total_files INTEGER NOT NULL,
+    total_bytes INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS files (
+    scan_id INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    size INTEGER,
+    mtime REAL,
+    flags INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (scan_id, path)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS dup_groups (
+    scan_id INTEGER NOT NULL,
+    group_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    members INTEGER NOT NULL,
+    file_size INTEGER NOT NULL,
+    reclaimable_bytes INTEGER NOT NULL,
+    PRIMARY KEY (scan_id, group_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS dup_members (
+    scan_id INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    group_id INTEGER NOT NULL,
+    PRIMARY KEY (scan_id, path)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_files_flags ON files (scan_id, flags);
+CREATE INDEX IF NOT EXISTS idx_dup_members_group ON dup_members (scan_id, group_id);
+"""
+
+logger = get_logger("snapshot")
+
+
+def _duplicate_groups(results: Dict[str, Any]) -> Dict[str, List[str]]:
+    groups = results.get("duplicates") or {}
+    if isinstance(groups, list):
+        groups = {f"group_{i + 1}": group for i, group in enumerate(groups)}
+    return groups
+
+
+class SnapshotStore:
+    """SQLite-backed store of scan snapshots. Use as a context manager or call close()."""
+
+    def __init__(self, db_path: str = DEFAULT_SNAPSHOT_DB):
+        path = Path(db_path)
+        if str(db_path) != ":memory:":
+            path.parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = str(db_path)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self) -> "SnapshotStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def save(self, results: Dict[str, Any], roots: Optional[List[str]] = None,
+             label: Optional[str] = None) -> int:
+        """Store a scan's results (needs 'file_stats'); returns the new snapshot id."""
+        file_stats = results.get("file_stats") or {}
+        findings = findings_by_path(results)
+        groups = _duplicate_groups(results)
+        shared_extents = results.get("shared_extents") or {}
+        # Extra links of a hard-linked file share its data; count the bytes once
+        aliases = {link for links in (results.get("hardlinks") or {}).values() for link in links}
+        total_bytes = sum(entry[0] for path, entry in file_stats.items() if path not in aliases)
+
+        with self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO scans (created_at, label, roots, total_files, total_bytes) VALUES (?, ?, ?, ?, ?)",
+                (datetime.now().isoformat(timespec="seconds"), label, json.dumps(sorted(roots or [])),
+                 results.get("total_files", len(file_stats)), total_bytes),
+            )
+            scan_id = cur.lastrowid
+
+            def file_rows():
+                for file_path in set(file_stats).union(findings):
+                    entry = file_stats.get(file_path)
+                    flags = 0
+                    for name in findings.get(file_path, ()):
+                        flags |= _FLAG_BY_FINDING.get(name, 0)
+                    yield (scan_id, file_path, entry[0] if entry else None,
+                           entry[1] if entry else None, flags)
+
+            self.conn.executemany(
+                "INSERT INTO files (scan_id, path, size, mtime, flags) VALUES (?, ?, ?, ?, ?)", file_rows())
+
+            group_rows = []
+            member_rows = []
+            for group_id, (name, members) in enumerate(groups.items(), 1):
+                sizes = [file_stats[p][0] for p in members if p in file_stats]
+                file_size = max(sizes) if sizes else 0
+                group_rows.append((scan_id, group_id, name, len(members), file_size,
+                                   reclaimable_bytes(len(members), file_size, shared_extents.get(name, ()))))
+                member_rows.extend((scan_id, p, group_id) for p in members)
+            self.conn.executemany(
+                "INSERT INTO dup_groups (scan_id, group_id, name, members, file_size, reclaimable_bytes) "
+                "VALUES (?, ?, ?, ?, ?, ?)", group_rows)
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO dup_members (scan_id, path, group_id) VALUES (?, ?, ?)", member_rows)
+
+        logger.info("snapshot %s saved: %d files, %d duplicate groups", scan_id, len(file_stats), len(groups))
+        return scan_id
+
+    def delete(self, scan_id: int) -> None:
+        with self.conn:
+            for table in ("dup_members", "dup_groups", "files"):
+                self.conn.execute(f"DELETE FROM {table} WHERE scan_id = ?", (scan_id,))
+            self.conn.execute("DELETE FROM scans WHERE id = ?", (scan_id,))
+
+    def prune(self, keep: int) -> int:
+        """Delete all but the newest `keep` snapshots; returns how many were removed."""
+        old_ids = [row[0] for row in self.conn.execute(
+            "SELECT id FROM scans ORDER BY id DESC LIMIT -1 OFFSET ?", (keep,))]
+        for scan_id in old_ids:
+            self.delete(scan_id)
+        return len(old_ids)
+
+    # ------------------------------------------------------------------
+    # Reading
+    # ------------------------------------------------------------------
+
+    def list_scans(self, limit: int = 50) -> List[Dict[str, Any]]:
+        rows = self.conn.execute(
+            "SELECT id, created_at, label, roots, total_files, total_bytes FROM scans ORDER BY id DESC LIMIT ?",
+            (limit,))
+        return [{**dict(row), "roots": json.loads(row["roots"])} for row in rows]
+
+    def latest_ids(self, roots: Optional[List[str]] = None, count: int = 2) -> List[int]:
+        """Newest snapshot ids (optionally only those of the same roots), newest first."""
+        if roots is None:
+            rows = self.conn.execute("SELECT id FROM scans ORDER BY id DESC LIMIT ?", (count,))
+        else:
+            rows = self.conn.execute("SELECT id FROM scans WHERE roots = ? ORDER BY id DESC LIMIT ?",
+                                     (json.dumps(sorted(roots)), count))
+        return [row[0] for row in rows]
+
+    def _totals(self, scan_id: int) -> Dict[str, int]:
+        row = self.conn.execute(
+            "SELECT total_files, total_bytes FROM scans WHERE id = ?", (scan_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"no snapshot with id {scan_id}")
+        flagged = {}
+        for name, flag in (("large", FLAG_LARGE), ("old", FLAG_OLD)):
+            flagged[name] = self.conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM files WHERE scan_id = ? AND flags & ? != 0",
+                (scan_id, flag)).fetchone()[0]
+        reclaimable = self.conn.execute(
+            "SELECT COALESCE(SUM(reclaimable_bytes), 0) FROM dup_groups WHERE scan_id = ?", (scan_id,)).fetchone()[0]
+        return {
+            "files": row["total_files"],
+            "total_bytes": row["total_bytes"],
+            "duplicate_reclaimable_bytes": reclaimable,
+            "large_bytes": flagged["large"],
+            "old_bytes": flagged["old"],
+        }
+
+    def _newly_flagged(self, old_id: int, new_id: int, flag: int) -> List[Dict[str, Any]]:
+        rows = self.conn.execute(
+            "SELECT n.path, n.size, n.mtime FROM files n "
+            "LEFT JOIN files o ON o.scan_id = ? AND o.path = n.path "
+            "WHERE n.scan_id = ? AND n.flags & ? != 0 AND (o.path IS NULL OR o.flags & ? = 0) "
+            "ORDER BY n.size DESC",
+            (old_id, new_id, flag, flag))
+        return [dict(row) for row in rows]
+
+    def _group_members(self, scan_id: int) -> Dict[int, List[str]]:
+        members: Dict[int, List[str]] = {}
+        for row in self.conn.execute(
+                "SELECT group_id, path FROM dup_members WHERE scan_id = ? ORDER BY group_id, path", (scan_id,)):
+            members.setdefault(row[0], []).append(row[1])
+        return members
+
+    def _group_info(self, scan_id: int) -> Dict[int, Dict[str, Any]]:
+        return {row["group_id"]: dict(row) for row in self.conn.execute(
+            "SELECT group_id, name, members, file_size, reclaimable_bytes FROM dup_groups WHERE scan_id = ?",
+            (scan_id,))}
+
+    def diff(self, old_id: int, new_id: int) -> Dict[str, Any]:
+        """Compare two snapshots.
+
+        Duplicate groups are matched by shared member paths: a group in the new snapshot
+        sharing no path with any old group is new, an old group with no match is removed,
+        and matched groups whose member lists differ are reported as changed.
+        """
+        old_totals = self._totals(old_id)
+        new_totals = self._totals(new_id)
+
+        # (old_group, new_group) pairs that share at least one path, via the (scan_id, path) keys
+        pairs = self.conn.execute(
+            "SELECT DISTINCT o.group_id, n.group_id FROM dup_members n "
+            "JOIN dup_members o ON o.scan_id = ? AND o.path = n.path WHERE n.scan_id = ?",
+            (old_id, new_id))
+        pairs = sorted((row[0], row[1]) for row in pairs)
+        old_matched = {row[0] for row in pairs}
+        new_matched = {row[1] for row in pairs}
+
+        old_info = self._group_info(old_id)
+        new_info = self._group_info(new_id)
+        old_members = self._group_members(old_id)
+        new_members = self._group_members(new_id)
+
+        def describe(info: Dict[str, Any], members: List[str]) -> Dict[str, Any]:
+            return {"name": info["name"], "file_size": info["file_size"],
+                    "reclaimable_bytes": info["reclaimable_bytes"], "paths": members}
+
+        new_groups = [describe(new_info[g], new_members.get(g, [])) for g in sorted(new_info) if g not in new_matched]
+        removed_groups = [describe(old_info[g], old_members.get(g, [])) for g in sorted(old_info) if g not in old_matched]
+        changed_groups = []
+        for old_group, new_group in pairs:
+            before = set(old_members.get(old_group, []))
+            after = set(new_members.get(new_group, []))
+            if before != after:
+                changed_groups.append({
+                    "old_name": old_info[old_group]["name"],
+                    "new_name": new_info[new_group]["name"],
+                    "added": sorted(after - before),
+                    "removed": sorted(before - after),
+                })
+
+        deltas = {key: new_totals[key] - old_totals[key] for key in new_totals}
+        return {
+            "old_id": old_id,
+            "new_id": new_id,
+            "old": old_totals,
+            "new": new_totals,
+            "deltas": deltas,
+            "new_duplicate_groups": new_groups,
+            "removed_duplicate_groups": removed_groups,
+            "changed_duplicate_groups": changed_groups,
+            "newly_large": self._newly_flagged(old_id, new_id, FLAG_LARGE),
+            "newly_old": self._newly_flagged(old_id, new_id, FLAG_OLD),
+        }
+
+
+def _signed_bytes(value: int) -> str:
+    return f"{'+' if value > 0 else ''}{value:,} bytes"
+
+
+def format_diff(diff: Dict[str, Any], max_items: int = 20) -> str:
+    """Human-readable summary of a diff() result."""
+    deltas = diff["deltas"]
+    lines = [
+        f"Snapshot diff {diff['old_id']} -> {diff['new_id']}",
+        "-" * 40,
+        f"Files: {diff['old']['files']:,} -> {diff['new']['files']:,} ({deltas['files']:+,})",
+        f"Total size: {_signed_bytes(deltas['total_bytes'])}",
+        f"Reclaimable (duplicates): {diff['new']['duplicate_reclaimable_bytes']:,} bytes "
+        f"({_signed_bytes(deltas['duplicate_reclaimable_bytes'])})",
+        f"Large files size: {_signed_bytes(deltas['large_bytes'])}",
+        f"Old files size: {_signed_bytes(deltas['old_bytes'])}",
+        "",
+    ]
+    sections = (
+        ("New duplicate groups", diff["new_duplicate_groups"],
+         lambda g: f"  {g['name']}: {len(g['paths'])} files, {g['reclaimable_bytes']:,} bytes reclaimable"),
+        ("Removed duplicate groups", diff["removed_duplicate_groups"],
+         lambda g: f"  {g['name']}: {len(g['paths'])} files"),
+        ("Changed duplicate groups", diff["changed_duplicate_groups"],
+         lambda g: f"  {g['new_name']}: +{len(g['added'])} / -{len(g['removed'])} files"),
+        ("Newly large files", diff["newly_large"], lambda f: f"  {f['path']} ({(f['size'] or 0):,} bytes)"),
+        ("Newly old files", diff["newly_old"], lambda f: f"  {f['path']}"),
+    )
+    for title, items, fmt in sections:
+        lines.append(f"{title}: {len(items)}")
+        lines.extend(fmt(item) for item in items[:max_items])
+        if len(items) > max_items:
+            lines.append(f"  ... and {len(items) - max_items} more")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="List and compare stored LocalMind scan snapshots.")
+    parser.add_argument("--db", default=DEFAULT_SNAPSHOT_DB, help="Snapshot database path")
+    sub = parser.add_subparsers(dest="command", required=True)
+    list_parser = sub.add_parser("list", help="List stored snapshots")
+    list_parser.add_argument("--limit", type=int, default=20)
+    diff_parser = sub.add_parser("diff", help="Compare two snapshots (default: the latest two)")
+    diff_parser.add_argument("ids", nargs="*", type=int, help="OLD_ID NEW_ID")
+    diff_parser.add_argument("--json", action="store_true", help="Print the diff as JSON")
+    prune_parser = sub.add_parser("prune", help="Keep only the newest snapshots")
+    prune_parser.add_argument("--keep", type=int, default=30)
+    args = parser.parse_args(argv)
+
+    if not Path(args.db).exists():
+        print(f"No snapshot database at {args.db}", file=sys.stderr)
+        return 1
+
+    with SnapshotStore(args.db) as store:
+        if args.command == "list":
+            for scan in store.list_scans(args.limit):
+                print(f"{scan['id']:>5}  {scan['created_at']}  {scan['total_files']:>9,} files  "
+                      f"{scan['total_bytes']:>15,} bytes  {', '.join(scan['roots'])}")
+            return 0
+        if args.command == "prune":
+            print(f"Removed {store.prune(args.keep)} snapshot(s)")
+            return 0
+        if len(args.ids) == 2:
+            old_id, new_id = args.ids
+        elif not args.ids:
+            latest = store.latest_ids(count=2)
+            if len(latest) < 2:
+                print("Need at least two snapshots to diff", file=sys.stderr)
+                return 1
+            new_id, old_id = latest
+        else:
+            parser.error("diff takes zero or two snapshot ids")
+        try:
+            result = store.diff(old_id, new_id)
+        except KeyError as e:
+            print(str(e), file=sys.stderr)
+            return 1
+        print(json.dumps(result, indent=2) if args.json else format_diff(result))
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+LocalMind Tasks - Background runner for chat tools (largest files, duplicates, ...)
+Chat tools can take minutes on a big workspace (duplicates hash every same-size file), so
+they never run on the GUI event loop. A ToolRunner owns one worker thread that runs tool
+tasks in submission order and reports through an emit callback, which the GUI points at
+window.write_event_value:
+
+    runner = ToolRunner(lambda kind, payload: window.write_event_value(EVENTS[kind], payload))
+    runner.submit(workspace, "dupes", (), run_dupes)   # run_dupes(cancel_event, partial)
+
+emit(kind, payload) with kind one of
+    "partial"   payload["partial"] is a list of values the task passed to partial(...);
+                partials are coalesced to at most one event per PARTIAL_INTERVAL_S (a
+                held-back partial goes out with the next one or when the task ends)
+    "done"      payload["result"]; payload["cached"] is True for an answer from the cache
+    "canceled"  the task was canceled before it finished
+    "error"     payload["error"] is the message
+Every payload also carries "key" (workspace, tool, params), "tool", "workspace" and the
+caller's "context" (e.g. which conversation asked).
+
+A request equal to one already queued or running is not run twice; the caller just gets
+the running task's answer. Finished results are cached per workspace until invalidated
+(e.g. after a new scan of that folder).
+"""
+
+import os
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from cleanslate_logging import get_logger
+
+logger = get_logger("tasks")
+
+# Streamed partial answers are sent to the GUI at most this often (the rest are batched)
+PARTIAL_INTERVAL_S = 0.1
+
+# (workspace, tool, params)
+TaskKey = Tuple[str, str, Hashable]
+
+# fn(cancel_event, partial) -> result
+TaskFn = Callable[[threading.Event, Callable[[Any], None]], Any]
+
+
+class _Task:
+    __slots__ = ("key", "fn", "cancel_event", "contexts", "generation")
+
+    def __init__(self, key: TaskKey, fn: TaskFn, context: Any, generation: int):
+        self.key = key
+        self.fn = fn
+        self.generation = generation  # cache generation at submit time
+        self.cancel_event = threading.Event()
+        self.contexts = [context]
+
+
+class ToolRunner:
+    """Runs chat tool tasks on one background thread with dedup, cancel and a per-workspace cache."""
+
+    def __init__(self, emit: Callable[[str, Dict[str, Any]], None]):
+        self.emit = emit
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[Optional[_Task]]" = queue.Queue()
+        self._tasks: Dict[TaskKey, _Task] = {}        # queued or running
+        self._cache: Dict[str, Dict[Tuple[str, Hashable], Any]] = {}
+        self._generation = 0  # bumped by invalidate(); results computed before it are not cached
+        self._thread = threading.Thread(target=self._run, name="chat-tools", daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def _workspace_key(workspace: str) -> str:
+        return os.path.abspath(workspace)
+
+    def submit(self, workspace: str, tool: str, params: Hashable, fn: TaskFn, context: Any = None) -> str:
+        """Queue a tool run. Returns 'cached', 'joined' (same request already pending) or 'queued'."""
+        ws = self._workspace_key(workspace)
+        key: TaskKey = (ws, tool, params)
+        with self._lock:
+            cache = self._cache.get(ws, {})
+            if (tool, params) in cache:
+                result = cache[(tool, params)]
+            else:
+                task = self._tasks.get(key)
+                if task is not None and not task.cancel_event.is_set():
+                    task.contexts.append(context)
+                    return "joined"
+                task = self._tasks[key] = _Task(key, fn, context, self._generation)
+                self._queue.put(task)
+                return "queued"
+        self._emit("done", key, context, result=result, cached=True)
+        return "cached"
+
+    def cancel(self, workspace: Optional[str] = None) -> int:
+        """Cancel queued and running tasks (of one workspace, or all). Returns how many."""
+        ws = self._workspace_key(workspace) if workspace else None
+        with self._lock:
+            tasks = [t for k, t in self._tasks.items() if ws is None or k[0] == ws]
+        for task in tasks:
+            task.cancel_event.set()
+        return len(tasks)
+
+    def busy(self) -> bool:
+        with self._lock:
+            return bool(self._tasks)
+
+    def invalidate(self, workspace: Optional[str] = None) -> None:
+        """Forget cached results for workspace, or for every workspace inside it (all if None)."""
+        with self._lock:
+            self._generation += 1
+            if workspace is None:
+                self._cache.clear()
+                return
+            root = self._workspace_key(workspace)
+            for ws in list(self._cache):
+                if ws == root or ws.startswith(root.rstrip(os.sep) + os.sep):
+                    del self._cache[ws]
+
+    def close(self) -> None:
+        """Cancel everything and stop the worker thread."""
+        self.cancel()
+        self._queue.put(None)
+        self._thread.join(timeout=2)
+
+    def _emit(self, kind: str, key: TaskKey, context: Any, **payload: Any) -> None:
+        payload.update({"key": key, "workspace": key[0], "tool": key[1], "context": context})
+        self.emit(kind, payload)
+
+    def _run(self) -> None:
+        while True:
+            task = self._queue.get()
+            if task is None:
+                return
+            key = task.key
+            if task.cancel_event.is_set():
+                self._finish(task, "canceled")
+                continue
+
+            pending: List[Any] = []
+            last_emit = [0.0]
+
+            def flush(task: _Task = task) -> None:
+                if pending and not task.cancel_event.is_set():
+                    batch = list(pending)
+                    for context in list(task.contexts):
+                        self._emit("partial", task.key, context, partial=batch)
+                pending.clear()
+                last_emit[0] = time.monotonic()
+
+            def partial(value: Any) -> None:
+                pending.append(value)
+                if time.monotonic() - last_emit[0] >= PARTIAL_INTERVAL_S:
+                    flush()
+
+            try:
+                result = task.fn(task.cancel_event, partial)
+                flush()
+            except Exception as e:
+                logger.exception("chat tool %s failed", key[1])
+                self._finish(task, "error", error=str(e))
+                continue
+            if task.cancel_event.is_set():
+                self._finish(task, "canceled")
+                continue
+            with self._lock:
+                if task.generation == self._generation:
+                    self._cache.setdefault(key[0], {})[(key[1], key[2])] = result
+            self._finish(task, "done", result=result, cached=False)
+
+    def _finish(self, task: _Task, kind: str, **payload: Any) -> None:
+        with self._lock:
+            if self._tasks.get(task.key) is task:
+                del self._tasks[task.key]
+            contexts = list(task.contexts)
+        for context in contexts:
+            self._emit(kind, task.key, context, **payload)
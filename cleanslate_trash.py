@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+LocalMind Trash - Bulk move-to-Trash engine for cleanup plans
+A plan is a list of paths (e.g. all but one file of every duplicate group). The engine
+sends them to the system Trash in batches -- one send2trash call per batch, which on
+macOS and Windows is one native operation for the whole batch -- reports progress after
+each batch, checks for cancellation between batches, and records every trashed file so
+the operation can be undone (see TrashRecord and cleanslate_journal) and the inventory updated without a rescan
+(apply_to_results).
+
+Nothing is ever deleted permanently. Files that changed since the scan (size or mtime
+differ from the inventory) or disappeared are skipped, not trashed.
+
+    trasher = BulkTrasher()
+    result = trasher.run(plan.paths, cancel_event, expected=results["file_stats"],
+                         progress=lambda done, total, nbytes: ...)
+    results = apply_to_results(results, result.trashed_paths)
+"""
+
+import os
+import time
+import uuid
+from threading import Event
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from cleanslate_links import reclaimable_bytes
+from cleanslate_logging import get_logger
+
+logger = get_logger("trash")
+
+FileStats = Dict[str, Tuple[int, float]]
+
+# Files per send2trash call
+DEFAULT_BATCH_SIZE = 100
+
+
+class TrashRecord(NamedTuple):
+    """One file moved to the Trash (enough to find it again for undo)."""
+    operation_id: str
+    path: str
+    size: int
+    mtime: float
+    trashed_at: float
+    fingerprint: Optional[str] = None
+
+
+class TrashPlan(NamedTuple):
+    """Paths to trash, with a human description and the bytes they free."""
+    description: str
+    paths: List[str]
+    total_bytes: int
+
+
+class TrashResult:
+    """Outcome of one bulk operation."""
+
+    def __init__(self, operation_id: str, total: int):
+        self.operation_id = operation_id
+        self.total = total
+        self.trashed: List[TrashRecord] = []
+        self.skipped: Dict[str, str] = {}   # path -> reason (missing, changed since scan)
+        self.failed: Dict[str, str] = {}    # path -> error
+        self.canceled = False
+
+    @property
+    def trashed_paths(self) -> List[str]:
+        return [record.path for record in self.trashed]
+
+    @property
+    def trashed_bytes(self) -> int:
+        return sum(record.size for record in self.trashed)
+
+    def summary(self) -> str:
+        text = f"Moved {len(self.trashed):,} of {self.total:,} files to Trash ({self.trashed_bytes / 1024 / 1024:,.1f} MB)"
+        if self.skipped:
+            text += f", skipped {len(self.skipped):,}"
+        if self.failed:
+            text += f", {len(self.failed):,} failed"
+        if self.canceled:
+            text += " (canceled)"
+        return text
+
+
+def _default_send(paths: List[str]) -> None:
+    from send2trash import send2trash
+    send2trash(paths)
+
+
+def duplicates_plan(duplicates: Sequence[Sequence[str]], file_stats: FileStats) -> TrashPlan:
+    """Trash all but the first file of every duplicate group."""
+    paths: List[str] = []
+    total = 0
+    for group in duplicates:
+        for path in group[1:]:
+            paths.append(path)
+            total += file_stats.get(path, (0, 0.0))[0]
+    return TrashPlan(f"Keep one file per duplicate group ({len(duplicates):,} groups)", paths, total)
+
+
+class BulkTrasher:
+    """Sends a plan to the Trash in batches; run() blocks, so call it from a worker thread."""
+
+    def __init__(self, send: Optional[Callable[[List[str]], None]] = None, batch_size: int = DEFAULT_BATCH_SIZE,
+                 fingerprint: Optional[Callable[[str], Optional[str]]] = None):
+        self.send = send or _default_send
+        self.batch_size = max(1, batch_size)
+        # Hashes each file just before it is trashed, so undo can recognise it in the Trash
+        self.fingerprint = fingerprint
+
+    def run(self, paths: Sequence[str], cancel_event: Optional[Event] = None,
+            expected: Optional[FileStats] = None,
+            progress: Optional[Callable[[int, int, int], None]] = None,
+            on_batch: Optional[Callable[[List[TrashRecord]], None]] = None) -> TrashResult:
+        """Trash paths batch by batch.
+
+        expected (path -> (size, mtime) from the scan) makes files that changed since
+        the scan be skipped. progress(done, total, bytes_trashed) and on_batch(records)
+        are called after every batch; on_batch is where an undo journal hooks in.
+        """
+        result = TrashResult(uuid.uuid4().hex, len(paths))
+        done = 0
+        for start in range(0, len(paths), self.batch_size):
+            if cancel_event is not None and cancel_event.is_set():
+                result.canceled = True
+                break
+            batch = self._checked(paths[start:start + self.batch_size], expected, result)
+            records = self._send_batch(batch, result)
+            result.trashed.extend(records)
+            done = min(start + self.batch_size, len(paths))
+            if records and on_batch is not None:
+                on_batch(records)
+            if progress is not None:
+                progress(done, len(paths), result.trashed_bytes)
+        logger.info("trash operation %s: %s", result.operation_id, result.summary())
+        return result
+
+    def _checked(self, paths: Iterable[str], expected: Optional[FileStats],
+                 result: TrashResult) -> List[Tuple[str, int, float, Optional[str]]]:
+        batch = []
+        for path in paths:
+            try:
+                st = os.lstat(path)
+            except OSError:
+                result.skipped[path] = "missing"
+                continue
+            if expected is not None and path in expected:
+                size, mtime = expected[path]
+                if st.st_size != size or st.st_mtime != mtime:
+                    result.skipped[path] = "changed since scan"
+                    continue
+            digest = self.fingerprint(path) if self.fingerprint is not None else None
+            batch.append((path, st.st_size, st.st_mtime, digest))
+        return batch
+
+    def _send_batch(self, batch: List[Tuple[str, int, float, Optional[str]]],
+                    result: TrashResult) -> List[TrashRecord]:
+        if not batch:
+            return []
+        try:
+            self.send([path for path, _, _, _ in batch])
+            now = time.time()
+            return [TrashRecord(result.operation_id, path, size, mtime, now, digest)
+                    for path, size, mtime, digest in batch]
+        except OSError as e:
+            logger.warning("batch trash failed (%s); retrying file by file", e)
+        # Part of the batch may have gone already; trash the rest singly to find the failures
+        records = []
+        for path, size, mtime, digest in batch:
+            if not os.path.lexists(path):
+                records.append(TrashRecord(result.operation_id, path, size, mtime, time.time(), digest))
+                continue
+            try:
+                self.send([path])
+                records.append(TrashRecord(result.operation_id, path, size, mtime, time.time(), digest))
+            except OSError as e:
+                result.failed[path] = str(e)
+        return records
+
+
+def apply_to_results(results: Dict[str, Any], removed: Iterable[str]) -> Dict[str, Any]:
+    """A copy of scan_folder-style results without the removed files (no rescan needed)."""
+    gone = set(removed)
+    if not gone:
+        return results
+    updated = dict(results)
+    file_stats = {p: entry for p, entry in (results.get("file_stats") or {}).items() if p not in gone}
+    large = [p for p in results.get("large_files") or [] if p not in gone]
+    old = [p for p in results.get("old_files") or [] if p not in gone]
+    duplicates = []
+    for group in results.get("duplicates") or []:
+        kept = [p for p in group if p not in gone]
+        if len(kept) > 1:
+            duplicates.append(kept)
+    hardlinks = {}
+    for owner, links in (results.get("hardlinks") or {}).items():
+        kept = [p for p in links if p not in gone]
+        if owner in gone and kept:
+            owner, kept = kept[0], kept[1:]
+        if owner not in gone and kept:
+            hardlinks[owner] = kept
+    updated.update({
+        "file_stats": file_stats,
+        "total_files": len(file_stats),
+        "large_files": large,
+        "large_count": len(large),
+        "old_files": old,
+        "old_count": len(old),
+        "duplicates": duplicates,
+        "dup_groups": len(duplicates),
+        "hardlinks": hardlinks,
+        # Shared extents are not re-read here; reflinked copies count as full copies
+        "reclaimable_bytes": sum(reclaimable_bytes(len(group), file_stats[group[0]][0]) for group in duplicates),
+    })
+    return updated
@@ -0,0 +1,574 @@
+#!/usr/bin/env python3
+"""
+LocalMind Watcher - Keeps a finished scan's inventory live as files change
+A watcher reports which paths under the scanned root changed; a LiveInventory re-stats
+just those paths and updates its file stats, large/old findings and duplicate groups
+incrementally (only size buckets that gained or changed a file are re-hashed; removals
+never read anything).
+
+    live = LiveInventory.from_scan(results, root, size_threshold_mb, age_threshold_days)
+    watcher = create_watcher(root, lambda paths: post(live.apply(paths)))
+    watcher.start()
+    ...
+    watcher.stop()
+
+Watchers:
+    InotifyWatcher   Linux inotify through ctypes (no extra dependency); one watch per directory
+    PollingWatcher   re-walks the tree every `interval` seconds and reports what differs
+create_watcher() picks inotify when it is available and the tree fits in the user's watch
+limit, polling otherwise. Bursts of events (a file being written) are coalesced: a batch is
+delivered once the tree has been quiet for DEBOUNCE_S, or after MAX_BATCH_DELAY_S.
+
+A reported path may be a file (re-stat it) or a directory (re-list that subtree); a path
+that no longer exists removes it and everything under it.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from cleanslate_hashing import hash_file, resolve_algorithm
+from cleanslate_links import FileId, link_id
+from cleanslate_logging import get_logger
+
+logger = get_logger("watcher")
+
+FileStats = Dict[str, Tuple[int, float]]
+
+# Event coalescing and polling cadence
+DEBOUNCE_S = 0.3
+MAX_BATCH_DELAY_S = 2.0
+POLL_INTERVAL_S = 5.0
+
+# Duplicate groups compare this many leading bytes, like scan_folder
+DUP_HASH_BYTES = 4 * 1024 * 1024
+
+
+# =============================================================================
+# WATCHERS
+# =============================================================================
+
+class Watcher:
+    """Base class: runs on a daemon thread and hands batches of changed paths to on_changes."""
+
+    name = "watcher"
+
+    def __init__(self, root: str, on_changes: Callable[[Set[str]], None],
+                 exclude: Optional[Callable[[str], bool]] = None):
+        self.root = root  # reported paths are spelled like the scan's (root + relative part)
+        self.on_changes = on_changes
+        self.exclude = exclude or (lambda path: False)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pending: Set[str] = set()
+        self._first_pending = 0.0
+        self._last_event = 0.0
+
+    def start(self) -> "Watcher":
+        self._thread = threading.Thread(target=self._guarded_run, name=self.name, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def _guarded_run(self) -> None:
+        try:
+            self._run()
+        except Exception:
+            logger.exception("%s stopped", self.name)
+
+    def _run(self) -> None:
+        raise NotImplementedError
+
+    def _note(self, path: str) -> None:
+        if self.exclude(path):
+            return
+        now = time.monotonic()
+        if not self._pending:
+            self._first_pending = now
+        self._pending.add(path)
+        self._last_event = now
+
+    def _deliver_due(self) -> None:
+        """Hand over the pending batch once events have settled (or waited long enough)."""
+        if not self._pending:
+            return
+        now = time.monotonic()
+        if now - self._last_event >= DEBOUNCE_S or now - self._first_pending >= MAX_BATCH_DELAY_S:
+            batch, self._pending = self._pending, set()
+            try:
+                self.on_changes(batch)
+            except Exception:
+                logger.exception("change handler failed")
+
+
+def _walk(root: str, exclude: Callable[[str], bool]) -> Iterator[Tuple[str, bool, Optional[os.stat_result]]]:
+    """(path, is_dir, stat) for everything under root, not following directory symlinks."""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as it:
+                entries = list(it)
+        except OSError:
+            continue
+        for entry in entries:
+            if exclude(entry.path):
+                continue
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                    yield entry.path, True, None
+                else:
+                    yield entry.path, False, entry.stat()
+            except OSError:
+                continue
+
+
+class PollingWatcher(Watcher):
+    """Portable fallback: compares (size, mtime) of every file between periodic walks."""
+
+    name = "fs-poll"
+
+    def __init__(self, root: str, on_changes: Callable[[Set[str]], None],
+                 exclude: Optional[Callable[[str], bool]] = None, interval: float = POLL_INTERVAL_S):
+        super().__init__(root, on_changes, exclude)
+        self.interval = interval
+
+    def _snapshot(self) -> Dict[str, Tuple[int, int]]:
+        return {path: (st.st_size, st.st_mtime_ns)
+                for path, is_dir, st in _walk(self.root, self.exclude) if not is_dir and st is not None}
+
+    def _run(self) -> None:
+        previous = self._snapshot()
+        while not self._stop.wait(self.interval):
+            current = self._snapshot()
+            changed = {path for path, state in current.items() if previous.get(path) != state}
+            changed.update(path for path in previous if path not in current)
+            previous = current
+            if changed:
+                try:
+                    self.on_changes(changed)
+                except Exception:
+                    logger.exception("change handler failed")
+
+
+# inotify (linux/inotify.h)
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_DONTFOLLOW = 0x02000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+_WATCH_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE
+               | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR | IN_DONTFOLLOW)
+_EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, len
+
+_libc: Any = None
+
+
+def _inotify_libc() -> Any:
+    global _libc
+    if _libc is None:
+        _libc = False
+        if sys.platform.startswith("linux"):
+            try:
+                libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+                libc.inotify_init1.argtypes = [ctypes.c_int]
+                libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+                _libc = libc
+            except (OSError, AttributeError):
+                pass
+    return _libc or None
+
+
+def inotify_available() -> bool:
+    return _inotify_libc() is not None
+
+
+class WatchLimitError(OSError):
+    """The tree needs more inotify watches than the user may create."""
+
+
+class InotifyWatcher(Watcher):
+    """Linux inotify watcher: one watch per directory, new directories are watched as they appear."""
+
+    name = "fs-inotify"
+
+    def __init__(self, root: str, on_changes: Callable[[Set[str]], None],
+                 exclude: Optional[Callable[[str], bool]] = None):
+        super().__init__(root, on_changes, exclude)
+        libc = _inotify_libc()
+        if libc is None:
+            raise OSError(errno.ENOSYS, "inotify is not available")
+        self._libc = libc
+        self._fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._wds: Dict[int, str] = {}
+        self._wake_r, self._wake_w = os.pipe()
+        try:
+            self._watch_tree(self.root)
+        except OSError:
+            self._close()
+            raise
+
+    def _watch(self, directory: str) -> None:
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), _WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                raise WatchLimitError(err, "inotify watch limit reached (fs.inotify.max_user_watches)")
+            if err in (errno.ENOENT, errno.ENOTDIR, errno.EACCES):
+                return  # gone or unreadable meanwhile
+            raise OSError(err, f"inotify_add_watch failed for {directory}")
+        self._wds[wd] = directory
+
+    def _watch_tree(self, top: str) -> None:
+        self._watch(top)
+        for path, is_dir, _ in _walk(top, self.exclude):
+            if is_dir:
+                self._watch(path)
+
+    def stop(self) -> None:
+        self._stop.set()
+        try:
+            os.write(self._wake_w, b"x")
+        except OSError:
+            pass
+        super().stop()
+        self._close()
+
+    def _close(self) -> None:
+        for fd in (self._fd, self._wake_r, self._wake_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self._fd = self._wake_r = self._wake_w = -1
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            timeout = DEBOUNCE_S if self._pending else None
+            readable, _, _ = select.select([self._fd, self._wake_r], [], [], timeout)
+            if self._stop.is_set():
+                return
+            if self._fd in readable:
+                self._read_events()
+            self._deliver_due()
+
+    def _read_events(self) -> None:
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                # Events were lost: have the whole tree re-listed
+                self._note(self.root)
+                continue
+            directory = self._wds.get(wd)
+            if mask & IN_IGNORED:
+                self._wds.pop(wd, None)
+                continue
+            if directory is None:
+                continue
+            path = os.path.join(directory, name) if name else directory
+            if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO) and not self.exclude(path):
+                try:
+                    self._watch_tree(path)
+                except WatchLimitError as e:
+                    logger.warning("%s; changes below %s are not watched", e, path)
+            self._note(path)
+
+
+def create_watcher(root: str, on_changes: Callable[[Set[str]], None],
+                   exclude: Optional[Callable[[str], bool]] = None,
+                   poll_interval: float = POLL_INTERVAL_S) -> Watcher:
+    """inotify watcher when possible, polling watcher otherwise (not started)."""
+    if inotify_available():
+        try:
+            return InotifyWatcher(root, on_changes, exclude)
+        except OSError as e:
+            logger.info("inotify unavailable for %s (%s); polling every %.0fs", root, e, poll_interval)
+    return PollingWatcher(root, on_changes, exclude, poll_interval)
+
+
+# =============================================================================
+# LIVE INVENTORY
+# =============================================================================
+
+class LiveInventory:
+    """A scan's file stats, findings and duplicate groups, updated from watcher batches.
+
+    Findings use the scan's rules: large is size >= threshold, old is mtime before the
+    scan-time cutoff, and duplicates share size and the hash of the first DUP_HASH_BYTES.
+    Further hard links to a file are tracked but never duplicates. Owned by one thread.
+    """
+
+    def __init__(self, root: str, file_stats: FileStats, duplicates: List[List[str]],
+                 hardlinks: Dict[str, List[str]], size_threshold_mb: int, age_threshold_days: int,
+                 exclude: Optional[Callable[[str], bool]] = None, hash_algorithm: Optional[str] = None):
+        self.root = root
+        self.file_stats: FileStats = dict(file_stats)
+        self.exclude = exclude or (lambda path: False)
+        self.algorithm = resolve_algorithm(hash_algorithm)
+        self.threshold_bytes = size_threshold_mb * 1024 * 1024
+        self.cutoff = (datetime.now() - timedelta(days=age_threshold_days)).timestamp()
+        self.large: Dict[str, None] = {p: None for p, (s, _) in self.file_stats.items() if s >= self.threshold_bytes}
+        self.old: Dict[str, None] = {p: None for p, (_, m) in self.file_stats.items() if m < self.cutoff}
+        # Hard links: extra link -> owner, owner -> its links, inode -> owner
+        self.alias_of: Dict[str, str] = {}
+        self.hardlinks: Dict[str, List[str]] = {}
+        self.link_owners: Dict[FileId, str] = {}
+        for owner, links in hardlinks.items():
+            self.hardlinks[owner] = list(links)
+            for link in links:
+                self.alias_of[link] = owner
+            try:
+                fid = link_id(os.stat(owner))
+            except OSError:
+                fid = None
+            if fid is not None:
+                self.link_owners[fid] = owner
+        self.file_ids: Dict[str, FileId] = {owner: fid for fid, owner in self.link_owners.items()}
+        # Same-size candidates (one path per inode) and confirmed groups per size
+        self.by_size: Dict[int, Set[str]] = {}
+        for path, (size, _) in self.file_stats.items():
+            if path not in self.alias_of:
+                self.by_size.setdefault(size, set()).add(path)
+        self.groups: Dict[int, List[List[str]]] = {}
+        for group in duplicates:
+            if group and group[0] in self.file_stats:
+                self.groups.setdefault(self.file_stats[group[0]][0], []).append(list(group))
+        self._digests: Dict[str, Tuple[int, float, Optional[str]]] = {}
+
+    @classmethod
+    def from_scan(cls, results: Dict[str, Any], root: str, size_threshold_mb: int, age_threshold_days: int,
+                  exclude: Optional[Callable[[str], bool]] = None,
+                  hash_algorithm: Optional[str] = None) -> "LiveInventory":
+        """From scan_folder results."""
+        return cls(root, results.get("file_stats") or {}, results.get("duplicates") or [],
+                   results.get("hardlinks") or {}, size_threshold_mb, age_threshold_days, exclude, hash_algorithm)
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def apply(self, paths: Set[str]) -> Optional[Dict[str, Any]]:
+        """Re-check changed paths. Returns None if nothing changed, else
+        {"updated": {path: (size, mtime)}, "removed": [paths]} (also see results())."""
+        current: Dict[str, Tuple[int, float, Optional[FileId]]] = {}
+        gone: Set[str] = set()
+        for path in paths:
+            self._recheck(path, current, gone)
+
+        updated: FileStats = {}
+        removed: List[str] = []
+        dirty: Set[int] = set()
+        for path in gone:
+            if path in self.file_stats:
+                self._forget(path)
+                removed.append(path)
+        for path, (size, mtime, fid) in current.items():
+            if self.file_stats.get(path) == (size, mtime):
+                continue
+            if path in self.file_stats:
+                self._forget(path)
+            self._remember(path, size, mtime, fid, dirty)
+            updated[path] = (size, mtime)
+        for size in dirty:
+            self._regroup(size)
+        if not updated and not removed:
+            return None
+        return {"updated": updated, "removed": removed}
+
+    def _recheck(self, path: str, current: Dict[str, Tuple[int, float, Optional[FileId]]], gone: Set[str]) -> None:
+        try:
+            st = os.stat(path, follow_symlinks=False)
+        except OSError:
+            st = None
+        if st is None or (os.path.isdir(path) and not os.path.islink(path)):
+            # Deleted (file or whole directory) or a directory to re-list
+            prefix = path.rstrip(os.sep) + os.sep
+            known = [p for p in self.file_stats if p == path or p.startswith(prefix)]
+            if st is None:
+                gone.update(known)
+                return
+            listed: Set[str] = set()
+            for child, is_dir, child_st in _walk(path, self.exclude):
+                if not is_dir and child_st is not None:
+                    listed.add(child)
+                    current[child] = (child_st.st_size, child_st.st_mtime, link_id(child_st))
+            gone.update(p for p in known if p not in listed)
+            return
+        if self.exclude(path):
+            return
+        current[path] = (st.st_size, st.st_mtime, link_id(st))
+
+    def _forget(self, path: str) -> None:
+        size, _ = self.file_stats.pop(path)
+        self.large.pop(path, None)
+        self.old.pop(path, None)
+        self._digests.pop(path, None)
+        owner = self.alias_of.pop(path, None)
+        if owner is not None:
+            links = self.hardlinks.get(owner, [])
+            if path in links:
+                links.remove(path)
+            if not links:
+                self.hardlinks.pop(owner, None)
+            return
+        fid = self.file_ids.pop(path, None)
+        if fid is not None and self.link_owners.get(fid) == path:
+            del self.link_owners[fid]
+            # The next link (if any) takes over as the inode's representative
+            links = [link for link in self.hardlinks.pop(path, []) if link in self.file_stats]
+            if links:
+                heir = links.pop(0)
+                self.alias_of.pop(heir, None)
+                for link in links:
+                    self.alias_of[link] = heir
+                if links:
+                    self.hardlinks[heir] = links
+                self.link_owners[fid] = heir
+                self.file_ids[heir] = fid
+                self.by_size.setdefault(self.file_stats[heir][0], set()).add(heir)
+                self._replace_in_groups(size, path, heir)
+        bucket = self.by_size.get(size)
+        if bucket is not None:
+            bucket.discard(path)
+            if not bucket:
+                del self.by_size[size]
+        self._drop_from_groups(size, path)
+
+    def _remember(self, path: str, size: int, mtime: float, fid: Optional[FileId], dirty: Set[int]) -> None:
+        self.file_stats[path] = (size, mtime)
+        if size >= self.threshold_bytes:
+            self.large[path] = None
+        if mtime < self.cutoff:
+            self.old[path] = None
+        if fid is not None:
+            owner = self.link_owners.get(fid) or self._find_link_owner(size, fid) or path
+            self.link_owners.setdefault(fid, owner)
+            if owner != path and owner in self.file_stats:
+                self.alias_of[path] = owner
+                self.hardlinks.setdefault(owner, []).append(path)
+                return
+            self.link_owners[fid] = path
+            self.file_ids[path] = fid
+        self.by_size.setdefault(size, set()).add(path)
+        dirty.add(size)
+
+    def _find_link_owner(self, size: int, fid: FileId) -> Optional[str]:
+        """A known file that is the same inode as a new link (it was single-linked until now).
+
+        Only same-size files can be the same inode, and only those not yet known as
+        hard-linked need a stat.
+        """
+        for candidate in self.by_size.get(size, ()):
+            if candidate in self.file_ids:
+                continue
+            try:
+                st = os.stat(candidate)
+            except OSError:
+                continue
+            if link_id(st) == fid:
+                self.link_owners[fid] = candidate
+                self.file_ids[candidate] = fid
+                return candidate
+        return None
+
+    def _drop_from_groups(self, size: int, path: str) -> None:
+        groups = self.groups.get(size)
+        if not groups:
+            return
+        kept = []
+        for group in groups:
+            if path in group:
+                group = [p for p in group if p != path]
+            if len(group) > 1:
+                kept.append(group)
+        if kept:
+            self.groups[size] = kept
+        else:
+            del self.groups[size]
+
+    def _replace_in_groups(self, size: int, old: str, new: str) -> None:
+        for group in self.groups.get(size, []):
+            if old in group:
+                group[group.index(old)] = new
+
+    def _digest(self, path: str) -> Optional[str]:
+        size, mtime = self.file_stats[path]
+        cached = self._digests.get(path)
+        if cached is not None and cached[:2] == (size, mtime):
+            return cached[2]
+        digest = hash_file(path, self.algorithm, limit=DUP_HASH_BYTES)
+        self._digests[path] = (size, mtime, digest)
+        return digest
+
+    def _regroup(self, size: int) -> None:
+        """Recompute the duplicate groups of one size bucket."""
+        members = self.by_size.get(size, ())
+        by_digest: Dict[str, List[str]] = {}
+        if len(members) > 1:
+            for path in sorted(members):
+                digest = self._digest(path)
+                if digest is not None:
+                    by_digest.setdefault(digest, []).append(path)
+        groups = [group for group in by_digest.values() if len(group) > 1]
+        if groups:
+            self.groups[size] = groups
+        else:
+            self.groups.pop(size, None)
+
+    # ------------------------------------------------------------------
+    # Views
+    # ------------------------------------------------------------------
+
+    def duplicates(self) -> List[List[str]]:
+        return [group for groups in self.groups.values() for group in groups]
+
+    def results(self) -> Dict[str, Any]:
+        """A scan_folder-style results snapshot (copies; safe to hand to another thread)."""
+        duplicates = [list(group) for group in self.duplicates()]
+        return {
+            "total_files": len(self.file_stats),
+            "large_count": len(self.large),
+            "old_count": len(self.old),
+            "dup_groups": len(duplicates),
+            "large_files": list(self.large),
+            "old_files": list(self.old),
+            "duplicates": duplicates,
+            "file_stats": dict(self.file_stats),
+            "hardlinks": {owner: list(links) for owner, links in self.hardlinks.items()},
+        }
@@ -0,0 +1,40 @@
+"""Shared pytest fixtures."""
+
+import pytest
+
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def scan_results():
+    """run_scan-style results for a small made-up tree under root/ (nothing on disk).
+
+    a/ and b/ hold copies of each other, keep/ is the folder tests protect with keep_in,
+    and a/disk.iso has a second hard link.
+    """
+    return {
+        "total_files": 11,
+        "file_stats": {
+            "root/a/photo.jpg": (3 * MB, 100.0),
+            "root/b/photo.jpg": (3 * MB, 200.0),
+            "root/keep/photo.jpg": (3 * MB, 50.0),
+            "root/a/notes.txt": (1 * MB, 300.0),
+            "root/b/notes.txt": (1 * MB, 100.0),
+            "root/a/disk.iso": (50 * MB, 10.0),
+            "root/a/disk-link.iso": (50 * MB, 10.0),
+            "root/keep/archive.bin": (40 * MB, 10.0),
+            "root/a/empty.log": (0, 10.0),
+            "root/a/shot.png": (2 * MB, 400.0),
+            "root/b/shot-small.png": (1 * MB, 500.0),
+        },
+        "duplicates": {
+            "group_1": ["root/a/photo.jpg", "root/b/photo.jpg", "root/keep/photo.jpg"],
+            "group_2": ["root/a/notes.txt", "root/b/notes.txt"],
+        },
+        "near_duplicates": {"group_1": ["root/a/shot.png", "root/b/shot-small.png"]},
+        "large_files": ["root/a/disk.iso", "root/a/disk-link.iso", "root/keep/archive.bin", "root/b/photo.jpg"],
+        "old_files": ["root/a/disk.iso", "root/a/empty.log", "root/a/photo.jpg", "root/keep/photo.jpg"],
+        "empty_files": ["root/a/empty.log"],
+        "blurry_files": [],
+        "hardlinks": {"root/a/disk.iso": ["root/a/disk-link.iso"]},
+    }
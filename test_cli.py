@@ -0,0 +1,79 @@
+"""Headless CLI: exit codes, JSON Lines progress on stdout and summary.json."""
+
+import json
+
+import pytest
+
+from cleanslate_cli import EXIT_OK, EXIT_SCAN_FAILED, EXIT_USAGE, main
+
+
+@pytest.fixture
+def setup(tmp_path):
+    root = tmp_path / "files"
+    root.mkdir()
+    (root / "a.txt").write_bytes(b"same")
+    (root / "b.txt").write_bytes(b"same")
+    config = tmp_path / "config.json"
+    config.write_text(json.dumps({"large_file_threshold_mb": 1}), encoding="utf-8")
+    return root, config, tmp_path / "out"
+
+
+def events(out):
+    return [json.loads(line) for line in out.splitlines() if line.strip()]
+
+
+def test_scan_ok(setup, capsys):
+    root, config, out_dir = setup
+    code = main(["--config", str(config), "--output-dir", str(out_dir), "--root", str(root),
+                 "--detectors", "duplicates,empty"])
+    assert code == EXIT_OK
+    stdout = capsys.readouterr().out
+    names = [e["event"] for e in events(stdout)]
+    assert names[0] == "start" and names[-1] == "summary" and "root_done" in names, "stdout is JSON only"
+
+    summary = json.loads((out_dir / "summary.json").read_text(encoding="utf-8"))
+    assert summary["ok"] and summary["exit_code"] == EXIT_OK and summary["roots_scanned"] == 1
+    [result] = summary["results"]
+    assert result["duplicate_groups"] == 1 and result["total_files"] == 2
+
+
+def test_missing_root_fails(setup, capsys):
+    root, config, out_dir = setup
+    code = main(["--config", str(config), "--output-dir", str(out_dir), "--quiet",
+                 "--root", str(root), "--root", str(root.parent / "missing")])
+    assert code == EXIT_SCAN_FAILED
+    [summary_event] = events(capsys.readouterr().out)
+    assert summary_event["event"] == "summary" and summary_event["roots_failed"] == 1
+    assert summary_event["roots_scanned"] == 1
+
+
+@pytest.mark.parametrize("extra", [
+    ["--detectors", "duplicates,no_such_detector"],
+    ["--jobs", "0"],
+    ["--no-such-flag"],
+])
+def test_usage_errors(setup, extra, capsys):
+    root, config, out_dir = setup
+    assert main(["--config", str(config), "--output-dir", str(out_dir), "--root", str(root)] + extra) == EXIT_USAGE
+    assert capsys.readouterr().out == ""
+    assert not (out_dir / "summary.json").exists()
+
+
+def test_bad_config(setup):
+    root, config, out_dir = setup
+    config.write_text("[1, 2]", encoding="utf-8")
+    assert main(["--config", str(config), "--output-dir", str(out_dir), "--root", str(root)]) == EXIT_USAGE
+    assert main(["--config", str(config.parent / "missing.json"), "--output-dir", str(out_dir)]) == EXIT_USAGE
+
+
+def test_help_goes_to_stdout(capsys):
+    assert main(["--help"]) == EXIT_OK
+    captured = capsys.readouterr()
+    assert captured.out.startswith("usage:") and captured.err == ""
+
+
+def test_library_warnings_stay_off_stdout(tmp_path, capsys):
+    from cleanslate_core import scan_files
+    assert scan_files([str(tmp_path / "missing")], {}) == []
+    captured = capsys.readouterr()
+    assert captured.out == "" and "does not exist" in captured.err
@@ -0,0 +1,51 @@
+"""Detector registry: planning order, and run_scan running only the selected detectors."""
+
+import os
+
+import pytest
+
+from cleanslate_core import DETECTOR_REGISTRY, NEED_COST, plan_detectors, run_scan
+
+
+def test_plan_is_cheapest_first():
+    plan = plan_detectors()
+    assert {d.name for d in plan} == set(DETECTOR_REGISTRY)
+    costs = [NEED_COST[d.needs] for d in plan]
+    assert costs == sorted(costs)
+    assert [d.name for d in plan][:3] == ["large", "old", "empty"], "Ties keep registration order"
+
+
+def test_plan_selection():
+    assert [d.name for d in plan_detectors(["blurry", "large", "duplicates"])] == ["large", "duplicates", "blurry"]
+    with pytest.raises(ValueError):
+        plan_detectors(["large", "no_such_detector"])
+
+
+def test_run_scan_runs_selected_detectors(tmp_path):
+    root = tmp_path / "files"
+    root.mkdir()
+    (root / "a.txt").write_bytes(b"same")
+    (root / "b.txt").write_bytes(b"same")
+    (root / "empty.txt").write_bytes(b"")
+    (root / "big.bin").write_bytes(b"\0" * (2 * 1024 * 1024))
+    os.utime(root / "a.txt", (1, 1))
+
+    events = []
+    config = {
+        "directories_to_scan": [str(root)],
+        "large_file_threshold_mb": 1,
+        "old_file_threshold_days": 30,
+        "output_dir": str(tmp_path / "out"),
+        "detectors": ["empty", "large"],
+    }
+    results = run_scan(config, progress_callback=events.append)
+
+    started = [e["detector"] for e in events if e.get("event") == "detector" and e["status"] == "start"]
+    assert started == ["large", "empty"]
+    assert results["large_files"] == [str(root / "big.bin")]
+    assert results["empty_files"] == [str(root / "empty.txt")]
+    assert results["old_files"] == [], "Unselected detectors report their empty findings"
+    assert results["duplicates"] == {} and results["near_duplicates"] == {} and results["blurry_files"] == []
+    assert results["total_files"] == 4
+    assert os.path.exists(results["report_path"])
+
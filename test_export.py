@@ -0,0 +1,91 @@
+"""JSON Lines and columnar exports read back to the results they were written from."""
+
+import json
+import math
+
+import pytest
+
+from cleanslate_export import (_have_pyarrow, read_columnar, read_columnar_metadata, read_jsonl,
+                               write_columnar, write_jsonl)
+
+
+@pytest.fixture
+def results(scan_results):
+    scan_results["blurry_files"] = ["root/c/unlisted.png"]   # known only from a finding
+    scan_results["ai_analyses"] = {"root/a/photo.jpg": {"ai_score": 0.25}}
+    return scan_results
+
+
+def exported_paths(results):
+    return sorted(set(results["file_stats"]) | {"root/c/unlisted.png"})
+
+
+@pytest.mark.parametrize("name", ["scan.jsonl", "scan.jsonl.gz"])
+def test_jsonl_round_trip(tmp_path, results, name):
+    path = write_jsonl(results, str(tmp_path / "out" / name), {"label": "nightly"})
+    records = list(read_jsonl(path))
+
+    header, files, summary = records[0], records[1:-1], records[-1]
+    assert header["type"] == "scan" and header["label"] == "nightly" and header["total_files"] == 11
+    assert [r["path"] for r in files] == exported_paths(results)
+    by_path = {r["path"]: r for r in files}
+    for file_path, (size, mtime) in results["file_stats"].items():
+        assert (by_path[file_path]["size"], by_path[file_path]["mtime"]) == (size, mtime)
+    assert by_path["root/c/unlisted.png"]["size"] is None
+    assert by_path["root/a/photo.jpg"]["findings"] == {"duplicate": "group_1", "old": True, "ai_score": 0.25}
+    assert by_path["root/keep/archive.bin"]["findings"] == {"large": True}
+
+    links = {link for links in results["hardlinks"].values() for link in links}
+    expected_bytes = sum(size for p, (size, _) in results["file_stats"].items() if p not in links)
+    assert summary["type"] == "summary" and summary["files"] == len(files)
+    assert summary["bytes"] == expected_bytes, "A hard-linked file's bytes count once"
+    assert summary["findings"]["large"] == 4 and summary["findings"]["empty"] == 1
+
+
+def test_columnar_round_trip(tmp_path, results):
+    results["plugin_findings"] = {
+        "tiny": ["root/a/empty.log"],
+        "same_name": {"photo": ["root/a/photo.jpg"], "notes": ["root/a/notes.txt", "root/a/empty.log"]},
+        "unused": [],
+    }
+    path = write_columnar(results, str(tmp_path / "scan.lmcol"), {"label": "nightly"})
+    table = read_columnar(path)
+    paths = table["path"]
+    assert paths == exported_paths(results)
+    assert all(len(values) == len(paths) for values in table.values())
+
+    row = {name: dict(zip(paths, values)) for name, values in table.items()}
+    for file_path, (size, mtime) in results["file_stats"].items():
+        assert row["size"][file_path] == size and row["mtime"][file_path] == mtime
+    assert row["size"]["root/c/unlisted.png"] == -1 and math.isnan(row["mtime"]["root/c/unlisted.png"])
+    assert row["large"]["root/a/disk.iso"] and not row["large"]["root/a/photo.jpg"]
+    assert row["empty"]["root/a/empty.log"] and row["blurry"]["root/c/unlisted.png"]
+    assert row["duplicate"]["root/b/notes.txt"] == "group_2" and row["duplicate"]["root/a/disk.iso"] == ""
+    assert row["near_duplicate"]["root/a/shot.png"] == "group_1"
+    assert row["ai_score"]["root/a/photo.jpg"] == 0.25 and math.isnan(row["ai_score"]["root/b/photo.jpg"])
+    assert json.loads(row["plugins"]["root/a/empty.log"]) == {"same_name": "notes", "tiny": True}
+    assert json.loads(row["plugins"]["root/a/photo.jpg"]) == {"same_name": "photo"}
+    assert row["plugins"]["root/b/photo.jpg"] == "", "Files without plugin findings get an empty string"
+
+    assert read_columnar(path, columns=["path", "size"]).keys() == {"path", "size"}
+    header = read_columnar_metadata(path)
+    assert header["rows"] == len(paths) and header["metadata"]["label"] == "nightly"
+
+
+def test_columnar_empty(tmp_path):
+    table = read_columnar(write_columnar({}, str(tmp_path / "empty.lmcol")))
+    assert table["path"] == [] and table["size"] == []
+
+
+@pytest.mark.skipif(_have_pyarrow(), reason="pyarrow writes real Parquet")
+def test_parquet_falls_back_to_lmcol(tmp_path, results):
+    path = write_columnar(results, str(tmp_path / "scan.parquet"))
+    assert path.endswith(".lmcol")
+    assert read_columnar(path)["path"] == exported_paths(results)
+
+
+def test_not_an_export(tmp_path):
+    other = tmp_path / "other.bin"
+    other.write_bytes(b"not columnar")
+    with pytest.raises(ValueError):
+        read_columnar(str(other))
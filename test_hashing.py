@@ -0,0 +1,106 @@
+"""Buffered and mmap hashing must agree with hashlib over the same bytes."""
+
+import hashlib
+import os
+
+import pytest
+
+import cleanslate_hashing
+from cleanslate_hashing import hash_file, resolve_algorithm, set_mmap_threshold
+from cleanslate_metrics import ScanMetrics
+
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def mmap_threshold():
+    """Restore the module-wide mmap threshold after a test changes it."""
+    saved = cleanslate_hashing.MMAP_MIN_BYTES
+    yield
+    set_mmap_threshold(saved)
+
+
+def make_file(path, size):
+    data = os.urandom(size)
+    path.write_bytes(data)
+    return str(path), data
+
+
+def expected(data, algorithm="sha256"):
+    return hashlib.new(algorithm, data).hexdigest()
+
+
+@pytest.mark.parametrize("size", [0, 1, 4095, 4096, MB + 17, 3 * MB])
+def test_paths_agree(tmp_path, size):
+    path, data = make_file(tmp_path / "f.bin", size)
+    buffered = hash_file(path, "sha256", use_mmap=False)
+    mapped = hash_file(path, "sha256", use_mmap=True)
+    assert buffered == mapped == expected(data)
+
+
+@pytest.mark.parametrize("limit", [1, 4096, MB, 2 * MB + 3, 10 * MB])
+def test_limit(tmp_path, limit):
+    path, data = make_file(tmp_path / "f.bin", 2 * MB + 3)
+    for use_mmap in (False, True):
+        assert hash_file(path, "sha256", limit=limit, use_mmap=use_mmap) == expected(data[:limit]), use_mmap
+
+
+def test_mmap_slices(tmp_path, monkeypatch):
+    """Mapped files are fed to the hasher in MMAP_SLICE_BYTES pieces."""
+    monkeypatch.setattr(cleanslate_hashing, "MMAP_SLICE_BYTES", 64 * 1024)
+    path, data = make_file(tmp_path / "f.bin", MB + 5)
+    assert hash_file(path, "sha256", use_mmap=True) == expected(data)
+
+
+def test_threshold_selects_path(tmp_path, monkeypatch, mmap_threshold):
+    small, small_data = make_file(tmp_path / "small.bin", 1000)
+    large, large_data = make_file(tmp_path / "large.bin", 5000)
+    mapped = []
+    real = cleanslate_hashing._update_mmap
+
+    def spy(h, f, length):
+        mapped.append(length)
+        return real(h, f, length)
+
+    monkeypatch.setattr(cleanslate_hashing, "_update_mmap", spy)
+    set_mmap_threshold(4096)
+    assert hash_file(small, "sha256") == expected(small_data)
+    assert hash_file(large, "sha256") == expected(large_data)
+    assert mapped == [5000]
+
+    set_mmap_threshold(None)
+    hash_file(large, "sha256")
+    assert mapped == [5000], "None turns the mmap path off"
+
+
+def test_mmap_failure_falls_back(tmp_path, monkeypatch):
+    path, data = make_file(tmp_path / "f.bin", 10000)
+
+    def broken(h, f, length):
+        h.update(b"partial")
+        raise OSError("cannot map")
+
+    monkeypatch.setattr(cleanslate_hashing, "_update_mmap", broken)
+    assert hash_file(path, "sha256", use_mmap=True) == expected(data)
+
+
+def test_metrics_and_unreadable(tmp_path):
+    path, data = make_file(tmp_path / "f.bin", 12345)
+    metrics = ScanMetrics()
+    hash_file(path, "sha256", limit=1000, metrics=metrics, use_mmap=True)
+    hash_file(path, "sha256", metrics=metrics, use_mmap=False)
+    assert hash_file(str(tmp_path / "missing.bin"), "sha256", metrics=metrics) is None
+    counters = metrics.as_dict()["counters"]
+    assert counters["bytes_read"] == 1000 + 12345
+    assert counters["errors_skipped"] == 1
+
+
+def test_algorithms(tmp_path):
+    path, data = make_file(tmp_path / "f.bin", 5000)
+    assert hash_file(path, "blake2b") == hashlib.blake2b(data, digest_size=16).hexdigest()
+    assert hash_file(path, "md5", use_mmap=True) == expected(data, "md5")
+    assert resolve_algorithm("auto") in ("xxh3_128", "blake3", "blake2b")
+    assert resolve_algorithm(" SHA256 ") == "sha256"
+    with pytest.raises(ValueError):
+        resolve_algorithm("no-such-hash")
+
@@ -0,0 +1,76 @@
+"""SizeIndex top-N queries and incremental updates."""
+
+import os
+import threading
+
+from cleanslate_index import SizeIndex
+
+
+def make_index():
+    root = os.path.join("scan", "root")
+    stats = {
+        os.path.join(root, "a.bin"): (500, 1.0),
+        os.path.join(root, "sub", "b.bin"): (900, 2.0),
+        os.path.join(root, "sub", "c.bin"): (100, 3.0),
+        os.path.join(root, "d.bin"): (900, 4.0),
+        os.path.join(root, "e.bin"): (0, 5.0),
+    }
+    return SizeIndex.from_stats(stats, root=root), root
+
+
+def test_top_is_largest_first():
+    index, root = make_index()
+    sizes = [size for _, size, _ in index.top(10)]
+    assert sizes == sorted(sizes, reverse=True) and len(sizes) == 5
+    assert [path for path, _, _ in index.top(2)] == [os.path.join(root, "sub", "b.bin"), os.path.join(root, "d.bin")]
+    assert index.top(1)[0][2] == 2.0, "Entries carry the scan mtime"
+
+
+def test_min_bytes_and_under():
+    index, root = make_index()
+    assert [size for _, size, _ in index.top(10, min_bytes=500)] == [900, 900, 500]
+    under = index.top(10, under=os.path.join(root, "sub"))
+    assert [path for path, _, _ in under] == [os.path.join(root, "sub", "b.bin"), os.path.join(root, "sub", "c.bin")]
+    assert len(index.top(10, under=os.path.abspath(root))) == 5, "The root itself means every file"
+
+
+def test_covers():
+    index, root = make_index()
+    assert index.covers(root) and index.covers(os.path.join(root, "sub"))
+    assert not index.covers(os.path.join("scan", "rootless"))
+    assert not SizeIndex({}).covers(root)
+
+
+def test_add_remove_and_apply():
+    index, root = make_index()
+    new = os.path.join(root, "new.bin")
+    index.apply({new: (2000, 9.0)}, removed=[os.path.join(root, "d.bin")])
+    assert index.top(1) == [(new, 2000, 9.0)]
+    assert len(index) == 5 and os.path.join(root, "d.bin") not in index.file_stats
+
+    index.add(os.path.join(root, "a.bin"), 50, 7.0)
+    assert [size for _, size, _ in index.top(10)] == [2000, 900, 100, 50, 0]
+    index.remove(os.path.join(root, "a.bin"))
+    index.remove("not/indexed")
+    assert len(index) == 4
+
+
+def test_queries_while_updating():
+    index = SizeIndex.from_stats({f"f{i}": (i, 0.0) for i in range(2000)})
+    stop = threading.Event()
+
+    def churn():
+        i = 0
+        while not stop.is_set():
+            index.apply({f"new{i}": (i % 3000, 0.0)}, removed=[f"new{i - 1}"])
+            i += 1
+
+    worker = threading.Thread(target=churn)
+    worker.start()
+    try:
+        for _ in range(200):
+            sizes = [size for _, size, _ in index.iter_largest()]
+            assert sizes == sorted(sizes, reverse=True) and len(sizes) >= 2000
+    finally:
+        stop.set()
+        worker.join()
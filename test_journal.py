@@ -0,0 +1,177 @@
+"""Trash journal: record a bulk trash, then undo it from a freedesktop Trash under a temporary XDG_DATA_HOME."""
+
+import os
+import sys
+import time
+from urllib.parse import quote
+
+import pytest
+
+from cleanslate_hashing import resolve_algorithm
+from cleanslate_journal import TrashIndex, TrashJournal, fingerprint
+from cleanslate_trash import BulkTrasher, TrashRecord
+
+needs_freedesktop = pytest.mark.skipif(sys.platform in ("win32", "darwin"),
+                                       reason="restore reads the freedesktop Trash")
+
+
+class FakeTrash:
+    """Moves files into $XDG_DATA_HOME/Trash the way send2trash does (files/ + info/*.trashinfo)."""
+
+    def __init__(self, xdg_data_home):
+        self.files_dir = os.path.join(xdg_data_home, "Trash", "files")
+        self.info_dir = os.path.join(xdg_data_home, "Trash", "info")
+        os.makedirs(self.files_dir)
+        os.makedirs(self.info_dir)
+
+    def __call__(self, paths):
+        for path in paths:
+            name = base = os.path.basename(path)
+            counter = 1
+            while os.path.exists(os.path.join(self.info_dir, name + ".trashinfo")):
+                counter += 1
+                name = f"{base}.{counter}"
+            with open(os.path.join(self.info_dir, name + ".trashinfo"), "w") as f:
+                f.write("[Trash Info]\nPath=%s\nDeletionDate=%s\n"
+                        % (quote(os.path.abspath(path)), time.strftime("%Y-%m-%dT%H:%M:%S")))
+            os.rename(path, os.path.join(self.files_dir, name))
+
+
+@pytest.fixture
+def env(tmp_path, monkeypatch):
+    monkeypatch.setenv("XDG_DATA_HOME", str(tmp_path / "xdg"))
+    data = tmp_path / "data"
+    data.mkdir()
+    files = {}
+    for name, content in (("a.txt", b"alpha" * 100), ("b.txt", b"bravo" * 200), ("c.txt", b"")):
+        path = data / name
+        path.write_bytes(content)
+        files[str(path)] = content
+    journal = TrashJournal(str(tmp_path / "journal" / "trash.db"))
+    yield journal, FakeTrash(str(tmp_path / "xdg")), files
+    journal.close()
+
+
+def trash_all(journal, send, paths, batch_size=2):
+    """Run BulkTrasher the way the GUI does, journaling every batch."""
+    algorithm = resolve_algorithm()
+    op = {}
+
+    def record(records):
+        if "id" not in op:
+            op["id"] = journal.begin(records[0].operation_id, "test", algorithm)
+        journal.append(op["id"], records)
+
+    trasher = BulkTrasher(send=send, batch_size=batch_size, fingerprint=lambda path: fingerprint(path, algorithm))
+    result = trasher.run(paths, on_batch=record)
+    return op["id"], result
+
+
+@needs_freedesktop
+def test_undo_restores_everything(env):
+    journal, send, files = env
+    op_id, result = trash_all(journal, send, list(files))
+    assert len(result.trashed) == len(files)
+    assert not any(os.path.exists(path) for path in files)
+
+    ops = journal.operations()
+    assert ops[0]["id"] == op_id and ops[0]["files"] == len(files)
+    assert journal.latest_undoable() == op_id
+
+    restored = journal.undo(op_id)
+    assert not restored.failed, restored.failed
+    assert sorted(path for path, _, _ in restored.restored) == sorted(files)
+    for path, content in files.items():
+        with open(path, "rb") as f:
+            assert f.read() == content
+    assert os.listdir(send.files_dir) == [] and os.listdir(send.info_dir) == []
+    assert journal.latest_undoable() is None, "A fully restored operation is not undoable"
+    assert journal.undo(op_id).restored == [], "Undoing twice restores nothing"
+
+
+@needs_freedesktop
+def test_undo_keeps_existing_files(env):
+    journal, send, files = env
+    op_id, _ = trash_all(journal, send, list(files))
+    taken = next(iter(files))
+    with open(taken, "wb") as f:
+        f.write(b"new file in the old place")
+
+    result = journal.undo(op_id)
+    assert set(result.failed) == {taken}
+    assert len(result.restored) == len(files) - 1
+    with open(taken, "rb") as f:
+        assert f.read() == b"new file in the old place"
+    assert journal.latest_undoable() == op_id, "The conflicting file can still be restored later"
+
+    os.remove(taken)
+    assert [path for path, _, _ in journal.undo(op_id).restored] == [taken]
+
+
+@needs_freedesktop
+def test_undo_matches_by_fingerprint(env):
+    journal, send, files = env
+    path = next(iter(files))
+    op_id, _ = trash_all(journal, send, [path])
+    # Same original path and size, different content: not ours
+    with open(path, "wb") as f:
+        f.write(b"X" * len(files[path]))
+    send([path])
+
+    result = journal.undo(op_id)
+    assert result.failed == {}
+    with open(path, "rb") as f:
+        assert f.read() == files[path]
+
+
+@needs_freedesktop
+def test_latest_undoable_is_newest(env):
+    journal, send, files = env
+    paths = list(files)
+    first, _ = trash_all(journal, send, paths[:1])
+    second, _ = trash_all(journal, send, paths[1:])
+    assert journal.latest_undoable() == second
+    journal.undo(second)
+    assert journal.latest_undoable() == first
+    with pytest.raises(KeyError):
+        journal.undo(second + 100)
+
+
+def test_counts_and_latest_undoable_in_a_long_history(tmp_path):
+    with TrashJournal(str(tmp_path / "trash.db")) as journal:
+        op_ids = []
+        for i in range(80):
+            op_id = journal.begin(f"op-{i}", f"operation {i}")
+            journal.append(op_id, [TrashRecord(f"op-{i}", f"/data/{i}/{n}.txt", 10 * n, 0.0, 0.0) for n in (1, 2)])
+            op_ids.append(op_id)
+        # Everything but the oldest operation has been restored
+        with journal.conn:
+            journal.conn.executemany("INSERT INTO restores (op_id, seq, restored_at) VALUES (?, ?, 0)",
+                                     [(op_id, seq) for op_id in op_ids[1:] for seq in (1, 2)])
+        journal.conn.execute("DELETE FROM restores WHERE op_id = ? AND seq = 2", (op_ids[-1],))
+
+        ops = journal.operations(limit=3)
+        assert [op["id"] for op in ops] == op_ids[:-4:-1]
+        assert ops[0] == {"id": op_ids[-1], "op_uuid": "op-79", "created_at": ops[0]["created_at"],
+                          "description": "operation 79", "files": 2, "bytes": 30, "restored": 1}
+        assert journal.latest_undoable() == op_ids[-1]
+
+        journal.conn.execute("INSERT INTO restores (op_id, seq, restored_at) VALUES (?, 2, 0)", (op_ids[-1],))
+        assert journal.latest_undoable() == op_ids[0], "Found past more than 50 fully restored operations"
+
+
+def test_mac_trash_matches_renamed_clashes(tmp_path):
+    trash_dir = tmp_path / ".Trash"
+    trash_dir.mkdir()
+    for name in ("my photo.jpg", "my photo 2.jpg", "my photo 10.31.22.jpg", "my photo 2.png", "my.jpg",
+                 "my photos.jpg", "other 2.jpg"):
+        (trash_dir / name).write_bytes(b"")
+    index = TrashIndex()
+    index._read_mac(str(trash_dir))
+
+    def names(name):
+        return sorted(os.path.basename(item.files_path) for item in index._candidates({"name": name}))
+
+    assert names("my photo.jpg") == ["my photo 10.31.22.jpg", "my photo 2.jpg", "my photo.jpg"]
+    assert names("my.jpg") == ["my photo 10.31.22.jpg", "my photo 2.jpg", "my photo.jpg", "my photos.jpg", "my.jpg"]
+    assert names("missing.jpg") == []
@@ -0,0 +1,56 @@
+"""Per-stage timings and counters, standalone and as reported by scan_folder."""
+
+import json
+import threading
+import time
+
+from cleanslate_core import scan_folder
+from cleanslate_metrics import DEFAULT_COUNTERS, ScanMetrics
+
+
+def test_nested_stages_are_exclusive():
+    metrics = ScanMetrics("t")
+    with metrics.stage("outer"):
+        time.sleep(0.01)
+        with metrics.stage("inner"):
+            time.sleep(0.1)
+    metrics.add_time("hash", 0.5, calls=3)
+    data = metrics.finish().as_dict()
+
+    assert data["stages"]["inner"]["seconds"] >= 0.1
+    assert 0.01 <= data["stages"]["outer"]["seconds"] < 0.08, "outer excludes the nested stage"
+    assert data["stages"]["hash"] == {"seconds": 0.5, "calls": 3}
+    assert list(data["stages"])[0] == "hash", "Stages are listed slowest first"
+    assert data["wall_seconds"] == metrics.finish().as_dict()["wall_seconds"], "finish() freezes wall time"
+
+
+def test_counters_and_export(tmp_path):
+    metrics = ScanMetrics("t")
+    assert set(DEFAULT_COUNTERS) <= set(metrics.counters) and not any(metrics.counters.values())
+    metrics.incr("files_processed", 10)
+    metrics.incr("errors_skipped")
+    metrics.incr("custom")
+    path = metrics.finish().export_json(str(tmp_path / "out" / "metrics.json"))
+    with open(path, encoding="utf-8") as f:
+        exported = json.load(f)
+    assert exported["counters"]["files_processed"] == 10
+    assert exported["counters"]["errors_skipped"] == 1 and exported["counters"]["custom"] == 1
+    assert exported["throughput"]["files_per_s"] > 0
+    assert "files_processed=10" in metrics.summary()
+
+
+def test_scan_folder_reports_metrics(tmp_path):
+    root = tmp_path / "tree"
+    root.mkdir()
+    for i in range(5):
+        (root / f"f{i}.txt").write_bytes(b"x" * (i + 1))
+    (root / "copy.txt").write_bytes(b"x")
+    metrics_path = tmp_path / "metrics.json"
+
+    results = scan_folder(str(root), 100, 365, [], False, False, threading.Event(), metrics_path=str(metrics_path))
+    metrics = results["metrics"]
+    assert metrics["counters"]["files_processed"] == 6
+    assert metrics["counters"]["bytes_read"] == sum(range(1, 6)) + 1
+    assert {"walk", "stat", "hash", "dup_grouping"} <= set(metrics["stages"])
+    with open(metrics_path, encoding="utf-8") as f:
+        assert json.load(f)["counters"] == metrics["counters"]
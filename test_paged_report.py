@@ -0,0 +1,74 @@
+"""Paged HTML report: chunk files, the embedded manifest, and mode selection."""
+
+import json
+import re
+
+from cleanslate_core import write_html_report
+from cleanslate_paged_report import PAGED_REPORT_THRESHOLD, choose_mode, data_dir_for, write_paged_html_report
+
+CHUNK = re.compile(r'^window\.__lmChunk\("(\w+)",(\d+),(.*)\);$')
+
+
+def findings(n_large):
+    large = [f"/gone/big_{i}.iso" for i in range(n_large)]
+    return dict(
+        duplicates=[["/gone/a.txt", "/gone/b.txt"]],
+        large_files=large,
+        old_files=[],
+        empty_files=["/gone/empty.log"],
+        near_duplicates={},
+        blurry_files=[],
+        file_stats={path: (1024 * (i + 1), 86400.0) for i, path in enumerate(large)},
+    )
+
+
+def read_chunks(data_dir, key):
+    rows = []
+    for path in sorted(data_dir.glob(f"{key}_*.js")):
+        match = CHUNK.match(path.read_text(encoding="utf-8").strip())
+        assert match and match.group(1) == key
+        rows.extend(json.loads(match.group(3)))
+    return rows
+
+
+def test_paged_report_chunks_and_manifest(tmp_path):
+    report = tmp_path / "report.html"
+    write_paged_html_report(str(report), **findings(5), chunk_rows=2)
+    data_dir = data_dir_for(str(report))
+
+    assert len(list(data_dir.glob("large_*.js"))) == 3
+    large = read_chunks(data_dir, "large")
+    assert [row[1] for row in large] == [f"/gone/big_{i}.iso" for i in range(5)]
+    assert large[0] == ["", "/gone/big_0.iso", 1024, 86400]
+    assert read_chunks(data_dir, "dup") == [["Group 1", "/gone/a.txt", None, None],
+                                            ["Group 1", "/gone/b.txt", None, None]]
+    assert not list(data_dir.glob("old_*.js")), "Empty sections get no chunk files"
+
+    html = report.read_text(encoding="utf-8")
+    assert "/gone/big_0.iso" not in html, "Findings live in the chunks, not the page"
+    manifest = json.loads(re.search(r"var M = (.*);\n", html).group(1))
+    assert manifest["data_dir"] == data_dir.name and manifest["chunk_rows"] == 2
+    assert {s["key"]: (s["rows"], s["chunks"]) for s in manifest["sections"]}["large"] == (5, 3)
+
+
+def test_rewrite_removes_stale_chunks(tmp_path):
+    report = tmp_path / "report.html"
+    write_paged_html_report(str(report), **findings(5), chunk_rows=2)
+    write_paged_html_report(str(report), **findings(1), chunk_rows=2)
+    assert [p.name for p in data_dir_for(str(report)).glob("large_*.js")] == ["large_00000.js"]
+
+
+def test_choose_mode():
+    assert choose_mode("auto", PAGED_REPORT_THRESHOLD) == "static"
+    assert choose_mode("auto", PAGED_REPORT_THRESHOLD + 1) == "paged"
+    assert choose_mode("paged", 1) == "paged" and choose_mode("static", 10 ** 6) == "static"
+    assert choose_mode("bogus", 1) == "static", "Unknown modes fall back to auto"
+
+
+def test_static_report_after_paged_clears_data_dir(tmp_path):
+    report = tmp_path / "report.html"
+    write_html_report(str(report), **findings(3), mode="paged")
+    assert data_dir_for(str(report)).is_dir()
+    write_html_report(str(report), **findings(3), mode="static")
+    assert not data_dir_for(str(report)).exists()
+    assert "/gone/big_0.iso" in report.read_text(encoding="utf-8")
@@ -0,0 +1,106 @@
+"""Cleanup planner: one entry per file, constraints always honoured, ranked by space freed."""
+
+import os
+from collections import Counter
+
+import pytest
+
+from cleanslate_planner import plan_cleanup
+
+MB = 1024 * 1024
+
+
+def test_each_file_once(scan_results):
+    plan = plan_cleanup(scan_results)
+    counts = Counter(plan.paths())
+    assert all(n == 1 for n in counts.values()), f"Repeated paths: {counts}"
+    entries = {entry.path: entry for entry in plan}
+    assert set(entries["root/a/disk.iso"].reasons) == {"large", "old"}
+    assert len(plan) == len(entries)
+
+
+def test_keep_in_always_honoured(scan_results):
+    plan = plan_cleanup(scan_results, keep="newest", keep_in=["root/keep"], root="root")
+    paths = set(plan.paths())
+    assert not any(p.startswith("root/keep/") for p in paths), paths
+    entries = {entry.path: entry for entry in plan}
+    assert entries["root/a/photo.jpg"].kept_copy == "root/keep/photo.jpg"
+    assert entries["root/b/photo.jpg"].kept_copy == "root/keep/photo.jpg"
+
+
+def test_keep_in_absolute_spelling(tmp_path):
+    """keep_in given as an absolute folder matches the relative paths of the scan."""
+    root = os.path.relpath(tmp_path)
+    results = {
+        "file_stats": {os.path.join(root, "x", "f"): (10, 1.0), os.path.join(root, "y", "f"): (10, 2.0)},
+        "duplicates": [[os.path.join(root, "x", "f"), os.path.join(root, "y", "f")]],
+    }
+    plan = plan_cleanup(results, keep="newest", keep_in=[str(tmp_path / "x")], root=root)
+    assert plan.paths() == [os.path.join(root, "y", "f")]
+
+
+@pytest.mark.parametrize("keep", ["newest", "oldest", "first"])
+def test_one_survivor_per_group(scan_results, keep):
+    paths = set(plan_cleanup(scan_results, keep=keep).paths())
+    groups = list(scan_results["duplicates"].values()) + list(scan_results["near_duplicates"].values())
+    for group in groups:
+        survivors = [p for p in group if p not in paths]
+        assert len(survivors) == 1, f"{keep}: {group} kept {survivors}"
+
+
+@pytest.mark.parametrize("keep, survivor", [("newest", "root/b/photo.jpg"), ("oldest", "root/keep/photo.jpg"),
+                                            ("first", "root/a/photo.jpg")])
+def test_keep_rules(scan_results, keep, survivor):
+    group = scan_results["duplicates"]["group_1"]
+    plan = plan_cleanup(scan_results, keep=keep, categories=["duplicate"])
+    assert survivor not in plan.paths()
+    assert all(entry.kept_copy == survivor for entry in plan if entry.path in group)
+
+
+def test_survivor_not_trashed_for_other_reasons(scan_results):
+    # keep/photo.jpg is the oldest copy and also flagged old
+    assert "root/keep/photo.jpg" not in plan_cleanup(scan_results, keep="oldest").paths()
+
+
+def test_hardlinks_move_together(scan_results):
+    plan = plan_cleanup(scan_results, categories=["large"])
+    entries = {entry.path: entry for entry in plan}
+    assert entries["root/a/disk.iso"].freed == 50 * MB
+    assert entries["root/a/disk-link.iso"].freed == 0
+    assert plan.total_bytes == sum(entry.freed for entry in plan)
+
+    stats = scan_results["file_stats"]
+    stats["root/keep/disk-link.iso"] = stats.pop("root/a/disk-link.iso")
+    scan_results["hardlinks"] = {"root/a/disk.iso": ["root/keep/disk-link.iso"]}
+    protected = plan_cleanup(scan_results, categories=["large"], keep_in=["root/keep"])
+    assert "root/a/disk.iso" not in protected.paths(), "A link under keep_in keeps the whole file"
+
+
+def test_ranking_limit_and_target(scan_results):
+    plan = plan_cleanup(scan_results)
+    freed = [entry.freed for entry in plan if entry.freed]
+    assert freed == sorted(freed, reverse=True)
+    assert plan.paths()[:2] == ["root/a/disk.iso", "root/a/disk-link.iso"]
+
+    limited = plan_cleanup(scan_results, limit=2)
+    assert limited.paths()[:2] == plan.paths()[:2]
+    assert limited.total_bytes == 90 * MB
+
+    target = plan_cleanup(scan_results, target_bytes=60 * MB)
+    assert target.total_bytes >= 60 * MB
+    assert target.total_bytes - target.top(len(target))[-1].freed < 60 * MB
+
+
+def test_expected_and_trash_plan(scan_results):
+    plan = plan_cleanup(scan_results, categories=["duplicate", "empty"])
+    trash_plan = plan.trash_plan()
+    assert trash_plan.paths == plan.paths()
+    assert trash_plan.total_bytes == plan.total_bytes
+    assert set(plan.expected()) == set(plan.paths())
+
+
+def test_invalid_arguments(scan_results):
+    with pytest.raises(ValueError):
+        plan_cleanup(scan_results, keep="largest")
+    with pytest.raises(ValueError):
+        plan_cleanup(scan_results, categories=["huge"])
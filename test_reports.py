@@ -0,0 +1,52 @@
+"""Text and HTML reports streamed to disk from scan-time metadata."""
+
+import threading
+
+from cleanslate_core import (generate_html_report, generate_report, scan_folder, write_html_report,
+                             write_report)
+
+FINDINGS = dict(
+    duplicates=[["/gone/a.txt", "/gone/b.txt"]],
+    large_files=["/gone/big <1>.iso"],
+    old_files=["/gone/a.txt"],
+    empty_files=["/gone/empty.log"],
+    near_duplicates={"group_1": ["/gone/x.png", "/gone/y.png"]},
+    blurry_files=["/gone/x.png"],
+    file_stats={"/gone/a.txt": (2048, 0.0), "/gone/b.txt": (2048, 0.0), "/gone/big <1>.iso": (3 * 1024 * 1024, 0.0)},
+)
+
+
+def _undated(report):
+    """Drop the generation timestamp so two renderings compare equal."""
+    return [line for line in report.split("\n") if "generated" not in line.lower()]
+
+
+def test_streamed_text_report_matches_generated(tmp_path):
+    # None of the files exist: sizes and dates come from file_stats only
+    path = write_report(str(tmp_path / "report.txt"), **FINDINGS)
+    with open(path, encoding="utf-8") as f:
+        written = f.read()
+    assert _undated(written) == _undated(generate_report(**FINDINGS) + "\n")
+    assert "/gone/big <1>.iso (3,145,728 bytes)" in written
+
+
+def test_streamed_html_report_matches_generated(tmp_path):
+    path = write_html_report(str(tmp_path / "report.html"), **FINDINGS)
+    with open(path, encoding="utf-8") as f:
+        written = f.read()
+    assert _undated(written) == _undated(generate_html_report(**FINDINGS) + "\n")
+    assert "/gone/big &lt;1&gt;.iso" in written and "<1>" not in written, "Paths are escaped"
+
+
+def test_scan_folder_writes_both_reports(tmp_path, monkeypatch):
+    root = tmp_path / "tree"
+    root.mkdir()
+    (root / "a.txt").write_bytes(b"same")
+    (root / "b.txt").write_bytes(b"same")
+    monkeypatch.chdir(tmp_path)
+
+    results = scan_folder(str(root), 100, 365, [], True, True, threading.Event())
+    for key in ("report_txt_path", "report_html_path"):
+        assert results[key], key
+        with open(results[key], encoding="utf-8") as f:
+            assert str(root / "a.txt") in f.read()
@@ -0,0 +1,63 @@
+"""scan_folder and run_scan duplicate detection options."""
+
+import threading
+
+import pytest
+
+from cleanslate_core import DEFAULT_CONFIG, run_scan, scan_folder
+
+
+@pytest.fixture
+def tree(tmp_path, monkeypatch):
+    root = tmp_path / "tree"
+    (root / "sub").mkdir(parents=True)
+    (root / "a.txt").write_bytes(b"same content")
+    (root / "sub" / "a-copy.txt").write_bytes(b"same content")
+    (root / "other.txt").write_bytes(b"different!!!")
+    monkeypatch.chdir(tmp_path)  # scan_folder writes its reports to the working directory
+    return root
+
+
+def scan(root, **kwargs):
+    return scan_folder(str(root), 100, 365, [], False, False, threading.Event(), **kwargs)
+
+
+@pytest.mark.parametrize("algorithm", ["auto", "md5", "sha256", "BLAKE2B"])
+def test_hash_algorithm_selection(tree, algorithm):
+    results = scan(tree, hash_algorithm=algorithm)
+    assert results["dup_groups"] == 1 and results["total_files"] == 3
+
+
+def test_unknown_hash_algorithm(tree):
+    with pytest.raises(ValueError):
+        scan(tree, hash_algorithm="no-such-hash")
+
+
+def test_run_scan_records_hash_algorithm(tree, tmp_path):
+    config = {**DEFAULT_CONFIG, "directories_to_scan": [str(tree)], "output_dir": str(tmp_path / "out"),
+              "detectors": ["duplicates"], "hash_algorithm": "md5"}
+    results = run_scan(config)
+    assert results["hash_algorithm"] == "md5"
+    assert len(results["duplicates"]) == 1
+
+
+def test_hardlinks_collapse_before_hashing(tree):
+    link = tree / "sub" / "a-link.txt"
+    link.hardlink_to(tree / "a.txt")
+    results = scan(tree)
+
+    assert results["dup_groups"] == 1
+    [(owner, links)] = results["hardlinks"].items()
+    assert sorted([owner] + links) == [str(tree / "a.txt"), str(link)]
+    assert results["reclaimable_bytes"] == len(b"same content"), "The link frees nothing; the copy does"
+
+
+def test_hardlinks_alone_are_not_duplicates(tmp_path, monkeypatch):
+    root = tmp_path / "links"
+    root.mkdir()
+    (root / "a.bin").write_bytes(b"payload")
+    (root / "b.bin").hardlink_to(root / "a.bin")
+    monkeypatch.chdir(tmp_path)
+    results = scan(root)
+    assert results["dup_groups"] == 0 and results["reclaimable_bytes"] == 0
+    assert len(results["hardlinks"]) == 1
@@ -0,0 +1,92 @@
+"""Snapshots: save two scans of the same root and compare them."""
+
+import copy
+
+import pytest
+
+from cleanslate_snapshot import SnapshotStore, format_diff
+
+MB = 1024 * 1024
+
+
+@pytest.fixture
+def store(tmp_path):
+    with SnapshotStore(str(tmp_path / "snapshots" / "test.db")) as store:
+        yield store
+
+
+@pytest.fixture
+def rescan(scan_results):
+    """The same tree a day later: notes.txt deduplicated, one more photo copy, a new song pair."""
+    after = copy.deepcopy(scan_results)
+    stats = after["file_stats"]
+    del stats["root/b/notes.txt"]
+    del after["duplicates"]["group_2"]
+    stats["root/b/photo-copy.jpg"] = (3 * MB, 600.0)
+    after["duplicates"]["group_1"].append("root/b/photo-copy.jpg")
+    stats["root/c/song.mp3"] = stats["root/c/song-copy.mp3"] = (5 * MB, 700.0)
+    after["duplicates"]["group_3"] = ["root/c/song.mp3", "root/c/song-copy.mp3"]
+    after["large_files"].append("root/c/song.mp3")
+    after["old_files"].append("root/a/notes.txt")
+    after["total_files"] = len(stats)
+    return after
+
+
+def stored_bytes(results):
+    links = {link for links in (results.get("hardlinks") or {}).values() for link in links}
+    return sum(size for path, (size, _) in results["file_stats"].items() if path not in links)
+
+
+def test_save_and_list(store, scan_results, rescan):
+    first = store.save(scan_results, roots=["root"], label="before")
+    second = store.save(rescan, roots=["root"], label="after")
+    scans = store.list_scans()
+    assert [scan["id"] for scan in scans] == [second, first]
+    assert scans[0]["roots"] == ["root"] and scans[0]["label"] == "after"
+    assert scans[1]["total_files"] == 11
+    assert scans[1]["total_bytes"] == stored_bytes(scan_results), "A hard-linked file's bytes count once"
+    assert store.latest_ids(["root"]) == [second, first]
+    assert store.latest_ids(["elsewhere"]) == []
+
+
+def test_diff(store, scan_results, rescan):
+    first = store.save(scan_results, roots=["root"])
+    second = store.save(rescan, roots=["root"])
+    diff = store.diff(first, second)
+
+    assert [g["paths"] for g in diff["new_duplicate_groups"]] == [["root/c/song-copy.mp3", "root/c/song.mp3"]]
+    assert [g["paths"] for g in diff["removed_duplicate_groups"]] == [["root/a/notes.txt", "root/b/notes.txt"]]
+    changed = diff["changed_duplicate_groups"]
+    assert len(changed) == 1
+    assert changed[0]["added"] == ["root/b/photo-copy.jpg"] and changed[0]["removed"] == []
+    assert [f["path"] for f in diff["newly_large"]] == ["root/c/song.mp3"]
+    assert [f["path"] for f in diff["newly_old"]] == ["root/a/notes.txt"]
+
+    deltas = diff["deltas"]
+    assert deltas["files"] == 2
+    assert deltas["total_bytes"] == 12 * MB
+    assert deltas["duplicate_reclaimable_bytes"] == (9 + 5) * MB - (6 + 1) * MB
+    assert deltas["large_bytes"] == 5 * MB
+
+    text = format_diff(diff)
+    assert f"Snapshot diff {first} -> {second}" in text
+    assert "New duplicate groups: 1" in text and "Changed duplicate groups: 1" in text
+
+
+def test_diff_identical(store, scan_results):
+    first = store.save(scan_results)
+    second = store.save(scan_results)
+    diff = store.diff(first, second)
+    assert not (diff["new_duplicate_groups"] or diff["removed_duplicate_groups"]
+                or diff["changed_duplicate_groups"] or diff["newly_large"] or diff["newly_old"])
+    assert all(value == 0 for value in diff["deltas"].values())
+
+
+def test_delete_and_prune(store, scan_results):
+    ids = [store.save(scan_results) for _ in range(4)]
+    assert store.prune(keep=2) == 2
+    assert [scan["id"] for scan in store.list_scans()] == [ids[3], ids[2]]
+    store.delete(ids[3])
+    assert [scan["id"] for scan in store.list_scans()] == [ids[2]]
+    with pytest.raises(KeyError):
+        store.diff(ids[0], ids[2])
@@ -0,0 +1,100 @@
+"""ToolRunner: deduplicated requests, the per-workspace cache, invalidation and cancel."""
+
+import queue
+import threading
+
+import pytest
+
+from cleanslate_tasks import ToolRunner
+
+
+class Recorder:
+    """emit callback that queues (kind, payload) for the test thread."""
+
+    def __init__(self):
+        self.events = queue.Queue()
+
+    def __call__(self, kind, payload):
+        self.events.put((kind, payload))
+
+    def next(self, skip_partial=True):
+        while True:
+            kind, payload = self.events.get(timeout=5)
+            if not (skip_partial and kind == "partial"):
+                return kind, payload
+
+
+@pytest.fixture
+def runner():
+    recorder = Recorder()
+    runner = ToolRunner(recorder)
+    runner.recorder = recorder
+    yield runner
+    runner.close()
+
+
+def gated(gate, calls, result="answer"):
+    """A task that counts its runs and blocks until gate is set (or it is canceled)."""
+    def fn(cancel_event, partial):
+        calls.append(1)
+        while not gate.wait(0.01):
+            if cancel_event.is_set():
+                return None
+        return result
+    return fn
+
+
+def test_duplicate_request_joins_running_task(runner, tmp_path):
+    gate, calls = threading.Event(), []
+    assert runner.submit(str(tmp_path), "dupes", (), gated(gate, calls), context="first") == "queued"
+    assert runner.submit(str(tmp_path), "dupes", (), gated(gate, calls), context="second") == "joined"
+    assert runner.busy()
+    gate.set()
+
+    done = [runner.recorder.next(), runner.recorder.next()]
+    assert [kind for kind, _ in done] == ["done", "done"]
+    assert sorted(p["context"] for _, p in done) == ["first", "second"]
+    assert all(p["result"] == "answer" and not p["cached"] for _, p in done)
+    assert len(calls) == 1, "The joined request did not run again"
+
+
+def test_cache_and_invalidate(runner, tmp_path):
+    gate, calls = threading.Event(), []
+    gate.set()
+    workspace = str(tmp_path / "ws")
+    runner.submit(workspace, "largest", 10, gated(gate, calls))
+    assert runner.recorder.next()[0] == "done"
+
+    assert runner.submit(workspace, "largest", 10, gated(gate, calls)) == "cached"
+    kind, payload = runner.recorder.next()
+    assert kind == "done" and payload["cached"] and payload["result"] == "answer"
+    assert runner.submit(workspace, "largest", 20, gated(gate, calls)) == "queued", "Other params are not cached"
+    runner.recorder.next()
+
+    runner.invalidate(str(tmp_path))  # a scan of a parent folder makes the answer stale
+    assert runner.submit(workspace, "largest", 10, gated(gate, calls)) == "queued"
+    runner.recorder.next()
+    assert len(calls) == 3
+
+
+def test_cancel(runner, tmp_path):
+    gate, calls = threading.Event(), []
+    runner.submit(str(tmp_path), "dupes", (), gated(gate, calls))
+    runner.submit(str(tmp_path), "largest", 10, gated(gate, calls))
+    assert runner.cancel(str(tmp_path)) == 2
+    assert [runner.recorder.next()[0] for _ in range(2)] == ["canceled", "canceled"]
+    assert not runner.busy()
+    assert len(calls) <= 1, "The queued task never started"
+
+    gate.set()
+    assert runner.submit(str(tmp_path), "dupes", (), gated(gate, calls)) == "queued", "Canceled results are not cached"
+    assert runner.recorder.next()[0] == "done"
+
+
+def test_error_is_reported(runner, tmp_path):
+    def boom(cancel_event, partial):
+        raise RuntimeError("disk on fire")
+
+    runner.submit(str(tmp_path), "dupes", (), boom)
+    kind, payload = runner.recorder.next()
+    assert kind == "error" and payload["error"] == "disk on fire" and payload["tool"] == "dupes"
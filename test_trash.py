@@ -0,0 +1,110 @@
+"""Bulk trash engine, with a stand-in for send2trash that records batches and deletes the files."""
+
+import os
+import threading
+
+import pytest
+
+from cleanslate_trash import BulkTrasher, apply_to_results, duplicates_plan
+
+
+class RecordingSend:
+    """Deletes each batch and remembers it; can fail on chosen paths or cancel after a batch."""
+
+    def __init__(self, fail=(), cancel_event=None):
+        self.batches = []
+        self.fail = set(fail)
+        self.cancel_event = cancel_event
+
+    def __call__(self, paths):
+        if self.fail.intersection(paths):
+            raise OSError("cannot trash")
+        self.batches.append(list(paths))
+        for path in paths:
+            os.remove(path)
+        if self.cancel_event is not None:
+            self.cancel_event.set()
+
+
+@pytest.fixture
+def files(tmp_path):
+    paths = []
+    for i in range(7):
+        path = tmp_path / f"f{i}.txt"
+        path.write_bytes(b"x" * (i + 1))
+        paths.append(str(path))
+    return paths
+
+
+def test_batches_and_progress(files):
+    send = RecordingSend()
+    progress = []
+    result = BulkTrasher(send=send, batch_size=3).run(files, progress=lambda *args: progress.append(args))
+    assert send.batches == [files[0:3], files[3:6], files[6:]]
+    assert result.trashed_paths == files
+    assert result.trashed_bytes == sum(range(1, 8))
+    assert [done for done, _, _ in progress] == [3, 6, 7]
+    assert progress[-1] == (7, 7, result.trashed_bytes)
+    assert not result.canceled
+
+
+def test_cancel_after_first_batch(files):
+    cancel = threading.Event()
+    send = RecordingSend(cancel_event=cancel)
+    batches = []
+    result = BulkTrasher(send=send, batch_size=3).run(files, cancel_event=cancel, on_batch=batches.append)
+    assert result.canceled
+    assert result.trashed_paths == files[:3]
+    assert [[record.path for record in batch] for batch in batches] == [files[:3]]
+    assert all(os.path.exists(path) for path in files[3:])
+    assert "(canceled)" in result.summary()
+
+
+def test_skips_missing_and_changed_files(files):
+    expected = {path: (os.stat(path).st_size, os.stat(path).st_mtime) for path in files}
+    os.remove(files[0])
+    with open(files[1], "ab") as f:
+        f.write(b"grown since the scan")
+    result = BulkTrasher(send=RecordingSend(), batch_size=3).run(files, expected=expected)
+    assert result.skipped == {files[0]: "missing", files[1]: "changed since scan"}
+    assert result.trashed_paths == files[2:]
+    assert os.path.exists(files[1])
+
+
+def test_failed_batch_retried_file_by_file(files):
+    send = RecordingSend(fail=[files[1]])
+    result = BulkTrasher(send=send, batch_size=3).run(files)
+    assert list(result.failed) == [files[1]]
+    assert result.trashed_paths == [p for p in files if p != files[1]]
+    assert [files[0]] in send.batches and [files[2]] in send.batches
+
+
+def test_fingerprint_recorded(files):
+    result = BulkTrasher(send=RecordingSend(), fingerprint=lambda path: "fp:" + os.path.basename(path)).run(files[:2])
+    assert [record.fingerprint for record in result.trashed] == ["fp:f0.txt", "fp:f1.txt"]
+
+
+def test_duplicates_plan_keeps_first():
+    stats = {"a": (10, 1.0), "b": (10, 2.0), "c": (10, 3.0), "d": (4, 1.0), "e": (4, 1.0)}
+    plan = duplicates_plan([["a", "b", "c"], ["d", "e"]], stats)
+    assert plan.paths == ["b", "c", "e"]
+    assert plan.total_bytes == 24
+
+
+def test_apply_to_results():
+    results = {
+        "file_stats": {"a": (10, 1.0), "b": (10, 1.0), "c": (10, 1.0), "d": (5, 1.0), "l": (5, 1.0)},
+        "large_files": ["a", "d"],
+        "old_files": ["b"],
+        "duplicates": [["a", "b", "c"], ["d", "x"]],
+        "hardlinks": {"d": ["l"]},
+    }
+    updated = apply_to_results(results, ["b", "x", "d"])
+    assert set(updated["file_stats"]) == {"a", "c", "l"}
+    assert updated["total_files"] == 3
+    assert updated["large_files"] == ["a"] and updated["old_files"] == []
+    assert updated["duplicates"] == [["a", "c"]] and updated["dup_groups"] == 1
+    assert updated["hardlinks"] == {}
+    assert results["file_stats"]["b"] == (10, 1.0), "The original results are not changed"
+    assert apply_to_results(results, []) is results
+
@@ -0,0 +1,125 @@
+"""LiveInventory kept current from batches of changed paths, as the watcher reports them."""
+
+import os
+
+import pytest
+
+from cleanslate_watcher import LiveInventory
+
+MB = 1024 * 1024
+
+
+def write(path, content):
+    with open(path, "wb") as f:
+        f.write(content)
+    return str(path)
+
+
+@pytest.fixture
+def tree(tmp_path):
+    write(tmp_path / "a.txt", b"same content")
+    write(tmp_path / "b.txt", b"other bytes!")   # same size as a.txt, different content
+    write(tmp_path / "big.bin", b"\0" * (2 * MB))
+    return tmp_path
+
+
+def inventory_of(root):
+    """An inventory built the way the watcher first sees a folder: one batch with the root."""
+    inventory = LiveInventory(str(root), {}, [], {}, size_threshold_mb=1, age_threshold_days=30)
+    inventory.apply({str(root)})
+    return inventory
+
+
+def test_initial_listing(tree):
+    inventory = inventory_of(tree)
+    assert set(inventory.file_stats) == {str(tree / n) for n in ("a.txt", "b.txt", "big.bin")}
+    assert list(inventory.large) == [str(tree / "big.bin")]
+    assert inventory.duplicates() == []
+    assert inventory.apply({str(tree)}) is None, "An unchanged folder is not a change"
+
+
+def test_added_copy_becomes_duplicate(tree):
+    inventory = inventory_of(tree)
+    copy = write(tree / "copy.txt", b"same content")
+    change = inventory.apply({copy})
+    assert change == {"updated": {copy: inventory.file_stats[copy]}, "removed": []}
+    assert inventory.duplicates() == [[str(tree / "a.txt"), copy]]
+    assert inventory.results()["dup_groups"] == 1
+
+
+def test_removed_copy_dissolves_group(tree):
+    inventory = inventory_of(tree)
+    copy = write(tree / "copy.txt", b"same content")
+    inventory.apply({copy})
+    os.remove(copy)
+    change = inventory.apply({copy})
+    assert change == {"updated": {}, "removed": [copy]}
+    assert copy not in inventory.file_stats
+    assert inventory.duplicates() == []
+
+
+def test_modified_file_leaves_group(tree):
+    inventory = inventory_of(tree)
+    copy = write(tree / "copy.txt", b"same content")
+    inventory.apply({copy})
+    write(copy, b"edited text!")
+    os.utime(copy, (1, 1))
+    inventory.apply({copy})
+    assert inventory.duplicates() == []
+    assert copy in inventory.old
+
+
+def test_removed_directory(tree):
+    sub = tree / "sub"
+    sub.mkdir()
+    inner = write(sub / "a.txt", b"same content")
+    inventory = inventory_of(tree)
+    assert inventory.duplicates() == [[str(tree / "a.txt"), inner]]
+    os.remove(inner)
+    sub.rmdir()
+    assert inventory.apply({str(sub)}) == {"updated": {}, "removed": [inner]}
+    assert inventory.duplicates() == []
+
+
+@pytest.mark.skipif(not hasattr(os, "link"), reason="needs hard links")
+def test_new_hard_link_is_not_a_duplicate(tree):
+    inventory = inventory_of(tree)
+    original = str(tree / "a.txt")
+    link = str(tree / "link.txt")
+    os.link(original, link)
+    inventory.apply({link})
+    assert inventory.duplicates() == []
+    assert inventory.hardlinks == {original: [link]}
+    assert inventory.results()["hardlinks"] == {original: [link]}
+
+    # A real copy groups with one link of the inode, not with both
+    copy = write(tree / "copy.txt", b"same content")
+    inventory.apply({copy})
+    assert inventory.duplicates() == [[original, copy]]
+
+
+@pytest.mark.skipif(not hasattr(os, "link"), reason="needs hard links")
+def test_removed_link_owner_hands_over(tree):
+    original = str(tree / "a.txt")
+    link = str(tree / "link.txt")
+    os.link(original, link)
+    copy = write(tree / "copy.txt", b"same content")
+    inventory = inventory_of(tree)
+    assert inventory.hardlinks and len(inventory.duplicates()) == 1
+
+    owner = next(iter(inventory.hardlinks))
+    heir = inventory.hardlinks[owner][0]
+    os.remove(owner)
+    inventory.apply({owner})
+    assert inventory.hardlinks == {}
+    assert [sorted(group) for group in inventory.duplicates()] == [sorted([heir, copy])]
+
+
+def test_excluded_paths_ignored(tree):
+    inventory = LiveInventory(str(tree), {}, [], {}, size_threshold_mb=1, age_threshold_days=30,
+                              exclude=lambda path: path.endswith(".tmp"))
+    inventory.apply({str(tree)})
+    scratch = write(tree / "scratch.tmp", b"same content")
+    assert inventory.apply({scratch}) is None
+    assert scratch not in inventory.file_stats
+